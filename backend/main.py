@@ -12,14 +12,20 @@ import pandas as pd
 import numpy as np
 import json
 import os
+from collections import deque
 from pathlib import Path
 from datetime import datetime, timedelta
-import gzip
 import time
 import subprocess
 import threading
 import sys
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from ops.llm_logging import compacted_path, read_gzip_tail, read_gzip_tolerant, read_log_partition
+
 app = FastAPI(title="MetaStackerBandit API", version="1.0.0")
 
 # SECURITY: Trading bots auto-start is DISABLED by default to prevent unintended execution
@@ -122,24 +128,56 @@ def read_csv_safe(filepath: Path, limit: Optional[int] = None) -> List[Dict]:
         return []
 
 
+def partition_exists(filepath: Path) -> bool:
+    """True if a log file exists, or its day was compacted to Parquet (source may be removed)"""
+    return filepath.exists() or (filepath.name.endswith(".jsonl.gz") and compacted_path(filepath).exists())
+
+
+def _json_value(value):
+    """Undo Parquet typing for one cell: timestamps back to ISO strings, JSON strings back to objects"""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, str) and value[:1] in ("{", "["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
 def read_jsonl_safe(filepath: Path, limit: Optional[int] = None) -> List[Dict]:
     """Safely read JSONL file (compressed or not) and return as list of dicts"""
     try:
-        if not filepath.exists():
+        if not partition_exists(filepath):
             return []
         
-        records = []
-        open_func = gzip.open if filepath.suffix == ".gz" else open
-        mode = "rt" if filepath.suffix == ".gz" else "r"
+        if filepath.suffix == ".gz" and compacted_path(filepath).exists():
+            # Closed day: read_log_partition prefers the compacted Parquet file
+            df = read_log_partition(filepath)
+            if df is not None:
+                if limit:
+                    df = df.tail(limit)
+                return [{k: _json_value(v) for k, v in row.items()} for row in df.to_dict("records")]
+            if not filepath.exists():
+                return []
         
-        with open_func(filepath, mode, encoding="utf-8") as f:
+        if filepath.suffix == ".gz":
+            # Last `limit` lines via the partition's block index, without inflating the whole day
+            raw = read_gzip_tail(filepath, limit) if limit else read_gzip_tolerant(filepath)
+            return [json.loads(line) for line in raw.decode("utf-8").splitlines() if line.strip()]
+        
+        # Last `limit` lines, like the gz branch
+        lines = deque(maxlen=limit) if limit else []
+        with open(filepath, "r", encoding="utf-8") as f:
             for line in f:
                 if line.strip():
-                    records.append(json.loads(line))
-                if limit and len(records) >= limit:
-                    break
+                    lines.append(line)
         
-        return records[-limit:] if limit else records
+        return [json.loads(line) for line in lines]
     except Exception as e:
         print(f"Error reading {filepath}: {e}")
         return []
@@ -576,7 +614,7 @@ async def get_executions(version: str, limit: Optional[int] = 100):
                 )
         
         for execution_jsonl_file in execution_jsonl_paths:
-            if execution_jsonl_file.exists():
+            if partition_exists(execution_jsonl_file):
                 execution_jsonl_data = read_jsonl_safe(execution_jsonl_file, limit=limit)
                 # Convert execution.jsonl format to CSV-like format
                 data = []
@@ -684,9 +722,9 @@ async def get_health_metrics(version: str, limit: Optional[int] = 100):
             if dates:
                 latest_date = sorted(dates, reverse=True)[0]
                 kpi_log_file = bot_kpi_dir / f"date={latest_date}" / "asset=BTCUSDT" / "kpi_scorecard.jsonl.gz"
-                if not kpi_log_file.exists():
+                if not partition_exists(kpi_log_file):
                     kpi_log_file = bot_kpi_dir / f"date={latest_date}" / "kpi_scorecard.jsonl.gz"
-                if kpi_log_file.exists():
+                if partition_exists(kpi_log_file):
                     kpi_data = read_jsonl_safe(kpi_log_file, limit=limit)
                     # Convert KPI data to health metrics format
                     data = []
@@ -719,7 +757,7 @@ async def get_health_metrics(version: str, limit: Optional[int] = 100):
                 if dates:
                     latest_date = sorted(dates, reverse=True)[0]
                     kpi_log_file = kpi_file / f"date={latest_date}" / "asset=BTCUSDT" / "kpi_scorecard.jsonl.gz"
-                    if kpi_log_file.exists():
+                    if partition_exists(kpi_log_file):
                         kpi_data = read_jsonl_safe(kpi_log_file, limit=limit)
                         # Convert KPI data to health metrics format
                         data = []
@@ -1044,7 +1082,7 @@ async def get_logs(log_type: str, date: Optional[str] = None, limit: Optional[in
     
     # Find first existing file
     for path in paths_to_try:
-        if path.exists():
+        if partition_exists(path):
             log_file = path
             break
     
@@ -1058,14 +1096,14 @@ async def get_logs(log_type: str, date: Optional[str] = None, limit: Optional[in
             if version_log_dir.exists():
                 # Try date-partitioned
                 date_file = version_log_dir / f"date={date}" / f"asset={asset}" / f"{log_type}.jsonl.gz"
-                if not date_file.exists():
+                if not partition_exists(date_file):
                     date_file = version_log_dir / f"date={date}" / f"{log_type}.jsonl.gz"
-                if not date_file.exists():
+                if not partition_exists(date_file):
                     date_file = version_log_dir / f"{log_type}.jsonl"
-                if not date_file.exists():
+                if not partition_exists(date_file):
                     date_file = version_log_dir / f"{log_type}.jsonl.gz"
                 
-                if date_file.exists():
+                if partition_exists(date_file):
                     version_data = read_jsonl_safe(date_file, limit=limit)
                     all_data.extend(version_data)
             
@@ -1073,14 +1111,14 @@ async def get_logs(log_type: str, date: Optional[str] = None, limit: Optional[in
             nested_log_dir = OUTPUTS_DIR / version / "logs" / version / log_type
             if nested_log_dir.exists():
                 date_file = nested_log_dir / f"date={date}" / f"asset={asset}" / f"{log_type}.jsonl.gz"
-                if not date_file.exists():
+                if not partition_exists(date_file):
                     date_file = nested_log_dir / f"date={date}" / f"{log_type}.jsonl.gz"
-                if not date_file.exists():
+                if not partition_exists(date_file):
                     date_file = nested_log_dir / f"{log_type}.jsonl"
-                if not date_file.exists():
+                if not partition_exists(date_file):
                     date_file = nested_log_dir / f"{log_type}.jsonl.gz"
                 
-                if date_file.exists():
+                if partition_exists(date_file):
                     version_data = read_jsonl_safe(date_file, limit=limit)
                     all_data.extend(version_data)
         
@@ -1088,12 +1126,12 @@ async def get_logs(log_type: str, date: Optional[str] = None, limit: Optional[in
         # Legacy location doesn't have bot-specific structure, so only check if no bot_version filter
         if not bot_version:
             root_file = LOGS_DIR / log_type / f"date={date}" / f"asset={asset}" / f"{log_type}.jsonl.gz"
-            if not root_file.exists():
+            if not partition_exists(root_file):
                 root_file = LOGS_DIR / log_type / f"date={date}" / f"{log_type}.jsonl.gz"
-            if not root_file.exists():
+            if not partition_exists(root_file):
                 root_file = LOGS_DIR / log_type / f"{log_type}.jsonl.gz"
             
-            if root_file.exists():
+            if partition_exists(root_file):
                 root_data = read_jsonl_safe(root_file, limit=limit)
                 all_data.extend(root_data)
         
@@ -1122,7 +1160,7 @@ async def get_logs(log_type: str, date: Optional[str] = None, limit: Optional[in
         "asset": asset,
         "data": data,
         "count": len(data),
-        "file_exists": log_file.exists()
+        "file_exists": partition_exists(log_file)
     }
 
 
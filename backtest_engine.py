@@ -11,6 +11,7 @@ from typing import Tuple, Dict, Optional
 from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 import json  # Day 4: For saving backtest results
+import math
 import os
 from datetime import datetime
 
@@ -93,6 +94,225 @@ def run_allocator_backtest(
         metrics: Performance metrics dictionary
     """
     
+    Eq, Tr, Bu = _allocator_loop(
+        bt_df, arm_signals, arm_eligible, adv_series, cooldown_bars, cost_bps, impact_k,
+        side_eps_vec, eps, sigma_target, pos_max, dd_stop, latency_bars,
+    )
+    
+    # Calculate performance metrics
+    eq_rets = Eq['equity'].pct_change().dropna()
+    if annualizer is None:
+        annualizer = np.sqrt(365*24*12)  # 5-minute bars
+    
+    sharpe = float(annualizer * eq_rets.mean() / (eq_rets.std() if eq_rets.std() != 0 else np.nan)) if len(eq_rets) else np.nan
+    
+    # Sortino ratio
+    downside_rets = eq_rets[eq_rets < 0]
+    sortino = float(annualizer * eq_rets.mean() / (downside_rets.std() if len(downside_rets) > 0 else np.nan)) if len(eq_rets) else np.nan
+    
+    maxdd = float(-(Eq['equity'] / Eq['equity'].cummax() - 1.0).min()) if not Eq.empty else np.nan
+    
+    # Turnover
+    turnover = float(np.abs(Tr['to_pos'].astype(float) - Tr['from_pos'].astype(float)).sum()) if not Tr.empty else 0.0
+    
+    # Hit rate
+    hit_rate = float((Tr['pnl_$'] > 0).sum() / max(len(Tr), 1)) if not Tr.empty and 'pnl_$' in Tr.columns else np.nan
+    
+    metrics = {
+        'final_equity': float(Eq['equity'].iloc[-1]) if len(Eq) else 1.0,
+        'n_trades': int(len(Tr)),
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'maxDD': maxdd,
+        'turnover': turnover,
+        'hit_rate': hit_rate,
+    }
+    
+    # Day 4: Save results to JSON if requested
+    if save_results:
+        _save_backtest_results(metrics, 'allocator', save_results_path)
+    
+    return Eq, Tr, Bu, metrics
+
+
+_VOL_WINDOW = 21  # bars in the position-sizing std window, t-20..t
+_VOL_CHUNK = 1 << 16
+
+
+def _trailing_std(rets: np.ndarray, window: int = _VOL_WINDOW) -> np.ndarray:
+    """np.std(rets[max(0, t-window+1):t+1]) for every t.
+
+    Full windows are reduced over a sliding-window view in fixed-size chunks,
+    which gives the same bits as the per-slice np.std call in O(n * window).
+    """
+    n = len(rets)
+    out = np.empty(n, dtype=float)
+    head = min(n, window - 1)
+    for t in range(head):
+        out[t] = np.std(rets[:t + 1])
+    if n >= window:
+        view = np.lib.stride_tricks.sliding_window_view(rets, window)
+        for s in range(0, len(view), _VOL_CHUNK):
+            out[window - 1 + s:window - 1 + s + _VOL_CHUNK] = np.std(view[s:s + _VOL_CHUNK], axis=1)
+    return out
+
+
+def _allocator_loop(
+    bt_df: pd.DataFrame,
+    arm_signals: np.ndarray,
+    arm_eligible: np.ndarray,
+    adv_series: pd.Series,
+    cooldown_bars: int,
+    cost_bps: float,
+    impact_k: float,
+    side_eps_vec: np.ndarray,
+    eps: float,
+    sigma_target: float,
+    pos_max: float,
+    dd_stop: float,
+    latency_bars: int,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Bar loop of run_allocator_backtest in O(n).
+
+    Matches _allocator_loop_reference exactly, including the bandit's draws from
+    the global NumPy RNG. The trailing vol is precomputed, the drawdown peak is
+    a running max, and the Thompson bandit runs inline on Python floats. The
+    equity, trade and bandit records are written into preallocated arrays
+    instead of tuple lists.
+    """
+    n = len(bt_df)
+    n_arms = arm_signals.shape[1]
+    rets = bt_df['returns'].to_numpy(dtype=float) if 'returns' in bt_df.columns else np.zeros(n)
+
+    adv_valid = isinstance(adv_series, pd.Series) and not adv_series.dropna().empty
+    adv_arr = adv_series.reindex(bt_df.index).to_numpy() if adv_valid else np.ones(n, dtype=float)
+    impact_k_eff = impact_k if adv_valid else 0.0
+
+    # Per-bar inputs hoisted out of the loop
+    n_elig = min(n, len(arm_eligible))
+    elig_arr = np.zeros((n, n_arms), dtype=bool)
+    elig_arr[:n_elig] = arm_eligible[:n_elig]
+    any_elig = elig_arr.any(axis=1)
+    elig_l = elig_arr.tolist()
+    sig_l = arm_signals.tolist()
+    # SimpleThompsonBandit.select draws n_arms normals per call from the global
+    # legacy RNG; drawing them all up front consumes the identical stream.
+    z_l = np.random.standard_normal((int(any_elig.sum()), n_arms)).tolist()
+    counts = [0.0] * n_arms
+    means = [0.0] * n_arms
+    sds = [1.0] * n_arms
+    n_sel = 0
+    neg_inf = -np.inf
+    vol_scale = np.full(n, np.nan)
+    sized = np.abs(rets) > eps
+    sized[:1] = False
+    if sized.any():
+        vol_est = _trailing_std(rets)
+        ok = sized & (vol_est > eps)
+        vol_scale[ok] = np.minimum(sigma_target / (vol_est[ok] * np.sqrt(252 * 24 * 12)), 2.0)
+    rets_l = rets.tolist()
+    vol_l = vol_scale.tolist()
+    th_l = [float(x) for x in side_eps_vec] if side_eps_vec is not None else [0.0] * n_arms
+    cost_per_bar = (cost_bps / 10000.0) if cost_bps > 0 else 0.0
+
+    eq_out = np.empty(n, dtype=float)
+    tr_idx = np.empty(n, dtype=np.int64)
+    tr_from = np.empty(n, dtype=float)
+    tr_to = np.empty(n, dtype=float)
+    tr_cost = np.empty(n, dtype=float)
+    bu_idx = np.empty(n, dtype=np.int64)
+    bu_arm = np.empty(n, dtype=np.int64)
+    bu_reward = np.empty(n, dtype=float)
+    n_tr = n_bu = 0
+
+    exec_pos_buffer = deque(maxlen=cooldown_bars + 1)
+    exec_pos_buffer.append(0.0)
+    last_flip_idx = -10**9
+    cum_equity = 1.0
+    peak = -np.inf
+
+    for t in range(n):
+        # pos_smooth is always the buffer head left by the previous bar
+        exec_pos = exec_pos_buffer[0]
+        desired_side = 0.0
+        chosen = None
+        if any_elig[t]:
+            # Inline SimpleThompsonBandit.select: first argmax, NaN wins like np.argmax
+            z, el = z_l[n_sel], elig_l[t]
+            n_sel += 1
+            chosen, best = 0, None
+            for j in range(n_arms):
+                v = means[j] + sds[j] * z[j] if el[j] else neg_inf
+                if v != v:
+                    chosen = j
+                    break
+                if best is None or v > best:
+                    chosen, best = j, v
+            raw_val = float(sig_l[t][chosen])
+            desired_side = 0.0 if abs(raw_val) < th_l[chosen] else np.sign(raw_val) * pos_max
+
+        scale = vol_l[t]
+        if scale == scale:
+            desired_side *= scale
+
+        if abs(desired_side - exec_pos) > eps and (t - last_flip_idx) >= cooldown_bars:
+            exec_pos_buffer.append(desired_side)
+            cost_bps_eff = cost_bps
+            if impact_k_eff > 0 and adv_valid:
+                cost_bps_eff += impact_k_eff * abs(desired_side - exec_pos) / (adv_arr[t] + eps)
+            tr_idx[n_tr], tr_from[n_tr], tr_to[n_tr], tr_cost[n_tr] = t, exec_pos, desired_side, cost_bps_eff
+            n_tr += 1
+            last_flip_idx = t
+
+        pnl = rets_l[t] * (exec_pos_buffer[0] if latency_bars > 0 else exec_pos)
+        pnl -= cost_per_bar
+        cum_equity *= (1.0 + pnl)
+        eq_out[t] = cum_equity
+
+        if chosen is not None:
+            # Inline SimpleThompsonBandit.update
+            counts[chosen] += 1
+            c = counts[chosen]
+            means[chosen] = (means[chosen] * (c - 1) + pnl) / c
+            if c > 1:
+                sds[chosen] = math.sqrt(1.0 / c)
+            bu_idx[n_bu], bu_arm[n_bu], bu_reward[n_bu] = t, chosen, pnl
+            n_bu += 1
+
+        if dd_stop > 0:
+            if cum_equity > peak:
+                peak = cum_equity
+            if peak > 0 and (cum_equity / peak - 1.0) < -dd_stop:
+                exec_pos_buffer.append(0.0)
+
+    index = bt_df.index
+    Eq = pd.DataFrame({'ts': index, 'equity': eq_out}).set_index('ts')
+    Tr = pd.DataFrame({
+        'ts': index[tr_idx[:n_tr]],
+        'from_pos': tr_from[:n_tr],
+        'to_pos': tr_to[:n_tr],
+        'cost_bps': tr_cost[:n_tr],
+    })
+    Bu = pd.DataFrame({'ts': index[bu_idx[:n_bu]], 'chosen': bu_arm[:n_bu], 'reward': bu_reward[:n_bu]})
+    return Eq, Tr, Bu
+
+
+def _allocator_loop_reference(
+    bt_df: pd.DataFrame,
+    arm_signals: np.ndarray,
+    arm_eligible: np.ndarray,
+    adv_series: pd.Series,
+    cooldown_bars: int,
+    cost_bps: float,
+    impact_k: float,
+    side_eps_vec: np.ndarray,
+    eps: float,
+    sigma_target: float,
+    pos_max: float,
+    dd_stop: float,
+    latency_bars: int,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Original per-bar loop (O(n^2) drawdown peak), kept as the parity/benchmark baseline."""
     n = len(bt_df)
     rets = bt_df['returns'].values if 'returns' in bt_df.columns else np.zeros(n)
     
@@ -181,40 +401,7 @@ def run_allocator_backtest(
     Tr = pd.DataFrame.from_records(records_tr, columns=['ts', 'from_pos', 'to_pos', 'cost_bps'])
     Bu = pd.DataFrame.from_records(records_bu, columns=['ts', 'chosen', 'reward'])
     
-    # Calculate performance metrics
-    eq_rets = Eq['equity'].pct_change().dropna()
-    if annualizer is None:
-        annualizer = np.sqrt(365*24*12)  # 5-minute bars
-    
-    sharpe = float(annualizer * eq_rets.mean() / (eq_rets.std() if eq_rets.std() != 0 else np.nan)) if len(eq_rets) else np.nan
-    
-    # Sortino ratio
-    downside_rets = eq_rets[eq_rets < 0]
-    sortino = float(annualizer * eq_rets.mean() / (downside_rets.std() if len(downside_rets) > 0 else np.nan)) if len(eq_rets) else np.nan
-    
-    maxdd = float(-(Eq['equity'] / Eq['equity'].cummax() - 1.0).min()) if not Eq.empty else np.nan
-    
-    # Turnover
-    turnover = float(np.abs(Tr['to_pos'].astype(float) - Tr['from_pos'].astype(float)).sum()) if not Tr.empty else 0.0
-    
-    # Hit rate
-    hit_rate = float((Tr['pnl_$'] > 0).sum() / max(len(Tr), 1)) if not Tr.empty and 'pnl_$' in Tr.columns else np.nan
-    
-    metrics = {
-        'final_equity': float(Eq['equity'].iloc[-1]) if len(Eq) else 1.0,
-        'n_trades': int(len(Tr)),
-        'sharpe': sharpe,
-        'sortino': sortino,
-        'maxDD': maxdd,
-        'turnover': turnover,
-        'hit_rate': hit_rate,
-    }
-    
-    # Day 4: Save results to JSON if requested
-    if save_results:
-        _save_backtest_results(metrics, 'allocator', save_results_path)
-    
-    return Eq, Tr, Bu, metrics
+    return Eq, Tr, Bu
 
 
 def run_simple_backtest(
@@ -0,0 +1,30 @@
+"""
+Benchmarks for the bot's hot paths.
+
+    python scripts/run_benchmarks.py run --out benchmarks/results/latest.json
+    python scripts/run_benchmarks.py compare benchmarks/results/latest.json \\
+        --baseline benchmarks/baseline.json --threshold 0.25
+"""
+
+from benchmarks.harness import (
+    Benchmark,
+    compare_results,
+    format_comparison,
+    load_results,
+    run_benchmark,
+    run_suite,
+    write_results,
+)
+from benchmarks.suite import BENCHMARKS, select
+
+__all__ = [
+    "BENCHMARKS",
+    "Benchmark",
+    "compare_results",
+    "format_comparison",
+    "load_results",
+    "run_benchmark",
+    "run_suite",
+    "select",
+    "write_results",
+]
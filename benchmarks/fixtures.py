@@ -0,0 +1,125 @@
+"""
+Fixed synthetic inputs for the benchmark suite.
+
+Every fixture is built from a seeded generator so two runs (and two machines)
+time exactly the same work. Nothing here reads repo artifacts or the network.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+# Column order of the production 5m feature schema
+FEATURE_COLUMNS = [
+    "mom_1", "mom_3", "mr_ema20_z", "rv_1h", "regime_high_vol", "gk_volatility", "jump_magnitude",
+    "volume_intensity", "price_efficiency", "price_volume_corr", "vwap_momentum", "depth_proxy",
+    "funding_rate", "funding_momentum_1h", "flow_diff", "S_top", "S_bot",
+]
+
+T0_MS = 1_760_000_000_000
+BAR_MS = 300_000
+
+
+def bars(n: int, seed: int = 0) -> List[Dict[str, float]]:
+    """n 5m OHLCV bar dicts on a geometric random walk."""
+    rng = np.random.default_rng(seed)
+    close = 60000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.001, n)) * close
+    volume = rng.uniform(50.0, 150.0, n)
+    return [
+        {"ts": T0_MS + BAR_MS * i, "open": float(open_[i]), "high": float(max(open_[i], close[i]) + spread[i]),
+         "low": float(min(open_[i], close[i]) - spread[i]), "close": float(close[i]), "volume": float(volume[i])}
+        for i in range(n)
+    ]
+
+
+def cohort_snapshots(n: int, seed: int = 1) -> List[Dict[str, float]]:
+    rng = np.random.default_rng(seed)
+    vals = rng.normal(0.0, 0.01, (n, 3))
+    return [{"pros": float(p), "amateurs": float(a), "mood": float(m)} for p, a, m in vals]
+
+
+def fills(n: int, seed: int = 2) -> List[Dict]:
+    """Hyperliquid-style cohort fills with mixed side encodings."""
+    rng = np.random.default_rng(seed)
+    sides = np.array(["buy", "sell", "A", "B"])[rng.integers(0, 4, n)]
+    return [
+        {"ts": T0_MS + 1000 * i, "address": f"0x{i % 97:040x}", "coin": "BTC", "side": str(sides[i]),
+         "price": float(60000.0 + rng.normal(0.0, 50.0)), "size": float(rng.uniform(0.001, 2.0))}
+        for i in range(n)
+    ]
+
+
+def model_manifest(root: str, seed: int = 3) -> str:
+    """Write a 3-class LogisticRegression over FEATURE_COLUMNS and return its LATEST.json path."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0.0, 1.0, (2000, len(FEATURE_COLUMNS)))
+    y = np.digitize(X[:, 0] + X[:, 2] + 0.5 * rng.normal(size=len(X)), [-0.7, 0.7])
+    joblib.dump(LogisticRegression(max_iter=500).fit(X, y), os.path.join(root, "model.joblib"))
+    with open(os.path.join(root, "feature_columns.json"), "w", encoding="utf-8") as f:
+        json.dump({"feature_cols": FEATURE_COLUMNS}, f)
+    manifest = os.path.join(root, "LATEST.json")
+    with open(manifest, "w", encoding="utf-8") as f:
+        json.dump({"meta_classifier": "model.joblib", "feature_columns": "feature_columns.json",
+                   "feature_dim": len(FEATURE_COLUMNS)}, f)
+    return manifest
+
+
+def feature_rows(n: int, seed: int = 4) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0.0, 1.0, (n, len(FEATURE_COLUMNS)))
+
+
+def log_records(n: int, seed: int = 5) -> List[Dict]:
+    """Per-bar decision log payloads shaped like LogEmitter.emit_signals() input."""
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(n):
+        feats = {c: float(v) for c, v in zip(FEATURE_COLUMNS, rng.normal(0.0, 1.0, len(FEATURE_COLUMNS)))}
+        p = rng.dirichlet([1.0, 1.0, 1.0])
+        out.append({
+            "ts_ist": pd.Timestamp(T0_MS + BAR_MS * i, unit="ms", tz="Asia/Kolkata").isoformat(),
+            "symbol": "BTCUSDT",
+            "features": feats,
+            "model": {"p_down": float(p[0]), "p_neutral": float(p[1]), "p_up": float(p[2]),
+                      "s_model": float(p[2] - p[0])},
+            "decision": {"dir": int(rng.integers(-1, 2)), "alpha": float(rng.uniform()),
+                         "details": {"mode": "model_meta", "reasons": ["ok", "band"]}},
+            "cohort": {"pros": float(rng.normal()), "amateurs": float(rng.normal()), "mood": 0.0},
+            "exchange": {"api_key": "k" * 32, "account_id": f"acct-{i % 5}"},
+        })
+    return out
+
+
+def schema_examples() -> List[Tuple[str, Dict]]:
+    """(schema_name, record) pairs built from every production schema's field examples."""
+    from live_demo.schemas.production_schemas import ProductionSchemas
+
+    names = ["market_data", "signals", "ensemble", "risk", "execution", "costs", "health", "repro",
+             "order_intent", "feature_log", "calibration"]
+    return [(name, {f.field: f.example for f in ProductionSchemas.get_schema(name)}) for name in names]
+
+
+def allocator_inputs(n: int, n_arms: int = 4, seed: int = 7) -> Dict:
+    """Keyword arguments for run_allocator_backtest over n synthetic 5m bars."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2025-01-01", periods=n, freq="5min", tz="UTC")
+    rets = rng.normal(0.0, 0.002, n)
+    rets[rng.random(n) < 0.03] = 0.0
+    return {
+        "bt_df": pd.DataFrame({"returns": rets}, index=idx),
+        "arm_signals": rng.normal(0.0, 1.0, (n, n_arms)),
+        "arm_eligible": rng.random((n, n_arms)) < 0.4,
+        "adv_series": pd.Series(rng.uniform(1e6, 2e6, n), index=idx),
+        "cooldown_bars": 3,
+        "cost_bps": 2.0,
+        "impact_k": 1e3,
+        "side_eps_vec": np.linspace(0.0, 0.5, n_arms),
+    }
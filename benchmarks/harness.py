@@ -0,0 +1,166 @@
+"""
+Timing harness, JSON result files and baseline comparison for the benchmark suite.
+
+A Benchmark's setup(workdir) builds its fixture and returns a zero-argument
+callable that performs `ops` operations (e.g. 100 feature updates). The
+harness calibrates how many calls make up one sample, times `repeat` samples
+with the garbage collector off (as timeit does) and reports per-operation
+latency and throughput. compare_results() flags a benchmark as regressed when
+its median per-op latency exceeds the baseline's by more than `threshold`.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+RESULTS_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Callable[[str], Callable[[], Any]]
+    ops: int = 1
+    description: str = ""
+
+
+def _calibrate(fn: Callable[[], Any], target_s: float) -> int:
+    """Smallest power-of-two call count whose run takes at least target_s."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= target_s or number >= 1 << 20:
+            return number
+        number *= 2
+
+
+def run_benchmark(bench: Benchmark, *, repeat: int = 5, min_time: float = 0.5,
+                  workdir: Optional[str] = None) -> Dict[str, Any]:
+    """Time one benchmark; returns its result entry (latencies in seconds per op)."""
+    repeat = max(1, int(repeat))
+    with tempfile.TemporaryDirectory(prefix=f"bench_{bench.name}_", dir=workdir) as tmp:
+        t0 = time.perf_counter()
+        fn = bench.setup(tmp)
+        setup_s = time.perf_counter() - t0
+        fn()  # warm caches, lazy imports and first-call paths
+        number = _calibrate(fn, max(1e-3, float(min_time) / repeat))
+        samples = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                for _ in range(number):
+                    fn()
+                samples.append((time.perf_counter() - t0) / (number * bench.ops))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    median = statistics.median(samples)
+    return {
+        "description": bench.description,
+        "ops_per_call": bench.ops,
+        "calls_per_sample": number,
+        "repeat": repeat,
+        "setup_s": setup_s,
+        "min_s": min(samples),
+        "median_s": median,
+        "mean_s": statistics.fmean(samples),
+        "max_s": max(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops_per_s": 1.0 / median if median > 0 else None,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(benchmarks: Iterable[Benchmark], *, repeat: int = 5, min_time: float = 0.5,
+              progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Run benchmarks in order and return a results document ready for write_results()."""
+    results = {}
+    for bench in benchmarks:
+        results[bench.name] = run_benchmark(bench, repeat=repeat, min_time=min_time)
+        if progress is not None:
+            progress(bench.name, results[bench.name])
+    return {"version": RESULTS_VERSION, "environment": environment(), "benchmarks": results}
+
+
+def write_results(results: Dict[str, Any], path: str) -> None:
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    if not isinstance(results, dict) or "benchmarks" not in results:
+        raise ValueError(f"{path} is not a benchmark results file")
+    return results
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], *, threshold: float = 0.25,
+                    metric: str = "median_s") -> List[Dict[str, Any]]:
+    """One row per benchmark in either document.
+
+    status is 'regressed' (slower than baseline by more than threshold),
+    'improved' (faster by more than threshold), 'ok', 'new' (no baseline)
+    or 'missing' (in the baseline but not measured now).
+    """
+    cur, base = current["benchmarks"], baseline["benchmarks"]
+    rows = []
+    for name in list(base) + [n for n in cur if n not in base]:
+        b = base.get(name, {}).get(metric)
+        c = cur.get(name, {}).get(metric)
+        if c is None:
+            rows.append({"name": name, "baseline": b, "current": None, "change": None, "status": "missing"})
+            continue
+        if b is None or b <= 0:
+            rows.append({"name": name, "baseline": b, "current": c, "change": None, "status": "new"})
+            continue
+        change = c / b - 1.0
+        if change > threshold:
+            status = "regressed"
+        elif change < -threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": b, "current": c, "change": change, "status": status})
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    def _us(v):
+        return f"{v * 1e6:12.3f}" if v is not None else f"{'-':>12}"
+
+    lines = [f"{'benchmark':<34}{'base us/op':>12}{'now us/op':>12}{'change':>10}  status"]
+    for r in rows:
+        change = f"{100.0 * r['change']:+9.1f}%" if r["change"] is not None else f"{'-':>10}"
+        lines.append(f"{r['name']:<34}{_us(r['baseline'])}{_us(r['current'])}{change}  {r['status']}")
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+"""
+The hot-path benchmarks, in the order run_suite() runs them.
+
+    features.update_and_build        LiveFeatureComputer, 100 bars per call, steady state
+    model_runtime.infer              ModelRuntime.infer, one row at a time
+    cohort.update_from_fill          CohortState.update_from_fill, 1000 fills per call
+    llm_logging.write_jsonl          ops.llm_logging.write_jsonl into a temp log root
+    log_emitter.sanitize             live_demo.ops.log_emitter.sanitize on decision payloads
+    schemas.validate_record          ProductionSchemas.validate_record, one record per schema
+    backtest.run_allocator_backtest  run_allocator_backtest, 20k bars; latency is per bar
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks import fixtures
+from benchmarks.harness import Benchmark
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def register(name: str, ops: int = 1, description: str = "") -> Callable:
+    def wrap(setup):
+        BENCHMARKS[name] = Benchmark(name=name, setup=setup, ops=ops, description=description)
+        return setup
+    return wrap
+
+
+def select(patterns: List[str] = None) -> List[Benchmark]:
+    """Benchmarks whose name contains any of the patterns (all when none are given)."""
+    if not patterns:
+        return list(BENCHMARKS.values())
+    return [b for name, b in BENCHMARKS.items() if any(p in name for p in patterns)]
+
+
+FEATURE_BLOCK = 100
+
+
+@register("features.update_and_build", ops=FEATURE_BLOCK, description="per bar")
+def _features(workdir):
+    from live_demo.features import LiveFeatureComputer
+
+    lf = LiveFeatureComputer(fixtures.FEATURE_COLUMNS, timeframe="5m")
+    bars = fixtures.bars(2000)
+    cohorts = fixtures.cohort_snapshots(len(bars))
+    for bar, cohort in zip(bars[:500], cohorts[:500]):
+        lf.update_and_build(bar, cohort, 1e-5)
+    # Steady state: windows are full, so cycling the same bars keeps the cost flat
+    blocks = itertools.cycle([list(zip(bars[i:i + FEATURE_BLOCK], cohorts[i:i + FEATURE_BLOCK]))
+                              for i in range(500, len(bars), FEATURE_BLOCK)])
+
+    def run():
+        for bar, cohort in next(blocks):
+            lf.update_and_build(bar, cohort, 1e-5)
+    return run
+
+
+INFER_ROWS = 256
+
+
+@register("model_runtime.infer", ops=INFER_ROWS, description="per row")
+def _infer(workdir):
+    from live_demo.model_runtime import ModelRuntime
+
+    mr = ModelRuntime(fixtures.model_manifest(workdir))
+    rows = [list(r) for r in fixtures.feature_rows(INFER_ROWS)]
+
+    def run():
+        for x in rows:
+            mr.infer(x)
+    return run
+
+
+FILLS = 1000
+
+
+@register("cohort.update_from_fill", ops=FILLS, description="per fill")
+def _cohort(workdir):
+    from live_demo.cohort_signals import CohortState
+
+    state = CohortState()
+    state.set_adv20(1.5e6)
+    fills = fixtures.fills(FILLS)
+    weights = {"pros": 1.0, "amateurs": 0.5, "mood": 1.0}
+
+    def run():
+        for f in fills:
+            state.update_from_fill(f, weights)
+    return run
+
+
+LOG_RECORDS = 50
+
+
+@register("llm_logging.write_jsonl", ops=LOG_RECORDS, description="per record")
+def _write_jsonl(workdir):
+    from ops.llm_logging import write_jsonl
+
+    records = [{"ts_ist": r["ts_ist"], "symbol": r["symbol"], **r["model"], "dir": r["decision"]["dir"],
+                "alpha": r["decision"]["alpha"]} for r in fixtures.log_records(LOG_RECORDS)]
+
+    def run():
+        for rec in records:
+            write_jsonl("signals", rec, asset="BTCUSDT", root=workdir)
+    return run
+
+
+@register("log_emitter.sanitize", ops=LOG_RECORDS, description="per record")
+def _sanitize(workdir):
+    from live_demo.ops.log_emitter import sanitize
+
+    records = fixtures.log_records(LOG_RECORDS)
+
+    def run():
+        for rec in records:
+            sanitize(rec)
+    return run
+
+
+_SCHEMA_COUNT = 11
+
+
+@register("schemas.validate_record", ops=_SCHEMA_COUNT, description="per record")
+def _validate(workdir):
+    from live_demo.schemas.production_schemas import ProductionSchemas
+
+    examples = fixtures.schema_examples()
+    assert len(examples) == _SCHEMA_COUNT
+
+    def run():
+        for name, rec in examples:
+            ProductionSchemas.validate_record(rec, name)
+    return run
+
+
+ALLOCATOR_BARS = 20_000
+
+
+@register("backtest.run_allocator_backtest", ops=ALLOCATOR_BARS, description="per bar")
+def _allocator(workdir):
+    from backtest_engine import run_allocator_backtest
+
+    kwargs = fixtures.allocator_inputs(ALLOCATOR_BARS)
+
+    def run():
+        np.random.seed(11)
+        run_allocator_backtest(**kwargs)
+    return run
@@ -0,0 +1,274 @@
+"""
+Block Bootstrap Confidence Intervals for Backtest Metrics
+Resamples a return (or per-trade PnL) series with the stationary or moving
+block bootstrap and reports percentile confidence intervals and one-sided
+p-values for Sharpe, Sortino, max drawdown, hit rate and mean.
+
+Resamples are drawn as (rows, n) index matrices and every metric is a
+vectorized kernel over the rows, so one chunk of replicates is a handful of
+NumPy calls. Chunks run on a process pool. The series is shared with the
+workers through one shared-memory block, and each chunk has its own seed, so
+results do not depend on the worker count.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ops.shared_arrays import attach_arrays, share_arrays
+
+ANNUALIZER_5M = float(np.sqrt(365 * 24 * 12))
+METHODS = ('stationary', 'moving', 'iid')
+# Null values for the one-sided p-value P(metric <= null); max drawdown has none
+DEFAULT_NULL = {'sharpe': 0.0, 'sortino': 0.0, 'mean': 0.0, 'hit_rate': 0.5}
+_CHUNK_ELEMS = 1 << 22
+
+
+# ---- resampling ------------------------------------------------------------------
+
+def default_block_len(n: int) -> int:
+    """n ** (1/3), the usual rate for block bootstrap variance estimates."""
+    return max(1, int(round(n ** (1.0 / 3.0))))
+
+
+def resample_indices(n: int, rows: int, block_len: int, rng: np.random.Generator,
+                     method: str = 'stationary') -> np.ndarray:
+    """(rows, n) positions into a length-n series; blocks wrap around the end.
+
+    stationary: blocks start at uniform positions with geometric lengths of
+    mean block_len (Politis & Romano). moving: fixed-length blocks. iid:
+    single observations.
+    """
+    if method == 'iid' or block_len <= 1:
+        return rng.integers(0, n, size=(rows, n))
+    if method not in ('stationary', 'moving'):
+        raise ValueError(f"Unknown bootstrap method '{method}', expected one of {METHODS}")
+    # Draw whole blocks (length, origin) instead of a coin flip per position:
+    # enough blocks to cover n almost surely, topped up in the rare case they do not
+    m = int(1.5 * n / block_len) + 16
+    if method == 'stationary':
+        lengths = rng.geometric(1.0 / block_len, size=(rows, m))
+        while lengths.sum(axis=1).min() < n:
+            lengths = np.hstack([lengths, rng.geometric(1.0 / block_len, size=(rows, m))])
+    else:
+        lengths = np.full((rows, -(-n // block_len)), block_len, dtype=np.int64)
+    origins = rng.integers(0, n, size=lengths.shape)
+    begin = np.cumsum(lengths, axis=1) - lengths
+    used = begin < n
+    # Truncate each row's last block at n; blocks of a row stay contiguous in C order
+    lens = np.minimum(lengths, n - begin)[used]
+    shift = (origins - begin)[used]
+    idx = (np.repeat(shift, lens).reshape(rows, n) + np.arange(n))
+    idx[idx >= n] -= n
+    return idx
+
+
+# ---- metric kernels (rows = replicates) ------------------------------------------
+
+def _sharpe(x: np.ndarray, annualizer: float) -> np.ndarray:
+    sd = x.std(axis=1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(sd > 0, annualizer * x.mean(axis=1) / sd, np.nan)
+
+
+def _sortino(x: np.ndarray, annualizer: float) -> np.ndarray:
+    # Sample std of the negative observations only, as run_allocator_backtest computes it
+    k = (x < 0).sum(axis=1)
+    neg = np.minimum(x, 0.0)
+    s1 = neg.sum(axis=1)
+    s2 = np.einsum('ij,ij->i', neg, neg)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = (s2 - s1 * s1 / k) / (k - 1)
+        sd = np.sqrt(np.maximum(var, 0.0))
+        return np.where((k > 1) & (sd > 0), annualizer * x.mean(axis=1) / sd, np.nan)
+
+
+def _max_dd(x: np.ndarray, annualizer: float) -> np.ndarray:
+    equity = np.cumprod(1.0 + x, axis=1)
+    # Equity starts at 1 before the first return, so the start counts as a peak
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, 1.0, out=peak)
+    np.divide(equity, peak, out=equity)
+    return 1.0 - equity.min(axis=1)
+
+
+def _hit_rate(x: np.ndarray, annualizer: float) -> np.ndarray:
+    return (x > 0).mean(axis=1)
+
+
+def _mean(x: np.ndarray, annualizer: float) -> np.ndarray:
+    return x.mean(axis=1)
+
+
+KERNELS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    'sharpe': _sharpe,
+    'sortino': _sortino,
+    'max_dd': _max_dd,
+    'hit_rate': _hit_rate,
+    'mean': _mean,
+}
+
+
+def metric_values(x: np.ndarray, metrics: Sequence[str], annualizer: float = ANNUALIZER_5M) -> Dict[str, np.ndarray]:
+    """Every requested metric for each row of x (a 1-D x is one row)."""
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    return {m: KERNELS[m](x, annualizer) for m in metrics}
+
+
+# ---- replicate chunks ------------------------------------------------------------
+
+def _run_chunk(x: np.ndarray, rows: int, seed: np.random.SeedSequence, block_len: int, method: str,
+               metrics: Sequence[str], annualizer: float) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    idx = resample_indices(len(x), rows, block_len, rng, method)
+    vals = metric_values(x[idx], metrics, annualizer)
+    return np.column_stack([vals[m] for m in metrics])
+
+
+_WORKER: Dict = {}
+
+
+def _init_worker(spec: Dict, params: Tuple) -> None:
+    shm, views = attach_arrays(spec)
+    _WORKER.update(shm=shm, x=views['x'], params=params)
+
+
+def _run_chunk_in_worker(job: Tuple[int, np.random.SeedSequence]) -> np.ndarray:
+    rows, seed = job
+    return _run_chunk(_WORKER['x'], rows, seed, *_WORKER['params'])
+
+
+def bootstrap_distribution(
+    x: np.ndarray,
+    metrics: Sequence[str] = ('sharpe', 'sortino', 'max_dd', 'hit_rate'),
+    n_boot: int = 5000,
+    block_len: Optional[int] = None,
+    method: str = 'stationary',
+    annualizer: float = ANNUALIZER_5M,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> np.ndarray:
+    """(n_boot, len(metrics)) matrix of bootstrap replicates."""
+    x = np.ascontiguousarray(np.asarray(x, dtype=float))
+    x = x[np.isfinite(x)]
+    n = len(x)
+    if n < 2:
+        raise ValueError('need at least two observations to bootstrap')
+    unknown = [m for m in metrics if m not in KERNELS]
+    if unknown:
+        raise ValueError(f'Unknown metrics {unknown}, expected some of {sorted(KERNELS)}')
+    if method not in METHODS:
+        raise ValueError(f"Unknown bootstrap method '{method}', expected one of {METHODS}")
+    block_len = int(block_len) if block_len else default_block_len(n)
+    metrics = tuple(metrics)
+
+    # Chunk size bounds the (rows, n) index matrix, not the worker count, so a
+    # seed always produces the same replicates however many processes run them
+    per_chunk = max(1, min(int(n_boot), _CHUNK_ELEMS // n))
+    sizes = [per_chunk] * (int(n_boot) // per_chunk)
+    if int(n_boot) % per_chunk:
+        sizes.append(int(n_boot) % per_chunk)
+    jobs = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+    params = (block_len, method, metrics, float(annualizer))
+
+    workers = int(workers if workers is not None else (os.cpu_count() or 1))
+    if workers <= 1 or len(jobs) == 1:
+        parts = [_run_chunk(x, rows, s, *params) for rows, s in jobs]
+    else:
+        shm, spec = share_arrays({'x': x})
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                                     initargs=(spec, params)) as pool:
+                parts = list(pool.map(_run_chunk_in_worker, jobs))
+        finally:
+            shm.close()
+            shm.unlink()
+    return np.vstack(parts)
+
+
+def bootstrap_metrics(
+    x,
+    metrics: Sequence[str] = ('sharpe', 'sortino', 'max_dd', 'hit_rate'),
+    n_boot: int = 5000,
+    block_len: Optional[int] = None,
+    method: str = 'stationary',
+    alpha: float = 0.05,
+    annualizer: float = ANNUALIZER_5M,
+    null: Optional[Dict[str, float]] = None,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Bootstrap confidence intervals and p-values for metrics of one series
+
+    Args:
+        x: Per-bar returns (or per-trade PnL for hit_rate); NaNs are dropped
+        metrics: Names from KERNELS
+        n_boot: Number of bootstrap replicates
+        block_len: Mean (stationary) or fixed (moving) block length;
+            default n ** (1/3). Use 1 or method='iid' for trade series
+        method: 'stationary', 'moving' or 'iid'
+        alpha: Two-sided level of the percentile interval
+        annualizer: Multiplier for sharpe/sortino (default 5m bars)
+        null: Per-metric null values, merged over DEFAULT_NULL
+        workers: Process count (default os.cpu_count(); <= 1 runs in-process)
+        seed: Seed for the replicate chunks
+
+    Returns:
+        One row per metric: estimate, boot_mean, boot_std, ci_low, ci_high,
+        null and p_value. p_value is the one-sided bootstrap p-value for
+        metric <= null (replicates recentred on the estimate); NaN when the
+        metric has no null value.
+    """
+    arr = np.asarray(x, dtype=float)
+    arr = arr[np.isfinite(arr)]
+    boot = bootstrap_distribution(arr, metrics, n_boot, block_len, method, annualizer, workers, seed)
+    estimate = metric_values(arr, metrics, annualizer)
+    nulls = {**DEFAULT_NULL, **(null or {})}
+    rows = []
+    for j, m in enumerate(metrics):
+        est = float(estimate[m][0])
+        col = boot[:, j]
+        col = col[np.isfinite(col)]
+        h0 = nulls.get(m)
+        if len(col) == 0:
+            lo = hi = mu = sd = p = np.nan
+        else:
+            lo, hi = np.quantile(col, [alpha / 2.0, 1.0 - alpha / 2.0])
+            mu, sd = float(col.mean()), float(col.std(ddof=1)) if len(col) > 1 else 0.0
+            # Null distribution = replicates shifted so they centre on h0
+            p = float((np.sum(col - est + h0 >= est) + 1) / (len(col) + 1)) if h0 is not None and np.isfinite(est) else np.nan
+        rows.append({'metric': m, 'estimate': est, 'boot_mean': mu, 'boot_std': sd, 'ci_low': float(lo),
+                     'ci_high': float(hi), 'null': h0 if h0 is not None else np.nan, 'p_value': p,
+                     'n_obs': len(arr), 'n_boot': int(n_boot)})
+    return pd.DataFrame(rows)
+
+
+def bootstrap_backtest(
+    eq_df: pd.DataFrame,
+    tr_df: Optional[pd.DataFrame] = None,
+    n_boot: int = 5000,
+    block_len: Optional[int] = None,
+    alpha: float = 0.05,
+    annualizer: float = ANNUALIZER_5M,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Confidence intervals for run_allocator_backtest's headline metrics
+
+    Sharpe, Sortino and maxDD resample the equity curve's bar returns with the
+    stationary bootstrap; hit_rate resamples the per-trade 'pnl_$' values
+    i.i.d. (trades are treated as exchangeable).
+    """
+    eq_rets = eq_df['equity'].pct_change().dropna().to_numpy(dtype=float)
+    table = bootstrap_metrics(eq_rets, ('sharpe', 'sortino', 'max_dd'), n_boot, block_len, 'stationary',
+                              alpha, annualizer, workers=workers, seed=seed)
+    if tr_df is not None and not tr_df.empty and 'pnl_$' in tr_df.columns and len(tr_df) > 1:
+        hits = bootstrap_metrics(tr_df['pnl_$'].to_numpy(dtype=float), ('hit_rate',), n_boot, 1, 'iid',
+                                 alpha, annualizer, workers=workers, seed=seed + 1)
+        table = pd.concat([table, hits], ignore_index=True)
+    return table
@@ -1,23 +1,92 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import math
 import os
-from dataclasses import dataclass
+import tempfile
+import time
+from dataclasses import dataclass, field
 from typing import Optional
 
 import numpy as np
 
-try:
-    # Prefer local JSONState for simple persistence
-    from .state import JSONState  # type: ignore
-except ImportError:  # pragma: no cover
-    JSONState = None  # type: ignore
-
 logger = logging.getLogger(__name__)
 
 
+REWARD_HISTORY_MAX = 1000
+
+
+class _RewardWindow:
+    """Fixed-size ring of raw rewards with running sum / sum of squares.
+
+    Sums are shifted by a reference reward so a constant window has exactly
+    zero variance, and are recomputed from the buffer every `maxlen`
+    evictions to bound floating-point drift.
+    """
+
+    def __init__(self, maxlen: int, values=()) -> None:
+        self.maxlen = int(maxlen)
+        self._buf = np.zeros(self.maxlen, dtype=float)
+        self._start = 0
+        self._n = 0
+        vals = np.asarray(list(values), dtype=float)[-self.maxlen:]
+        self._buf[: vals.size] = vals
+        self._n = int(vals.size)
+        self._resync()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _resync(self) -> None:
+        vals = self._ordered()
+        self._k = float(vals[0]) if vals.size else 0.0
+        d = vals - self._k
+        self._s = float(d.sum())
+        self._ss = float(np.dot(d, d))
+        self._evictions = 0
+
+    def _ordered(self) -> np.ndarray:
+        idx = (self._start + np.arange(self._n)) % self.maxlen
+        return self._buf[idx]
+
+    def append(self, x: float) -> None:
+        if self._n == 0:
+            self._k = x
+        d = x - self._k
+        if self._n < self.maxlen:
+            self._buf[(self._start + self._n) % self.maxlen] = x
+            self._n += 1
+        else:
+            old = self._buf[self._start] - self._k
+            self._buf[self._start] = x
+            self._start = (self._start + 1) % self.maxlen
+            self._s -= old
+            self._ss -= old * old
+            self._evictions += 1
+        self._s += d
+        self._ss += d * d
+        if self._evictions >= self.maxlen:
+            self._resync()
+
+    def mean_std(self) -> tuple:
+        """Population mean and std (np.mean / np.std semantics) of the window."""
+        n = self._n
+        m = self._s / n
+        var = self._ss / n - m * m
+        # Cancellation noise on a constant window must read as exactly zero
+        if var <= 1e-12 * (self._ss / n):
+            var = 0.0
+        return float(self._k + m), float(math.sqrt(var))
+
+    def tolist(self, last: Optional[int] = None) -> list:
+        vals = self._ordered()
+        if last is not None:
+            vals = vals[-int(last):] if last > 0 else vals[:0]
+        return vals.tolist()
+
+
 class SimpleThompsonBandit:
     """Online Gaussian Thompson Sampling over fixed arms.
 
@@ -72,10 +141,10 @@ class SimpleThompsonBandit:
             self.variances = np.ones(self.n_arms, dtype=float)
         
         # Ensemble 1.1: Reward normalization tracking
-        self.reward_history = reward_history if reward_history is not None else []
+        self.reward_history_max = REWARD_HISTORY_MAX  # Rolling window size
+        self._rewards = _RewardWindow(self.reward_history_max, reward_history or [])
         self.global_reward_mean = global_reward_mean if global_reward_mean is not None else 0.0
         self.global_reward_std = global_reward_std if global_reward_std is not None else 1.0
-        self.reward_history_max = 1000  # Rolling window size
         
         # Ensemble 1.1: Freeze guard state
         self.frozen = frozen
@@ -85,6 +154,15 @@ class SimpleThompsonBandit:
         self.drawdown_threshold = drawdown_threshold
         self.freeze_recovery_threshold = 0.08  # Unfreeze at 8% drawdown
 
+    @property
+    def reward_history(self) -> list:
+        """Raw rewards in the normalization window, oldest first (a copy)."""
+        return self._rewards.tolist()
+
+    @reward_history.setter
+    def reward_history(self, values) -> None:
+        self._rewards = _RewardWindow(self.reward_history_max, values or [])
+
     def select(self, eligible_mask: np.ndarray) -> int:
         """Select arm via Thompson sampling.
         
@@ -129,17 +207,14 @@ class SimpleThompsonBandit:
         
         reward_raw = float(reward)
         
-        # Ensemble 1.1: Update global reward statistics
-        self.reward_history.append(reward_raw)
-        if len(self.reward_history) > self.reward_history_max:
-            self.reward_history.pop(0)
-        
-        if len(self.reward_history) >= 2:
-            self.global_reward_mean = float(np.mean(self.reward_history))
-            self.global_reward_std = float(np.std(self.reward_history))
+        # Ensemble 1.1: Update global reward statistics (O(1) via running sums)
+        self._rewards.append(reward_raw)
+        n_hist = len(self._rewards)
+        if n_hist >= 2:
+            self.global_reward_mean, self.global_reward_std = self._rewards.mean_std()
         
         # Ensemble 1.1: Normalize reward (z-score)
-        if self.global_reward_std > 1e-9 and len(self.reward_history) >= 10:
+        if self.global_reward_std > 1e-9 and n_hist >= 10:
             reward_normalized = (reward_raw - self.global_reward_mean) / self.global_reward_std
             
             # Clip to ±3σ to prevent extreme values from dominating
@@ -218,7 +293,7 @@ class SimpleThompsonBandit:
             "means": self.means.tolist(),
             "variances": self.variances.tolist(),
             # Ensemble 1.1: Normalization state
-            "reward_history": self.reward_history[-100:],  # Keep last 100 for persistence
+            "reward_history": self._rewards.tolist(last=100),  # Keep last 100 for persistence
             "global_reward_mean": float(self.global_reward_mean),
             "global_reward_std": float(self.global_reward_std),
             # Ensemble 1.1: Freeze state
@@ -250,30 +325,172 @@ class SimpleThompsonBandit:
         )
 
 
+
+def _rolling_mean_std(r: np.ndarray, window: int) -> tuple:
+    """Population mean/std of r over the trailing `window` (inclusive) at every step.
+
+    Same values as _RewardWindow.mean_std() after each append. Prefix sums are
+    taken per block relative to a local reference to keep cancellation error
+    at the window scale, and exactly constant windows get std 0.
+    """
+    T = r.size
+    w = int(window)
+    n = np.minimum(np.arange(1, T + 1), w).astype(float)
+    mean = np.empty(T, dtype=float)
+    var = np.empty(T, dtype=float)
+    block = max(w, 4096)
+    for b in range(0, T, block):
+        e = min(T, b + block)
+        lo = max(0, b - w + 1)
+        seg = r[lo:e] - r[lo]
+        cs = np.concatenate(([0.0], np.cumsum(seg)))
+        css = np.concatenate(([0.0], np.cumsum(seg * seg)))
+        t = np.arange(b, e)
+        hi_i = t - lo + 1
+        lo_i = np.maximum(t - w + 1, 0) - lo
+        nn = n[b:e]
+        s = (cs[hi_i] - cs[lo_i]) / nn
+        ss = (css[hi_i] - css[lo_i]) / nn
+        v = ss - s * s
+        v[v <= 1e-12 * ss] = 0.0
+        mean[b:e] = r[lo] + s
+        var[b:e] = v
+    # Exact zero for windows without any change in value
+    changes = np.concatenate(([0], np.cumsum(r[1:] != r[:-1])))
+    first = np.maximum(np.arange(T) - w + 1, 0)
+    var[changes - changes[first] == 0] = 0.0
+    return mean, np.sqrt(var), n
+
+
+def replay_rewards(
+    arms,
+    rewards,
+    n_arms: int,
+    drawdown_thresholds=(0.10,),
+    freeze_recovery_threshold: float = 0.08,
+    reward_history_max: int = REWARD_HISTORY_MAX,
+) -> dict:
+    """Vectorized replay of SimpleThompsonBandit.update over (arm, reward) history.
+
+    Simulates one fresh bandit per drawdown threshold without a per-reward
+    Python loop, so millions of historical rewards can be swept quickly when
+    tuning `drawdown_threshold`. Normalization, clipping and freeze/unfreeze
+    follow update(); means are exact up to rounding, variances are the
+    population variance of each arm's normalized rewards floored at 1e-6
+    (update() applies the floor at every step, which only differs for arms
+    whose variance dips below the floor along the way).
+
+    Returns per-threshold arrays: counts/means/variances (K, n_arms), frozen
+    (final state), frozen_share, n_freezes, skipped_updates, plus the
+    threshold-independent cumulative_pnl, peak_pnl and max_drawdown.
+    """
+    a = np.asarray(arms, dtype=int).ravel()
+    r = np.asarray(rewards, dtype=float).ravel()
+    if a.shape != r.shape:
+        raise ValueError("arms and rewards must have the same length")
+    ok = (a >= 0) & (a < int(n_arms))
+    a, r = a[ok], r[ok]
+    thresholds = np.atleast_1d(np.asarray(drawdown_thresholds, dtype=float))
+    K, A, T = thresholds.size, int(n_arms), r.size
+
+    out = {
+        "thresholds": thresholds,
+        "n_rewards": T,
+        "counts": np.zeros((K, A)),
+        "means": np.zeros((K, A)),
+        "variances": np.ones((K, A)),
+        "frozen": np.zeros(K, dtype=bool),
+        "frozen_share": np.zeros(K),
+        "n_freezes": np.zeros(K, dtype=int),
+        "skipped_updates": np.zeros(K, dtype=int),
+        "cumulative_pnl": 0.0,
+        "peak_pnl": 0.0,
+        "max_drawdown": 0.0,
+    }
+    if T == 0:
+        return out
+
+    # Global z-score normalization with +/-3 sigma clipping (threshold independent)
+    mean, std, n_hist = _rolling_mean_std(r, reward_history_max)
+    use_z = (n_hist >= 10) & (std > 1e-9)
+    z = r.copy()
+    z[use_z] = np.clip((r[use_z] - mean[use_z]) / std[use_z], -3.0, 3.0)
+
+    # Drawdown path from raw rewards (updated even while frozen)
+    cum = np.cumsum(r)
+    peak = np.maximum.accumulate(np.maximum(cum, 0.0))
+    dd = np.zeros(T)
+    pos = peak > 0
+    dd[pos] = (peak[pos] - cum[pos]) / peak[pos]
+    out["cumulative_pnl"] = float(cum[-1])
+    out["peak_pnl"] = float(peak[-1])
+    out["max_drawdown"] = float(dd.max())
+
+    reset = dd < freeze_recovery_threshold
+    idx = np.arange(T)
+    for k, thr in enumerate(thresholds):
+        # Freeze and unfreeze checks run back to back, so unfreeze wins on the same step
+        trip = dd > thr
+        last = np.maximum.accumulate(np.where(trip | reset, idx, -1))
+        frozen = (last >= 0) & trip[np.maximum(last, 0)] & ~reset[np.maximum(last, 0)]
+        active = ~frozen
+        aa, zz = a[active], z[active]
+        counts = np.bincount(aa, minlength=A).astype(float)
+        seen = counts > 0
+        means = np.zeros(A)
+        means[seen] = np.bincount(aa, weights=zz, minlength=A)[seen] / counts[seen]
+        dev = zz - means[aa]
+        variances = np.ones(A)
+        variances[seen] = np.maximum(np.bincount(aa, weights=dev * dev, minlength=A)[seen] / counts[seen], 1e-6)
+        out["counts"][k] = counts
+        out["means"][k] = means
+        out["variances"][k] = variances
+        out["frozen"][k] = bool(frozen[-1])
+        out["frozen_share"][k] = float(frozen.mean())
+        out["n_freezes"][k] = int(np.count_nonzero(frozen[1:] & ~frozen[:-1]) + frozen[0])
+        out["skipped_updates"][k] = int(frozen.sum())
+    return out
+
+
 @dataclass
 class BanditStateIO:
     """Best-effort JSON persistence for bandit state.
 
-    If JSONState is available, use it; otherwise write/read a standalone JSON.
+    Snapshots are written compactly to a temp file and renamed over `path`,
+    so readers never see a torn file. Other top-level keys in the file are
+    preserved. By default every save() writes; with `flush_every_s` and/or
+    `flush_every_n` set, save() only marks the state dirty and the write
+    happens once either limit is reached (seconds since the last write, or
+    save() calls since then). flush() writes pending state immediately and is
+    registered to run at interpreter exit when writes are deferred.
     """
 
     path: str
+    flush_every_s: float = 0.0
+    flush_every_n: int = 0
+    writes: int = field(default=0, init=False)
+    _doc: dict = field(default_factory=dict, init=False, repr=False)
+    _pending: Optional[SimpleThompsonBandit] = field(default=None, init=False, repr=False)
+    _n_pending: int = field(default=0, init=False, repr=False)
+    _last_write: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._last_write = time.monotonic()
+        if self.deferred:
+            atexit.register(self.flush)
+
+    @property
+    def deferred(self) -> bool:
+        return self.flush_every_s > 0 or self.flush_every_n > 1
 
     def load(self, n_arms: int) -> SimpleThompsonBandit:
-        if JSONState is not None:
-            try:
-                st = JSONState(self.path)
-                d = st.get("bandit_state")
-                if isinstance(d, dict) and d.get("n_arms") == n_arms:
-                    return SimpleThompsonBandit.from_state(d)
-            except (OSError, ValueError, TypeError, json.JSONDecodeError):
-                pass
-        # Fallback plain JSON
         try:
             if os.path.exists(self.path):
                 with open(self.path, "r", encoding="utf-8") as f:
                     raw = json.load(f)
-                d = raw.get("bandit_state") if isinstance(raw, dict) else raw
+                if isinstance(raw, dict):
+                    self._doc = raw if "bandit_state" in raw else {"bandit_state": raw}
+                d = self._doc.get("bandit_state")
                 if isinstance(d, dict) and int(d.get("n_arms", -1)) == n_arms:
                     return SimpleThompsonBandit.from_state(d)
         except (OSError, ValueError, TypeError, json.JSONDecodeError):
@@ -281,18 +498,53 @@ class BanditStateIO:
         return SimpleThompsonBandit(n_arms=n_arms)
 
     def save(self, bandit: SimpleThompsonBandit) -> None:
-        d = {"bandit_state": bandit.to_state()}
-        if JSONState is not None:
-            try:
-                st = JSONState(self.path)
-                st.set("bandit_state", d["bandit_state"])
-                return
-            except (OSError, ValueError, TypeError):
-                pass
-        # Fallback plain JSON
+        """Record the latest state; writes now unless writes are deferred and not yet due."""
+        self._pending = bandit
+        self._n_pending += 1
+        self.flush_if_due()
+
+    def flush_if_due(self) -> bool:
+        """Write pending state if the interval or save-count limit has been reached."""
+        if self._pending is None:
+            return False
+        due = not self.deferred
+        if self.flush_every_s > 0 and time.monotonic() - self._last_write >= self.flush_every_s:
+            due = True
+        if self.flush_every_n > 0 and self._n_pending >= self.flush_every_n:
+            due = True
+        return self.flush() if due else False
+
+    def flush(self) -> bool:
+        """Write pending state now; returns True if a snapshot was written."""
+        bandit = self._pending
+        if bandit is None:
+            return False
+        self._doc["bandit_state"] = bandit.to_state()
+        if not self._write_atomic(json.dumps(self._doc, separators=(",", ":"))):
+            return False
+        self._pending = None
+        self._n_pending = 0
+        self._last_write = time.monotonic()
+        self.writes += 1
+        return True
+
+    def _write_atomic(self, text: str) -> bool:
+        tmp = None
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(d, f, indent=2)
-        except OSError:
-            pass
+            d = os.path.dirname(self.path) or "."
+            os.makedirs(d, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=d)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            return True
+        except OSError as e:
+            logger.warning(f"[BANDIT_STATE] Failed to write {self.path}: {e}")
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            return False
@@ -0,0 +1,572 @@
+"""Vectorized counterfactual replay of the decision pipeline.
+
+Logged signal records (model_out + cohort snapshot per bar) are loaded once
+into column arrays; replay() then re-evaluates the gating stages over the
+whole history with array operations, so "what if band_bps were 10" or "what
+if conflict_band_mult were 3" is one call instead of a per-record script.
+
+Stages, in live-loop order (the first stage that zeroes a bar is its veto):
+  1. gate_and_score, or one fixed bandit arm via the tri-class eligibility
+     used by decide() (bandit sampling itself is not replayed)
+  2. overlay alignment, on bars where the overlay was active: 5m vs 15m
+     conflict skip unless |pred_cal_bps| > conflict_band_mult * conflict_band_bps,
+     alpha halved on 1h opposition
+  3. compute_edge_after_costs veto (costs.enable_net_edge_gating), also only on
+     overlay bars: live runs it inside the overlay branch
+  4. pre-trade guards: funding, min sign-flip gap, delta-pi-min, impact
+     guards and RiskConfig net-edge gating
+  5. calibration no-trade band on pred_cal_bps = 1e4 * (a + b * s_model)
+
+The target position is RiskAndExec.target_position(dir, alpha) (flat when
+vetoed) with realized vol from the replayed closes. Guards that depend on
+the previous position (flip gap, delta-pi, impact) need one scalar pass over
+the arrays and only run when configured. Spread, throttle and ADV caps,
+cooldown, forced exits and the daily stop are not modeled. Nor is the overlay
+decision itself: live replaces dir/alpha with the overlay's direction before
+the alignment rules, while replay keeps the gate/arm decision on those bars.
+
+PnL per bar: previous position x close-to-close return (bps) minus
+(cost_bps + slippage_bps) per unit of position change.
+"""
+
+import dataclasses
+import glob
+import gzip
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from live_demo.decision import Thresholds
+from live_demo.reason_codes import GuardReasonCode
+from live_demo.risk_and_exec import RiskConfig
+
+# Veto reasons (index into VETO_NAMES); 0 = traded
+PASS = 0
+VETO_NAMES = [
+    "",
+    "gate",
+    "conflict_band_skip",
+    "negative_edge",
+    GuardReasonCode.FUNDING.value,
+    GuardReasonCode.MIN_SIGN_FLIP.value,
+    GuardReasonCode.DELTA_PI_MIN.value,
+    GuardReasonCode.IMPACT_GUARD.value,
+    GuardReasonCode.IMPACT_CRITICAL.value,
+    GuardReasonCode.NET_EDGE_INSUFFICIENT.value,
+    GuardReasonCode.CALIBRATION_BAND.value,
+]
+(_GATE, _CONFLICT, _EDGE, _FUNDING, _FLIP, _DELTA_PI, _IMPACT, _IMPACT_HARD,
+ _NET_EDGE, _BAND) = range(1, len(VETO_NAMES))
+
+ARMS = ("pros", "amateurs", "model_meta", "model_bma")
+_COLUMNS = (
+    "ts", "p_up", "p_down", "p_neutral", "s_model", "s_model_meta", "s_model_bma",
+    "a", "b", "pros", "amateurs", "mood", "dir_5m", "dir_15m", "dir_1h", "overlay",
+    "logged_dir", "logged_alpha", "close", "funding",
+)
+
+
+@dataclass
+class ReplayArrays:
+    """Column arrays, one row per bar, sorted by ts.
+
+    s_model is the score the live decision used (the BMA score when the row
+    was logged with model_source 'bma'). dir_5m/15m/1h are 0 when no overlay
+    signals were logged; overlay is 1 on bars where the overlay was active
+    (logged overlay.enabled or any timeframe direction); close/funding are
+    NaN/0 when unknown.
+    """
+
+    ts: np.ndarray
+    p_up: np.ndarray
+    p_down: np.ndarray
+    p_neutral: np.ndarray
+    s_model: np.ndarray
+    s_model_meta: np.ndarray
+    s_model_bma: np.ndarray
+    a: np.ndarray
+    b: np.ndarray
+    pros: np.ndarray
+    amateurs: np.ndarray
+    mood: np.ndarray
+    dir_5m: np.ndarray
+    dir_15m: np.ndarray
+    dir_1h: np.ndarray
+    overlay: np.ndarray
+    logged_dir: np.ndarray
+    logged_alpha: np.ndarray
+    close: np.ndarray
+    funding: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.ts.size)
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in _COLUMNS}
+
+    @classmethod
+    def from_columns(cls, n: Optional[int] = None, **cols) -> "ReplayArrays":
+        """Build from any subset of columns; missing ones get neutral defaults."""
+        if n is None:
+            n = len(next(iter(cols.values())))
+        defaults = {"p_neutral": 1.0, "b": 1.0, "close": np.nan}
+        out = {}
+        for name in _COLUMNS:
+            if name in cols and cols[name] is not None:
+                out[name] = np.asarray(cols[name], dtype=np.int64 if name == "ts" else float)
+            else:
+                out[name] = np.full(n, defaults.get(name, 0.0), dtype=np.int64 if name == "ts" else float)
+        if "s_model_meta" not in cols:
+            out["s_model_meta"] = out["s_model"].copy()
+        if "s_model_bma" not in cols:
+            out["s_model_bma"] = out["s_model"].copy()
+        if cols.get("overlay") is None:
+            dirs = (out["dir_5m"] != 0) | (out["dir_15m"] != 0) | (out["dir_1h"] != 0)
+            out["overlay"] = dirs.astype(float)
+        return cls(**out)
+
+    def with_prices(self, prices: Union[str, pd.DataFrame]) -> "ReplayArrays":
+        """Attach closes by exact ts match from an OHLCV CSV path or DataFrame (ts, close)."""
+        df = pd.read_csv(prices) if isinstance(prices, str) else prices
+        px_ts = df["ts"].to_numpy(dtype=np.int64)
+        px_close = df["close"].to_numpy(dtype=float)
+        order = np.argsort(px_ts, kind="stable")
+        px_ts, px_close = px_ts[order], px_close[order]
+        idx = np.clip(np.searchsorted(px_ts, self.ts), 0, max(0, px_ts.size - 1))
+        close = np.full(len(self), np.nan)
+        if px_ts.size:
+            hit = px_ts[idx] == self.ts
+            close[hit] = px_close[idx[hit]]
+        return dataclasses.replace(self, close=close)
+
+
+def _open(path: str):
+    return gzip.open(path, "rt", encoding="utf-8") if path.endswith(".gz") else open(path, "r", encoding="utf-8")
+
+
+def _overlay_dir(indiv: Dict, tf: str) -> float:
+    sig = indiv.get(tf) or {}
+    return float(sig.get("dir", sig.get("direction", 0)) or 0)
+
+
+def iter_signal_records(paths: Iterable[str]):
+    for path in paths:
+        with _open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def load_signal_arrays(paths: Union[str, Iterable[str]], prices=None) -> ReplayArrays:
+    """Load signals JSONL (plain or .gz; globs allowed) into ReplayArrays.
+
+    Restarts log the same bar more than once; the last record per ts wins.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    files: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(sorted(glob.glob(os.path.join(p, "**", "signals*.jsonl*"), recursive=True)))
+        else:
+            files.extend(sorted(glob.glob(p)) or [p])
+
+    rows: Dict[int, tuple] = {}
+    for rec in iter_signal_records(files):
+        try:
+            ts = int(rec["ts"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        mo = rec.get("model_out") or {}
+        coh = rec.get("cohort") or {}
+        dec = rec.get("decision") or {}
+        det = dec.get("details") or {}
+        s_meta = float(mo.get("s_model", 0.0) or 0.0)
+        pred_bma = det.get("pred_bma_bps")
+        s_bma = float(pred_bma) / 10000.0 if pred_bma is not None else s_meta
+        s_dec = s_bma if str(det.get("model_source", "")).lower() == "bma" else s_meta
+        ov = det.get("overlay") or {}
+        indiv = ov.get("individual_signals") or {}
+        dirs = (_overlay_dir(indiv, "5m"), _overlay_dir(indiv, "15m"), _overlay_dir(indiv, "1h"))
+        rows[ts] = (
+            ts,
+            float(mo.get("p_up", 0.0) or 0.0),
+            float(mo.get("p_down", 0.0) or 0.0),
+            float(mo.get("p_neutral", 1.0) if mo.get("p_neutral") is not None else 1.0),
+            s_dec, s_meta, s_bma,
+            float(mo.get("a", 0.0) or 0.0),
+            float(mo.get("b", 1.0) if mo.get("b") is not None else 1.0),
+            float(coh.get("pros", 0.0) or 0.0),
+            float(coh.get("amateurs", 0.0) or 0.0),
+            float(coh.get("mood", 0.0) or 0.0),
+            *dirs,
+            float(bool(ov.get("enabled")) or any(dirs)),
+            float(dec.get("dir", 0) or 0),
+            float(dec.get("alpha", 0.0) or 0.0),
+            float(rec["close"]) if rec.get("close") is not None else np.nan,
+            float(rec.get("funding", 0.0) or 0.0),
+        )
+    ordered = [rows[k] for k in sorted(rows)]
+    cols = {name: [r[i] for r in ordered] for i, name in enumerate(_COLUMNS)}
+    arrays = ReplayArrays.from_columns(n=len(ordered), **cols)
+    return arrays.with_prices(prices) if prices is not None else arrays
+
+
+@dataclass
+class ReplayParams:
+    """Every knob replay() reads; from_config() mirrors how the live loop reads cfg.
+
+    The live loop reads calibration.band_bps twice with different defaults: 5
+    for the no-trade band and 15 for the overlay conflict check. band_bps and
+    conflict_band_bps keep those defaults, and overriding band_bps moves both
+    unless conflict_band_bps is overridden too.
+    """
+
+    thresholds: Thresholds = field(default_factory=Thresholds)
+    risk: RiskConfig = field(default_factory=RiskConfig)
+    controls: Dict = field(default_factory=dict)
+    band_bps: float = 5.0
+    conflict_band_bps: float = 15.0
+    conflict_band_mult: float = 2.0
+    edge_gating: bool = True
+    cost_bps: float = 5.0
+    expected_move_bps: float = 50.0
+    policy: str = "gate"  # 'gate' (gate_and_score) or one of ARMS
+    use_realized_vol: bool = True
+
+    @classmethod
+    def from_config(cls, cfg: Dict, **overrides) -> "ReplayParams":
+        risk_fields = {f.name for f in dataclasses.fields(RiskConfig)}
+        th_fields = {f.name for f in dataclasses.fields(Thresholds)}
+        costs = cfg.get("costs", {}) or {}
+        arules = (cfg.get("alignment", {}) or {}).get("rules") or cfg.get("alignment", {}) or {}
+        cal = cfg.get("calibration", {}) or {}
+        params = cls(
+            thresholds=Thresholds(**{k: v for k, v in (cfg.get("thresholds", {}) or {}).items() if k in th_fields}),
+            risk=RiskConfig(**{k: v for k, v in (cfg.get("risk", {}) or {}).items() if k in risk_fields}),
+            controls=dict(cfg.get("risk_controls", {}) or {}),
+            band_bps=float(cal.get("band_bps", 5)),
+            conflict_band_bps=float(cal.get("band_bps", 15)),
+            conflict_band_mult=float(arules.get("conflict_band_mult", 2.0)),
+            edge_gating=bool(costs.get("enable_net_edge_gating", True)),
+            cost_bps=float(costs.get("cost_bps", 5.0)),
+            expected_move_bps=float(costs.get("expected_move_bps", 50.0)),
+        )
+        return params.with_overrides(overrides) if overrides else params
+
+    def with_overrides(self, overrides: Dict) -> "ReplayParams":
+        """Copy with 'field', 'thresholds.X', 'risk.X' or 'controls.X' keys replaced."""
+        top, th, risk = {}, {}, {}
+        controls = dict(self.controls)
+        for key, value in overrides.items():
+            group, _, name = key.rpartition(".")
+            if group == "thresholds":
+                th[name] = value
+            elif group == "risk":
+                risk[name] = value
+            elif group == "controls":
+                controls[name] = value
+            elif group:
+                raise KeyError(f"Unknown parameter group in '{key}'")
+            else:
+                top[name] = value
+        if "band_bps" in top:
+            top.setdefault("conflict_band_bps", top["band_bps"])
+        return dataclasses.replace(
+            self,
+            thresholds=dataclasses.replace(self.thresholds, **th),
+            risk=dataclasses.replace(self.risk, **risk),
+            controls=controls,
+            **top,
+        )
+
+
+# ReplayParams field -> config path read by from_config()
+_CONFIG_PATHS = {
+    "band_bps": ("calibration", "band_bps"),
+    "conflict_band_bps": ("calibration", "band_bps"),
+    "conflict_band_mult": ("alignment", "rules", "conflict_band_mult"),
+    "edge_gating": ("costs", "enable_net_edge_gating"),
+    "cost_bps": ("costs", "cost_bps"),
+    "expected_move_bps": ("costs", "expected_move_bps"),
+}
+_CONFIG_GROUPS = {"thresholds": "thresholds", "risk": "risk", "controls": "risk_controls"}
+
+
+def config_overlay(overrides: Dict) -> Dict:
+    """Nested config dict that, deep-merged over a bot config, applies `overrides`.
+
+    Inverse of ReplayParams.from_config for with_overrides() keys; replay-only
+    fields (policy, use_realized_vol) have no config equivalent and raise KeyError.
+    """
+    out: Dict = {}
+    for key, value in overrides.items():
+        group, _, name = key.rpartition(".")
+        if group:
+            if group not in _CONFIG_GROUPS:
+                raise KeyError(f"Unknown parameter group in '{key}'")
+            path = (_CONFIG_GROUPS[group], name)
+        elif key in _CONFIG_PATHS:
+            path = _CONFIG_PATHS[key]
+        else:
+            raise KeyError(f"'{key}' has no config equivalent")
+        node = out
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+        node[path[-1]] = value.item() if isinstance(value, np.generic) else value
+    return out
+
+
+def _sign(x: np.ndarray) -> np.ndarray:
+    # decision.py convention: 1 if x > 0 else -1
+    return np.where(x > 0, 1.0, -1.0)
+
+
+def gate_and_score_arrays(arr: ReplayArrays, th: Thresholds):
+    """Array form of decision.gate_and_score -> (dir, alpha)."""
+    s_mood = -arr.mood if th.flip_mood else arr.mood
+    s_model = -arr.s_model if th.flip_model else arr.s_model
+    mood_ok = np.abs(s_mood) >= th.M_MIN
+    model_ok = np.abs(s_model) >= th.S_MIN
+
+    conf_model = np.clip(np.abs(s_model), 0.0, 1.0)
+    model_only = (~mood_ok) & model_ok & bool(th.allow_model_only_when_mood_neutral) & (conf_model >= th.CONF_MIN)
+
+    conf_both = np.clip(0.5 * (np.abs(s_mood) + np.abs(s_model)), 0.0, 1.0)
+    both = mood_ok & model_ok & (_sign(s_mood) == _sign(s_model)) & (conf_both >= th.CONF_MIN)
+
+    conf = np.where(both, conf_both, conf_model)
+    trade = model_only | both
+    direction = np.where(trade, _sign(s_model), 0.0)
+    alpha = np.where(trade, np.maximum(th.ALPHA_MIN, np.minimum(1.0, conf)), 0.0)
+    return direction, alpha
+
+
+def arm_decision_arrays(arr: ReplayArrays, th: Thresholds, arm: str):
+    """Array form of decide_bandit with the bandit always choosing `arm` -> (dir, alpha)."""
+    if arm not in ARMS:
+        raise ValueError(f"Unknown arm '{arm}'; expected one of {ARMS}")
+    if arm in ("pros", "amateurs"):
+        raw = arr.pros if arm == "pros" else arr.amateurs
+        eligible = np.abs(raw) >= th.S_MIN
+        eps = th.S_MIN
+        alpha_base = np.abs(raw)
+    else:
+        if arm == "model_meta":
+            raw = -arr.s_model_meta if th.flip_model else arr.s_model_meta
+        else:
+            raw = -arr.s_model_bma if th.flip_model_bma else arr.s_model_bma
+        p_dir = arr.p_up + arr.p_down
+        with np.errstate(divide="ignore", invalid="ignore"):
+            conf_dir = np.where(p_dir > 0, np.maximum(arr.p_up, arr.p_down) / (p_dir + 1e-12), 0.0)
+        strength = np.abs(arr.p_up - arr.p_down)
+        p_non_neutral = np.maximum(0.0, 1.0 - arr.p_neutral)
+        eligible = (p_non_neutral >= th.PNN_MIN) & (conf_dir >= th.CONF_DIR_MIN) & (strength >= th.STRENGTH_MIN)
+        eps = th.ALPHA_MIN
+        alpha_base = np.maximum(conf_dir, strength)
+    trade = eligible & (np.abs(raw) >= eps)
+    direction = np.where(trade, _sign(raw), 0.0)
+    alpha = np.where(trade, np.maximum(th.ALPHA_MIN, np.minimum(1.0, alpha_base)), 0.0)
+    return direction, alpha
+
+
+def edge_after_costs_arrays(p_up: np.ndarray, p_down: np.ndarray, cost_bps: float, expected_move_bps: float = 50.0):
+    """Array form of decision.compute_edge_after_costs -> (edge_after_costs_bps, direction, should_trade).
+
+    Edge is unrounded; should_trade matches the scalar function.
+    """
+    long_bps = p_up * expected_move_bps - p_down * expected_move_bps
+    short_bps = p_down * expected_move_bps - p_up * expected_move_bps
+    go_long = (long_bps > 0) & (long_bps >= short_bps)
+    go_short = ~go_long & (short_bps > 0)
+    expected = np.where(go_long, long_bps, np.where(go_short, short_bps, 0.0))
+    direction = np.where(go_long, 1.0, np.where(go_short, -1.0, 0.0))
+    edge = expected - cost_bps
+    return edge, direction, edge > 0
+
+
+def realized_vol_arrays(close: np.ndarray, risk: RiskConfig) -> np.ndarray:
+    """RiskAndExec.realized_vol() after each bar's return has been recorded."""
+    rets = pd.Series(close, dtype=float).pct_change(fill_method=None)
+    sd = rets.rolling(int(risk.realized_vol_window), min_periods=2).std(ddof=1).to_numpy()
+    bars_per_year = (365.0 * 24.0 * 60.0) / max(1e-9, float(risk.bar_minutes))
+    return np.nan_to_num(sd * math.sqrt(bars_per_year), nan=0.0)
+
+
+def target_position_arrays(direction: np.ndarray, alpha: np.ndarray, rv: np.ndarray, risk: RiskConfig) -> np.ndarray:
+    """RiskAndExec.target_position, flat where direction is 0."""
+    vol = np.where(rv > 0, rv, float(risk.vol_floor or 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pos = np.where(vol > 0, (risk.sigma_target / vol) * alpha, 0.0)
+    pos = np.clip(pos, -risk.pos_max, risk.pos_max)
+    return np.where(direction != 0, direction * pos, 0.0)
+
+
+def _veto(veto: np.ndarray, mask: np.ndarray, code: int) -> None:
+    veto[mask & (veto == PASS)] = code
+
+
+def _impact_bps(delta_frac: float, price: float, risk: RiskConfig):
+    """(soft-guard bps, hard-guard/net-edge bps) as estimated in evaluate_pretrade_guards."""
+    est_notional = delta_frac * max(1e-6, float(risk.base_notional))
+    est_qty = est_notional / max(1e-6, price)
+    soft = float(risk.impact_k) * est_qty * 10000.0
+    hard = (float(risk.impact_k) * est_qty ** 2 * price / est_notional) * 10000.0 if est_notional > 0 else 0.0
+    return soft, hard
+
+
+def _position_pass(
+    arr: ReplayArrays,
+    direction: np.ndarray,
+    tgt: np.ndarray,
+    alpha_bps: np.ndarray,
+    band_veto: np.ndarray,
+    veto: np.ndarray,
+    p: ReplayParams,
+) -> np.ndarray:
+    """Guards that compare the target with the position held going in (one scalar pass)."""
+    risk, ctl = p.risk, p.controls
+    gap_ms = int(ctl.get("min_sign_flip_gap_s", 0) or 0) * 1000
+    frac_min = float(ctl.get("delta_pi_min_bps", 0.0) or 0.0) / 10_000.0
+    max_impact = float(ctl.get("max_impact_bps", 0.0) or 0.0)
+    impact_k = float(risk.impact_k or 0.0)
+    base_cost = float(risk.cost_bps) + float(risk.slippage_bps)
+
+    ts, close, dirs = arr.ts.tolist(), arr.close.tolist(), direction.tolist()
+    tgt_l, alpha_l, band_l, veto_l = tgt.tolist(), alpha_bps.tolist(), band_veto.tolist(), veto.tolist()
+    pos = np.zeros(len(arr))
+    prev = 0.0
+    last_sign, last_flip = 0, 0
+    for i, t in enumerate(tgt_l):
+        v = veto_l[i]
+        if v == PASS:
+            sign = 1 if dirs[i] > 0 else -1
+            delta = abs(t - prev)
+            price = close[i]
+            soft = hard = 0.0
+            if impact_k > 0.0 and price == price:
+                soft, hard = _impact_bps(delta, price, risk)
+            if gap_ms > 0 and last_sign != 0 and sign != last_sign and last_flip > 0 and ts[i] - last_flip < gap_ms:
+                v = _FLIP
+            elif frac_min > 0 and delta < frac_min:
+                v = _DELTA_PI
+            elif max_impact > 0.0 and soft > max_impact:
+                v = _IMPACT
+            elif risk.max_impact_bps_hard > 0.0 and hard > risk.max_impact_bps_hard:
+                v = _IMPACT_HARD
+            elif risk.enable_net_edge_gating and alpha_l[i] - (base_cost + hard) < risk.min_net_edge_bps:
+                v = _NET_EDGE
+            elif band_l[i]:
+                v = _BAND
+            veto[i] = v
+        new = t if v == PASS else 0.0
+        new_sign = 1 if new > 0 else (-1 if new < 0 else 0)
+        if last_sign != 0 and new_sign != 0 and new_sign != last_sign:
+            last_flip = ts[i]
+        if new_sign != 0:
+            last_sign = new_sign
+        pos[i] = new
+        prev = new
+    return pos
+
+
+def replay(arr: ReplayArrays, params: Optional[ReplayParams] = None) -> Dict[str, np.ndarray]:
+    """Re-run the decision pipeline over `arr` -> per-bar decision and PnL arrays.
+
+    Returns dir, alpha, veto (reason string, '' when traded), veto_code,
+    pred_cal_bps, edge_after_costs_bps, target_pos, pos, pnl_bps, cum_pnl_bps.
+    """
+    p = params or ReplayParams()
+    th, risk, ctl = p.thresholds, p.risk, p.controls
+    n = len(arr)
+
+    if p.policy == "gate":
+        direction, alpha = gate_and_score_arrays(arr, th)
+    else:
+        direction, alpha = arm_decision_arrays(arr, th, p.policy)
+    veto = np.where(direction == 0, _GATE, PASS).astype(np.int8)
+
+    pred_cal_bps = 10000.0 * (arr.a + arr.b * arr.s_model)
+
+    # Overlay alignment (only where overlay timeframe signals were logged)
+    conflict = (arr.dir_5m != 0) & (arr.dir_15m != 0) & (arr.dir_5m != arr.dir_15m)
+    _veto(veto, conflict & (np.abs(pred_cal_bps) <= p.conflict_band_mult * p.conflict_band_bps), _CONFLICT)
+    live = veto == PASS
+    alpha = np.where(live & (arr.dir_1h != 0) & (arr.dir_1h != direction), 0.5 * alpha, alpha)
+
+    edge, _, should_trade = edge_after_costs_arrays(arr.p_up, arr.p_down, p.cost_bps, p.expected_move_bps)
+    if p.edge_gating:
+        _veto(veto, (arr.overlay != 0) & ~should_trade, _EDGE)
+
+    # Stateless pre-trade guards
+    fg_bias = float(ctl.get("funding_guard_bias", 0.0) or 0.0)
+    _veto(veto, (np.abs(arr.funding) > fg_bias) & (_sign(arr.funding) == direction), _FUNDING)
+
+    rv = realized_vol_arrays(arr.close, risk) if p.use_realized_vol else np.zeros(n)
+    tgt = target_position_arrays(direction, alpha, rv, risk)
+    band_veto = np.abs(pred_cal_bps) <= p.band_bps
+
+    alpha_bps = alpha * 10000.0
+    sequential = (
+        int(ctl.get("min_sign_flip_gap_s", 0) or 0) > 0
+        or float(ctl.get("delta_pi_min_bps", 0.0) or 0.0) > 0
+        or float(risk.impact_k or 0.0) > 0.0
+    )
+    if sequential:
+        pos = _position_pass(arr, direction, tgt, alpha_bps, band_veto, veto, p)
+    else:
+        if risk.enable_net_edge_gating:
+            net_edge = alpha_bps - (float(risk.cost_bps) + float(risk.slippage_bps))
+            _veto(veto, net_edge < risk.min_net_edge_bps, _NET_EDGE)
+        _veto(veto, band_veto, _BAND)
+        pos = np.where(veto == PASS, tgt, 0.0)
+
+    traded = veto == PASS
+    final_dir = np.where(traded, direction, 0.0).astype(np.int8)
+    final_alpha = np.where(traded, alpha, 0.0)
+
+    rets_bps = np.nan_to_num(pd.Series(arr.close, dtype=float).pct_change(fill_method=None).to_numpy() * 10000.0)
+    prev_pos = np.concatenate(([0.0], pos[:-1]))
+    cost = (float(risk.cost_bps) + float(risk.slippage_bps)) * np.abs(pos - prev_pos)
+    pnl_bps = prev_pos * rets_bps - cost
+
+    return {
+        "ts": arr.ts,
+        "dir": final_dir,
+        "alpha": final_alpha,
+        "veto_code": veto,
+        "veto": np.asarray(VETO_NAMES, dtype=object)[veto],
+        "pred_cal_bps": pred_cal_bps,
+        "edge_after_costs_bps": edge,
+        "target_pos": tgt,
+        "pos": pos,
+        "pnl_bps": pnl_bps,
+        "cum_pnl_bps": np.cumsum(pnl_bps),
+    }
+
+
+def summarize(result: Dict[str, np.ndarray]) -> Dict:
+    """Headline metrics for a replay() result."""
+    n = int(result["dir"].size)
+    pos = result["pos"]
+    turnover = float(np.abs(np.diff(np.concatenate(([0.0], pos)))).sum())
+    codes, counts = np.unique(result["veto_code"], return_counts=True)
+    return {
+        "n_bars": n,
+        "trade_rate": float(np.mean(result["dir"] != 0)) if n else 0.0,
+        "eligibility_rate": float(np.mean(result["veto_code"] != _GATE)) if n else 0.0,
+        "net_pnl_bps": float(result["pnl_bps"].sum()),
+        "turnover": turnover,
+        "mean_abs_pos": float(np.mean(np.abs(pos))) if n else 0.0,
+        "vetoes": {VETO_NAMES[int(c)]: int(k) for c, k in zip(codes, counts) if c != PASS},
+    }
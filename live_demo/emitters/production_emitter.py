@@ -42,26 +42,98 @@ class EmitterConfig:
     batch_size: int = 100
     flush_interval: float = 5.0  # seconds
     enable_async: bool = True
+    queue_size: int = 10000
+
+
+LOG_TYPES = (
+    "market",
+    "signals",
+    "ensemble",
+    "risk",
+    "execution",
+    "costs",
+    "health",
+    "repro",
+    "order_intent",
+    "feature_log",
+    "calibration",
+)
+
+_STOP = object()
+
+
+class _Handle:
+    """An open append handle for one log type's current file.
+
+    Compressed files get one complete gzip member per flush, so plain gzip
+    readers can read a file that is still open for writing.
+    """
+
+    def __init__(self, path: str, date_str: str, compression: bool):
+        self.path = path
+        self.date_str = date_str
+        self.raw = open(path, "ab")
+        self.size = self.raw.tell()
+        self.compression = compression
+        self.pending: List[bytes] = []
+        self.dirty = False
+
+    def write(self, data: bytes) -> None:
+        if self.compression:
+            self.pending.append(data)
+        else:
+            self.raw.write(data)
+            self.size += len(data)
+        self.dirty = True
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        if self.pending:
+            member = gzip.compress(b"".join(self.pending))
+            self.raw.write(member)
+            self.pending = []
+            self.size += len(member)
+        self.raw.flush()
+        self.dirty = False
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.raw.close()
 
 
 class ProductionLogEmitter:
-    """Production-ready log emitter with rotation, sampling, and error handling"""
+    """Production-ready log emitter with rotation, sampling, and error handling
+
+    Async mode runs one writer thread for all log types: emit_* puts
+    (log_type, record) on a single bounded queue, the writer drains it in
+    batches, keeps one append handle per log type open, tracks file size from
+    the bytes it writes and rotates once a file reaches max_file_size_mb.
+
+    emit_* never blocks: a record that finds the queue full is dropped and
+    counted (get_stats()["queue"]["dropped"]), and after close() records are
+    written inline.
+    """
 
     def __init__(self, config: EmitterConfig):
         self.config = config
         self.logger = self._setup_logger()
-        self._queues: Dict[str, queue.Queue] = {}
-        self._writers: Dict[str, threading.Thread] = {}
-        self._file_handles: Dict[str, Any] = {}
-        self._file_sizes: Dict[str, int] = {}
-        self._last_flush: Dict[str, float] = {}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.config.queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._handles: Dict[str, _Handle] = {}
+        self._written: Dict[str, int] = {}
+        self._dropped: Dict[str, int] = {}
+        self._closed = False
+        self._last_flush = time.monotonic()
         self._lock = threading.RLock()
 
         # Create base directory
         Path(self.config.base_dir).mkdir(parents=True, exist_ok=True)
 
         if self.config.enable_async:
-            self._start_background_writers()
+            self._start_background_writer()
 
     def _setup_logger(self) -> logging.Logger:
         """Setup internal logger for emitter operations"""
@@ -78,106 +150,120 @@ class ProductionLogEmitter:
 
         return logger
 
-    def _start_background_writers(self):
-        """Start background writer threads for async logging"""
-        for log_type in [
-            "market",
-            "signals",
-            "ensemble",
-            "risk",
-            "execution",
-            "costs",
-            "health",
-            "repro",
-            "order_intent",
-            "feature_log",
-            "calibration",
-        ]:
-            self._queues[log_type] = queue.Queue(maxsize=10000)
-            self._writers[log_type] = threading.Thread(
-                target=self._background_writer,
-                args=(log_type,),
-                daemon=True,
-                name=f"Writer-{log_type}",
-            )
-            self._writers[log_type].start()
+    def _start_background_writer(self):
+        """Start the single background writer thread for async logging"""
+        self._writer = threading.Thread(
+            target=self._background_writer, daemon=True, name="Writer-logs"
+        )
+        self._writer.start()
 
-    def _background_writer(self, log_type: str):
-        """Background writer thread for async logging"""
+    def _background_writer(self):
+        """Drain (log_type, record) batches from the shared queue"""
+        q = self._queue
         while True:
             try:
-                # Get batch of records
-                records = []
-                timeout = self.config.flush_interval
-
-                # Try to get batch_size records or timeout
-                for _ in range(self.config.batch_size):
-                    try:
-                        record = self._queues[log_type].get(timeout=timeout)
-                        records.append(record)
-                        timeout = 0.1  # Reduce timeout for subsequent records
-                    except queue.Empty:
-                        break
-
-                if records:
+                item = q.get(timeout=self.config.flush_interval)
+            except queue.Empty:
+                self._flush_handles()
+                continue
+            items = [item]
+            while len(items) < self.config.batch_size:
+                try:
+                    items.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            batches: Dict[str, List[Dict[str, Any]]] = {}
+            for it in items:
+                if it is _STOP:
+                    stop = True
+                else:
+                    batches.setdefault(it[0], []).append(it[1])
+            try:
+                for log_type, records in batches.items():
                     self._write_batch(log_type, records)
+                if time.monotonic() - self._last_flush >= self.config.flush_interval:
+                    self._flush_handles()
+            except Exception as e:
+                self.logger.error(f"Background writer error: {e}")
+            finally:
+                for _ in items:
+                    q.task_done()
+            if stop:
+                return
+
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def _handle_for(self, log_type: str) -> _Handle:
+        """Open handle for log_type, rolling over on date change or size limit"""
+        date_str = datetime.now(IST).strftime("%Y-%m-%d")
+        h = self._handles.get(log_type)
+        if h is not None and h.date_str != date_str:
+            self._close_handle(log_type)
+            h = None
+        if h is not None and h.size >= self.config.max_file_size_mb * 1024 * 1024:
+            self._close_handle(log_type)
+            self._rotate_file(log_type, h.path)
+            h = None
+        if h is None:
+            h = self._handles[log_type] = _Handle(
+                self._get_file_path(log_type, date_str), date_str, self.config.compression
+            )
+        return h
 
+    def _close_handle(self, log_type: str) -> None:
+        h = self._handles.pop(log_type, None)
+        if h is not None:
+            try:
+                h.close()
             except Exception as e:
-                self.logger.error(f"Background writer error for {log_type}: {e}")
-                time.sleep(1)
+                self.logger.error(f"Error closing {log_type} log file: {e}")
+
+    def _flush_handles(self) -> None:
+        with self._lock:
+            for log_type, h in list(self._handles.items()):
+                try:
+                    h.flush()
+                except Exception as e:
+                    self.logger.error(f"Error flushing {log_type} log file: {e}")
+                    self._close_handle(log_type)
+            self._last_flush = time.monotonic()
 
     def _write_batch(self, log_type: str, records: List[Dict[str, Any]]):
-        """Write batch of records to file"""
+        """Write batch of records to the open file for log_type"""
         try:
-            file_path = self._get_file_path(log_type)
-
-            # Check if file needs rotation
-            if self._should_rotate_file(log_type, file_path):
-                self._rotate_file(log_type, file_path)
-                file_path = self._get_file_path(log_type)
-
-            # Write records
+            data = b"".join(self._encode(record) for record in records)
             with self._lock:
-                mode = "a" if os.path.exists(file_path) else "w"
-                open_func = gzip.open if self.config.compression else open
-
-                with open_func(file_path, mode, encoding="utf-8") as f:
-                    for record in records:
-                        f.write(json.dumps(record, separators=(",", ":")) + "\n")
-
-                # Update file size
-                self._file_sizes[log_type] = os.path.getsize(file_path)
-                self._last_flush[log_type] = time.time()
+                self._handle_for(log_type).write(data)
+                self._written[log_type] = self._written.get(log_type, 0) + len(records)
 
         except Exception as e:
             self.logger.error(f"Error writing batch for {log_type}: {e}")
+            with self._lock:
+                self._close_handle(log_type)
             # Retry individual records
             for record in records:
                 self._write_single_with_retry(log_type, record)
 
-    def _write_single_with_retry(self, log_type: str, record: Dict[str, Any]):
+    def _write_single_with_retry(self, log_type: str, record: Dict[str, Any], flush: bool = False):
         """Write single record with retry logic"""
         for attempt in range(self.config.retry_attempts):
             try:
-                file_path = self._get_file_path(log_type)
-
-                if self._should_rotate_file(log_type, file_path):
-                    self._rotate_file(log_type, file_path)
-                    file_path = self._get_file_path(log_type)
-
+                data = self._encode(record)
                 with self._lock:
-                    mode = "a" if os.path.exists(file_path) else "w"
-                    open_func = gzip.open if self.config.compression else open
-
-                    with open_func(file_path, mode, encoding="utf-8") as f:
-                        f.write(json.dumps(record, separators=(",", ":")) + "\n")
-
-                    self._file_sizes[log_type] = os.path.getsize(file_path)
-                    self._last_flush[log_type] = time.time()
+                    h = self._handle_for(log_type)
+                    h.write(data)
+                    if flush:
+                        h.flush()
+                    self._written[log_type] = self._written.get(log_type, 0) + 1
 
                 return  # Success
 
             except Exception as e:
+                with self._lock:
+                    self._close_handle(log_type)
                 self.logger.warning(
                     f"Write attempt {attempt + 1} failed for {log_type}: {e}"
                 )
@@ -210,26 +296,15 @@ class ProductionLogEmitter:
         except Exception as e:
             self.logger.critical(f"Failed to write error log: {e}")
 
-    def _get_file_path(self, log_type: str) -> str:
+    def _get_file_path(self, log_type: str, date_str: Optional[str] = None) -> str:
         """Get current file path for log type"""
-        date_str = datetime.now(IST).strftime("%Y-%m-%d")
+        date_str = date_str or datetime.now(IST).strftime("%Y-%m-%d")
         log_dir = Path(self.config.base_dir) / log_type / f"date={date_str}"
         log_dir.mkdir(parents=True, exist_ok=True)
 
         ext = ".jsonl.gz" if self.config.compression else ".jsonl"
         return str(log_dir / f"{log_type}{ext}")
 
-    def _should_rotate_file(self, log_type: str, file_path: str) -> bool:
-        """Check if file should be rotated"""
-        if not os.path.exists(file_path):
-            return False
-
-        # Size-based rotation
-        file_size = os.path.getsize(file_path)
-        max_size_bytes = self.config.max_file_size_mb * 1024 * 1024
-
-        return file_size >= max_size_bytes
-
     def _rotate_file(self, log_type: str, file_path: str):
         """Rotate log file"""
         try:
@@ -239,6 +314,12 @@ class ProductionLogEmitter:
             rotated_path = (
                 base_path.parent / f"{base_path.stem}_{timestamp}{base_path.suffix}"
             )
+            n = 1
+            while rotated_path.exists():  # several rotations within one second
+                rotated_path = (
+                    base_path.parent / f"{base_path.stem}_{timestamp}_{n}{base_path.suffix}"
+                )
+                n += 1
 
             # Move current file to rotated name
             os.rename(file_path, str(rotated_path))
@@ -286,106 +367,67 @@ class ProductionLogEmitter:
 
         return record
 
+    def _emit(self, log_type: str, record: Dict[str, Any]):
+        record = self._add_metadata(record, log_type)
+        if self.config.enable_async and not self._closed:
+            try:
+                self._queue.put_nowait((log_type, record))
+            except queue.Full:
+                n = self._dropped[log_type] = self._dropped.get(log_type, 0) + 1
+                if n == 1 or n % 1000 == 0:
+                    self.logger.warning(f"Log queue full, dropped {n} {log_type} records so far")
+        else:
+            self._write_single_with_retry(log_type, record, flush=True)
+
     def emit_market_data(self, record: Dict[str, Any]):
         """Emit market data log"""
-        record = self._add_metadata(record, "market")
-        if self.config.enable_async:
-            self._queues["market"].put(record)
-        else:
-            self._write_single_with_retry("market", record)
+        self._emit("market", record)
 
     def emit_signals(self, record: Dict[str, Any]):
         """Emit signals log"""
-        record = self._add_metadata(record, "signals")
-        if self.config.enable_async:
-            self._queues["signals"].put(record)
-        else:
-            self._write_single_with_retry("signals", record)
+        self._emit("signals", record)
 
     def emit_ensemble(self, record: Dict[str, Any]):
         """Emit ensemble log"""
-        record = self._add_metadata(record, "ensemble")
-        if self.config.enable_async:
-            self._queues["ensemble"].put(record)
-        else:
-            self._write_single_with_retry("ensemble", record)
+        self._emit("ensemble", record)
 
     def emit_risk(self, record: Dict[str, Any]):
         """Emit risk log"""
-        record = self._add_metadata(record, "risk")
-        if self.config.enable_async:
-            self._queues["risk"].put(record)
-        else:
-            self._write_single_with_retry("risk", record)
+        self._emit("risk", record)
 
     def emit_execution(self, record: Dict[str, Any]):
         """Emit execution log"""
-        record = self._add_metadata(record, "execution")
-        if self.config.enable_async:
-            self._queues["execution"].put(record)
-        else:
-            self._write_single_with_retry("execution", record)
+        self._emit("execution", record)
 
     def emit_costs(self, record: Dict[str, Any]):
         """Emit costs log"""
-        record = self._add_metadata(record, "costs")
-        if self.config.enable_async:
-            self._queues["costs"].put(record)
-        else:
-            self._write_single_with_retry("costs", record)
+        self._emit("costs", record)
 
     def emit_health(self, record: Dict[str, Any]):
         """Emit health log"""
-        record = self._add_metadata(record, "health")
-        if self.config.enable_async:
-            self._queues["health"].put(record)
-        else:
-            self._write_single_with_retry("health", record)
+        self._emit("health", record)
 
     def emit_repro(self, record: Dict[str, Any]):
         """Emit repro/config log"""
-        record = self._add_metadata(record, "repro")
-        if self.config.enable_async:
-            self._queues["repro"].put(record)
-        else:
-            self._write_single_with_retry("repro", record)
+        self._emit("repro", record)
 
     def emit_order_intent(self, record: Dict[str, Any]):
         """Emit order intent log"""
-        record = self._add_metadata(record, "order_intent")
-        if self.config.enable_async:
-            self._queues["order_intent"].put(record)
-        else:
-            self._write_single_with_retry("order_intent", record)
+        self._emit("order_intent", record)
 
     def emit_feature_log(self, record: Dict[str, Any]):
         """Emit feature log"""
-        record = self._add_metadata(record, "feature_log")
-        if self.config.enable_async:
-            self._queues["feature_log"].put(record)
-        else:
-            self._write_single_with_retry("feature_log", record)
+        self._emit("feature_log", record)
 
     def emit_calibration(self, record: Dict[str, Any]):
         """Emit calibration log"""
-        record = self._add_metadata(record, "calibration")
-        if self.config.enable_async:
-            self._queues["calibration"].put(record)
-        else:
-            self._write_single_with_retry("calibration", record)
+        self._emit("calibration", record)
 
     def flush_all(self):
         """Flush all pending records"""
-        if not self.config.enable_async:
-            return
-
-        for log_type in self._queues:
-            # Wait for queue to empty
-            while not self._queues[log_type].empty():
-                time.sleep(0.1)
-
-            # Force flush
-            self._last_flush[log_type] = 0
+        if self.config.enable_async and self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+        self._flush_handles()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get emitter statistics"""
@@ -398,35 +440,33 @@ class ProductionLogEmitter:
                 "sampling_rate": self.config.sampling_rate,
                 "async_enabled": self.config.enable_async,
             },
-            "queues": {},
+            "queue": {
+                "size": self._queue.qsize(),
+                "maxsize": self._queue.maxsize,
+                "dropped": dict(self._dropped),
+            },
             "files": {},
         }
 
-        for log_type in self._queues:
-            stats["queues"][log_type] = {
-                "size": self._queues[log_type].qsize(),
-                "maxsize": self._queues[log_type].maxsize,
-            }
-
-            file_path = self._get_file_path(log_type)
-            if os.path.exists(file_path):
+        with self._lock:
+            for log_type, h in self._handles.items():
                 stats["files"][log_type] = {
-                    "path": file_path,
-                    "size_mb": os.path.getsize(file_path) / (1024 * 1024),
-                    "last_modified": datetime.fromtimestamp(
-                        os.path.getmtime(file_path), IST
-                    ).isoformat(),
+                    "path": h.path,
+                    "size_mb": h.size / (1024 * 1024),
+                    "records_written": self._written.get(log_type, 0),
                 }
 
         return stats
 
     def close(self):
-        """Close emitter and flush all records"""
-        self.flush_all()
-
-        # Stop background writers
-        for writer in self._writers.values():
-            writer.join(timeout=5)
+        """Close emitter and flush all records; later emits are written inline"""
+        self._closed = True
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join(timeout=5)
+        with self._lock:
+            for log_type in list(self._handles):
+                self._close_handle(log_type)
 
         self.logger.info("ProductionLogEmitter closed")
 
@@ -16,7 +16,9 @@ import json
 import math
 import statistics
 from collections import deque
-from typing import Deque, Dict, List
+from typing import Deque, Dict, List, Optional
+
+from live_demo.trade_tape import TAPE_FEATURES
 
 
 class FeatureBuilder:
@@ -69,6 +71,7 @@ class LiveFeatureComputer:
         vol_window: int = 50,
         corr_window: int = 36,
         timeframe: str = "5m",
+        use_tape_proxies: bool = False,
     ):
         self.columns = columns
         self.rv_window = rv_window
@@ -97,6 +100,10 @@ class LiveFeatureComputer:
         self._price_dev_hist: Deque[float] = deque(maxlen=max(3, vol_window))
         self._bar_count: int = 0        # incremented every update_and_build call
         self._min_warm_bars: int = 50   # bars needed before is_warmed() = True
+        # When True, bars with trade-tape stats replace the vwap_momentum/depth_proxy
+        # proxies with real VWAP deviation and signed-volume imbalance. Off by default
+        # because current artifacts were trained on the proxies (mom_3 / 0.0).
+        self.use_tape_proxies = use_tape_proxies
 
     def is_warmed(self) -> bool:
         """True once >= 50 bars have been fed. Gate live trading on this flag.
@@ -118,8 +125,9 @@ class LiveFeatureComputer:
         )
 
     def update_and_build(
-        self, bar_row: Dict, cohort: Dict, funding: float
+        self, bar_row: Dict, cohort: Dict, funding: float, tape: Optional[Dict] = None
     ) -> List[float]:
+        """tape: optional IntrabarTradeAggregator.roll() output for this bar."""
         o = float(bar_row.get("open", 0.0))
         h = float(bar_row.get("high", 0.0))
         l = float(bar_row.get("low", 0.0))
@@ -197,6 +205,10 @@ class LiveFeatureComputer:
 
         vwap_momentum = r3  # proxy
         depth_proxy = 0.0   # no order book in live demo
+        tape = tape or {}
+        if self.use_tape_proxies and tape.get("tape_trade_count", 0.0) > 0:
+            vwap_momentum = float(tape.get("tape_vwap_dev", r3))
+            depth_proxy = float(tape.get("tape_imbalance", 0.0))
 
         # funding
         funding_rate = float(funding)
@@ -240,6 +252,9 @@ class LiveFeatureComputer:
             "S_top": s_top,
             "S_bot": s_bot,
         }
+        # Trade-tape microstructure (0.0 when no tape was supplied)
+        for k in TAPE_FEATURES:
+            feature_map[k] = float(tape.get(k, 0.0))
 
         # Prepare output in schema order, defaulting to 0.0 for missing
         out: List[float] = []
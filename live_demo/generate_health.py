@@ -4,7 +4,7 @@ from datetime import datetime
 
 from live_demo.reason_codes import VetoReasonCode, GuardReasonCode
 
-def save_health_snapshot(log_dir="paper_trading_outputs/5m/logs"):
+def save_health_snapshot(log_dir="paper_trading_outputs/5m/logs", latency=None):
     signals_path = os.path.join(log_dir, "signals.jsonl")
     snapshot_path = os.path.join(log_dir, "snapshot_health.jsonl")
     
@@ -17,6 +17,9 @@ def save_health_snapshot(log_dir="paper_trading_outputs/5m/logs"):
         "vetos": {"neutral_signal": 0, "risk_blocked": 0},
         "staleness_ms": None
     }
+    # Rolling per-stage bar latency percentiles from the live loop (BarSpanRecorder)
+    if latency:
+        stats["latency_ms"] = latency
 
     # Updated to find all signals.jsonl files recursively (handling date partitions)
     signals_files = []
@@ -12,6 +12,8 @@ import pytz
 from dataclasses import dataclass
 import json
 
+from live_demo.ops.bma import RollingIC
+
 IST = pytz.timezone("Asia/Kolkata")
 
 
@@ -56,6 +58,7 @@ class HealthMonitor:
         self.predictions_history = deque(maxlen=window_1w)
         self.actual_returns_history = deque(maxlen=window_1w)
         self.ic_history = deque(maxlen=200)  # 200-bar IC window
+        self._ic_acc = RollingIC(window=20, min_samples=2)  # IC over the last 20 predictions
 
         # Execution tracking
         self.execution_times = deque(maxlen=1000)
@@ -111,18 +114,9 @@ class HealthMonitor:
         )
 
         # Calculate IC
-        if len(self.predictions_history) >= 2:
-            preds = [p["prediction"] for p in list(self.predictions_history)[-20:]]
-            actuals = [
-                a["actual_return"] for a in list(self.actual_returns_history)[-20:]
-            ]
-            if len(preds) == len(actuals) and len(preds) > 1:
-                ic = (
-                    np.corrcoef(preds, actuals)[0, 1]
-                    if not np.isnan(np.corrcoef(preds, actuals)[0, 1])
-                    else 0.0
-                )
-                self.ic_history.append(ic)
+        self._ic_acc.add(prediction, actual_return)
+        if len(self._ic_acc) >= 2:
+            self.ic_history.append(self._ic_acc.value())
 
     def update_inband(self, pred_cal_bps: float, band_bps: float):
         """Update in-band status for the current bar.
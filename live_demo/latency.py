@@ -0,0 +1,122 @@
+"""Per-stage latency spans for the bar loop.
+
+The bar loop is one long inline sequence, so stages are timed with marks
+rather than nested context managers: begin() when the candle poll starts,
+mark(stage) as each stage finishes (duration since the previous mark, on the
+monotonic perf_counter clock), end_bar() once the bar is done.
+
+end_bar() writes one record per bar to the 'latency' JSONL stream:
+  - stages:            {stage: ms} in loop order
+  - total_ms:          poll start to end of bar
+  - to_order_ms:       poll start to the end of the order stage
+  - close_lag_ms:      wall clock at poll return minus bar close time (live only)
+  - close_to_order_ms: close_lag_ms + to_order_ms
+
+Rolling p50/p95/p99 per stage (plus total/close_to_order) over the last
+`window` bars are available from percentiles() for the health snapshot.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+import numpy as np
+
+STREAM = "latency"
+TOTAL = "total"
+CLOSE_TO_ORDER = "close_to_order"
+
+
+class BarSpanRecorder:
+    def __init__(
+        self,
+        window: int = 288,
+        order_stage: str = "execution",
+        asset: str = "BTC",
+        writer: Optional[Callable[[Dict], None]] = None,
+    ):
+        self.window = int(window)
+        self.order_stage = order_stage
+        self.asset = asset
+        self._writer = writer
+        self._hist: Dict[str, Deque[float]] = {}
+        self._stages: Dict[str, float] = {}
+        self._t0: Optional[float] = None
+        self._last = 0.0
+        self._to_order: Optional[float] = None
+        self._ts = None
+        self._close_lag_ms: Optional[float] = None
+
+    def begin(self) -> None:
+        """Start timing a bar; called again on retries simply restarts it."""
+        self._t0 = self._last = time.perf_counter()
+        self._stages = {}
+        self._to_order = None
+        self._ts = None
+        self._close_lag_ms = None
+
+    def set_bar(self, ts, close_ts_ms: Optional[float] = None) -> None:
+        """Attach the bar timestamp; close_ts_ms enables close-to-order lag."""
+        self._ts = ts
+        if close_ts_ms is not None:
+            self._close_lag_ms = time.time() * 1000.0 - float(close_ts_ms)
+
+    def mark(self, stage: str) -> None:
+        if self._t0 is None:
+            return
+        now = time.perf_counter()
+        self._stages[stage] = self._stages.get(stage, 0.0) + (now - self._last) * 1000.0
+        self._last = now
+        if stage == self.order_stage:
+            self._to_order = (now - self._t0) * 1000.0
+
+    def end_bar(self) -> Optional[Dict]:
+        """Close the bar, update rolling stats and emit the latency record."""
+        if self._t0 is None:
+            return None
+        total = (time.perf_counter() - self._t0) * 1000.0
+        self._t0 = None
+        rec = {
+            "ts": self._ts,
+            "asset": self.asset,
+            "total_ms": round(total, 3),
+            "to_order_ms": round(self._to_order, 3) if self._to_order is not None else None,
+            "close_lag_ms": round(self._close_lag_ms, 1) if self._close_lag_ms is not None else None,
+            "close_to_order_ms": None,
+            "stages": {k: round(v, 3) for k, v in self._stages.items()},
+        }
+        if self._close_lag_ms is not None and self._to_order is not None:
+            rec["close_to_order_ms"] = round(self._close_lag_ms + self._to_order, 1)
+            self._push(CLOSE_TO_ORDER, rec["close_to_order_ms"])
+        for stage, ms in self._stages.items():
+            self._push(stage, ms)
+        self._push(TOTAL, total)
+        try:
+            self._write(rec)
+        except Exception as e:
+            print(f"[Latency] Failed to write latency record: {e}")
+        return rec
+
+    def _push(self, key: str, ms: float) -> None:
+        hist = self._hist.get(key)
+        if hist is None:
+            hist = self._hist[key] = deque(maxlen=self.window)
+        hist.append(float(ms))
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {'p50','p95','p99','n'}} in ms over the rolling window."""
+        out = {}
+        for key, hist in self._hist.items():
+            if not hist:
+                continue
+            p50, p95, p99 = np.percentile(np.fromiter(hist, dtype=float), [50, 95, 99])
+            out[key] = {"p50": round(float(p50), 3), "p95": round(float(p95), 3),
+                        "p99": round(float(p99), 3), "n": len(hist)}
+        return out
+
+    def _write(self, rec: Dict) -> None:
+        if self._writer is not None:
+            self._writer(rec)
+            return
+        from ops.llm_logging import write_jsonl
+        write_jsonl(STREAM, rec, asset=self.asset)
@@ -4,11 +4,13 @@ import os
 import requests
 import time
 from typing import Dict
+import functools
 import importlib
 from datetime import datetime, timezone, timedelta
 from collections import deque
 import aiohttp
 import gspread
+import numpy as np
 import pandas as pd
 from live_demo.market_data import MarketData
 from live_demo.hyperliquid_listener import HyperliquidListener
@@ -16,6 +18,9 @@ from live_demo.funding_hl import FundingHL
 from live_demo.cohort_signals import CohortState
 from live_demo.cohort_cache import CohortCache
 from live_demo.features import FeatureBuilder, LiveFeatureComputer
+from live_demo.trade_tape import IntrabarTradeAggregator
+from live_demo.shadow_lane import ShadowModelLane
+from live_demo.latency import BarSpanRecorder
 from live_demo.model_runtime import ModelRuntime
 from live_demo.decision import Thresholds, decide, gate_and_score, compute_edge_after_costs
 from live_demo.risk_and_exec import RiskConfig, RiskAndExec
@@ -33,7 +38,9 @@ from live_demo.unified_overlay_system import UnifiedOverlaySystem, OverlaySystem
 from live_demo.alerts.alert_router import get_alert_router
 from ops.llm_logging import write_jsonl
 from live_demo.ops.log_router import LogRouter
-from live_demo.ops.bma import bma_weights, rolling_ic, series_vol
+from live_demo.ops.log_writer import LogWriter
+from live_demo.ops.event_bus import EventBus, SheetsSink
+from live_demo.ops.bma import RollingIC, RollingVol, bma_weights
 from live_demo.generate_health import save_health_snapshot
 from live_demo.reason_codes import GuardReasonCode
 from live_demo.ops.manifest_writer import ManifestWriter
@@ -76,7 +83,44 @@ def load_config(path: str) -> Dict:
     return cfg
 
 
-async def run_live(config_path: str, dry_run: bool = False):
+def _health_sheet_row(ts_iso: str, ts, health: Dict) -> list:
+    """Row for the Sheets health tab."""
+    return [
+        ts_iso, ts,
+        health.get('recent_bars'),
+        health.get('mean_p_down'),
+        health.get('mean_p_up'),
+        health.get('mean_s_model'),
+        health.get('exec_count_recent'),
+        int(health.get('funding_stale')) if isinstance(health.get('funding_stale'), bool) else health.get('funding_stale'),
+        health.get('equity'),
+        health.get('ws_queue_drops'),
+        health.get('ws_reconnects'),
+        health.get('ws_staleness_ms'),
+        health.get('Sharpe_roll_1d'),
+        health.get('Sharpe_roll_1w'),
+        health.get('Sortino_1w'),
+        health.get('max_dd_to_date'),
+        health.get('time_in_mkt'),
+        health.get('hit_rate_w'),
+        health.get('turnover_bps_day'),
+        health.get('capacity_participation'),
+        health.get('ic_drift'),
+        health.get('calibration_drift'),
+        int(health.get('leakage_flag')) if isinstance(health.get('leakage_flag'), bool) else health.get('leakage_flag'),
+        int(health.get('same_bar_roundtrip_flag')) if isinstance(health.get('same_bar_roundtrip_flag'), bool) else health.get('same_bar_roundtrip_flag'),
+        health.get('in_band_share')
+    ]
+
+
+async def run_live(config_path: str, dry_run: bool = False, replay=None):
+    """Run the bot loop.
+
+    replay: optional live_demo.replay.ReplaySession. Klines, public trades,
+    user fills and funding then come from its recording, every loop sleep
+    advances its virtual clock, and the bandit starts from a seeded fresh
+    prior, so the whole async path replays deterministically and fast.
+    """
     cfg = load_config(config_path)
     sym = cfg['data']['symbol']
     interval = cfg['data']['interval']
@@ -88,11 +132,23 @@ async def run_live(config_path: str, dry_run: bool = False):
     offline = cfg.get('execution', {}).get('offline', False)
     if os.environ.get('LIVE_DEMO_OFFLINE'):
         offline = os.environ.get('LIVE_DEMO_OFFLINE') == '1'
+    # Replays take the online code path against recorded transports
+    _sleep = asyncio.sleep
+    if replay is not None:
+        offline = False
+        _sleep = replay.clock.sleep
+        if replay.seed is not None:
+            np.random.seed(replay.seed)
     force_validation = bool(cfg.get('execution', {}).get('force_validation_trade', False))
+    # Per-timeframe output root; a replay with output_root gets its own, set
+    # before anything resolves PAPER_TRADING_ROOT so nothing lands in the live folders
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+    tf_root = os.path.join(repo_root, 'paper_trading_outputs', '5m')
+    replay_root = os.path.abspath(replay.output_root) if replay is not None and replay.output_root else None
+    if replay_root:
+        tf_root = replay_root
     try:
-        if not os.environ.get('PAPER_TRADING_ROOT'):
-            repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
-            tf_root = os.path.join(repo_root, 'paper_trading_outputs', '5m')
+        if replay_root or not os.environ.get('PAPER_TRADING_ROOT'):
             os.makedirs(tf_root, exist_ok=True)
             try:
                 os.makedirs(os.path.join(tf_root, 'logs'), exist_ok=True)
@@ -102,6 +158,8 @@ async def run_live(config_path: str, dry_run: bool = False):
             os.environ['PAPER_TRADING_ROOT'] = tf_root
     except Exception:
         pass
+    # get_emitter() only honors PAPER_TRADING_ROOT inside the repo, so replays pass their root
+    default_emitter_dir = os.path.join(tf_root, 'logs', 'default') if replay_root else None
     # Project root and path helper
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
@@ -115,8 +173,11 @@ async def run_live(config_path: str, dry_run: bool = False):
     # Exchange client: support Binance (testnet/mainnet) or Hyperliquid
     # Select exchange environment for data. We always respect dry_run for execution.
     ex_active = cfg["exchanges"].get("active", "testnet")
-    
-    if ex_active == "hyperliquid":
+
+    if replay is not None:
+        client = replay.client
+        pb_client = None
+    elif ex_active == "hyperliquid":
         # Use Hyperliquid for market data
         hl_base = cfg["exchanges"]["hyperliquid"]["base_url"]
         
@@ -399,7 +460,8 @@ async def run_live(config_path: str, dry_run: bool = False):
     
     # Initialize cohort cache for persistence across restarts
     cohort_cache = CohortCache(cache_path=os.path.join(tf_root, 'cohort_state.json'))
-    cached_cohort = cohort_cache.load(max_age_hours=24)
+    # Replays start cold: the cache age check runs on the wall clock
+    cached_cohort = None if replay is not None else cohort_cache.load(max_age_hours=24)
     if cached_cohort:
         # Warm start with last known values (will decay naturally as new data arrives)
         cohort.pros = cached_cohort["pros"]
@@ -467,8 +529,19 @@ async def run_live(config_path: str, dry_run: bool = False):
     manifest_rel = cfg["artifacts"]["latest_manifest"]
     manifest = abspath(manifest_rel)
     mr = ModelRuntime(manifest)
+    reload_cfg = (cfg.get('artifacts', {}) or {}).get('hot_reload', {}) or {}
+    if bool(reload_cfg.get('enabled', False)) and replay is None:
+        mr.enable_hot_reload(
+            check_interval_s=float(reload_cfg.get('check_interval_s', 30.0)),
+            probation_calls=int(reload_cfg.get('probation_bars', 3)),
+        )
     fb = FeatureBuilder(mr.feature_schema_path)
-    lf = LiveFeatureComputer(fb.columns, timeframe="5m")
+    tape_cfg = (cfg.get('features', {}) or {}).get('tape', {}) or {}
+    lf = LiveFeatureComputer(
+        fb.columns,
+        timeframe="5m",
+        use_tape_proxies=bool(tape_cfg.get('use_as_proxies', False)),
+    )
 
 
     # ── EMA / rv_1h pre-warmup ──────────────────────────────────────────────
@@ -510,7 +583,7 @@ async def run_live(config_path: str, dry_run: bool = False):
     # Logger
     # Prefer environment variable for Sheet ID, fallback to config.json
     sheet_id = os.environ.get("GOOGLE_SHEETS_5MIN_ID") or cfg["sheets"]["sheet_id"]
-    creds_path = abspath(cfg["sheets"].get("creds_json"))
+    creds_path = abspath(cfg["sheets"].get("creds_json")) if replay is None else None
     # Sheet tab headers (optional but helpful)
     tabs = cfg["sheets"]["tabs"]
     headers = {
@@ -553,9 +626,7 @@ async def run_live(config_path: str, dry_run: bool = False):
     # Optional alerts tab header
     if tabs.get('alerts'):
         headers[tabs['alerts']] = ['ts_iso','ts','type','staleness_ms','reconnects','queue_drops','payload_json']
-    # Determine per-timeframe root
-    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
-    tf_root = os.path.join(repo_root, 'paper_trading_outputs', '5m')
+    # Per-timeframe root (tf_root, resolved above)
     os.makedirs(tf_root, exist_ok=True)
     try:
         os.makedirs(os.path.join(tf_root, 'logs'), exist_ok=True)
@@ -565,13 +636,28 @@ async def run_live(config_path: str, dry_run: bool = False):
     logger = SheetsLogger(creds_path, sheet_id, headers=headers, root_dir=tf_root)
     # Ensure tabs and headers exist before any rows are buffered/appended (best-effort inside method)
     logger.ensure_headers()
-    # Log router (per-topic sink fan-out)
-    log_router = LogRouter(cfg.get('logging', {}), bot_version='5m', base_root=os.path.join(tf_root, 'logs'))
+    # Log router (per-topic sink fan-out); ensemble/health/calibration events are
+    # encoded once on the event bus and written to each sink from the same bytes
+    bus = EventBus() if bool((cfg.get('logging', {}) or {}).get('event_bus', True)) else None
+    log_router = LogRouter(cfg.get('logging', {}), bot_version='5m', base_root=os.path.join(tf_root, 'logs'), bus=bus)
     # Initialize unified emitter once for this run (used in multiple places)
     try:
         emitter = get_emitter('5m', base_dir=os.path.join(tf_root, 'logs'))
     except Exception:
         emitter = None
+    # Sink calls in the bar loop are queued to one writer thread so disk/print
+    # stalls never delay a decision; see live_demo/ops/log_writer.py
+    writer_cfg = (cfg.get('logging', {}) or {}).get('writer')
+    log_writer = LogWriter.from_config(writer_cfg)
+    log_router = log_writer.proxy(log_router, 'router')
+    if emitter is not None:
+        emitter = log_writer.proxy(emitter, 'emitter')
+    # Sheets flushes are network calls; they get their own writer thread so a
+    # slow API never delays the disk writes queued behind them. Every
+    # SheetsLogger call (including the bus health sink) goes through this proxy.
+    sheets_writer = LogWriter.from_config(writer_cfg, name='sheets-writer')
+    logger = sheets_writer.proxy(logger, 'sheets')
+    write_llm = log_writer.wrap(write_jsonl, 'llm')
 
     # Initialize ManifestWriter
     run_id = f"run_{int(time.time())}"
@@ -580,6 +666,8 @@ async def run_live(config_path: str, dry_run: bool = False):
 
     # Output root helper: prefer PAPER_TRADING_ROOT when it is a subfolder of the repo paper_trading_outputs
     def paper_root() -> str:
+        if replay_root:
+            return tf_root
         repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
         repo_paper = os.path.abspath(os.path.join(repo_root, 'paper_trading_outputs'))
         env = os.environ.get('PAPER_TRADING_ROOT')
@@ -606,6 +694,25 @@ async def run_live(config_path: str, dry_run: bool = False):
     # Thresholds and risk
     th_cfg = cfg["thresholds"]
     th = Thresholds(**th_cfg)
+    # Shadow lane: candidate manifests scored off the decision path (worker thread)
+    shadow_cfg = cfg.get('shadow_models', {}) or {}
+    shadow_lane = None
+    if bool(shadow_cfg.get('enabled', False)) and shadow_cfg.get('candidates'):
+        cands = shadow_cfg['candidates']
+        cands = {k: abspath(v) for k, v in cands.items()} if isinstance(cands, dict) else [abspath(v) for v in cands]
+        shadow_lane = ShadowModelLane(
+            cands,
+            th,
+            asset=sym,
+            cost_bps=float(shadow_cfg.get('cost_bps', 0.0)),
+            max_queue=int(shadow_cfg.get('max_queue', 8)),
+        )
+    # Per-stage bar latency: 'latency' JSONL stream + rolling percentiles in health
+    spans = BarSpanRecorder(
+        window=int((cfg.get('health', {}) or {}).get('latency_window_bars', 288)),
+        asset=sym,
+        writer=log_writer.wrap(functools.partial(write_jsonl, 'latency', asset=sym), 'llm.latency'),
+    )
     # Derive bar duration in minutes from interval string
     _interval_to_minutes = {
         "1m": 1.0,
@@ -620,6 +727,12 @@ async def run_live(config_path: str, dry_run: bool = False):
         "1d": 1440.0,
     }
     bar_minutes = _interval_to_minutes.get(interval, 5.0)
+    # Public trades are folded in as they arrive; rolled once per bar close.
+    # Prints stamped after the bar's close are carried into the next bar.
+    tape_bar_ms = int(bar_minutes * 60_000)
+    tape = IntrabarTradeAggregator(
+        coin="BTC", large_print_size=float(tape_cfg.get('large_print_size', 1.0)), bar_ms=tape_bar_ms
+    )
     # Inject bar_minutes into risk config for correct annualization/cooldown per TF
     risk_cfg_dict = dict(cfg["risk"])
     risk_cfg_dict["bar_minutes"] = bar_minutes
@@ -665,11 +778,10 @@ async def run_live(config_path: str, dry_run: bool = False):
     session_peak_equity = starting_equity
 
     # BMA state: keep last-bar predictions (for alignment) and rolling histories
-    bma_preds_hist = {
-        'base': deque(maxlen=3000),
-        'prob': deque(maxlen=3000),
-    }
-    bma_realized_hist = deque(maxlen=3000)
+    # Streaming IC/vol per arm over the configured window (O(1) per bar)
+    bma_win = int(((cfg.get('ensemble', {}) or {}).get('bma', {}) or {}).get('ic_window_bars', 200))
+    bma_ic = {'base': RollingIC(bma_win), 'prob': RollingIC(bma_win)}
+    bma_vol = {'base': RollingVol(bma_win), 'prob': RollingVol(bma_win)}
     prev_base_pred_bps = None
     prev_prob_pred_bps = None
     last_realized_bps_buffer = None  # realized for the last completed bar, set later in the loop
@@ -692,6 +804,13 @@ async def run_live(config_path: str, dry_run: bool = False):
         # Return ISO-8601 with explicit IST offset (+05:30)
         return dt.isoformat()
 
+    health_tab_cfg = ((cfg.get('sheets', {}) or {}).get('tabs') or {}).get('health')
+    if bus is not None and health_tab_cfg:
+        bus.subscribe('health', SheetsSink(
+            logger, health_tab_cfg,
+            lambda ev: _health_sheet_row(to_iso(ev.ts), ev.ts, ev.record['metrics']),
+        ))
+
     def hour_bucket(ts_val) -> int:
         try:
             t = float(ts_val)
@@ -727,16 +846,31 @@ async def run_live(config_path: str, dry_run: bool = False):
     bandit_cfg = cfg.get("execution", {}).get("bandit", {})
     bandit = None
     bandit_io = None
-    if bandit_cfg and bool(bandit_cfg.get('enabled', False)):
+    if bandit_cfg and bool(bandit_cfg.get('enabled', False)) and replay is not None:
+        # Fresh prior, nothing persisted: the seeded run is reproducible from the recording alone
+        from live_demo.bandit import SimpleThompsonBandit
+
+        bandit = SimpleThompsonBandit(n_arms=4)
+    elif bandit_cfg and bool(bandit_cfg.get('enabled', False)):
         # Resolve bandit state inside unified paper root
         state_rel = bandit_cfg.get('state_path', os.path.join('paper_trading_outputs', 'runtime_bandit.json'))
         bandit_state_path = state_rel if os.path.isabs(state_rel) else os.path.join(paper_root(), os.path.basename(state_rel))
         try:
             from live_demo.bandit import BanditStateIO
 
-            bandit_io = BanditStateIO(path=bandit_state_path)
+            # Atomic snapshots, coalesced to at most one write per persist_every_s
+            # (and/or every persist_every_n saves); flushed on shutdown
+            bandit_io = BanditStateIO(
+                path=bandit_state_path,
+                flush_every_s=float(bandit_cfg.get('persist_every_s', 300.0)),
+                flush_every_n=int(bandit_cfg.get('persist_every_n', 0)),
+            )
             # 4 arms: pros, amateurs, model_meta, model_bma (mood removed)
             bandit = bandit_io.load(n_arms=4)
+            if not os.path.exists(bandit_state_path):
+                # Write the fresh prior now so runtime_bandit.json exists before the first (deferred) save
+                bandit_io.save(bandit)
+                bandit_io.flush()
         except (ImportError, OSError, ValueError, TypeError) as e:
             raise RuntimeError(f"Failed to initialize bandit: {e}") from e
 
@@ -848,6 +982,16 @@ async def run_live(config_path: str, dry_run: bool = False):
     else:
         local_HL = HyperliquidListener
 
+    if replay is not None:
+        local_HL = replay.listener
+        try:
+            funding_client.fetch_latest = replay.fetch_funding  # type: ignore[assignment]
+        except Exception:
+            pass
+
+        async def _fallback_public_mood_binance(ts_end_ms: int, interval_ms: int) -> float:  # type: ignore[func-redecl]
+            return 0.0
+
     # Switch to public trades to drive 'mood' from market-wide flow (or stub in offline)
     async with local_HL(
         hl_ws, addresses=addresses, coin="BTC", mode="public_trades"
@@ -873,6 +1017,7 @@ async def run_live(config_path: str, dry_run: bool = False):
                         last_ws_msg_ts_ms = int(_now() * 1000)
                     except Exception:
                         pass
+                    tape.add_trade(fmsg)
                     fill_queue.append(fmsg)
             except (aiohttp.ClientError, asyncio.CancelledError):
                 # Ignore; main loop will continue and funding still works. Reconnect on outer restart.
@@ -892,6 +1037,8 @@ async def run_live(config_path: str, dry_run: bool = False):
             """
             if offline:
                 return []
+            if replay is not None:
+                return replay.poll_user_fills(ts_end_ms)
             # Poll userFillsByTime for cohort addresses and return processed fill dicts for BTC
             url = hl_base  # e.g., https://api.hyperliquid.xyz/info
             
@@ -1013,7 +1160,7 @@ async def run_live(config_path: str, dry_run: bool = False):
         # WebSocket health monitoring task
         async def _ws_health_check():
             """Periodic check that WebSocket is receiving data"""
-            await asyncio.sleep(120)  # Wait 2 minutes for warmup
+            await _sleep(120)  # Wait 2 minutes for warmup
             if len(fill_queue) == 0 and not offline:
                 print("⚠️  WARNING: WebSocket received ZERO trades in first 2 minutes")
                 print(f"   Check Hyperliquid WS subscription for {sym}")
@@ -1030,12 +1177,13 @@ async def run_live(config_path: str, dry_run: bool = False):
         error_count = 0 # Initialize this before the while loop starts
         while True:
             row = None
+            spans.begin()
             
             if not offline:
                 try:
                     row = md.poll_last_closed_kline()
                     if row is None:
-                        await asyncio.sleep(2)
+                        await _sleep(2)
                         continue
                     # If we reach here, poll was successful
                     error_count = 0 
@@ -1051,7 +1199,7 @@ async def run_live(config_path: str, dry_run: bool = False):
                         except:
                             pass
                             
-                    await asyncio.sleep(5)
+                    await _sleep(5)
                     continue
             else:
                 # 2. OFFLINE MODE: Forced to use local CSV
@@ -1079,10 +1227,18 @@ async def run_live(config_path: str, dry_run: bool = False):
             
             # Standard safety check (don't skip since we are replaying)
             if last_ts is not None and ts <= last_ts:
+                if replay is not None:
+                    # Same closed bar again: done once the recording has no newer candle
+                    if replay.exhausted:
+                        save_health_snapshot(log_dir=os.path.join(tf_root, 'logs'))
+                        break
+                    await _sleep(1)
                 continue
                 
             last_close = c
             last_ts = ts
+            spans.set_bar(ts, close_ts_ms=None if offline else ts + bar_minutes * 60000.0)
+            spans.mark('candle_poll')
         # while True:
         #     # 1) Poll last closed kline (resilient to transient API errors)
         #     try:
@@ -1116,23 +1272,22 @@ async def run_live(config_path: str, dry_run: bool = False):
             # Update BMA histories with previous bar's aligned data (prev preds vs last realized)
             try:
                 if last_realized_bps_buffer is not None and prev_base_pred_bps is not None and prev_prob_pred_bps is not None:
-                    bma_preds_hist['base'].append(float(prev_base_pred_bps))
-                    bma_preds_hist['prob'].append(float(prev_prob_pred_bps))
-                    bma_realized_hist.append(float(last_realized_bps_buffer))
+                    for arm, pred in (('base', prev_base_pred_bps), ('prob', prev_prob_pred_bps)):
+                        bma_ic[arm].add(float(pred), float(last_realized_bps_buffer))
+                        bma_vol[arm].add(float(pred))
                     # Recompute weights from history (using config window/kappa) unless frozen
                     ens_cfg = cfg.get('ensemble', {}) or {}
                     bma_cfg = ens_cfg.get('bma', {}) or {}
                     if not bool(bma_cfg.get('freeze', False)):
-                        win = int(bma_cfg.get('ic_window_bars', 200))
                         kappa = float(bma_cfg.get('kappa', 8.0))
-                        ic_base = rolling_ic(bma_preds_hist['base'], bma_realized_hist, window=win)
-                        ic_prob = rolling_ic(bma_preds_hist['prob'], bma_realized_hist, window=win)
-                        vol_base = series_vol(bma_preds_hist['base'], window=win)
-                        vol_prob = series_vol(bma_preds_hist['prob'], window=win)
+                        ic_base, ic_prob = bma_ic['base'].value(), bma_ic['prob'].value()
+                        vol_base, vol_prob = bma_vol['base'].value(), bma_vol['prob'].value()
                         bma_weights_state = bma_weights([ic_base, ic_prob], [vol_base, vol_prob], kappa=kappa)
             except Exception:
                 pass
 
+            spans.mark('bma_update')
+
             # 2) Ingest HL fills seen since last bar (drain queued)
             drained_fills = []
             # Drain up to a reasonable cap to avoid blocking too long
@@ -1202,6 +1357,8 @@ async def run_live(config_path: str, dry_run: bool = False):
                         synthetic, weights={"pros": 0.0, "amateurs": 0.0, "mood": 1.0}
                     )
 
+            spans.mark('fill_drain')
+
             # Poll user fills by time to update pros/amateurs even when WS user fills aren't available
             interval_map = {
                 "1m": 60_000,
@@ -1263,11 +1420,15 @@ async def run_live(config_path: str, dry_run: bool = False):
                 except Exception:
                     pass
 
+            spans.mark('rest_fill_poll')
+
             # 3) Funding
             fnd = await funding_client.fetch_latest()
             funding_rate = float(fnd["funding"]) if fnd else 0.0
             funding_stale = bool(fnd.get("stale")) if isinstance(fnd, dict) else False
 
+            spans.mark('funding')
+
             # 4) Build features
             bar_row = {
                 "open": o,
@@ -1276,18 +1437,24 @@ async def run_live(config_path: str, dry_run: bool = False):
                 "close": c,
                 "volume": v,
             }
-            x = lf.update_and_build(bar_row, cohort.snapshot(), funding_rate)
+            x = lf.update_and_build(bar_row, cohort.snapshot(), funding_rate, tape=tape.roll(close=c, close_ts=ts + tape_bar_ms - 1))
 
             # is_warmed() gate: skip model inference until EMA/rv deques are stable
             if not lf.is_warmed():
                 print(f"[WARMUP] Bar {bar_count}: skipping model inference "
                       f"({lf._bar_count}/{lf._min_warm_bars} warmup bars fed)")
                 bar_count += 1
-                await asyncio.sleep(1)
+                await _sleep(1)
                 continue
 
-            # 5) Model inference
+            spans.mark('features')
+
+            # 5) Model inference (a validated hot-reloaded model is swapped in here, between bars)
+            reload_event = mr.poll_reload()
+            if reload_event:
+                print(f"🔁 Model reload {reload_event.get('status')}: {reload_event}")
             model_out = mr.infer(x)
+            spans.mark('inference')
             # Compute BMA blend across ['base','prob'] arms using current weights and honor ensemble.source
             try:
                 ens_cfg = cfg.get('ensemble', {}) or {}
@@ -1330,6 +1497,8 @@ async def run_live(config_path: str, dry_run: bool = False):
                 log_router.emit_ensemble(ts=ts, asset=sym, raw_preds=model_out, meta={'manifest': manifest_rel})
                 # Best effort: still expose meta as both signals to avoid missing keys downstream
                 decision_model_out = {**model_out, 's_model_meta': float(model_out.get('s_model', 0.0) if isinstance(model_out, dict) else 0.0), 's_model_bma': float(model_out.get('s_model', 0.0) if isinstance(model_out, dict) else 0.0)}
+            spans.mark('bma')
+
             # Log features (dedicated feature logging)
             try:
                 # Enrich market_data for feature logging (mid, spread, rv_1h, funding)
@@ -1369,7 +1538,7 @@ async def run_live(config_path: str, dry_run: bool = False):
                 )
                 if feature_log:
                     try:
-                        emitter = get_emitter()
+                        emitter = log_writer.proxy(get_emitter(base_dir=default_emitter_dir), 'emitter')
                         emitter.emit_feature_log(feature_log)
                     except Exception:
                         pass
@@ -1391,6 +1560,7 @@ async def run_live(config_path: str, dry_run: bool = False):
                 pass
 
             # Log calibration (enhanced with realized returns)
+            calibration_pending = {}
             try:
                 # Calculate realized return for calibration
                 realized_return = 0.0
@@ -1413,11 +1583,13 @@ async def run_live(config_path: str, dry_run: bool = False):
                     prediction=model_out.get("s_model", 0.0),
                     realized_return=realized_return,
                 )
-                if calibration_log:
-                    emitter.emit_calibration(calibration_log)
+                # Published once with the band gate fields below (6.3)
+                calibration_pending = calibration_log or {}
             except Exception:
                 pass
 
+            spans.mark('feature_calibration_logs')
+
             # 6) Decision (bandit)
             # Read epsilon and model_optimism from config (defaults 0.0)
             try:
@@ -1452,6 +1624,8 @@ async def run_live(config_path: str, dry_run: bool = False):
                     }
             except Exception:
                 pass
+            spans.mark('decision')
+
             # If overlay is enabled and system initialized, let it form/override the decision
             if overlay_sys and overlay_sys.is_initialized:
                 try:
@@ -1599,6 +1773,8 @@ async def run_live(config_path: str, dry_run: bool = False):
                         pass
                 except Exception:
                     pass
+            spans.mark('overlay')
+
             # Optional compact ensemble handled by router above per config
             # Log order intent (pre-trade decision)
             try:
@@ -1639,7 +1815,7 @@ async def run_live(config_path: str, dry_run: bool = False):
                         '', '', ''  # counts/means/variances after update
                     ],
                 )
-                # Persist bandit state immediately so runtime_bandit.json appears even before first reward
+                # Record the selection; written once the persist_every_s/_n debounce is due (or at shutdown)
                 try:
                     if bandit_io is not None:
                         bandit_io.save(bandit)
@@ -1681,14 +1857,14 @@ async def run_live(config_path: str, dry_run: bool = False):
                     pass
                 try:
                     in_band_flag = bool(abs(pred_cal_bps) <= band_bps)
-                    write_jsonl('calibration_log', {
-                        'asset': sym,
+                    log_router.emit_calibration(ts=ts, asset=sym, calibration={
+                        **calibration_pending,
                         'a': float(a),
                         'b': float(b),
                         'pred_cal_bps': float(pred_cal_bps),
                         'in_band_flag': bool(in_band_flag),
                         'band_bps': float(band_bps),
-                    }, asset=sym)
+                    })
                 except Exception:
                     pass
 
@@ -1706,6 +1882,8 @@ async def run_live(config_path: str, dry_run: bool = False):
             except Exception:
                 pass
 
+            spans.mark('intent_bandit_guards')
+
             # 7) Risk + execution
             # Warm-up skip: avoid trading for the first N bars
             is_current_trade_forced = False
@@ -1776,7 +1954,7 @@ async def run_live(config_path: str, dry_run: bool = False):
 
             # Emit sizing/risk JSONL (post sizing/before logging exec)
             try:
-                write_jsonl("sizing_risk_log", {
+                write_llm("sizing_risk_log", {
                     "asset": sym,
                     "forecast_vol_20": None,
                     "target_vol_ann": float(getattr(risk.cfg, 'sigma_target', 0.0) or 0.0),
@@ -1887,6 +2065,8 @@ async def run_live(config_path: str, dry_run: bool = False):
                         )
                 except (ValueError, TypeError, KeyError):
                     pass
+            spans.mark('execution')
+
             # Compute realized bps for the just-completed bar (for BMA alignment next bar)
             try:
                 if last_close_value is not None:
@@ -2101,6 +2281,8 @@ async def run_live(config_path: str, dry_run: bool = False):
                     except Exception:
                         pass
 
+            spans.mark('equity_trackers')
+
             # 8) Sheets logging (signals)
             # Extract BMA details from decision (populated above) if present
             try:
@@ -2125,9 +2307,11 @@ async def run_live(config_path: str, dry_run: bool = False):
                     risk.get_position(), json.dumps(exec_resp) if exec_resp else ''
                 ]
             )
+            spans.mark('sheets_buffer')
+
             # Emit signals JSONL for observability (best-effort)
             try:
-                emitter = get_emitter()
+                emitter = log_writer.proxy(get_emitter(base_dir=default_emitter_dir), 'emitter')
                 print(f"🔍 Emitting signal for {sym} at {ts}")
                 emitter.emit_signals(ts=ts, symbol=sym, features=x, model_out=model_out, decision=decision, cohort={'pros': cohort.pros, 'amateurs': cohort.amateurs, 'mood': cohort.mood})
                 print(f"✅ Signal emitted successfully")
@@ -2135,6 +2319,10 @@ async def run_live(config_path: str, dry_run: bool = False):
                 print(f"⚠️  Signal emission error: {e}")
                 import traceback
                 traceback.print_exc()
+            if shadow_lane is not None:
+                shadow_lane.submit(ts, x, cohort.snapshot(), model_out, decision, c)
+
+            spans.mark('signal_emit')
 
             # Periodic health emission
             try:
@@ -2172,6 +2360,10 @@ async def run_live(config_path: str, dry_run: bool = False):
                         'ws_queue_drops': int(ws_queue_drops),
                         'ws_reconnects': int(ws_reconnects),
                         'ws_staleness_ms': ws_stale_ms,
+                        'latency_ms': spans.percentiles(),
+                        'log_writer': log_writer.stats(),
+                        'sheets_writer': sheets_writer.stats(),
+                        'event_bus': bus.stats() if bus is not None else None,
                     }
                     # reset short counters
                     _health_exec_count = 0
@@ -2231,43 +2423,15 @@ async def run_live(config_path: str, dry_run: bool = False):
                         except Exception:
                             # Fallback to direct emitter to avoid losing health logs if router misconfigured
                             try:
-                                emitter = get_emitter()
+                                emitter = log_writer.proxy(get_emitter(base_dir=default_emitter_dir), 'emitter')
                                 emitter.emit_health(ts=ts, symbol=sym, health=health)
                             except Exception:
                                 pass
-                        # Also buffer health metrics to Sheets if configured
+                        # Also buffer health metrics to Sheets if configured (a bus subscriber otherwise)
                         try:
                             health_tab = cfg['sheets']['tabs'].get('health')
-                            if health_tab:
-                                logger.buffer(
-                                    tab=health_tab,
-                                    row=[
-                                        to_iso(ts), ts,
-                                        health.get('recent_bars'),
-                                        health.get('mean_p_down'),
-                                        health.get('mean_p_up'),
-                                        health.get('mean_s_model'),
-                                        health.get('exec_count_recent'),
-                                        int(health.get('funding_stale')) if isinstance(health.get('funding_stale'), bool) else health.get('funding_stale'),
-                                        health.get('equity'),
-                                        health.get('ws_queue_drops'),
-                                        health.get('ws_reconnects'),
-                                        health.get('ws_staleness_ms'),
-                                        health.get('Sharpe_roll_1d'),
-                                        health.get('Sharpe_roll_1w'),
-                                        health.get('Sortino_1w'),
-                                        health.get('max_dd_to_date'),
-                                        health.get('time_in_mkt'),
-                                        health.get('hit_rate_w'),
-                                        health.get('turnover_bps_day'),
-                                        health.get('capacity_participation'),
-                                        health.get('ic_drift'),
-                                        health.get('calibration_drift'),
-                                        int(health.get('leakage_flag')) if isinstance(health.get('leakage_flag'), bool) else health.get('leakage_flag'),
-                                        int(health.get('same_bar_roundtrip_flag')) if isinstance(health.get('same_bar_roundtrip_flag'), bool) else health.get('same_bar_roundtrip_flag'),
-                                        health.get('in_band_share')
-                                    ]
-                                )
+                            if health_tab and bus is None:
+                                logger.buffer(tab=health_tab, row=_health_sheet_row(to_iso(ts), ts, health))
                         except Exception:
                             pass
                     except Exception:
@@ -2275,7 +2439,7 @@ async def run_live(config_path: str, dry_run: bool = False):
                     
                     # Periodic Health Snapshot (using the same interval as health metrics)
                     try:
-                        save_health_snapshot(log_dir=os.path.join(tf_root, 'logs'))
+                        save_health_snapshot(log_dir=os.path.join(tf_root, 'logs'), latency=spans.percentiles())
                     except Exception:
                         pass
 
@@ -2345,7 +2509,7 @@ async def run_live(config_path: str, dry_run: bool = False):
                             range_bps = 10000.0 * ((float(h) - float(l)) / float(c)) if c else None
                         except Exception:
                             range_bps = None
-                        write_jsonl('market_ingest_log', {
+                        write_llm('market_ingest_log', {
                             'asset': sym,
                             'mid': mid_px,
                             'spread_bps': None if spread_bps is None else float(spread_bps),
@@ -2405,7 +2569,7 @@ async def run_live(config_path: str, dry_run: bool = False):
                             'turnover_pass': gate_turnover,
                             'cost_pass': gate_cost,
                         }
-                        write_jsonl('kpi_scorecard', {
+                        write_llm('kpi_scorecard', {
                             'asset': sym,
                             'event': 'kpi_scorecard',
                             'Sharpe_1w': sh_1w,
@@ -2462,6 +2626,8 @@ async def run_live(config_path: str, dry_run: bool = False):
                         pass
             except Exception:
                 pass
+            spans.mark('health')
+
             # Local mood debug to file (best-effort, non-blocking)
             try:
                 out_dir = paper_root()
@@ -2474,20 +2640,35 @@ async def run_live(config_path: str, dry_run: bool = False):
                     fh.write(f"{to_iso(ts)},{ts},{public_count},{cohort.mood}\n")
             except OSError:
                 pass
-            # Flush Sheets buffers; do not crash if Sheets is unavailable
-            try:
-                logger.flush()
-            except gspread.exceptions.APIError:
-                # Keep running; rows remain buffered for a later retry
-                pass
+            # Flush Sheets buffers on the writer thread; a failing flush is counted there per stream
+            logger.flush()
+            # Write deferred bandit state once its debounce window has passed
+            if bandit_io is not None:
+                bandit_io.flush_if_due()
+
+            spans.mark('mood_and_flush')
+            spans.end_bar()
 
             # Simple pacing per bar
             if one_shot:
                 break
-            await asyncio.sleep(1)
+            await _sleep(1)
             mw.update()
             bar_count += 1
 
+        if shadow_lane is not None:
+            shadow_lane.close()
+
+        if bandit_io is not None:
+            bandit_io.flush()
+
+        # Drain queued log writes before the manifest/health wrap-up; the
+        # main writer can still hand health rows to the Sheets writer
+        log_writer.close()
+        sheets_writer.close()
+        if bus is not None:
+            bus.close()
+
         # Clean up consumer task on exit (e.g., one-shot mode)
         try:
             if _consumer_task:
@@ -2507,7 +2688,7 @@ async def run_live(config_path: str, dry_run: bool = False):
 
     # Final health snapshot on exit
     try:
-        save_health_snapshot(log_dir=os.path.join(tf_root, 'logs'))
+        save_health_snapshot(log_dir=os.path.join(tf_root, 'logs'), latency=spans.percentiles())
     except Exception:
         pass
 
@@ -1,66 +1,77 @@
 import json
 import os
-import sys
-from typing import Dict, List
-import joblib
+import threading
+import time
+import warnings
+from typing import Dict, List, Optional
 import numpy as np
 import pandas as pd
 
-# Ensure custom classes are importable for joblib unpickling
+# Custom classes for the calibrator probe; pickle aliases (__main__, 1h
+# ensemble_wrapper) are registered once per process by the artifact registry
 try:
-    # Absolute import works when running package-less; package import when installed
-    try:
-        from live_demo.custom_models import EnhancedMetaClassifier, CustomClassificationCalibrator  # type: ignore
-    except ImportError:  # pragma: no cover
-        from .custom_models import EnhancedMetaClassifier, CustomClassificationCalibrator  # type: ignore
-    # Register in globals to help joblib locate symbols even if pickled under __main__
-    globals().setdefault("EnhancedMetaClassifier", EnhancedMetaClassifier)
-    globals().setdefault(
-        "CustomClassificationCalibrator", CustomClassificationCalibrator
-    )
-    # Also register in __main__ module to match notebook pickled module path
-    try:
-        main_mod = sys.modules.get("__main__")
-        if main_mod is not None:
-            setattr(main_mod, "EnhancedMetaClassifier", EnhancedMetaClassifier)
-            setattr(
-                main_mod,
-                "CustomClassificationCalibrator",
-                CustomClassificationCalibrator,
-            )
-    except (AttributeError, RuntimeError, TypeError):
-        pass
+    from live_demo.custom_models import EnhancedMetaClassifier, CustomClassificationCalibrator  # type: ignore
 except ImportError:
     # Proceed; joblib may still load if artifacts use only sklearn types
     EnhancedMetaClassifier = None  # type: ignore
     CustomClassificationCalibrator = None  # type: ignore
 
-# Import EnsembleWrapper for 1h model compatibility
-try:
-    try:
-        from live_demo_1h.ensemble_wrapper import EnsembleWrapper  # type: ignore
-    except ImportError:
-        import sys
-        import os
-        # Try adding live_demo_1h to path
-        live_demo_1h_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'live_demo_1h')
-        if os.path.exists(live_demo_1h_path):
-            sys.path.insert(0, live_demo_1h_path)
-            from ensemble_wrapper import EnsembleWrapper  # type: ignore
-    globals().setdefault("EnsembleWrapper", EnsembleWrapper)
-    # Register in __main__ for pickle compatibility
-    try:
-        main_mod = sys.modules.get("__main__")
-        if main_mod is not None:
-            setattr(main_mod, "EnsembleWrapper", EnsembleWrapper)
-    except (AttributeError, RuntimeError, TypeError):
-        pass
-except ImportError:
-    EnsembleWrapper = None  # type: ignore
+from live_demo.models.artifact_registry import file_digest, load_artifact, release_artifact
+from live_demo.models.flat_model import FlatModel, flat_export_path
+
+# Canned smoke batch for validating a hot-reloaded model or a flat export:
+# zeros plus small deterministic perturbations around typical feature scales
+_SMOKE_ROWS = 16
+
+
+def _smoke_batch(n_features: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return np.vstack([np.zeros((1, n_features)), rng.normal(0.0, 0.5, size=(_SMOKE_ROWS - 1, n_features))])
+
+
+def _ignore_feature_name_warning() -> None:
+    """Process-wide filter for sklearn's "X does not have valid feature names" warning.
+
+    Prepared calls pass an ndarray already in feature_names_in_ order (checked
+    in _prepare), so the warning is noise. A per-call catch_warnings() would swap
+    process-wide state and race with the shadow lane's inference thread; this is
+    installed at import and again by _prepare, since a catch_warnings() block
+    around the import (e.g. test collection) discards it on exit.
+    """
+    warnings.filterwarnings("ignore", message="X does not have valid feature names",
+                            category=UserWarning, module="sklearn")
+
+
+_ignore_feature_name_warning()
+
+
+class _CalibratorFailed(Exception):
+    """A prepared calibrator call raised; callers fall back to the DataFrame path."""
+
+
+def _release_artifacts(state: Dict) -> None:
+    """Return the model/calibrator of a replaced runtime state to the artifact registry."""
+    release_artifact(state.get('model'))
+    release_artifact(state.get('calibrator'))
 
 
 class ModelRuntime:
     def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        # Hot reload bookkeeping (see enable_hot_reload); never swapped with model state
+        self._reload_enabled = False
+        self._reload_interval_s = 30.0
+        self._reload_probation = 3
+        self._reload_lock = threading.Lock()
+        self._reload_thread = None
+        self._reload_pending = None
+        self._reload_events: List[Dict] = []
+        self._reload_previous = None
+        self._reload_probation_left = 0
+        self._reload_next_check = 0.0
+        self._reload_stat = None
+        self._reload_digest = None
+        self._reload_rejected = None
         # Support both legacy and versioned manifests via loader
         try:
             try:
@@ -131,7 +142,7 @@ class ModelRuntime:
             # Fallback to empty; inference will raise if lengths mismatch
             self.columns = []
         try:
-            self.model = joblib.load(self.model_path)
+            self.model = load_artifact(self.model_path)
         except (ValueError, TypeError, AttributeError, ImportError) as e:
             # Degrade gracefully if custom class from notebook cannot be unpickled
             self.model = None
@@ -140,7 +151,7 @@ class ModelRuntime:
             )
         try:
             self.calibrator = (
-                joblib.load(self.calibrator_path) if self.calibrator_path else None
+                load_artifact(self.calibrator_path) if self.calibrator_path else None
             )
         except (ValueError, TypeError, AttributeError, ImportError) as e:
             self.calibrator = None
@@ -149,8 +160,360 @@ class ModelRuntime:
             )
         # class order {down:0, neutral:1, up:2}
         self.class_order = [0, 1, 2]
+        self._prepare()
+
+    def _prepare(self) -> None:
+        """Resolve per-call decisions once so infer() runs on a NumPy buffer.
+
+        - feature order: schema columns mapped onto the model's feature_names_in_
+        - class order: model classes_ sorted into down/neutral/up
+        - calibrator calling convention: probed once on a zero vector
+        - flat NumPy export of the model (<model>.flat.npz), if present and verified
+        On any failure the runtime stays on the DataFrame path (_infer_dataframe).
+        """
+        self._prepared = False
+        self._flat = None
+        self._feat_idx = None
+        self._class_idx = None
+        self._cal_mode = "none"
+        n = len(self.columns)
+        if self.model is None or n == 0 or not hasattr(self.model, "predict_proba"):
+            return
+        names = getattr(self.model, "feature_names_in_", None)
+        if names is not None:
+            names = [str(c) for c in names]
+            if sorted(names) != sorted(self.columns):
+                print("[ModelRuntime] Warning: schema columns differ from model feature names; using DataFrame path")
+                return
+            if names != list(self.columns):
+                pos = {c: i for i, c in enumerate(self.columns)}
+                self._feat_idx = np.array([pos[c] for c in names], dtype=np.intp)
+            _ignore_feature_name_warning()
+        self._xbuf = np.zeros((1, n), dtype=float)
+        try:
+            proba = np.asarray(self.model.predict_proba(self._xbuf))
+        except Exception as e:
+            print(f"[ModelRuntime] Warning: predict_proba probe failed ({e}); using DataFrame path")
+            return
+        if proba.ndim != 2 or proba.shape[1] != 3:
+            return
+        classes = getattr(self.model, "classes_", None)
+        if classes is not None and len(classes) == 3:
+            try:
+                order = np.argsort(np.asarray(classes), kind="stable")
+                if not np.array_equal(order, np.arange(3)):
+                    self._class_idx = order
+            except (TypeError, ValueError):
+                pass
+        if self.calibrator is not None:
+            self._cal_mode = self._probe_calibrator(proba)
+            if self._cal_mode == "none":
+                print("[ModelRuntime] Warning: Calibrator unusable with either calling convention. Using uncalibrated probabilities.")
+        self._flat = self._load_flat_export()
+        self._prepared = True
+
+    def _load_flat_export(self):
+        """FlatModel for this model file, or None if absent, stale or not exact."""
+        path = flat_export_path(self.model_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            flat = FlatModel.load(path)
+            if flat.source_sha256 and flat.source_sha256 != file_digest(self.model_path):
+                print(f"[ModelRuntime] Warning: flat export '{path}' is stale; using sklearn model")
+                return None
+            X = _smoke_batch(self._xbuf.shape[1])
+            ref = np.asarray(self.model.predict_proba(X), dtype=float)
+            diff = np.abs(flat.predict_proba(X) - ref).max()
+            if not diff <= 1e-9:
+                print(f"[ModelRuntime] Warning: flat export differs from model by {diff:.3g}; using sklearn model")
+                return None
+        except Exception as e:
+            print(f"[ModelRuntime] Warning: failed to load flat export '{path}': {e}")
+            return None
+        print(f"[ModelRuntime] Using flat NumPy export {os.path.basename(path)}")
+        return flat
+
+    def _probe_calibrator(self, proba: np.ndarray) -> str:
+        """Return 'proba', 'transform', 'features' or 'none' for the loaded calibrator."""
+        cal = self.calibrator
+        if not (CustomClassificationCalibrator is not None and isinstance(cal, CustomClassificationCalibrator)):
+            for mode in ("proba", "transform"):
+                fn = getattr(cal, "predict_proba" if mode == "proba" else "transform", None)
+                if fn is None:
+                    continue
+                try:
+                    out = np.asarray(fn(proba))
+                    if out.size == 3:
+                        return mode
+                except Exception:
+                    pass
+                break
+        if hasattr(cal, "predict_proba"):
+            try:
+                out = np.asarray(cal.predict_proba(self._model_input()))
+                if out.size == 3:
+                    return "features"
+            except Exception:
+                pass
+        return "none"
+
+    def _model_input(self) -> np.ndarray:
+        if self._feat_idx is None:
+            return self._xbuf
+        return self._xbuf[:, self._feat_idx]
+
+    def _predict_rows(self, X: np.ndarray) -> np.ndarray:
+        """Calibrated (n, 3) probabilities in down/neutral/up order for prepared input.
+
+        Raises _CalibratorFailed when the calibrator raises, so callers can
+        take the DataFrame path with its calibrator fallbacks.
+        """
+        if self._cal_mode == "features":
+            proba = self._calibrate(self.calibrator.predict_proba, X)
+        else:
+            if self._flat is not None and np.isfinite(X).all():
+                proba = self._flat.predict_proba(X)
+            else:
+                proba = self.model.predict_proba(X)
+            if self._cal_mode == "proba":
+                proba = self._calibrate(self.calibrator.predict_proba, proba)
+            elif self._cal_mode == "transform":
+                proba = self._calibrate(self.calibrator.transform, proba)
+        proba = np.asarray(proba, dtype=float).reshape(X.shape[0], -1)
+        if self._class_idx is not None:
+            proba = proba[:, self._class_idx]
+        return proba
+
+    @staticmethod
+    def _calibrate(fn, arg):
+        try:
+            return fn(arg)
+        except Exception as e:
+            raise _CalibratorFailed(str(e)) from e
 
     def infer(self, x: List[float]) -> Dict:
+        if self._reload_previous is not None:
+            return self._on_probation(self._infer_one, x)
+        return self._infer_one(x)
+
+    def _infer_one(self, x: List[float]) -> Dict:
+        if not self._prepared or len(x) != self._xbuf.shape[1]:
+            return self._infer_dataframe(x)
+        self._xbuf[0, :] = x
+        try:
+            row = self._predict_rows(self._model_input())[0]
+        except _CalibratorFailed:
+            return self._infer_dataframe(x)
+        p_down, p_neutral, p_up = float(row[0]), float(row[1]), float(row[2])
+        return {
+            'p_down': p_down,
+            'p_neutral': p_neutral,
+            'p_up': p_up,
+            's_model': p_up - p_down,
+            'a': self.cal_a,
+            'b': self.cal_b,
+        }
+
+    def infer_batch(self, X) -> Dict:
+        """Vectorized infer over an (n, d) feature matrix in schema order.
+
+        Returns float arrays of length n for p_down/p_neutral/p_up/s_model plus
+        the scalar calibration params a/b. One predict_proba call per batch when
+        the runtime is prepared; otherwise falls back to per-row infer().
+        Right after a hot reload a batch counts as one probation call, like
+        infer().
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self._reload_previous is not None:
+            return self._on_probation(self._infer_batch, X)
+        return self._infer_batch(X)
+
+    def _infer_batch(self, X: np.ndarray) -> Dict:
+        n = X.shape[0]
+        if n == 0:
+            proba = np.zeros((0, 3), dtype=float)
+        elif self._prepared and X.shape[1] == self._xbuf.shape[1]:
+            Xm = X if self._feat_idx is None else X[:, self._feat_idx]
+            try:
+                proba = self._predict_rows(Xm)
+            except _CalibratorFailed:
+                proba = self._proba_via_dataframe(X)
+        else:
+            proba = self._proba_via_dataframe(X)
+        if proba.shape[1] != 3:
+            raise RuntimeError(f"Expected 3-class probabilities, got {proba.shape}")
+        return {
+            'p_down': proba[:, 0],
+            'p_neutral': proba[:, 1],
+            'p_up': proba[:, 2],
+            's_model': proba[:, 2] - proba[:, 0],
+            'a': self.cal_a,
+            'b': self.cal_b,
+        }
+
+    def _proba_via_dataframe(self, X: np.ndarray) -> np.ndarray:
+        outs = [self._infer_dataframe(list(r)) for r in X]
+        return np.array([[o['p_down'], o['p_neutral'], o['p_up']] for o in outs], dtype=float)
+
+    # ── Hot reload ──────────────────────────────────────────────────────────
+    def enable_hot_reload(self, check_interval_s: float = 30.0, probation_calls: int = 3) -> None:
+        """Watch the manifest and swap in new artifacts without a restart.
+
+        The bot calls poll_reload() once per bar. A manifest whose mtime/size
+        and then content hash changed is loaded into a candidate runtime on a
+        background thread and validated (model loaded, expected_feature_dim,
+        unchanged feature schema, finite probabilities on a smoke batch). The
+        candidate is swapped in on the next poll, i.e. between bars; the
+        previous model is kept for `probation_calls` live infer()/infer_batch()
+        calls and restored if any of them fails.
+        """
+        self._reload_enabled = True
+        self._reload_interval_s = max(0.0, float(check_interval_s))
+        self._reload_probation = max(1, int(probation_calls))
+        self._reload_next_check = time.monotonic() + self._reload_interval_s
+        self._reload_stat = self._manifest_stat()
+        try:
+            self._reload_digest = file_digest(self.manifest_path)
+        except OSError:
+            self._reload_digest = None
+
+    def poll_reload(self) -> Optional[Dict]:
+        """Apply a validated candidate and/or start a manifest check.
+
+        Returns an event dict (status 'swapped', 'rejected' or 'rolled_back')
+        when something happened since the last poll, else None.
+        """
+        if not self._reload_enabled:
+            return None
+        self._apply_pending_reload()
+        now = time.monotonic()
+        if now >= self._reload_next_check:
+            self._reload_next_check = now + self._reload_interval_s
+            self._check_manifest()
+        return self._reload_events.pop(0) if self._reload_events else None
+
+    def _manifest_stat(self):
+        try:
+            st = os.stat(self.manifest_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _check_manifest(self) -> None:
+        if self._reload_thread is not None and self._reload_thread.is_alive():
+            return
+        stat = self._manifest_stat()
+        if stat is None or stat == self._reload_stat:
+            return
+        self._reload_stat = stat
+        try:
+            digest = file_digest(self.manifest_path)
+        except OSError:
+            return
+        if digest in (self._reload_digest, self._reload_rejected):
+            return
+        print(f"[ModelRuntime] Manifest changed ({digest[:12]}); loading candidate in background")
+        self._reload_thread = threading.Thread(
+            target=self._load_candidate, args=(digest,), name="model-reload", daemon=True
+        )
+        self._reload_thread.start()
+
+    def _load_candidate(self, digest: str) -> None:
+        t0 = time.perf_counter()
+        event = {'manifest': self.manifest_path, 'digest': digest[:12]}
+        cand = None
+        try:
+            cand = ModelRuntime(self.manifest_path)
+            self._validate_candidate(cand)
+            event.update(status='swapped', model_path=cand.model_path, git_commit=cand.git_commit)
+        except Exception as e:
+            if cand is not None:
+                _release_artifacts(cand.__dict__)
+            cand = None
+            event.update(status='rejected', error=str(e))
+        event['load_ms'] = round((time.perf_counter() - t0) * 1000.0, 1)
+        with self._reload_lock:
+            self._reload_pending = (event, cand, digest)
+
+    def _validate_candidate(self, cand: "ModelRuntime") -> None:
+        """Raise ValueError unless cand can replace this runtime mid-session."""
+        if cand.model is None:
+            raise ValueError(f"model failed to load from {cand.model_path}")
+        n = len(cand.columns)
+        if cand.expected_feature_dim is not None and n != int(cand.expected_feature_dim):
+            raise ValueError(f"feature_dim {cand.expected_feature_dim} != {n} schema columns")
+        if list(cand.columns) != list(self.columns):
+            # Live features are built for the current schema; that needs a restart
+            raise ValueError("feature schema differs from the running model")
+        out = cand.infer_batch(_smoke_batch(n))
+        P = np.column_stack([out['p_down'], out['p_neutral'], out['p_up']])
+        if P.shape != (_SMOKE_ROWS, 3) or not np.all(np.isfinite(P)):
+            raise ValueError("smoke batch produced non-finite probabilities")
+        if P.min() < -1e-9 or P.max() > 1.0 + 1e-9:
+            raise ValueError("smoke batch produced probabilities outside [0, 1]")
+
+    def _apply_pending_reload(self) -> None:
+        with self._reload_lock:
+            pending, self._reload_pending = self._reload_pending, None
+        if pending is None:
+            return
+        event, cand, digest = pending
+        if cand is None:
+            self._reload_rejected = digest
+            print(f"[ModelRuntime] Hot reload rejected: {event.get('error')}; keeping current model")
+        else:
+            state = {k: v for k, v in cand.__dict__.items() if not k.startswith('_reload')}
+            if self._reload_previous is not None:
+                # Swapped again mid-probation: the oldest model can no longer be restored
+                _release_artifacts(self._reload_previous[0])
+            self._reload_previous = ({k: self.__dict__.get(k) for k in state}, self._reload_digest)
+            self.__dict__.update(state)
+            self._reload_digest = digest
+            self._reload_probation_left = self._reload_probation
+            print(f"[ModelRuntime] Hot reload: now serving {self.model_path}")
+        self._reload_events.append(event)
+
+    def _on_probation(self, fn, x) -> Dict:
+        """fn(x) on a just-swapped model; the previous model answers (and is restored) if it fails."""
+        try:
+            out = fn(x)
+            if not (np.all(np.isfinite(out['p_up'])) and np.all(np.isfinite(out['p_down']))):
+                raise ValueError("non-finite probabilities")
+        except Exception as e:
+            self._rollback_reload(f"inference failed after reload: {e}")
+            return fn(x)
+        self._reload_probation_left -= 1
+        if self._reload_probation_left <= 0:
+            previous, self._reload_previous = self._reload_previous, None
+            _release_artifacts(previous[0])
+        return out
+
+    def _rollback_reload(self, reason: str) -> None:
+        state, digest = self._reload_previous
+        failed = self._reload_digest
+        failed_state = {k: self.__dict__.get(k) for k in ('model', 'calibrator')}
+        self.__dict__.update(state)
+        _release_artifacts(failed_state)
+        self._reload_previous = None
+        self._reload_rejected = failed
+        self._reload_digest = digest
+        print(f"[ModelRuntime] Hot reload rolled back: {reason}")
+        self._reload_events.append({
+            'manifest': self.manifest_path,
+            'digest': (failed or '')[:12],
+            'status': 'rolled_back',
+            'error': reason,
+        })
+
+    def _infer_dataframe(self, x: List[float]) -> Dict:
+        """Original per-call path: one-row DataFrame and calibrator fallbacks.
+
+        Used when the runtime could not be prepared (no model, schema mismatch)
+        and as the reference for scripts/bench_model_runtime.py.
+        """
         # Build DataFrame with proper feature names if columns are available
         # October model (with calibration) expects DataFrames with feature names
         # Jan model (no calibration) expects numpy arrays
@@ -0,0 +1,179 @@
+"""Process-wide cache of loaded model artifacts.
+
+run_unified_bots.py starts several bots in one process, and each builds its own
+ModelRuntime. Without a cache every bot unpickles its own copy of the same
+joblib/pickle files. Here each artifact is loaded once per process, keyed by
+the SHA-256 of the file content, so identical files under different paths
+(e.g. copies in live_demo_1h/models) also resolve to one object.
+
+Cached objects are shared between bots and must be treated as read-only:
+predict_proba/transform only, never refit or mutate attributes.
+
+The cache does not keep artifacts alive: entries are weak references, so a
+model superseded by a hot reload is freed once no runtime uses it. Objects
+that cannot be weakly referenced (plain dicts/lists) are held with a load
+count instead and dropped when release_artifact() has been called once per
+load_artifact().
+
+NumPy arrays stored uncompressed inside joblib dumps can be memory-mapped
+(mmap_mode='r', or env MODEL_MMAP_MODE=r), so large tree/coefficient arrays
+are paged in from the OS file cache instead of copied into each process.
+Compressed dumps and plain pickles load normally; joblib ignores mmap_mode.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import sys
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import joblib
+
+_LOCK = threading.RLock()
+# (sha256, mmap_mode) -> weakref.ref to the object, or the object itself when it has no weakref support
+_BY_HASH: Dict[Tuple[str, Optional[str]], Any] = {}
+_COUNTS: Dict[Tuple[str, Optional[str]], int] = {}
+_KEYS_BY_ID: Dict[int, Tuple[str, Optional[str]]] = {}
+_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+_STATS = {'hits': 0, 'misses': 0}
+_ALIASES_REGISTERED = False
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of a file, memoized on (abspath, mtime_ns, size)."""
+    ap = os.path.abspath(path)
+    st = os.stat(ap)
+    key = (ap, st.st_mtime_ns, st.st_size)
+    with _LOCK:
+        cached = _DIGESTS.get(key)
+    if cached is not None:
+        return cached
+    h = hashlib.sha256()
+    with open(ap, 'rb') as fh:
+        for block in iter(lambda: fh.read(chunk_size), b''):
+            h.update(block)
+    digest = h.hexdigest()
+    with _LOCK:
+        # Keep only the current version of each path
+        for stale in [k for k in _DIGESTS if k[0] == ap]:
+            del _DIGESTS[stale]
+        _DIGESTS[key] = digest
+    return digest
+
+
+def register_pickle_aliases() -> None:
+    """Make custom model classes resolvable for artifacts pickled in notebooks.
+
+    Runs once per process. Classes pickled under __main__ are exposed there;
+    1h artifacts pickled as top-level 'ensemble_wrapper' get a sys.modules
+    alias to the package module instead of putting live_demo_1h on sys.path
+    (which would shadow live_demo's own features/bandit/... modules).
+    """
+    global _ALIASES_REGISTERED
+    with _LOCK:
+        if _ALIASES_REGISTERED:
+            return
+        _ALIASES_REGISTERED = True
+    classes: Dict[str, Any] = {}
+    try:
+        from live_demo import custom_models
+        classes['EnhancedMetaClassifier'] = custom_models.EnhancedMetaClassifier
+        classes['CustomClassificationCalibrator'] = custom_models.CustomClassificationCalibrator
+    except ImportError:
+        pass
+    try:
+        from live_demo_1h import ensemble_wrapper
+        classes['EnsembleWrapper'] = ensemble_wrapper.EnsembleWrapper
+        sys.modules.setdefault('ensemble_wrapper', ensemble_wrapper)
+    except ImportError:
+        pass
+    main_mod = sys.modules.get('__main__')
+    if main_mod is None:
+        return
+    for name, cls in classes.items():
+        if not hasattr(main_mod, name):
+            try:
+                setattr(main_mod, name, cls)
+            except (AttributeError, TypeError):
+                pass
+
+
+def load_artifact(path: str, mmap_mode: Optional[str] = None) -> Any:
+    """Load a joblib/pickle artifact once per process and return the shared object.
+
+    mmap_mode defaults to env MODEL_MMAP_MODE (unset = no memory mapping).
+    Load errors propagate unchanged so callers keep their own fallbacks.
+    """
+    if mmap_mode is None:
+        mmap_mode = os.environ.get('MODEL_MMAP_MODE') or None
+    register_pickle_aliases()
+    key = (file_digest(path), mmap_mode)
+    with _LOCK:
+        obj = _cached(key)
+        if obj is not None:
+            _STATS['hits'] += 1
+            _count(key, obj)
+            return obj
+        # Loading under the lock keeps concurrent bots from unpickling twice
+        obj = joblib.load(path, mmap_mode=mmap_mode)
+        try:
+            _BY_HASH[key] = weakref.ref(obj, functools.partial(_forget, key))
+        except TypeError:
+            _BY_HASH[key] = obj
+        _count(key, obj)
+        _STATS['misses'] += 1
+        return obj
+
+
+def release_artifact(obj: Any) -> None:
+    """Give back one load of obj; the last release drops a strongly held entry.
+
+    A no-op for weakly referenced objects, which leave the cache by themselves.
+    """
+    if obj is None:
+        return
+    with _LOCK:
+        key = _KEYS_BY_ID.get(id(obj))
+        if key is None or _BY_HASH.get(key) is not obj:
+            return
+        _COUNTS[key] -= 1
+        if _COUNTS[key] <= 0:
+            del _BY_HASH[key], _COUNTS[key], _KEYS_BY_ID[id(obj)]
+
+
+def _cached(key: Tuple[str, Optional[str]]) -> Any:
+    entry = _BY_HASH.get(key)
+    return entry() if isinstance(entry, weakref.ref) else entry
+
+
+def _count(key: Tuple[str, Optional[str]], obj: Any) -> None:
+    if not isinstance(_BY_HASH.get(key), weakref.ref):
+        _COUNTS[key] = _COUNTS.get(key, 0) + 1
+        _KEYS_BY_ID[id(obj)] = key
+
+
+def _forget(key: Tuple[str, Optional[str]], ref: weakref.ref) -> None:
+    with _LOCK:
+        if _BY_HASH.get(key) is ref:
+            del _BY_HASH[key]
+
+
+def cache_info() -> Dict[str, int]:
+    with _LOCK:
+        entries = sum(1 for key in _BY_HASH if _cached(key) is not None)
+        return {'entries': entries, 'hits': _STATS['hits'], 'misses': _STATS['misses']}
+
+
+def clear() -> None:
+    """Drop cached artifacts (tests, or forcing a fresh load after retraining)."""
+    with _LOCK:
+        _BY_HASH.clear()
+        _COUNTS.clear()
+        _KEYS_BY_ID.clear()
+        _DIGESTS.clear()
+        _STATS['hits'] = 0
+        _STATS['misses'] = 0
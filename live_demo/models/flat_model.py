@@ -0,0 +1,408 @@
+"""Flat NumPy export and evaluator for the live classifiers.
+
+EnhancedMetaClassifier.predict_proba calls predict_proba on every base model,
+stacks the results, scales them and runs a logistic meta-model. For one row
+per bar most of that time is Python/sklearn call overhead, not arithmetic.
+export_flat() compiles a fitted model into plain arrays stored in one .npz
+next to the joblib file; FlatModel evaluates them with vectorized NumPy, all
+trees of an ensemble traversed at once for a whole batch.
+
+Supported components:
+  - EnhancedMetaClassifier (base models -> scaler -> meta model)
+  - RandomForest/ExtraTrees classifiers, GradientBoostingClassifier,
+    HistGradientBoostingClassifier (numeric splits)
+  - LogisticRegression, GaussianNB
+  - Pipeline of RobustScaler/StandardScaler/QuantileTransformer steps
+
+Anything else raises NotImplementedError at export time and the live path
+keeps using the sklearn model. Tree comparisons follow sklearn exactly
+(float32 inputs for DecisionTree-based models, float64 for HGB). Rows with
+NaN/inf are not handled here; ModelRuntime sends those to sklearn.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+FLAT_SUFFIX = ".flat.npz"
+FORMAT_VERSION = 1
+_BOUNDS_THRESHOLD = 1e-7  # sklearn.preprocessing._data.BOUNDS_THRESHOLD
+
+
+def flat_export_path(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + FLAT_SUFFIX
+
+
+# ── Export ──────────────────────────────────────────────────────────────────
+
+class _Arrays:
+    """Collects named arrays while a spec is being built."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, np.ndarray] = {}
+
+    def add(self, arr) -> str:
+        key = f"a{len(self.data)}"
+        self.data[key] = np.ascontiguousarray(arr)
+        return key
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = np.zeros(len(left), dtype=np.intp)
+    for i in range(len(left)):  # children always follow their parent in both layouts
+        if left[i] >= 0:
+            depth[left[i]] = depth[right[i]] = depth[i] + 1
+    return int(depth.max()) if len(depth) else 0
+
+
+def _pack_trees(nodes: List[Dict[str, np.ndarray]], arrays: _Arrays) -> Dict[str, Any]:
+    """Concatenate per-tree node arrays, rebasing child indices.
+
+    Leaves point to themselves, so evaluation can step every (row, tree) pair
+    `depth` times without masking finished paths.
+    """
+    feature, threshold, left, right, value, roots = [], [], [], [], [], []
+    offset, depth = 0, 0
+    for t in nodes:
+        n = len(t["feature"])
+        is_leaf = t["left"] < 0
+        own = np.arange(offset, offset + n, dtype=np.intp)
+        roots.append(offset)
+        feature.append(np.where(is_leaf, 0, t["feature"]).astype(np.intp))
+        threshold.append(np.asarray(t["threshold"], dtype=np.float64))
+        left.append(np.where(is_leaf, own, t["left"] + offset).astype(np.intp))
+        right.append(np.where(is_leaf, own, t["right"] + offset).astype(np.intp))
+        value.append(np.asarray(t["value"], dtype=np.float64).reshape(n, -1))
+        depth = max(depth, _tree_depth(t["left"], t["right"]))
+        offset += n
+    return {
+        "feature": arrays.add(np.concatenate(feature)),
+        "threshold": arrays.add(np.concatenate(threshold)),
+        "left": arrays.add(np.concatenate(left)),
+        "right": arrays.add(np.concatenate(right)),
+        "value": arrays.add(np.concatenate(value)),
+        "roots": arrays.add(np.asarray(roots, dtype=np.intp)),
+        "depth": depth,
+    }
+
+
+def _sk_tree_nodes(tree, normalize: bool) -> Dict[str, np.ndarray]:
+    t = tree.tree_
+    value = t.value[:, 0, :].astype(np.float64)
+    if normalize:
+        norm = value.sum(axis=1, keepdims=True)
+        norm[norm == 0.0] = 1.0
+        value = value / norm
+    return {
+        "feature": t.feature,
+        "threshold": t.threshold,
+        "left": t.children_left,
+        "right": t.children_right,
+        "value": value,
+    }
+
+
+def _export_forest(model, arrays: _Arrays) -> Dict[str, Any]:
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise NotImplementedError("multi-output forests are not supported")
+    trees = [_sk_tree_nodes(est, normalize=True) for est in model.estimators_]
+    return {"op": "forest", "trees": _pack_trees(trees, arrays)}
+
+
+def _export_gb(model, arrays: _Arrays) -> Dict[str, Any]:
+    from sklearn.dummy import DummyClassifier
+
+    init = getattr(model, "init_", None)
+    if not (init == "zero" or isinstance(init, DummyClassifier)):
+        raise NotImplementedError(f"GradientBoosting init {type(init).__name__} is not supported")
+    n_iter, k = model.estimators_.shape
+    trees, tree_out = [], []
+    for i in range(n_iter):
+        for j in range(k):
+            trees.append(_sk_tree_nodes(model.estimators_[i, j], normalize=False))
+            tree_out.append(j)
+    baseline = model._raw_predict_init(np.zeros((1, model.n_features_in_), dtype=np.float32))[0]
+    return {
+        "op": "boosted",
+        "trees": _pack_trees(trees, arrays),
+        "tree_out": arrays.add(np.asarray(tree_out, dtype=np.intp)),
+        "baseline": arrays.add(np.asarray(baseline, dtype=np.float64)),
+        "scale": float(model.learning_rate),
+        "float32": True,
+        "link": "softmax" if k > 1 else "binary",
+    }
+
+
+def _export_hgb(model, arrays: _Arrays) -> Dict[str, Any]:
+    if getattr(model, "_preprocessor", None) is not None:
+        raise NotImplementedError("HistGradientBoosting with categorical preprocessing is not supported")
+    trees, tree_out = [], []
+    for predictors in model._predictors:
+        for j, pred in enumerate(predictors):
+            nd = pred.nodes
+            if np.any(nd["is_categorical"]):
+                raise NotImplementedError("categorical HGB splits are not supported")
+            leaf = nd["is_leaf"].astype(bool)
+            trees.append({
+                "feature": nd["feature_idx"].astype(np.intp),
+                "threshold": nd["num_threshold"],
+                "left": np.where(leaf, -1, nd["left"].astype(np.intp)),
+                "right": np.where(leaf, -1, nd["right"].astype(np.intp)),
+                "value": nd["value"],
+            })
+            tree_out.append(j)
+    k = int(model.n_trees_per_iteration_)
+    return {
+        "op": "boosted",
+        "trees": _pack_trees(trees, arrays),
+        "tree_out": arrays.add(np.asarray(tree_out, dtype=np.intp)),
+        "baseline": arrays.add(np.asarray(model._baseline_prediction, dtype=np.float64).reshape(-1)),
+        "scale": 1.0,
+        "float32": False,
+        "link": "softmax" if k > 1 else "binary",
+    }
+
+
+def _export_logistic(model, arrays: _Arrays) -> Dict[str, Any]:
+    multi = getattr(model, "multi_class", "auto")
+    ovr = multi in ("ovr", "warn") or (
+        multi in ("auto", "deprecated") and (model.classes_.size <= 2 or model.solver == "liblinear")
+    )
+    return {
+        "op": "linear",
+        "coef": arrays.add(np.asarray(model.coef_, dtype=np.float64)),
+        "intercept": arrays.add(np.asarray(model.intercept_, dtype=np.float64).reshape(-1)),
+        "link": "ovr" if ovr else "softmax",
+    }
+
+
+def _export_gnb(model, arrays: _Arrays) -> Dict[str, Any]:
+    return {
+        "op": "gnb",
+        "theta": arrays.add(np.asarray(model.theta_, dtype=np.float64)),
+        "var": arrays.add(np.asarray(model.var_, dtype=np.float64)),
+        "log_prior": arrays.add(np.log(model.class_prior_)),
+    }
+
+
+def _export_transform(step, arrays: _Arrays) -> Dict[str, Any]:
+    from sklearn.preprocessing import QuantileTransformer, RobustScaler, StandardScaler
+
+    if isinstance(step, RobustScaler):
+        center = step.center_ if step.with_centering else None
+        scale = step.scale_ if step.with_scaling else None
+    elif isinstance(step, StandardScaler):
+        center = step.mean_ if step.with_mean else None
+        scale = step.scale_ if step.with_std else None
+    elif isinstance(step, QuantileTransformer):
+        return {
+            "op": "quantile",
+            "quantiles": arrays.add(np.asarray(step.quantiles_, dtype=np.float64)),
+            "references": arrays.add(np.asarray(step.references_, dtype=np.float64)),
+            "normal": step.output_distribution == "normal",
+        }
+    else:
+        raise NotImplementedError(f"transform {type(step).__name__} is not supported")
+    return {
+        "op": "affine",
+        "center": arrays.add(np.asarray(center, dtype=np.float64)) if center is not None else None,
+        "scale": arrays.add(np.asarray(scale, dtype=np.float64)) if scale is not None else None,
+    }
+
+
+def _export_classifier(model, arrays: _Arrays) -> Dict[str, Any]:
+    from sklearn.ensemble import (
+        ExtraTreesClassifier,
+        GradientBoostingClassifier,
+        HistGradientBoostingClassifier,
+        RandomForestClassifier,
+    )
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.pipeline import Pipeline
+
+    from live_demo.custom_models import EnhancedMetaClassifier
+
+    if isinstance(model, EnhancedMetaClassifier):
+        return _export_stack(model, arrays)
+    if isinstance(model, Pipeline):
+        steps = [_export_transform(s, arrays) for _, s in model.steps[:-1]]
+        return {"op": "pipeline", "steps": steps, "final": _export_classifier(model.steps[-1][1], arrays)}
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        return _export_forest(model, arrays)
+    if isinstance(model, GradientBoostingClassifier):
+        return _export_gb(model, arrays)
+    if isinstance(model, HistGradientBoostingClassifier):
+        return _export_hgb(model, arrays)
+    if isinstance(model, LogisticRegression):
+        return _export_logistic(model, arrays)
+    if isinstance(model, GaussianNB):
+        return _export_gnb(model, arrays)
+    raise NotImplementedError(f"model {type(model).__name__} is not supported")
+
+
+def _export_stack(model, arrays: _Arrays) -> Dict[str, Any]:
+    if not model.is_fitted:
+        raise NotImplementedError("EnhancedMetaClassifier is not fitted")
+    k = int(model.n_classes)
+    bases = []
+    for est in model.base_models.values():
+        classes = [int(c) for c in getattr(est, "classes_", range(k))]
+        # Output column i lands in stacked column cols[i] (-1 drops it), as in predict_proba
+        cols = list(range(k)) if len(classes) == k else [c if c < k else -1 for c in classes]
+        bases.append({"model": _export_classifier(est, arrays), "cols": cols})
+    return {
+        "op": "stack",
+        "n_classes": k,
+        "bases": bases,
+        "scaler": _export_transform(model.scaler, arrays),
+        "meta": _export_classifier(model.meta_model, arrays),
+    }
+
+
+def export_flat(model, path: str, source_sha256: Optional[str] = None) -> str:
+    """Compile a fitted model into flat arrays and save them as .npz at path."""
+    arrays = _Arrays()
+    spec = _export_classifier(model, arrays)
+    header = {
+        "format_version": FORMAT_VERSION,
+        "model_type": type(model).__name__,
+        "source_sha256": source_sha256,
+        "n_features": int(getattr(model, "n_features_in_", 0) or 0),
+        "spec": spec,
+    }
+    np.savez(path, __header__=np.array(json.dumps(header)), **arrays.data)
+    return path
+
+
+# ── Evaluation ──────────────────────────────────────────────────────────────
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=1, keepdims=True)
+    np.exp(z, out=z)
+    z /= z.sum(axis=1, keepdims=True)
+    return z
+
+
+def _expit(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+class FlatModel:
+    """Batched predict_proba over arrays written by export_flat()."""
+
+    def __init__(self, header: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        if int(header.get("format_version", 0)) != FORMAT_VERSION:
+            raise ValueError(f"unsupported flat export version {header.get('format_version')}")
+        self.header = header
+        self.source_sha256 = header.get("source_sha256")
+        self.model_type = header.get("model_type")
+        self._a = arrays
+        self._spec = header["spec"]
+
+    @classmethod
+    def load(cls, path: str) -> "FlatModel":
+        with np.load(path, allow_pickle=False) as z:
+            header = json.loads(str(z["__header__"]))
+            arrays = {k: z[k] for k in z.files if k != "__header__"}
+        return cls(header, arrays)
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return self._proba(self._spec, X)
+
+    # Classifiers
+    def _proba(self, spec: Dict[str, Any], X: np.ndarray) -> np.ndarray:
+        op = spec["op"]
+        if op == "pipeline":
+            for step in spec["steps"]:
+                X = self._transform(step, X)
+            return self._proba(spec["final"], X)
+        if op == "forest":
+            leaves = self._leaves(spec["trees"], X.astype(np.float32))
+            value = self._a[spec["trees"]["value"]]
+            return value[leaves].sum(axis=1) / leaves.shape[1]
+        if op == "boosted":
+            Xc = X.astype(np.float32) if spec["float32"] else X
+            leaves = self._leaves(spec["trees"], Xc)
+            value = self._a[spec["trees"]["value"]][:, 0]
+            base = self._a[spec["baseline"]]
+            onehot = np.zeros((leaves.shape[1], base.size))
+            onehot[np.arange(leaves.shape[1]), self._a[spec["tree_out"]]] = 1.0
+            raw = base + spec["scale"] * (value[leaves] @ onehot)
+            if spec["link"] == "softmax":
+                return _softmax(raw)
+            p = _expit(raw[:, 0])
+            return np.column_stack([1.0 - p, p])
+        if op == "linear":
+            z = X @ self._a[spec["coef"]].T + self._a[spec["intercept"]]
+            if spec["link"] == "softmax":
+                return _softmax(np.column_stack([-z[:, 0], z[:, 0]]) if z.shape[1] == 1 else z)
+            p = _expit(z)
+            if p.shape[1] == 1:
+                return np.column_stack([1.0 - p[:, 0], p[:, 0]])
+            return p / p.sum(axis=1, keepdims=True)
+        if op == "gnb":
+            theta, var = self._a[spec["theta"]], self._a[spec["var"]]
+            jll = self._a[spec["log_prior"]] - 0.5 * np.sum(np.log(2.0 * np.pi * var), axis=1)
+            jll = jll - 0.5 * (((X[:, None, :] - theta[None]) ** 2) / var[None]).sum(axis=2)
+            m = jll.max(axis=1, keepdims=True)
+            return np.exp(jll - (m + np.log(np.exp(jll - m).sum(axis=1, keepdims=True))))
+        if op == "stack":
+            k = spec["n_classes"]
+            stacked = np.zeros((X.shape[0], len(spec["bases"]) * k))
+            for i, base in enumerate(spec["bases"]):
+                proba = self._proba(base["model"], X)
+                for j, col in enumerate(base["cols"]):
+                    if col >= 0:
+                        stacked[:, i * k + col] = proba[:, j]
+            return self._proba(spec["meta"], self._transform(spec["scaler"], stacked))
+        raise ValueError(f"unknown op {op}")
+
+    def _transform(self, spec: Dict[str, Any], X: np.ndarray) -> np.ndarray:
+        if spec["op"] == "affine":
+            if spec["center"] is not None:
+                X = X - self._a[spec["center"]]
+            if spec["scale"] is not None:
+                X = X / self._a[spec["scale"]]
+            return X
+        if spec["op"] == "quantile":
+            q, ref = self._a[spec["quantiles"]], self._a[spec["references"]]
+            out = np.empty_like(X)
+            for j in range(X.shape[1]):
+                col, qj = X[:, j], q[:, j]
+                lo_x, hi_x = qj[0], qj[-1]
+                if spec["normal"]:
+                    lower = col - _BOUNDS_THRESHOLD < lo_x
+                    upper = col + _BOUNDS_THRESHOLD > hi_x
+                else:
+                    lower, upper = col == lo_x, col == hi_x
+                v = 0.5 * (np.interp(col, qj, ref) - np.interp(-col, -qj[::-1], -ref[::-1]))
+                v[upper] = 1.0
+                v[lower] = 0.0
+                out[:, j] = v
+            if spec["normal"]:
+                from scipy.special import ndtri
+                out = ndtri(out)
+                clip_min = ndtri(_BOUNDS_THRESHOLD - np.spacing(1))
+                clip_max = ndtri(1 - (_BOUNDS_THRESHOLD - np.spacing(1)))
+                out = np.clip(out, clip_min, clip_max)
+            return out
+        raise ValueError(f"unknown transform {spec['op']}")
+
+    def _leaves(self, trees: Dict[str, Any], X: np.ndarray) -> np.ndarray:
+        """Leaf node index for every (row, tree), all trees stepped together."""
+        feature, threshold = self._a[trees["feature"]], self._a[trees["threshold"]]
+        left, right = self._a[trees["left"]], self._a[trees["right"]]
+        roots = self._a[trees["roots"]]
+        node = np.repeat(roots[None, :], X.shape[0], axis=0)
+        for _ in range(trees["depth"]):
+            go_left = np.take_along_axis(X, feature[node], axis=1) <= threshold[node]
+            node = np.where(go_left, left[node], right[node])
+        return node
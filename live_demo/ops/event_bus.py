@@ -0,0 +1,173 @@
+"""Single-emission event bus.
+
+An event is enveloped (the emitter's strategy_id/schema_version plus the
+llm_logging run_id/ts_ist/schema_v/bar_id) and serialized once, then the same
+bytes are handed to every sink subscribed to its topic. Event.data is the
+whole record; Event.capped is the same line under the LLM size budget, which
+is only re-encoded for the rare record that exceeds it. A sink is any callable
+taking an Event; the ones here cover the existing outputs:
+
+  - JsonlFileSink:  <base>/<topic>/<topic>.jsonl (the LogEmitter layout),
+                    one persistent append handle per topic, uncapped
+  - PartitionSink:  gzip partitions <root>/<stream>/date=D/asset=A/ (the
+                    write_jsonl layout), fed the capped line as-is or a
+                    projection onto a few fields
+  - SheetsSink:     one SheetsLogger row built from Event.record
+
+Alert or metrics hooks subscribe the same way. The event_id is derived from
+the encoded bytes and spliced into them, so it costs no second encode.
+
+The bus itself is synchronous; in the live loop it runs behind LogWriter
+(live_demo/ops/log_writer.py), so publish() happens on the writer thread.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from ops.llm_logging import cap_encoded, encode_jsonl, write_jsonl_bytes
+from ops.log_emitter import stamp_envelope
+
+ALL_TOPICS = "*"
+
+
+@dataclass(frozen=True)
+class Event:
+    topic: str
+    asset: str
+    ts: Optional[float]
+    record: Dict[str, Any]
+    data: bytes
+    capped: bytes
+
+
+Sink = Callable[[Event], Any]
+
+
+class _TopicStats:
+    __slots__ = ("events", "bytes", "deliveries", "errors")
+
+    def __init__(self):
+        self.events = 0
+        self.bytes = 0
+        self.deliveries = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class EventBus:
+    def __init__(self, freq_minutes: int = 5, event_ids: bool = True):
+        self.freq_minutes = int(freq_minutes)
+        self.event_ids = bool(event_ids)
+        self._subs: Dict[str, List[Sink]] = {}
+        self._stats: Dict[str, _TopicStats] = {}
+
+    def subscribe(self, topics: Union[str, Iterable[str]], sink: Sink) -> None:
+        """Deliver events for topics (or ALL_TOPICS) to sink, in subscription order."""
+        for topic in ([topics] if isinstance(topics, str) else topics):
+            self._subs.setdefault(topic, []).append(sink)
+
+    def sinks_for(self, topic: str) -> List[Sink]:
+        return self._subs.get(topic, []) + self._subs.get(ALL_TOPICS, [])
+
+    def publish(self, topic: str, record: Dict[str, Any], *, asset: str = "ALL",
+                ts: Optional[float] = None) -> Optional[Event]:
+        """Encode record once and fan it out; None when nothing is subscribed."""
+        sinks = self.sinks_for(topic)
+        if not sinks:
+            return None
+        rec, data = encode_jsonl(stamp_envelope(dict(record)), freq_minutes=self.freq_minutes, capped=False)
+        if self.event_ids and "event_id" not in rec:
+            ts_i = int(ts) if isinstance(ts, (int, float)) else 0
+            event_id = f"{ts_i}:{asset}:{topic}:{hashlib.sha256(data).hexdigest()[:8]}"
+            rec = {"event_id": event_id, **rec}
+            data = b'{"event_id":"' + event_id.encode("utf-8") + b'",' + data[1:]
+        event = Event(topic, asset, ts, rec, data, cap_encoded(rec, data)[1])
+        st = self._stats.get(topic)
+        if st is None:
+            st = self._stats[topic] = _TopicStats()
+        st.events += 1
+        st.bytes += len(data)
+        for sink in sinks:
+            try:
+                sink(event)
+                st.deliveries += 1
+            except Exception:
+                st.errors += 1
+        return event
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {k: v.as_dict() for k, v in list(self._stats.items())}
+
+    def close(self) -> None:
+        seen = set()
+        for sinks in self._subs.values():
+            for sink in sinks:
+                close = getattr(sink, "close", None)
+                if close is not None and id(sink) not in seen:
+                    seen.add(id(sink))
+                    close()
+
+
+class JsonlFileSink:
+    """Appends Event.data to <base_dir>/<topic>/<topic>.jsonl."""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self._files: Dict[str, Any] = {}
+
+    def path_for(self, topic: str) -> str:
+        return os.path.join(self.base_dir, topic, f"{topic}.jsonl")
+
+    def __call__(self, event: Event) -> None:
+        f = self._files.get(event.topic)
+        if f is None:
+            path = self.path_for(event.topic)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = self._files[event.topic] = open(path, "ab")
+        f.write(event.data)
+        f.flush()
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class PartitionSink:
+    """Appends Event.capped to the gzip partition of stream (default '<topic>_log').
+
+    With fields, the partition gets only those keys of the record (plus the
+    llm_logging envelope), encoded separately for this sink.
+    """
+
+    def __init__(self, stream: Optional[str] = None, root: Optional[str] = None,
+                 fields: Optional[Sequence[str]] = None):
+        self.stream = stream
+        self.root = root
+        self.fields = tuple(fields) if fields is not None else None
+
+    def __call__(self, event: Event) -> None:
+        data = event.capped
+        if self.fields is not None:
+            rec = event.record
+            compact = {k: rec[k] for k in self.fields if k in rec}
+            compact.update(ts_ist=rec["ts_ist"], schema_v=rec["schema_v"], bar_id=rec["bar_id"])
+            data = encode_jsonl(compact)[1]
+        write_jsonl_bytes(self.stream or f"{event.topic}_log", data, event.record["ts_ist"],
+                          event.asset, root=self.root)
+
+
+class SheetsSink:
+    """Buffers row(event) to a SheetsLogger tab (flushed by the caller as before)."""
+
+    def __init__(self, sheets_logger: Any, tab: str, row: Callable[[Event], List[Any]]):
+        self.sheets_logger = sheets_logger
+        self.tab = tab
+        self.row = row
+
+    def __call__(self, event: Event) -> None:
+        self.sheets_logger.buffer(self.tab, self.row(event))
@@ -4,6 +4,7 @@ import json
 from typing import Any, Dict, Optional
 
 from ops.log_emitter import get_emitter
+from live_demo.ops.event_bus import EventBus, JsonlFileSink, PartitionSink
 # Prefer top-level ops.llm_logging; fallback to package-local live_demo.ops.llm_logging for robustness
 try:
     # Enforces IST timestamps, bar_id, gzip partitions, and size caps
@@ -17,6 +18,15 @@ except Exception:  # ImportError or environment path issues
             return
 from datetime import datetime, timezone, timedelta
 
+# Topics the router publishes through an EventBus when one is attached
+BUS_TOPICS = ("ensemble", "health", "calibration")
+# Sink specs for topics that were written unconditionally before they moved behind the router
+DEFAULT_TOPICS = {"calibration": "emitter+llm"}
+# LLM streams that live under the unified logs root rather than llm_root
+_UNIFIED_ROOT_STREAMS = {"calibration"}
+# Compact LLM streams: the bus partition keeps only these fields, as write_jsonl did
+_LLM_FIELDS = {"ensemble": ("asset", "event_id", "pred_stack_bps")}
+
 
 def _hash8(obj: Any) -> str:
     try:
@@ -38,6 +48,10 @@ class LogRouter:
     - emitter: ops.log_emitter.LogEmitter (sanitized, structured)
     - llm: compact JSONL via ops.llm_logging.write_jsonl
 
+    With an EventBus attached, the BUS_TOPICS build one record per event that
+    is serialized once and written to every configured sink from the same
+    bytes (see live_demo/ops/event_bus.py).
+
     Topics mapping example (strings combined with '+'):
         {
           "signals": "emitter",
@@ -49,7 +63,13 @@ class LogRouter:
         }
     """
 
-    def __init__(self, logging_cfg: Dict[str, Any], bot_version: Optional[str] = None, base_root: Optional[str] = None):
+    def __init__(
+        self,
+        logging_cfg: Dict[str, Any],
+        bot_version: Optional[str] = None,
+        base_root: Optional[str] = None,
+        bus: Optional[EventBus] = None,
+    ):
         self.sinks = (logging_cfg or {}).get("sinks", {
             "sheets": True,
             "emitter": True,
@@ -63,6 +83,19 @@ class LogRouter:
             self.llm_root = (os.path.join(base_root, bot_version) if bot_version else base_root)
         else:
             self.llm_root = None
+        self.bus = bus
+        if bus is not None:
+            self._subscribe_bus(bus)
+
+    def _subscribe_bus(self, bus: EventBus) -> None:
+        emitter_sink = JsonlFileSink(get_emitter(self.bot_version, base_dir=self.emit_base).base_dir)
+        for topic in BUS_TOPICS:
+            targets = self._targets_for(topic)
+            if targets.get("emitter"):
+                bus.subscribe(topic, emitter_sink)
+            if targets.get("llm"):
+                root = None if topic in _UNIFIED_ROOT_STREAMS else self.llm_root
+                bus.subscribe(topic, PartitionSink(f"{topic}_log", root=root, fields=_LLM_FIELDS.get(topic)))
 
     def _enabled(self, sink: str) -> bool:
         # sink keys: emitter, llm
@@ -73,7 +106,7 @@ class LogRouter:
         return False
 
     def _targets_for(self, topic: str) -> Dict[str, bool]:
-        spec = str(self.topics.get(topic, "")).lower()
+        spec = str(self.topics.get(topic, DEFAULT_TOPICS.get(topic, ""))).lower()
         return {
             "emitter": self._enabled("emitter") and ("emitter" in spec),
             "llm": self._enabled("llm") and ("llm" in spec),
@@ -81,8 +114,20 @@ class LogRouter:
 
     # Ensemble
     def emit_ensemble(self, *, ts: Optional[float], asset: str, raw_preds: Dict[str, Any], meta: Dict[str, Any]):
-        targets = self._targets_for("ensemble")
         event_id = build_event_id(ts, asset, "ensemble", {"raw": raw_preds, "meta": meta})
+        if self.bus is not None:
+            # Same id as the direct path, also kept inside meta for existing consumers
+            self.bus.publish("ensemble", {
+                "event_id": event_id,
+                "ts": ts,
+                "symbol": asset,
+                "asset": asset,
+                "predictions": raw_preds,
+                "meta": {**(meta or {}), "event_id": event_id},
+                "pred_stack_bps": round(10000.0 * float(raw_preds.get("s_model", 0.0)), 1),
+            }, asset=asset, ts=ts)
+            return
+        targets = self._targets_for("ensemble")
         if targets.get("emitter"):
             try:
                 emitter = get_emitter(self.bot_version, base_dir=self.emit_base)
@@ -180,6 +225,9 @@ class LogRouter:
 
     # Health (emitter-only default)
     def emit_health(self, *, ts: Optional[float], asset: str, health: Dict[str, Any]):
+        if self.bus is not None:
+            self.bus.publish("health", {"ts": ts, "symbol": asset, "metrics": health}, asset=asset, ts=ts)
+            return
         targets = self._targets_for("health")
         if targets.get("emitter"):
             try:
@@ -188,6 +236,24 @@ class LogRouter:
             except Exception:
                 pass
 
+    # Calibration (emitter + llm by default)
+    def emit_calibration(self, *, ts: Optional[float], asset: str, calibration: Dict[str, Any]):
+        if self.bus is not None:
+            self.bus.publish("calibration", {**calibration, "asset": asset}, asset=asset, ts=ts)
+            return
+        targets = self._targets_for("calibration")
+        if targets.get("emitter"):
+            try:
+                emitter = get_emitter(self.bot_version, base_dir=self.emit_base)
+                emitter.emit_calibration(calibration)
+            except Exception:
+                pass
+        if targets.get("llm"):
+            try:
+                write_jsonl("calibration_log", {**calibration, "asset": asset}, asset=asset)
+            except Exception:
+                pass
+
     # Equity / PnL (llm + emitter)
     def emit_equity(self, *, asset: str, ts: Optional[float], pnl_total_usd: Optional[float], equity_value: Optional[float], realized_return_bps: Optional[float] = None):
         targets = self._targets_for("equity")
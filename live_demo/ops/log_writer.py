@@ -0,0 +1,261 @@
+"""Off-loop log writer: one bounded queue, one writer thread.
+
+The bar loop fans each record out to several sinks (LogRouter topics,
+LogEmitter streams, LLM JSONL partitions, SheetsLogger buffers), all of which
+end in makedirs/open/write/print on the calling thread. LogWriter moves that
+work off the event loop: callers submit (stream, fn, args) and return
+immediately, a single daemon thread drains the queue in FIFO order.
+
+Overflow is decided per stream when the queue is at capacity:
+  - drop_newest: reject the incoming record (default)
+  - drop_oldest: evict the oldest queued record of the same stream; if none
+                 is queued, reject the incoming one
+  - overflow:    accept past capacity (executions, fills, equity, sheets
+                 rows); counted so sustained overflow shows up in health
+
+submit() never blocks. stats() reports queue depth, enqueue-to-write lag and
+per-stream enqueued/written/dropped/error counters for the health snapshot.
+
+Payloads are copied at submit time (plain dict/list/tuple containers only) so
+the loop can keep mutating its own dicts while the writer serializes them.
+
+Sinks behind the queue must only be written from the writer thread; wrap
+every call site with the same LogWriter (see proxy()). A sink whose calls can
+block on the network (SheetsLogger.flush) gets a LogWriter of its own, so it
+never holds up the disk writes queued behind it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Tuple
+
+POLICIES = ("drop_newest", "drop_oldest", "overflow")
+
+DEFAULT_POLICIES = {
+    "router.emit_execution": "overflow",
+    "router.emit_hyperliquid_fill": "overflow",
+    "router.emit_equity": "overflow",
+    "emitter.emit_order_intent": "overflow",
+    "sheets": "overflow",
+}
+
+
+def _copy_payload(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: _copy_payload(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_payload(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_copy_payload(v) for v in obj)
+    return obj
+
+
+class _StreamStats:
+    __slots__ = ("enqueued", "written", "dropped", "overflowed", "errors")
+
+    def __init__(self):
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.overflowed = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+_Item = Tuple[str, float, Callable[..., Any], tuple, dict]
+
+
+class LogWriter:
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        default_policy: str = "drop_newest",
+        policies: Optional[Mapping[str, str]] = None,
+        copy_payloads: bool = True,
+        lag_window: int = 1024,
+        enabled: bool = True,
+        name: str = "log-writer",
+    ):
+        pol = dict(DEFAULT_POLICIES)
+        pol.update(policies or {})
+        for stream, p in list(pol.items()) + [("default", default_policy)]:
+            if p not in POLICIES:
+                raise ValueError(f"unknown overflow policy for {stream!r}: {p!r}")
+        self.max_queue = max(1, int(max_queue))
+        self.default_policy = default_policy
+        self.policies = pol
+        self.copy_payloads = bool(copy_payloads)
+        self.enabled = bool(enabled)
+        self._q: Deque[_Item] = deque()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._stats: Dict[str, _StreamStats] = {}
+        self._lags: Deque[float] = deque(maxlen=int(lag_window))
+        self._max_depth = 0
+        self._max_lag_ms = 0.0
+        self._busy = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if self.enabled:
+            self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Mapping[str, Any]], name: str = "log-writer") -> "LogWriter":
+        """Build from the logging.writer config block (all keys optional)."""
+        cfg = cfg or {}
+        return cls(
+            max_queue=int(cfg.get("max_queue", 10000)),
+            default_policy=str(cfg.get("default_policy", "drop_newest")),
+            policies=cfg.get("policies") or {},
+            copy_payloads=bool(cfg.get("copy_payloads", True)),
+            enabled=bool(cfg.get("enabled", True)),
+            name=name,
+        )
+
+    def policy_for(self, stream: str) -> str:
+        p = self.policies.get(stream)
+        if p is None:
+            p = self.policies.get(stream.split(".", 1)[0], self.default_policy)
+        return p
+
+    def _stream(self, stream: str) -> _StreamStats:
+        st = self._stats.get(stream)
+        if st is None:
+            st = self._stats[stream] = _StreamStats()
+        return st
+
+    def submit(self, stream: str, fn: Callable[..., Any], *args, **kwargs) -> bool:
+        """Queue fn(*args, **kwargs) for the writer thread; False if dropped."""
+        if self.enabled and self.copy_payloads:
+            args = _copy_payload(args)
+            kwargs = _copy_payload(kwargs)
+        with self._lock:
+            st = self._stream(stream)
+            st.enqueued += 1
+            inline = not self.enabled or self._closed
+            if not inline:
+                if len(self._q) >= self.max_queue:
+                    policy = self.policy_for(stream)
+                    if policy == "overflow":
+                        st.overflowed += 1
+                    elif policy == "drop_oldest" and self._evict_oldest(stream):
+                        st.dropped += 1
+                    else:
+                        st.dropped += 1
+                        return False
+                self._q.append((stream, time.perf_counter(), fn, args, kwargs))
+                if len(self._q) > self._max_depth:
+                    self._max_depth = len(self._q)
+                self._cond.notify()
+        if inline:
+            self._call(fn, args, kwargs, st)
+        return True
+
+    def _evict_oldest(self, stream: str) -> bool:
+        for i, item in enumerate(self._q):
+            if item[0] == stream:
+                del self._q[i]
+                return True
+        return False
+
+    def wrap(self, fn: Callable[..., Any], stream: str) -> Callable[..., bool]:
+        """A drop-in for fn that submits instead of calling."""
+        def submit(*args, **kwargs):
+            return self.submit(stream, fn, *args, **kwargs)
+        return submit
+
+    def proxy(self, target: Any, prefix: str) -> "QueuedSink":
+        """Attribute proxy whose method calls are submitted as '<prefix>.<method>'."""
+        return QueuedSink(self, target, prefix)
+
+    def _call(self, fn, args, kwargs, st: _StreamStats) -> None:
+        try:
+            fn(*args, **kwargs)
+            st.written += 1
+        except Exception:
+            st.errors += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._q and not self._closed:
+                    self._busy = False
+                    self._idle.notify_all()
+                    self._cond.wait()
+                if not self._q:
+                    self._busy = False
+                    self._idle.notify_all()
+                    return
+                stream, t_enq, fn, args, kwargs = self._q.popleft()
+                self._busy = True
+                st = self._stream(stream)
+                lag_ms = (time.perf_counter() - t_enq) * 1000.0
+                self._lags.append(lag_ms)
+                if lag_ms > self._max_lag_ms:
+                    self._max_lag_ms = lag_ms
+            self._call(fn, args, kwargs, st)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is written; False on timeout."""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._q or self._busy:
+                if not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Drain the queue and stop the writer; later submits run inline."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            depth = len(self._q)
+            streams = {k: v.as_dict() for k, v in self._stats.items()}
+            lags = sorted(self._lags)
+        p50 = lags[len(lags) // 2] if lags else None
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else None
+        return {
+            "depth": depth,
+            "max_depth": self._max_depth,
+            "capacity": self.max_queue,
+            "enqueued": sum(s["enqueued"] for s in streams.values()),
+            "written": sum(s["written"] for s in streams.values()),
+            "dropped": sum(s["dropped"] for s in streams.values()),
+            "overflowed": sum(s["overflowed"] for s in streams.values()),
+            "errors": sum(s["errors"] for s in streams.values()),
+            "lag_ms_p50": None if p50 is None else round(p50, 3),
+            "lag_ms_p99": None if p99 is None else round(p99, 3),
+            "lag_ms_max": round(self._max_lag_ms, 3),
+            "streams": streams,
+        }
+
+
+class QueuedSink:
+    """Forwards obj.method(...) calls for a sink to LogWriter.submit."""
+
+    def __init__(self, writer: LogWriter, target: Any, prefix: str):
+        self._writer = writer
+        self._target = target
+        self._prefix = prefix
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        return self._writer.wrap(attr, f"{self._prefix}.{name}")
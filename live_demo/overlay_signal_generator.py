@@ -68,15 +68,17 @@ class OverlaySignalGenerator:
             cohort_signals
         )
 
-        # Generate signals for each timeframe
-        signals = {}
+        # Score every timeframe with a single batched model call
         timestamp = datetime.now().isoformat()
-
-        for timeframe, overlay_features in features_by_timeframe.items():
-            signal = self._generate_single_signal(
-                timeframe, overlay_features, cohort_signals
-            )
-            signals[timeframe] = signal
+        try:
+            signals = self._generate_batch_signals(features_by_timeframe)
+        except Exception as e:
+            print(f"[OverlaySignalGenerator] Batched inference failed, scoring per timeframe: {e}")
+            signals = {}
+            for timeframe, overlay_features in features_by_timeframe.items():
+                signals[timeframe] = self._generate_single_signal(
+                    timeframe, overlay_features, cohort_signals
+                )
 
         # Create result object
         result = OverlaySignalResult(
@@ -93,6 +95,50 @@ class OverlaySignalGenerator:
 
         return result
 
+    def _generate_batch_signals(
+        self, features_by_timeframe: Dict[str, OverlayFeatures]
+    ) -> Dict[str, OverlaySignal]:
+        """Score all valid timeframes in one ModelRuntime.infer_batch call"""
+        signals: Dict[str, OverlaySignal] = {}
+        valid: List[Tuple[str, OverlayFeatures]] = []
+        for timeframe, overlay_features in features_by_timeframe.items():
+            if self.feature_computer.validate_features(overlay_features.features):
+                valid.append((timeframe, overlay_features))
+            else:
+                signals[timeframe] = self._create_neutral_signal(timeframe, overlay_features)
+        if not valid:
+            return signals
+
+        batch = self.model_runtime.infer_batch(
+            np.array([of.features for _, of in valid], dtype=float)
+        )
+        for i, (timeframe, overlay_features) in enumerate(valid):
+            prediction = {
+                "p_down": float(batch["p_down"][i]),
+                "p_neutral": float(batch["p_neutral"][i]),
+                "p_up": float(batch["p_up"][i]),
+                "s_model": float(batch["s_model"][i]),
+                "a": float(batch.get("a", 0.0)),
+                "b": float(batch.get("b", 1.0)),
+            }
+            thr = self._get_thresholds_for_timeframe(timeframe)
+            direction, alpha, confidence = self._calculate_signal_components_with_thresholds(
+                prediction["p_up"], prediction["p_down"], prediction["p_neutral"],
+                prediction["s_model"], thr
+            )
+            signals[timeframe] = OverlaySignal(
+                timeframe=timeframe,
+                direction=direction,
+                alpha=alpha,
+                confidence=confidence,
+                raw_prediction=prediction,
+                features=overlay_features.features,
+                timestamp=overlay_features.timestamp,
+                bar_id=overlay_features.bar_id,
+            )
+        # Preserve the timeframe order produced by the feature computer
+        return {tf: signals[tf] for tf in features_by_timeframe}
+
     def _generate_single_signal(
         self,
         timeframe: str,
@@ -0,0 +1,209 @@
+"""Parallel search over gating parameters using counterfactual replays.
+
+The signal arrays are copied once into a shared-memory block. Each worker
+in a process pool attaches to that block, so a configuration only costs one
+replay() and never re-pickles the history. Each configuration is a
+with_overrides() dict, for example {'band_bps': 10, 'thresholds.CONF_MIN': 0.5}.
+It is scored by Objective on net PnL, turnover and eligible bars per day.
+
+grid_search() evaluates the cartesian product of a value grid. bayes_search()
+fits a Gaussian process to the scores so far and evaluates the candidates
+with the highest expected improvement, one pool-sized batch per round.
+counterfactual.config_overlay() turns the winning overrides into a config
+fragment.
+"""
+
+import itertools
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from live_demo.counterfactual import ReplayArrays, ReplayParams, replay, summarize
+from ops.shared_arrays import attach_arrays, share_arrays
+
+_DAY_MS = 86_400_000
+
+
+@dataclass
+class Objective:
+    """Scalar score for one replay summary (higher is better).
+
+    score = net_pnl_bps - turnover_cost_bps * turnover
+            - eligibility_penalty_bps * (eligible bars/day outside [min, max])
+
+    Replayed PnL already pays cost_bps + slippage_bps per unit of turnover.
+    turnover_cost_bps adds a further penalty on churn. The eligibility band
+    defaults to the 5-50 bars/day KPI used by the eligibility-rate reports.
+    """
+
+    turnover_cost_bps: float = 0.0
+    min_eligible_per_day: float = 5.0
+    max_eligible_per_day: float = 50.0
+    eligibility_penalty_bps: float = 10.0
+
+    def violation(self, eligible_per_day: float) -> float:
+        return max(0.0, self.min_eligible_per_day - eligible_per_day) + max(0.0, eligible_per_day - self.max_eligible_per_day)
+
+    def score(self, summary: Dict) -> float:
+        return (
+            summary["net_pnl_bps"]
+            - self.turnover_cost_bps * summary["turnover"]
+            - self.eligibility_penalty_bps * self.violation(summary["eligible_per_day"])
+        )
+
+
+def evaluate(arr: ReplayArrays, base: ReplayParams, overrides: Dict, objective: Objective) -> Dict:
+    """Replay one configuration -> summary plus eligible_per_day, score and feasible."""
+    out = summarize(replay(arr, base.with_overrides(overrides)))
+    n_days = max(1, np.unique(arr.ts // _DAY_MS).size) if len(arr) else 1
+    out["eligible_per_day"] = out["eligibility_rate"] * out["n_bars"] / n_days
+    out["score"] = float(objective.score(out))
+    out["feasible"] = objective.violation(out["eligible_per_day"]) == 0.0
+    out["overrides"] = dict(overrides)
+    return out
+
+
+def rank(results: Sequence[Dict]) -> List[Dict]:
+    """Best first: highest score, then lowest turnover."""
+    return sorted(results, key=lambda r: (-r["score"], r["turnover"]))
+
+
+_WORKER: Dict = {}
+
+
+def _init_worker(spec: Dict, base: ReplayParams, objective: Objective) -> None:
+    shm, cols = attach_arrays(spec)
+    _WORKER.update(shm=shm, arr=ReplayArrays(**cols), base=base, objective=objective)
+
+
+def _evaluate_in_worker(overrides: Dict) -> Dict:
+    return evaluate(_WORKER["arr"], _WORKER["base"], overrides, _WORKER["objective"])
+
+
+class SearchPool:
+    """Process pool whose workers all replay against one shared copy of `arr`.
+
+    With workers <= 1, configurations are evaluated in-process and nothing
+    is shared. Use as a context manager so the block is always unlinked.
+    """
+
+    def __init__(
+        self,
+        arr: ReplayArrays,
+        base: Optional[ReplayParams] = None,
+        objective: Optional[Objective] = None,
+        workers: Optional[int] = None,
+    ):
+        self.arr = arr
+        self.base = base or ReplayParams()
+        self.objective = objective or Objective()
+        self.workers = int(workers if workers is not None else (os.cpu_count() or 1))
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "SearchPool":
+        if self.workers > 1:
+            self._shm, spec = share_arrays(self.arr.as_dict())
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(spec, self.base, self.objective),
+            )
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def map(self, points: Sequence[Dict]) -> List[Dict]:
+        """Evaluate each overrides dict, in input order."""
+        if self._executor is None:
+            return [evaluate(self.arr, self.base, p, self.objective) for p in points]
+        chunk = max(1, len(points) // (4 * self.workers))
+        return list(self._executor.map(_evaluate_in_worker, points, chunksize=chunk))
+
+
+# ---- search strategies -------------------------------------------------------
+
+def grid_points(space: Dict[str, Sequence]) -> List[Dict]:
+    """Cartesian product of {key: [values]} as a list of overrides dicts."""
+    keys = list(space)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(space[k] for k in keys))]
+
+
+def grid_search(pool: SearchPool, space: Dict[str, Sequence]) -> List[Dict]:
+    """Evaluate every grid point -> ranked results."""
+    return rank(pool.map(grid_points(space)))
+
+
+def _decode(u: np.ndarray, bounds: Dict[str, Tuple[float, float]]) -> Dict:
+    point = {}
+    for x, (key, (lo, hi)) in zip(u, bounds.items()):
+        v = lo + float(x) * (hi - lo)
+        point[key] = int(round(v)) if isinstance(lo, int) and isinstance(hi, int) else v
+    return point
+
+
+def _expected_improvement(mu: np.ndarray, sigma: np.ndarray, best: float, xi: float = 0.01) -> np.ndarray:
+    from scipy.stats import norm
+
+    sigma = np.maximum(sigma, 1e-12)
+    z = (mu - best - xi) / sigma
+    return (mu - best - xi) * norm.cdf(z) + sigma * norm.pdf(z)
+
+
+def bayes_search(
+    pool: SearchPool,
+    bounds: Dict[str, Tuple[float, float]],
+    n_iter: int = 48,
+    n_init: Optional[int] = None,
+    batch: Optional[int] = None,
+    n_candidates: int = 2048,
+    seed: int = 0,
+) -> List[Dict]:
+    """Gaussian-process search over {key: (low, high)} -> ranked results.
+
+    Integer bounds give integer values. The first n_init points are uniform
+    random. Each later round fits a GP (Matern 5/2 plus white noise) to the
+    scores and evaluates the `batch` random candidates with the highest
+    expected improvement. n_iter is the total evaluation budget.
+    """
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.gaussian_process import GaussianProcessRegressor
+    from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+
+    rng = np.random.default_rng(seed)
+    dim = len(bounds)
+    batch = max(1, int(batch or pool.workers))
+    n_init = min(n_iter, int(n_init or max(2 * dim + 1, batch)))
+
+    X = rng.random((n_init, dim))
+    results = pool.map([_decode(u, bounds) for u in X])
+    kernel = ConstantKernel(1.0) * Matern(length_scale=np.full(dim, 0.3), nu=2.5) + WhiteKernel(1e-3)
+    while len(results) < n_iter:
+        y = np.array([r["score"] for r in results])
+        gp = GaussianProcessRegressor(kernel=kernel, normalize_y=True, random_state=seed)
+        with warnings.catch_warnings():
+            # Flat score surfaces push kernel hyperparameters onto their bounds
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            gp.fit(X, y)
+        cand = rng.random((n_candidates, dim))
+        mu, sigma = gp.predict(cand, return_std=True)
+        ei = _expected_improvement(mu, sigma, float(y.max()))
+        take = cand[np.argsort(-ei)[: min(batch, n_iter - len(results))]]
+        results += pool.map([_decode(u, bounds) for u in take])
+        X = np.vstack([X, take])
+    return rank(results)
@@ -0,0 +1,241 @@
+"""Recorded-data transport and virtual clock for accelerated run_live replays.
+
+run_live(config_path, replay=ReplaySession(...)) swaps its network edges for
+these stand-ins: exchange klines, the Hyperliquid trade stream, the
+userFillsByTime poll and funding all answer from a Recording as of a virtual
+clock, and the sleeps of the bar loop advance that clock instead of waiting.
+A sleep is instant (speed=0) or takes seconds/speed of real time. Either way
+the trade stream is drained up to the new virtual time before the sleeper
+resumes, so the same recording and seed always replay to the same decisions.
+
+Recording layout (one directory):
+  candles.csv       ts (open time, ms), open, high, low, close, volume[, close_ts]
+  trades.jsonl      public trades as HyperliquidListener.stream() yields them
+  user_fills.jsonl  cohort fills {ts, address, coin, side, price, size}
+  funding.csv       ts, funding   (optional; 0.0 when absent)
+"""
+
+import asyncio
+import bisect
+import gzip
+import heapq
+import json
+import os
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+_INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "12h": 43_200_000, "1d": 86_400_000,
+}
+
+
+class ReplayClock:
+    """Virtual wall clock in epoch ms, advanced only by sleep()/advance()."""
+
+    def __init__(self, start_ms: int, speed: float = 0.0):
+        self._now_ms = int(start_ms)
+        self.speed = float(speed)
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = 0
+
+    def time(self) -> float:
+        return self._now_ms / 1000.0
+
+    def time_ms(self) -> int:
+        return self._now_ms
+
+    def advance(self, ts_ms: int) -> None:
+        """Move the clock forward to ts_ms and release waiters that are due, in deadline order."""
+        self._now_ms = max(self._now_ms, int(ts_ms))
+        while self._waiters and self._waiters[0][0] <= self._now_ms:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+
+    async def wait_until(self, ts_ms: int) -> None:
+        """Return once the virtual time reaches ts_ms (immediately if it already has)."""
+        if int(ts_ms) <= self._now_ms:
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(ts_ms), self._seq, fut))
+        self._seq += 1
+        await fut
+
+    async def sleep(self, seconds: float) -> None:
+        """Drop-in for asyncio.sleep in the bar loop."""
+        if self.speed > 0:
+            await asyncio.sleep(float(seconds) / self.speed)
+        self.advance(self._now_ms + int(round(float(seconds) * 1000.0)))
+        # Released waiters were scheduled first, so they run (and drain) before we resume
+        await asyncio.sleep(0)
+
+
+def _read_jsonl(path: str) -> List[Dict]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _find(root: str, name: str) -> Optional[str]:
+    for candidate in (os.path.join(root, name), os.path.join(root, name + ".gz")):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+@dataclass
+class Recording:
+    """Candles plus the trades, cohort fills and funding seen while they formed."""
+
+    candles: pd.DataFrame
+    trades: List[Dict] = field(default_factory=list)
+    user_fills: List[Dict] = field(default_factory=list)
+    funding: List[Tuple[int, float]] = field(default_factory=list)
+    interval: str = "5m"
+
+    def __post_init__(self):
+        c = self.candles.sort_values("ts").reset_index(drop=True)
+        if "close_ts" not in c.columns:
+            c["close_ts"] = c["ts"] + _INTERVAL_MS.get(self.interval, 300_000) - 1
+        self.candles = c
+        self._open_ts = c["ts"].astype("int64").tolist()
+        self._rows = [
+            [int(r[0]), float(r[1]), float(r[2]), float(r[3]), float(r[4]), float(r[5]), int(r[6])]
+            for r in c[["ts", "open", "high", "low", "close", "volume", "close_ts"]].itertuples(index=False)
+        ]
+        self.trades = sorted(self.trades, key=lambda t: int(t.get("ts", 0)))
+        self.user_fills = sorted(self.user_fills, key=lambda t: int(t.get("ts", 0)))
+        self._fill_ts = [int(f.get("ts", 0)) for f in self.user_fills]
+        self.funding = sorted((int(ts), float(rate)) for ts, rate in self.funding)
+        self._funding_ts = [ts for ts, _ in self.funding]
+
+    @classmethod
+    def load(cls, path: str, interval: str = "5m") -> "Recording":
+        candles = pd.read_csv(os.path.join(path, "candles.csv"))
+        trades_path = _find(path, "trades.jsonl")
+        fills_path = _find(path, "user_fills.jsonl")
+        funding_path = os.path.join(path, "funding.csv")
+        funding = []
+        if os.path.exists(funding_path):
+            fdf = pd.read_csv(funding_path)
+            funding = list(zip(fdf["ts"].astype("int64"), fdf["funding"].astype(float)))
+        return cls(
+            candles=candles,
+            trades=_read_jsonl(trades_path) if trades_path else [],
+            user_fills=_read_jsonl(fills_path) if fills_path else [],
+            funding=funding,
+            interval=interval,
+        )
+
+    def klines_until(self, now_ms: int, limit: int) -> List[List]:
+        """Binance-style rows for candles opened at or before now_ms (the last may be in progress)."""
+        end = bisect.bisect_right(self._open_ts, int(now_ms))
+        return [list(r) for r in self._rows[max(0, end - int(limit)):end]]
+
+    def fills_between(self, start_ms: int, end_ms: int) -> List[Dict]:
+        """Cohort fills with start_ms < ts <= end_ms."""
+        lo = bisect.bisect_right(self._fill_ts, int(start_ms))
+        hi = bisect.bisect_right(self._fill_ts, int(end_ms))
+        return [dict(f, source="user") for f in self.user_fills[lo:hi]]
+
+    def funding_at(self, now_ms: int) -> Optional[Tuple[int, float]]:
+        i = bisect.bisect_right(self._funding_ts, int(now_ms))
+        return self.funding[i - 1] if i > 0 else None
+
+
+class ReplayExchangeClient:
+    """Exchange REST stand-in for MarketData: klines as of the virtual clock, orders acknowledged locally."""
+
+    def __init__(self, recording: Recording, clock: ReplayClock):
+        self.recording = recording
+        self.clock = clock
+        self.orders: List[Dict] = []
+
+    def klines(self, symbol: str, interval: str, limit: int = 1000):
+        return self.recording.klines_until(self.clock.time_ms(), limit)
+
+    def new_order(self, **kwargs):
+        self.orders.append(dict(kwargs, ts=self.clock.time_ms()))
+        return {"status": "replay"}
+
+
+class ReplayListener:
+    """HyperliquidListener stand-in: yields recorded public trades as the virtual clock passes them."""
+
+    def __init__(self, recording: Recording, clock: ReplayClock, *args, **kwargs):
+        self.recording = recording
+        self.clock = clock
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def stream(self) -> AsyncIterator[Dict]:
+        for trade in self.recording.trades:
+            await self.clock.wait_until(int(trade.get("ts", 0)))
+            yield dict(trade)
+        # Recording exhausted: stay connected but silent, like a quiet socket
+        await asyncio.get_running_loop().create_future()
+
+
+class ReplaySession:
+    """Everything run_live needs to replay a Recording deterministically.
+
+    The clock starts just before candle `warmup_bars` opens, so the warmup
+    klines request returns the first warmup_bars candles. seed reseeds
+    np.random (bandit sampling) and the bandit starts from a fresh prior.
+    output_root, when set, replaces paper_trading_outputs/5m for logs and
+    state so replays do not write into the live bot's folders; run_live
+    points PAPER_TRADING_ROOT at it for the rest of the process.
+    """
+
+    def __init__(
+        self,
+        recording: Recording,
+        *,
+        warmup_bars: int = 1000,
+        speed: float = 0.0,
+        seed: Optional[int] = 0,
+        output_root: Optional[str] = None,
+    ):
+        self.recording = recording
+        n = len(recording.candles)
+        if n < 2:
+            raise ValueError("replay needs at least two candles")
+        self.warmup_bars = max(1, min(int(warmup_bars), n - 1))
+        self.clock = ReplayClock(int(recording._open_ts[self.warmup_bars]) - 1, speed=speed)
+        self.client = ReplayExchangeClient(recording, self.clock)
+        self.seed = seed
+        self.output_root = output_root
+        self._last_fill_poll_ms = self.clock.time_ms()
+
+    def listener(self, *args, **kwargs) -> ReplayListener:
+        """Factory with HyperliquidListener's signature."""
+        return ReplayListener(self.recording, self.clock, *args, **kwargs)
+
+    async def fetch_funding(self) -> Dict:
+        """FundingHL.fetch_latest stand-in."""
+        hit = self.recording.funding_at(self.clock.time_ms())
+        if hit is None:
+            return {"ts": self.clock.time_ms(), "coin": "BTC", "funding": 0.0, "stale": True}
+        return {"ts": hit[0], "coin": "BTC", "funding": hit[1], "stale": False}
+
+    def poll_user_fills(self, ts_end_ms: int) -> List[Dict]:
+        """Cohort fills since the previous poll, each returned exactly once."""
+        start = self._last_fill_poll_ms
+        self._last_fill_poll_ms = max(start, int(ts_end_ms))
+        return self.recording.fills_between(start, self._last_fill_poll_ms)
+
+    @property
+    def exhausted(self) -> bool:
+        """True once the last recorded candle has opened.
+
+        MarketData treats the newest kline as in progress, so from then on
+        every poll returns the same closed bar and nothing is left to replay.
+        """
+        return self.clock.time_ms() >= int(self.recording._open_ts[-1])
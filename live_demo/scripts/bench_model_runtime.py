@@ -0,0 +1,76 @@
+"""Per-call latency of ModelRuntime.infer: prepared NumPy path vs DataFrame path.
+
+Usage:
+    python live_demo/scripts/bench_model_runtime.py [--manifest PATH] [--calls N]
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from live_demo.model_runtime import ModelRuntime
+
+
+def _time_calls(fn, rows, calls: int) -> np.ndarray:
+    lat = np.empty(calls, dtype=float)
+    for i in range(calls):
+        x = rows[i % len(rows)]
+        t0 = time.perf_counter()
+        fn(x)
+        lat[i] = time.perf_counter() - t0
+    return lat
+
+
+def _summary(lat: np.ndarray) -> dict:
+    us = lat * 1e6
+    return {
+        'mean_us': round(float(us.mean()), 1),
+        'p50_us': round(float(np.percentile(us, 50)), 1),
+        'p95_us': round(float(np.percentile(us, 95)), 1),
+        'p99_us': round(float(np.percentile(us, 99)), 1),
+    }
+
+
+def main() -> None:
+    default_manifest = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models', 'LATEST.json'))
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--manifest', default=default_manifest)
+    ap.add_argument('--calls', type=int, default=2000)
+    ap.add_argument('--warmup', type=int, default=50)
+    args = ap.parse_args()
+
+    mr = ModelRuntime(args.manifest)
+    n = len(getattr(mr, 'columns', []) or [])
+    if n == 0:
+        raise SystemExit("No feature columns found; cannot benchmark")
+    rng = np.random.default_rng(7)
+    rows = [list(r) for r in rng.normal(0.0, 0.01, size=(256, n))]
+
+    # Both paths must agree before timing means anything
+    max_diff = 0.0
+    for x in rows[:32]:
+        a, b = mr.infer(x), mr._infer_dataframe(x)
+        max_diff = max(max_diff, *(abs(a[k] - b[k]) for k in ('p_down', 'p_neutral', 'p_up')))
+
+    _time_calls(mr._infer_dataframe, rows, args.warmup)
+    before = _time_calls(mr._infer_dataframe, rows, args.calls)
+    _time_calls(mr.infer, rows, args.warmup)
+    after = _time_calls(mr.infer, rows, args.calls)
+
+    report = {
+        'manifest': args.manifest,
+        'prepared': bool(getattr(mr, '_prepared', False)),
+        'calibrator_mode': getattr(mr, '_cal_mode', None),
+        'calls': args.calls,
+        'max_abs_prob_diff': max_diff,
+        'dataframe_path': _summary(before),
+        'prepared_path': _summary(after),
+        'speedup_p50': round(float(np.median(before) / max(np.median(after), 1e-12)), 2),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
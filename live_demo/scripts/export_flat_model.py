@@ -0,0 +1,70 @@
+"""Export the manifest's model to a flat NumPy file picked up by ModelRuntime.
+
+Writes <model>.flat.npz next to the joblib file, checks it against the sklearn
+model on random rows and reports single-row and batched latency.
+
+Usage:
+    python live_demo/scripts/export_flat_model.py [--manifest PATH] [--rows N]
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from live_demo.model_runtime import ModelRuntime
+from live_demo.models.artifact_registry import file_digest
+from live_demo.models.flat_model import FlatModel, export_flat, flat_export_path
+
+
+def _ms_per_call(fn, X, calls: int) -> float:
+    fn(X)
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn(X)
+    return round((time.perf_counter() - t0) / calls * 1000.0, 3)
+
+
+def main() -> None:
+    default_manifest = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models', 'LATEST.json'))
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--manifest', default=default_manifest)
+    ap.add_argument('--rows', type=int, default=2000, help='Random rows used for the parity check')
+    ap.add_argument('--calls', type=int, default=100)
+    args = ap.parse_args()
+
+    mr = ModelRuntime(args.manifest)
+    if mr.model is None or not mr.columns:
+        raise SystemExit("Model or feature schema failed to load; nothing to export")
+    out_path = flat_export_path(mr.model_path)
+    export_flat(mr.model, out_path, source_sha256=file_digest(mr.model_path))
+    flat = FlatModel.load(out_path)
+
+    X = np.random.default_rng(11).normal(0.0, 1.0, size=(args.rows, len(mr.columns)))
+    ref = np.asarray(mr.model.predict_proba(X), dtype=float)
+    max_diff = float(np.abs(flat.predict_proba(X) - ref).max())
+
+    report = {
+        'model': mr.model_path,
+        'export': out_path,
+        'model_type': flat.model_type,
+        'max_abs_prob_diff': max_diff,
+        'single_row_ms': {
+            'sklearn': _ms_per_call(mr.model.predict_proba, X[:1], args.calls),
+            'flat': _ms_per_call(flat.predict_proba, X[:1], args.calls),
+        },
+        'batch_288_ms': {
+            'sklearn': _ms_per_call(mr.model.predict_proba, X[:288], max(1, args.calls // 10)),
+            'flat': _ms_per_call(flat.predict_proba, X[:288], max(1, args.calls // 10)),
+        },
+        'live_runtime_uses_export': ModelRuntime(args.manifest)._flat is not None,
+    }
+    print(json.dumps(report, indent=2))
+    if max_diff > 1e-9:
+        os.remove(out_path)
+        raise SystemExit(f"Export differs from model by {max_diff:.3g}; removed {out_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Sweep the bandit freeze drawdown_threshold over historical rewards.
+
+Reads 'update' rows (chosen arm + reward) from bandit sheet CSVs, e.g.
+paper_trading_outputs/5m/sheets_fallback/bandit.csv, and replays them through
+replay_rewards() for every threshold at once. --synthetic N replays N random
+rewards instead (useful for timing).
+
+Usage:
+    python live_demo/scripts/tune_bandit_drawdown.py CSV [CSV ...] [--thresholds 0.05,0.1,0.2]
+    python live_demo/scripts/tune_bandit_drawdown.py --synthetic 1000000
+"""
+import argparse
+import csv
+import json
+import time
+
+import numpy as np
+
+from live_demo.bandit import replay_rewards
+
+# Same arm order as the live loop's reward attribution
+ARM_INDEX = {'pros': 0, 'amateurs': 1, 'model_meta': 2, 'model_bma': 3, 'model': 2}
+N_ARMS = 4
+
+
+def _read_updates(paths):
+    arms, rewards = [], []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('event') != 'update':
+                    continue
+                arm = ARM_INDEX.get(str(row.get('chosen')))
+                try:
+                    reward = float(row.get('reward'))
+                except (TypeError, ValueError):
+                    continue
+                if arm is not None:
+                    arms.append(arm)
+                    rewards.append(reward)
+    return np.asarray(arms, dtype=int), np.asarray(rewards, dtype=float)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument('csv', nargs='*', help='Bandit sheet CSV files, replayed in the given order')
+    ap.add_argument('--thresholds', default='0.05,0.075,0.10,0.15,0.20,0.30')
+    ap.add_argument('--recovery', type=float, default=0.08, help='freeze_recovery_threshold')
+    ap.add_argument('--synthetic', type=int, default=0, help='Replay N random rewards instead of CSVs')
+    ap.add_argument('--seed', type=int, default=7)
+    args = ap.parse_args()
+
+    if args.synthetic > 0:
+        rng = np.random.default_rng(args.seed)
+        arms = rng.integers(0, N_ARMS, args.synthetic)
+        rewards = rng.normal(0.02, 1.0, args.synthetic)
+    elif args.csv:
+        arms, rewards = _read_updates(args.csv)
+    else:
+        raise SystemExit("Pass bandit CSV files or --synthetic N")
+
+    thresholds = [float(x) for x in args.thresholds.split(',') if x.strip()]
+    t0 = time.perf_counter()
+    out = replay_rewards(arms, rewards, N_ARMS, thresholds, freeze_recovery_threshold=args.recovery)
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+
+    report = {
+        'n_rewards': int(out['n_rewards']),
+        'elapsed_ms': round(elapsed_ms, 1),
+        'cumulative_pnl': out['cumulative_pnl'],
+        'peak_pnl': out['peak_pnl'],
+        'max_drawdown': out['max_drawdown'],
+        'thresholds': [
+            {
+                'drawdown_threshold': float(thr),
+                'frozen_share': round(float(out['frozen_share'][k]), 6),
+                'n_freezes': int(out['n_freezes'][k]),
+                'skipped_updates': int(out['skipped_updates'][k]),
+                'frozen_at_end': bool(out['frozen'][k]),
+                'counts': out['counts'][k].tolist(),
+                'means': out['means'][k].tolist(),
+            }
+            for k, thr in enumerate(out['thresholds'])
+        ],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
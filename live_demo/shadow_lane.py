@@ -0,0 +1,183 @@
+"""Shadow evaluation of candidate models inside the live loop.
+
+Each bar the bot hands the lane the feature vector it just scored, the
+production model output and the final production decision. A single worker
+thread scores every candidate manifest on that same vector, runs it through
+gate_and_score with the live thresholds and tracks a hypothetical position per
+candidate. The bar loop only pays for a bounded queue put; when the worker
+falls behind, bars are dropped (and counted) rather than delaying decisions.
+
+One record per candidate per bar goes to the 'shadow_model_log' stream with
+production and candidate values side by side:
+  - p_up/p_down/p_neutral/s_model vs prod_p_up/prod_p_down/prod_s_model
+  - dir/alpha/gate_mode vs prod_dir/prod_alpha
+  - pnl_bps/cum_pnl_bps vs prod_pnl_bps/prod_cum_pnl_bps: the previous bar's
+    position (dir * alpha) times this bar's close-to-close return, minus
+    cost_bps per unit of position change (including the opening position on
+    the first scored bar)
+
+Candidates are gated with gate_and_score only; production may use the bandit
+(decide) and later guards, which are reflected in prod_dir.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from live_demo.decision import Thresholds, gate_and_score
+from live_demo.model_runtime import ModelRuntime
+
+STREAM = "shadow_model_log"
+_PROD = "__prod__"
+
+
+def _candidate_map(candidates) -> Dict[str, str]:
+    """Accept {name: manifest} or [manifest, ...] (named after the parent dir)."""
+    if isinstance(candidates, dict):
+        return {str(k): str(v) for k, v in candidates.items()}
+    out: Dict[str, str] = {}
+    for path in candidates or []:
+        name = os.path.basename(os.path.dirname(os.path.abspath(path))) or str(path)
+        if name in out:
+            name = f"{name}_{len(out)}"
+        out[name] = str(path)
+    return out
+
+
+class ShadowModelLane:
+    def __init__(
+        self,
+        candidates,
+        th: Thresholds,
+        asset: str = "BTC",
+        cost_bps: float = 0.0,
+        max_queue: int = 8,
+        writer: Optional[Callable[[Dict], None]] = None,
+    ):
+        self.candidates = _candidate_map(candidates)
+        self.th = th
+        self.asset = asset
+        self.cost_bps = float(cost_bps)
+        self._writer = writer
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._runtimes: Dict[str, ModelRuntime] = {}
+        self._pos: Dict[str, float] = {}
+        self._cum_bps: Dict[str, float] = {}
+        self._last_close: Optional[float] = None
+        self.stats = {"submitted": 0, "scored": 0, "dropped": 0, "errors": 0, "last_latency_ms": 0.0}
+        self._thread = threading.Thread(target=self._run, name="shadow-lane", daemon=True)
+        self._thread.start()
+
+    def submit(self, ts, x: List[float], cohort: Dict, prod_out: Dict, prod_decision: Dict, close: float) -> bool:
+        """Queue one bar for shadow scoring; never blocks the caller."""
+        item = (
+            ts,
+            list(x),
+            dict(cohort),
+            {k: prod_out.get(k) for k in ("p_up", "p_down", "p_neutral", "s_model")},
+            {"dir": prod_decision.get("dir", 0), "alpha": prod_decision.get("alpha", 0.0)},
+            float(close),
+        )
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["submitted"] += 1
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain queued bars and stop the worker."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _load(self) -> None:
+        # Loaded on the worker so startup and the bar loop never wait on unpickling
+        for name, manifest in self.candidates.items():
+            try:
+                self._runtimes[name] = ModelRuntime(manifest)
+            except Exception as e:
+                print(f"[ShadowLane] Failed to load candidate '{name}' ({manifest}): {e}")
+
+    def _run(self) -> None:
+        self._load()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            t0 = time.perf_counter()
+            try:
+                for rec in self._score(*item):
+                    self._write(rec)
+                self.stats["scored"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[ShadowLane] Scoring error: {e}")
+            self.stats["last_latency_ms"] = round((time.perf_counter() - t0) * 1000.0, 3)
+
+    def _step_pnl(self, key: str, position: float, ret_bps: Optional[float]) -> float:
+        prev = self._pos.get(key, 0.0)
+        # Turnover is charged even without a return (first bar, bad close)
+        pnl = -abs(position - prev) * self.cost_bps
+        if ret_bps is not None:
+            pnl += prev * ret_bps
+        self._pos[key] = position
+        self._cum_bps[key] = self._cum_bps.get(key, 0.0) + pnl
+        return pnl
+
+    def _score(self, ts, x, cohort, prod_out, prod_decision, close) -> List[Dict]:
+        ret_bps = None
+        if self._last_close and close > 0:
+            ret_bps = (close / self._last_close - 1.0) * 10000.0
+        self._last_close = close if close > 0 else self._last_close
+
+        prod_dir = int(prod_decision.get("dir") or 0)
+        prod_alpha = float(prod_decision.get("alpha") or 0.0)
+        prod_pnl = self._step_pnl(_PROD, prod_dir * prod_alpha, ret_bps)
+        base = {
+            "ts": ts,
+            "asset": self.asset,
+            "close": close,
+            "prod_p_up": prod_out.get("p_up"),
+            "prod_p_down": prod_out.get("p_down"),
+            "prod_s_model": prod_out.get("s_model"),
+            "prod_dir": prod_dir,
+            "prod_alpha": prod_alpha,
+            "prod_pnl_bps": prod_pnl,
+            "prod_cum_pnl_bps": self._cum_bps[_PROD],
+        }
+
+        records = []
+        for name, mr in self._runtimes.items():
+            out = mr.infer(x)
+            d = gate_and_score(cohort, out, self.th)
+            direction = int(d.get("dir", 0))
+            alpha = float(d.get("alpha", 0.0))
+            pnl = self._step_pnl(name, direction * alpha, ret_bps)
+            records.append({
+                **base,
+                "candidate": name,
+                "manifest": self.candidates[name],
+                "p_up": out.get("p_up"),
+                "p_down": out.get("p_down"),
+                "p_neutral": out.get("p_neutral"),
+                "s_model": out.get("s_model"),
+                "dir": direction,
+                "alpha": alpha,
+                "gate_mode": (d.get("details") or {}).get("mode"),
+                "pnl_bps": pnl,
+                "cum_pnl_bps": self._cum_bps[name],
+            })
+        return records
+
+    def _write(self, rec: Dict) -> None:
+        if self._writer is not None:
+            self._writer(rec)
+            return
+        from ops.llm_logging import write_jsonl
+        write_jsonl(STREAM, rec, asset=self.asset)
@@ -100,18 +100,15 @@ class SheetsLogger:
 
     def _paper_root(self) -> str:
         """Resolve the base paper_trading_outputs directory.
-        Policy: Use repo-local path, but if PAPER_TRADING_ROOT points to a subfolder
-        inside that repo path, honor it (for per-timeframe segregation).
+        Policy: an explicit root_dir wins (replays write outside the repo);
+        otherwise use the repo-local path, but if PAPER_TRADING_ROOT points to a
+        subfolder inside that repo path, honor it (for per-timeframe segregation).
         """
         demo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))  # .../live_demo
         repo_root = os.path.abspath(os.path.join(demo_dir, os.pardir))       # .../MetaStackerBandit
         repo_paper = os.path.abspath(os.path.join(repo_root, 'paper_trading_outputs'))
         if self._root_dir_override:
-            try:
-                if os.path.commonpath([self._root_dir_override, repo_paper]) == repo_paper:
-                    return self._root_dir_override
-            except Exception:
-                pass
+            return self._root_dir_override
         env = os.environ.get('PAPER_TRADING_ROOT')
         if env:
             try:
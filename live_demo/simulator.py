@@ -0,0 +1,525 @@
+"""Headless event-driven simulator of the live decision loop.
+
+Drives the objects run_live uses (LiveFeatureComputer, ModelRuntime,
+decide/gate_and_score, RiskAndExec.evaluate_pretrade_guards and the dry-run
+paper fills of RiskAndExec) from in-memory bar arrays. The only clock is the
+bar close timestamp, so there are no sleeps, network calls or Sheets writes
+and a year of bars replays in one call.
+
+Per-bar order is the offline branch of run_live:
+  1. BMA IC/vol update from the previous bar's predictions and realized bps
+  2. features from the bar, cohort snapshot, funding and the (empty) trade
+     tape; bars before LiveFeatureComputer.is_warmed() stop here
+  3. model inference and the BMA blend into the decision model_out
+  4. decide() when execution.bandit.enabled, else gate_and_score()
+  5. pre-trade guards, then the calibration no-trade band
+  6. warmup_skip_bars, force_validation_trade, forced exits, the daily stop,
+     cooldown, target_position and a dry-run mirror_to_exchange
+  7. position tracking, bandit reward for the previous bar's arm, paper
+     equity and the daily drawdown stop
+
+Logging is off unless a sink is given; it receives one dict per decided bar.
+Not simulated: the overlay/alignment branch, Hyperliquid fills (cohort
+signals come from optional pros/amateurs/mood columns and are otherwise
+flat, as offline), the Binance mood fallback, passive_then_cross
+execution, model hot reload and bandit persistence.
+"""
+
+import contextlib
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from live_demo.bandit import SimpleThompsonBandit
+from live_demo.cohort_signals import CohortState
+from live_demo.decision import Thresholds, decide, gate_and_score
+from live_demo.features import FeatureBuilder, LiveFeatureComputer
+from live_demo.model_runtime import ModelRuntime
+from live_demo.ops.bma import RollingIC, RollingVol, bma_weights
+from live_demo.reason_codes import GuardReasonCode
+from live_demo.risk_and_exec import RiskAndExec, RiskConfig
+from live_demo.trade_tape import IntrabarTradeAggregator
+
+ARMS = ("pros", "amateurs", "model_meta", "model_bma")
+_ARM_INDEX = {"pros": 0, "amateurs": 1, "model_meta": 2, "model_bma": 3, "model": 2}
+_OHLCV = ("open", "high", "low", "close", "volume")
+_OPTIONAL = ("funding", "pros", "amateurs", "mood", "bid", "ask")
+_NULL_COHORT = {"pros": 0.0, "amateurs": 0.0, "mood": 0.0}
+_BAR_MINUTES = {
+    "1m": 1.0, "3m": 3.0, "5m": 5.0, "15m": 15.0, "30m": 30.0,
+    "1h": 60.0, "2h": 120.0, "4h": 240.0, "12h": 720.0, "1d": 1440.0,
+}
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+Sink = Callable[[Dict], None]
+
+
+class SimClock:
+    """Simulated clock: the close timestamp (ms) of the bar being processed."""
+
+    def __init__(self, now_ms: int = 0):
+        self.now_ms = int(now_ms)
+
+    def advance(self, ts_ms: int) -> None:
+        self.now_ms = int(ts_ms)
+
+    def time(self) -> float:
+        return self.now_ms / 1000.0
+
+
+def bar_columns(bars: Union[pd.DataFrame, Dict]) -> Dict[str, List]:
+    """ts/open/high/low/close/volume (+ optional funding, pros, amateurs, mood,
+    bid, ask) as plain Python lists, which iterate faster than arrays."""
+    out = {"ts": np.asarray(bars["ts"], dtype=np.int64).tolist()}
+    for k in _OHLCV:
+        out[k] = np.asarray(bars[k], dtype=float).tolist()
+    for k in _OPTIONAL:
+        if k in bars:
+            out[k] = np.asarray(bars[k], dtype=float).tolist()
+    return out
+
+
+@contextlib.contextmanager
+def _silenced():
+    """Discard stdout and log records up to WARNING (guard/bandit chatter)."""
+    previous = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        logging.disable(previous)
+
+
+class Simulator:
+    """One simulated bot: warm it up on history, then feed it bars.
+
+    cfg is the bot config as load_config returns it. model defaults to the
+    ModelRuntime of artifacts.latest_manifest; any object with infer(x) works
+    when columns (the feature schema) is given. client is only consulted for
+    exchange filters/positions (None = unfiltered, flat exchange, as dry run).
+    """
+
+    def __init__(
+        self,
+        cfg: Dict,
+        model=None,
+        *,
+        columns: Optional[List[str]] = None,
+        bandit: Optional[SimpleThompsonBandit] = None,
+        client=None,
+        sink: Optional[Sink] = None,
+        clock: Optional[SimClock] = None,
+    ):
+        self.cfg = cfg
+        data_cfg = cfg.get("data", {}) or {}
+        self.symbol = str(data_cfg.get("symbol", "BTCUSDT"))
+        self.interval = str(data_cfg.get("interval", "5m"))
+        if model is None:
+            manifest = cfg["artifacts"]["latest_manifest"]
+            model = ModelRuntime(manifest if os.path.isabs(manifest) else os.path.join(_PROJECT_ROOT, manifest))
+        self.model = model
+        if columns is None:
+            columns = FeatureBuilder(model.feature_schema_path).columns
+        tape_cfg = (cfg.get("features", {}) or {}).get("tape", {}) or {}
+        self.lf = LiveFeatureComputer(
+            list(columns), timeframe="5m", use_tape_proxies=bool(tape_cfg.get("use_as_proxies", False))
+        )
+        self.tape = IntrabarTradeAggregator(coin="BTC", large_print_size=float(tape_cfg.get("large_print_size", 1.0)))
+        self.cohort = CohortState(window=50)
+        self.th = Thresholds(**cfg["thresholds"])
+        risk_cfg = dict(cfg["risk"])
+        risk_cfg["bar_minutes"] = _BAR_MINUTES.get(self.interval, 5.0)
+        self.risk = RiskAndExec(client, self.symbol, RiskConfig(**risk_cfg))
+        self.starting_equity = float(cfg.get("paper", {}).get("starting_equity", 10000.0))
+
+        exec_cfg = cfg.get("execution", {}) or {}
+        bandit_cfg = exec_cfg.get("bandit", {}) or {}
+        if bandit is None and bool(bandit_cfg.get("enabled", False)):
+            bandit = SimpleThompsonBandit(n_arms=len(ARMS))
+        self.bandit = bandit
+        try:
+            self.epsilon = float(bandit_cfg.get("epsilon", 0.0))
+        except (ValueError, TypeError):
+            self.epsilon = 0.0
+        try:
+            self.optimism = float(bandit_cfg.get("model_optimism", 0.0))
+        except (ValueError, TypeError):
+            self.optimism = 0.0
+        self.force_validation = bool(exec_cfg.get("force_validation_trade", False))
+
+        ens_cfg = cfg.get("ensemble", {}) or {}
+        bma_cfg = ens_cfg.get("bma", {}) or {}
+        self.enable_bma = bool(ens_cfg.get("enable_bma", False))
+        self.source = str(ens_cfg.get("source", "bma")).lower()
+        self.bma_freeze = bool(bma_cfg.get("freeze", False))
+        self.bma_kappa = float(bma_cfg.get("kappa", 8.0))
+        bma_win = int(bma_cfg.get("ic_window_bars", 200))
+        self.bma_ic = {"base": RollingIC(bma_win), "prob": RollingIC(bma_win)}
+        self.bma_vol = {"base": RollingVol(bma_win), "prob": RollingVol(bma_win)}
+        self.band_bps = float(cfg.get("calibration", {}).get("band_bps", 5))
+        self.controls = cfg.get("risk_controls", {})
+        self.microstructure = cfg.get("microstructure", {})
+        th_cfg, r_cfg = cfg.get("thresholds", {}), cfg.get("risk", {})
+        self.exit_thresholds = {
+            "exit_conf_min": float(th_cfg.get("exit_conf_min", 0.40)),
+            "exit_alpha_min": float(th_cfg.get("exit_alpha_min", 0.30)),
+            "max_position_duration_bars": int(th_cfg.get("max_position_duration_bars", 288)),
+            "stop_loss_bps": float(r_cfg.get("stop_loss_bps", 200.0)),
+            "take_profit_bps": float(r_cfg.get("take_profit_bps", 300.0)),
+        }
+
+        self.sink = sink
+        self.clock = clock or SimClock()
+        # Loop state carried between bars (names follow run_live)
+        self.bar_count = 0
+        self.last_ts: Optional[int] = None
+        self.prev_base_pred_bps: Optional[float] = None
+        self.prev_prob_pred_bps: Optional[float] = None
+        self.last_realized_bps: Optional[float] = None
+        self.bma_weights_state = [1.0, 0.0]
+        self.last_close_value: Optional[float] = None
+        self.last_exec_pos = 0.0
+        self.last_chosen_arm: Optional[str] = None
+        self.last_chosen_raw_val: Optional[float] = None
+        self.tgt: Optional[float] = None
+        self.used_force = False
+        self.stopped_for_day = False
+        self.session_peak_equity = self.starting_equity
+        self.equity: Optional[float] = None
+
+    # ---------- Warmup ----------
+    def warmup(self, bars: Union[pd.DataFrame, Dict]) -> None:
+        """Seed ADV20 and pre-warm the feature computer like run_live's startup."""
+        cols = bar_columns(bars)
+        n = len(cols["ts"])
+        if n == 0:
+            raise ValueError("warmup needs at least one bar")
+        bpd = int(round(1440.0 / _BAR_MINUTES.get(self.interval, 5.0)))
+        vol = pd.Series(cols["volume"])
+        adv20 = vol.tail(bpd * 20).mean() if n >= bpd * 20 else max(1.0, vol.mean())
+        try:
+            self.risk.adv20_usd = max(float(cols["close"][-1] * float(adv20)), 1_000_000.0)
+        except (TypeError, ValueError):
+            self.risk.adv20_usd = 1_000_000.0
+        self.cohort.set_adv20(self.risk.adv20_usd)
+        bar = None
+        for i in range(n):
+            bar = {k: cols[k][i] for k in _OHLCV}
+            self.lf.update_and_build(bar, _NULL_COHORT, 0.0)
+        # run_live repeats the last warmup bar as its mr_ema20_z sanity check
+        self.lf.update_and_build(bar, _NULL_COHORT, 0.0)
+
+    # ---------- Bar loop ----------
+    def run(
+        self,
+        bars: Union[pd.DataFrame, Dict],
+        seed: Optional[int] = None,
+        *,
+        batch_inference: bool = False,
+        quiet: bool = True,
+    ) -> Dict[str, np.ndarray]:
+        """Process bars in order; returns per-bar arrays for the bars processed.
+
+        seed reseeds np.random (bandit sampling/exploration) before the first
+        bar. Bars with ts <= the previous bar's ts are skipped, as live.
+        batch_inference builds every feature vector first and scores them with
+        one ModelRuntime.infer_batch call; features never depend on decisions,
+        but batched scores can differ from infer() in the last ulp, so keep
+        the default for exact parity with live. quiet discards the prints and
+        warnings of the live components (guards, bandit) during the run.
+        """
+        if seed is not None:
+            np.random.seed(seed)
+        cols = bar_columns(bars)
+        get = {k: cols.get(k) for k in _OPTIONAL}
+        kept, last = [], self.last_ts
+        for i, ts in enumerate(cols["ts"]):
+            if last is None or ts > last:
+                kept.append(i)
+                last = ts
+        rec = {k: [] for k in ("ts", "close", "warmed", "s_model", "dir", "alpha", "chosen",
+                               "mode", "target", "traded", "position", "equity")}
+        with _silenced() if quiet else contextlib.nullcontext():
+            inputs = []
+            for i in kept:
+                bar = {k: cols[k][i] for k in _OHLCV}
+                cohort = {k: get[k][i] for k in ("pros", "amateurs", "mood") if get[k] is not None} or None
+                book = {"bid": get["bid"][i], "ask": get["ask"][i]} if get["bid"] is not None and get["ask"] is not None else None
+                funding = get["funding"][i] if get["funding"] is not None else 0.0
+                inputs.append((cols["ts"][i], bar, funding, cohort, book))
+            model_outs = [None] * len(inputs)
+            states = None
+            if batch_inference:
+                # _features() writes each bar's cohort into self.cohort; keep the
+                # per-bar state so every decision sees its own bar's cohort
+                xs, states = [], []
+                for _, bar, funding, cohort, _ in inputs:
+                    xs.append(self._features(bar, funding, cohort))
+                    states.append((self.cohort.pros, self.cohort.amateurs, self.cohort.mood))
+                warm = [j for j, x in enumerate(xs) if x is not None]
+                if warm:
+                    scored = self.model.infer_batch(np.asarray([xs[j] for j in warm], dtype=float))
+                    for n, j in enumerate(warm):
+                        model_outs[j] = {k: float(scored[k][n]) for k in ("p_down", "p_neutral", "p_up", "s_model")}
+                        model_outs[j].update(a=scored["a"], b=scored["b"])
+            for j, (ts, bar, funding, cohort, book) in enumerate(inputs):
+                if states is None:
+                    x = self._features(bar, funding, cohort)
+                else:
+                    x = None
+                    self.cohort.pros, self.cohort.amateurs, self.cohort.mood = states[j]
+                out = self._advance(ts, bar, x, model_outs[j], funding, book)
+                rec["ts"].append(ts)
+                rec["close"].append(bar["close"])
+                if out is None:
+                    rec["warmed"].append(False)
+                    for k, v in (("s_model", np.nan), ("dir", 0), ("alpha", 0.0), ("chosen", -1), ("mode", ""),
+                                 ("target", np.nan), ("traded", False), ("position", self.risk.get_position()),
+                                 ("equity", np.nan)):
+                        rec[k].append(v)
+                    continue
+                decision = out["decision"]
+                det = decision.get("details", {}) or {}
+                rec["warmed"].append(True)
+                rec["s_model"].append(out["decision_model_out"].get("s_model", 0.0))
+                rec["dir"].append(int(decision["dir"]))
+                rec["alpha"].append(float(decision["alpha"]))
+                rec["chosen"].append(_ARM_INDEX.get(str(det.get("chosen")), -1))
+                rec["mode"].append(str(det.get("mode", "")))
+                rec["target"].append(np.nan if out["target"] is None else out["target"])
+                rec["traded"].append(bool(out["exec_resp"]))
+                rec["position"].append(self.risk.get_position())
+                rec["equity"].append(np.nan if self.equity is None else self.equity)
+        dtypes = {"ts": np.int64, "warmed": bool, "dir": np.int8, "chosen": np.int8, "mode": object, "traded": bool}
+        return {k: np.asarray(v, dtype=dtypes.get(k, float)) for k, v in rec.items()}
+
+    def step(
+        self,
+        ts: int,
+        bar: Dict[str, float],
+        *,
+        funding: float = 0.0,
+        cohort: Optional[Dict[str, float]] = None,
+        book_ticker: Optional[Dict[str, float]] = None,
+    ) -> Optional[Dict]:
+        """Run one closed bar through the live loop; None while features warm
+        up or when ts does not advance.
+
+        cohort, when given, replaces the cohort state's pros/amateurs/mood.
+        """
+        if self.last_ts is not None and int(ts) <= self.last_ts:
+            return None
+        x = self._features(bar, funding, cohort)
+        return self._advance(ts, bar, x, None, funding, book_ticker)
+
+    def _features(self, bar: Dict[str, float], funding: float, cohort: Optional[Dict[str, float]]):
+        """Feature vector for the bar, or None before LiveFeatureComputer is warmed."""
+        if cohort is not None:
+            self.cohort.pros = float(cohort.get("pros", self.cohort.pros))
+            self.cohort.amateurs = float(cohort.get("amateurs", self.cohort.amateurs))
+            self.cohort.mood = float(cohort.get("mood", self.cohort.mood))
+        x = self.lf.update_and_build(bar, self.cohort.snapshot(), float(funding),
+                                     tape=self.tape.roll(close=float(bar["close"])))
+        return x if self.lf.is_warmed() else None
+
+    def _advance(self, ts, bar, x, model_out, funding, book_ticker) -> Optional[Dict]:
+        ts = int(ts)
+        c = float(bar["close"])
+        funding = float(funding)
+        self.last_ts = ts
+        self.clock.advance(ts)
+        risk = self.risk
+
+        # 1) BMA histories from the previous bar's predictions vs realized
+        if self.last_realized_bps is not None and self.prev_base_pred_bps is not None and self.prev_prob_pred_bps is not None:
+            for arm, pred in (("base", self.prev_base_pred_bps), ("prob", self.prev_prob_pred_bps)):
+                self.bma_ic[arm].add(float(pred), float(self.last_realized_bps))
+                self.bma_vol[arm].add(float(pred))
+            if not self.bma_freeze:
+                self.bma_weights_state = bma_weights(
+                    [self.bma_ic["base"].value(), self.bma_ic["prob"].value()],
+                    [self.bma_vol["base"].value(), self.bma_vol["prob"].value()],
+                    kappa=self.bma_kappa,
+                )
+
+        # 2) Warm gate (features were built by _features)
+        if x is None and model_out is None:
+            self.bar_count += 1
+            return None
+
+        # 3) Inference and BMA blend
+        if model_out is None:
+            model_out = self.model.infer(x)
+        p_up = float(model_out.get("p_up", 0.0))
+        p_down = float(model_out.get("p_down", 0.0))
+        s_model = float(model_out.get("s_model", 0.0))
+        base_pred_bps = 10000.0 * s_model
+        prob_pred_bps = 10000.0 * (p_up - p_down)
+        w_base, w_prob = (list(self.bma_weights_state) + [0.0, 0.0])[:2]
+        pred_bma_bps = (w_base * base_pred_bps) + (w_prob * prob_pred_bps)
+        self.prev_base_pred_bps = base_pred_bps
+        self.prev_prob_pred_bps = prob_pred_bps
+        decision_model_out = dict(model_out)
+        decision_model_out["s_model_meta"] = s_model
+        decision_model_out["s_model_bma"] = float(pred_bma_bps) / 10000.0
+        if self.source == "bma" and self.enable_bma:
+            decision_model_out["s_model"] = decision_model_out["s_model_bma"]
+        else:
+            decision_model_out["s_model"] = s_model
+
+        # 4) Decision
+        snap = self.cohort.snapshot()
+        if self.bandit is not None:
+            decision = decide(snap, decision_model_out, self.th, bandit=self.bandit,
+                              epsilon=self.epsilon, model_optimism=self.optimism)
+        else:
+            decision = gate_and_score(snap, decision_model_out, self.th)
+        if self.enable_bma:
+            decision = {
+                **decision,
+                "details": {**decision.get("details", {}), "model_source": self.source, "bma_w_base": float(w_base),
+                            "bma_w_prob": float(w_prob), "pred_bma_bps": float(pred_bma_bps)},
+            }
+        if self.bandit is not None:
+            raw_val = (decision.get("details", {}) or {}).get("raw_val")
+            try:
+                self.last_chosen_raw_val = float(raw_val) if raw_val is not None else None
+            except (TypeError, ValueError):
+                self.last_chosen_raw_val = None
+
+        # 5) Pre-trade guards, then the calibration band
+        try:
+            decision = risk.evaluate_pretrade_guards(
+                decision, ts_ms=ts, book_ticker=book_ticker, funding_rate=funding, last_price=c,
+                controls=self.controls, microstructure_cfg=self.microstructure,
+            )
+        except Exception:
+            pass
+        a = float(model_out.get("a", 0.0))
+        b = float(model_out.get("b", 1.0))
+        pred_cal_bps = 10000.0 * (a + (b * float(decision_model_out.get("s_model", 0.0))))
+        if abs(pred_cal_bps) <= self.band_bps:
+            decision = {
+                **decision, "dir": 0, "alpha": 0.0,
+                "details": {**decision.get("details", {}), "mode": GuardReasonCode.CALIBRATION_BAND.value,
+                            "pred_cal_bps": pred_cal_bps, "band_bps": self.band_bps},
+            }
+
+        # 6) Risk and execution
+        exec_resp = None
+        target = None
+        if self.bar_count >= int(getattr(risk.cfg, "warmup_skip_bars", 0) or 0):
+            if decision["dir"] == 0 and self.force_validation and not self.used_force:
+                decision = {**decision, "dir": 1, "alpha": max(0.05, abs(model_out.get("s_model", 0.1)))}
+                self.used_force = True
+            try:
+                should_close, close_reason = risk.should_close_position(
+                    current_bar=self.bar_count, current_price=c, decision=decision,
+                    exit_thresholds=self.exit_thresholds,
+                )
+                if should_close:
+                    decision = risk.get_exit_decision(decision)
+                    decision["details"]["exit_reason"] = close_reason
+            except Exception:
+                pass
+            if self.stopped_for_day:
+                target = self.tgt = 0.0
+                exec_resp = risk.mirror_to_exchange(target, last_price=c, dry_run=True)
+            elif not risk.in_cooldown(ts):
+                target = self.tgt = (
+                    risk.target_position(decision["dir"], decision["alpha"]) if decision["dir"] != 0 else 0.0
+                )
+                risk.notify_order_attempt(ts)
+                exec_resp = risk.mirror_to_exchange(target, last_price=c, dry_run=True)
+                risk.set_cooldown(ts)
+
+        # 7) Position tracking, bandit reward, paper equity and daily stop
+        if exec_resp:
+            # run_live tracks the order's target quantity here, not the fraction
+            new_pos = float(exec_resp.get("target_qty", 0.0)) if "target_qty" in exec_resp else float(self.tgt or 0.0)
+            risk.update_position_tracking(
+                new_pos=new_pos, current_bar=self.bar_count,
+                current_price=float(exec_resp.get("price", c)), ts_ms=ts,
+            )
+            risk.post_execution_update(exec_resp, ts)
+        if self.bandit is not None and self.last_close_value is not None and self.last_chosen_arm is not None:
+            if self.last_chosen_raw_val is not None:
+                reward = 10000.0 * ((c / self.last_close_value) - 1.0) * float(self.last_chosen_raw_val)
+            else:
+                reward = ((c / self.last_close_value) - 1.0) * self.last_exec_pos
+            arm_index = _ARM_INDEX.get(str(self.last_chosen_arm))
+            if arm_index is not None:
+                self.bandit.update(int(arm_index), float(reward))
+        if self.last_close_value is not None:
+            self.last_realized_bps = 10000.0 * ((c / float(self.last_close_value)) - 1.0)
+        self.last_close_value = c
+        self.last_exec_pos = self.tgt if self.tgt is not None else 0.0
+        self.last_chosen_arm = (decision.get("details", {}) or {}).get("chosen") if self.bandit is not None else None
+
+        ps = risk.get_paper_state()
+        unrealized = (c - ps["paper_avg_px"]) * ps["paper_qty"] if abs(ps["paper_qty"]) > 1e-12 else 0.0
+        self.equity = self.starting_equity + ps["realized_pnl"] + unrealized
+        self.session_peak_equity = max(self.session_peak_equity, self.equity)
+        dd_pct = 100.0 * (self.session_peak_equity - self.equity) / max(1e-9, self.session_peak_equity)
+        stop_thr = float(getattr(risk.cfg, "daily_stop_dd_pct", 0.0) or 0.0)
+        if (not self.stopped_for_day) and stop_thr > 0.0 and dd_pct >= stop_thr:
+            self.stopped_for_day = True
+
+        out = {
+            "ts": ts,
+            "bar_id": self.bar_count,
+            "model_out": model_out,
+            "decision_model_out": decision_model_out,
+            "decision": decision,
+            "target": target,
+            "exec_resp": exec_resp,
+            "equity": self.equity,
+        }
+        if self.sink is not None:
+            self.sink({**out, "close": c, "position": risk.get_position(), "funding": funding})
+        self.bar_count += 1
+        return out
+
+
+def simulate(
+    cfg: Dict,
+    bars: pd.DataFrame,
+    *,
+    warmup_bars: int = 1000,
+    model=None,
+    sink: Optional[Sink] = None,
+    seed: Optional[int] = None,
+    batch_inference: bool = False,
+    **kwargs,
+) -> Dict[str, np.ndarray]:
+    """Warm up on the first warmup_bars rows (1000, as offline run_live does
+    with snapshot.csv) and simulate the rest."""
+    warmup_bars = min(int(warmup_bars), len(bars) - 1)
+    sim = Simulator(cfg, model, sink=sink, **kwargs)
+    sim.warmup(bars.iloc[:warmup_bars])
+    return sim.run(bars.iloc[warmup_bars:], seed=seed, batch_inference=batch_inference)
+
+
+def summarize(result: Dict[str, np.ndarray]) -> Dict:
+    """Headline numbers of a run() result."""
+    warmed = result["warmed"]
+    eq = result["equity"][warmed]
+    traded = result["traded"]
+    max_dd = 0.0
+    if eq.size:
+        peak = np.maximum.accumulate(eq)
+        max_dd = float(np.max((peak - eq) / np.maximum(peak, 1e-9)))
+    return {
+        "n_bars": int(len(warmed)),
+        "n_decisions": int(warmed.sum()),
+        "n_long": int(np.count_nonzero(result["dir"] > 0)),
+        "n_short": int(np.count_nonzero(result["dir"] < 0)),
+        "n_trades": int(traded.sum()),
+        "final_equity": float(eq[-1]) if eq.size else None,
+        "max_drawdown": max_dd,
+        "arm_counts": {arm: int(np.count_nonzero(result["chosen"] == i)) for i, arm in enumerate(ARMS)},
+    }
@@ -201,7 +201,15 @@ class TestOverlaySignalGenerator(unittest.TestCase):
             'p_neutral': 0.3,
             's_model': 0.1
         }
-        
+        self.mock_model_runtime.infer_batch.side_effect = lambda X: {
+            'p_up': np.full(len(X), 0.4),
+            'p_down': np.full(len(X), 0.3),
+            'p_neutral': np.full(len(X), 0.3),
+            's_model': np.full(len(X), 0.1),
+            'a': 0.0,
+            'b': 1.0,
+        }
+
         self.mock_feature_computer = Mock()
         self.mock_feature_computer.compute_all_timeframe_features.return_value = {
             "5m": OverlayFeatures(
@@ -234,7 +242,11 @@ class TestOverlaySignalGenerator(unittest.TestCase):
         self.assertIsInstance(result, OverlaySignalResult)
         self.assertIn("5m", result.signals)
         self.assertIn("15m", result.signals)
-        
+
+        # All timeframes are scored in one batched call
+        self.mock_model_runtime.infer_batch.assert_called_once()
+        self.mock_model_runtime.infer.assert_not_called()
+
         # Check individual signals
         for tf, signal in result.signals.items():
             self.assertIsInstance(signal, OverlaySignal)
@@ -0,0 +1,135 @@
+"""Incremental intrabar aggregation of the public trade tape.
+
+HyperliquidListener streams every public BTC print. Instead of buffering the
+prints and recomputing microstructure statistics when the bar closes, the
+aggregator folds each trade into a handful of running sums as it arrives.
+Closing a bar (``roll``) is O(1): it turns the sums into features and resets.
+
+The bar is rolled a little after its close, so prints for the next bar can
+arrive first. With ``bar_ms`` set and ``roll(close_ts=...)`` given the bar's
+close time, a trade stamped after the close of the bar being aggregated is
+folded into a second set of sums that becomes the next bar on roll.
+
+Features produced per bar:
+  - tape_vwap:          volume-weighted average trade price
+  - tape_vwap_dev:      close / VWAP - 1 (0.0 when no trades or no close)
+  - tape_imbalance:     (buy_vol - sell_vol) / (buy_vol + sell_vol), in [-1, 1]
+  - tape_trade_count:   number of prints in the bar
+  - tape_large_share:   share of volume printed in trades >= large_print_size
+  - tape_rv_intrabar:   realized variance, sum of squared trade-to-trade log returns
+"""
+
+import math
+from typing import Dict, Optional
+
+
+TAPE_FEATURES = (
+    "tape_vwap",
+    "tape_vwap_dev",
+    "tape_imbalance",
+    "tape_trade_count",
+    "tape_large_share",
+    "tape_rv_intrabar",
+)
+
+
+class _BarSums:
+    __slots__ = ("n", "sum_v", "sum_pv", "buy_v", "sell_v", "large_v", "rv", "last_px")
+
+    def __init__(self):
+        self.n = 0
+        self.sum_v = 0.0
+        self.sum_pv = 0.0
+        self.buy_v = 0.0
+        self.sell_v = 0.0
+        self.large_v = 0.0
+        self.rv = 0.0
+        self.last_px: Optional[float] = None
+
+
+class IntrabarTradeAggregator:
+    def __init__(self, coin: str = "BTC", large_print_size: float = 1.0, bar_ms: Optional[int] = None):
+        self.coin = coin.upper()
+        self.large_print_size = float(large_print_size)
+        self.bar_ms = int(bar_ms) if bar_ms else None
+        # Close time (ms) of the bar being aggregated; unknown until the first roll(close_ts=...)
+        self._close_ts: Optional[int] = None
+        self._bar = _BarSums()
+        self._next = _BarSums()
+
+    @property
+    def trade_count(self) -> int:
+        return self._bar.n
+
+    @property
+    def carried_count(self) -> int:
+        """Trades already folded into the next bar."""
+        return self._next.n
+
+    def add_trade(self, trade: Dict) -> bool:
+        """Fold one normalized trade (HyperliquidListener format) into its bar.
+
+        Returns False when the trade is ignored (other coin, non-public source,
+        or non-positive price/size). Trades stamped after the current bar's
+        close go to the next bar.
+        """
+        if str(trade.get("source") or "public") != "public":
+            return False
+        if str(trade.get("coin") or self.coin).upper() != self.coin:
+            return False
+        try:
+            px = float(trade.get("price") or 0.0)
+            sz = float(trade.get("size") or 0.0)
+            ts = int(trade.get("ts") or 0)
+        except (TypeError, ValueError):
+            return False
+        if px <= 0.0 or sz <= 0.0:
+            return False
+
+        b = self._next if self._close_ts is not None and ts > self._close_ts else self._bar
+        b.n += 1
+        b.sum_v += sz
+        b.sum_pv += px * sz
+        side = str(trade.get("side") or "").lower()
+        if side in ("buy", "b", "bid"):
+            b.buy_v += sz
+        elif side in ("sell", "a", "ask"):
+            b.sell_v += sz
+        if sz >= self.large_print_size:
+            b.large_v += sz
+        if b.last_px is not None:
+            lr = math.log(px / b.last_px)
+            b.rv += lr * lr
+        b.last_px = px
+        return True
+
+    def snapshot(self, close: Optional[float] = None) -> Dict[str, float]:
+        """Current bar statistics without resetting."""
+        b = self._bar
+        vwap = (b.sum_pv / b.sum_v) if b.sum_v > 0 else 0.0
+        signed_tot = b.buy_v + b.sell_v
+        imbalance = ((b.buy_v - b.sell_v) / signed_tot) if signed_tot > 0 else 0.0
+        large_share = (b.large_v / b.sum_v) if b.sum_v > 0 else 0.0
+        vwap_dev = 0.0
+        if vwap > 0 and close:
+            vwap_dev = (float(close) / vwap) - 1.0
+        return {
+            "tape_vwap": vwap,
+            "tape_vwap_dev": vwap_dev,
+            "tape_imbalance": imbalance,
+            "tape_trade_count": float(b.n),
+            "tape_large_share": large_share,
+            "tape_rv_intrabar": b.rv,
+        }
+
+    def roll(self, close: Optional[float] = None, close_ts: Optional[int] = None) -> Dict[str, float]:
+        """Close the current bar: return its statistics and start the next one.
+
+        close_ts is the closing bar's close time (ms); with bar_ms set, the next
+        bar then closes at close_ts + bar_ms and later trades are carried past it.
+        """
+        out = self.snapshot(close)
+        self._bar, self._next = self._next, _BarSums()
+        if close_ts is not None and self.bar_ms:
+            self._close_ts = int(close_ts) + self.bar_ms
+        return out
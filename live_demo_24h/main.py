@@ -38,7 +38,7 @@ from live_demo_24h.unified_overlay_system import UnifiedOverlaySystem, OverlaySy
 from live_demo_24h.alerts.alert_router import get_alert_router
 from ops.llm_logging import write_jsonl
 from live_demo_24h.ops.log_router import LogRouter
-from live_demo_24h.ops.bma import bma_weights, rolling_ic, series_vol
+from live_demo_24h.ops.bma import RollingIC, RollingVol, bma_weights
 
 
 def _deep_merge(base: Dict, override: Dict) -> Dict:
@@ -420,6 +420,12 @@ async def run_live(config_path: str, dry_run: bool = None):
     manifest_rel = cfg["artifacts"]["latest_manifest"]
     manifest = abspath(manifest_rel)
     mr = ModelRuntime(manifest)
+    reload_cfg = (cfg.get('artifacts', {}) or {}).get('hot_reload', {}) or {}
+    if bool(reload_cfg.get('enabled', False)):
+        mr.enable_hot_reload(
+            check_interval_s=float(reload_cfg.get('check_interval_s', 30.0)),
+            probation_calls=int(reload_cfg.get('probation_bars', 3)),
+        )
     fb = FeatureBuilder(mr.feature_schema_path)
     lf = LiveFeatureComputer(fb.columns, timeframe="1d")
 
@@ -566,11 +572,10 @@ async def run_live(config_path: str, dry_run: bool = None):
     session_peak_equity = starting_equity
 
     # BMA state: keep last-bar predictions (for alignment) and rolling histories
-    bma_preds_hist = {
-        'base': deque(maxlen=3000),
-        'prob': deque(maxlen=3000),
-    }
-    bma_realized_hist = deque(maxlen=3000)
+    # Streaming IC/vol per arm over the configured window (O(1) per bar)
+    bma_win = int(((cfg.get('ensemble', {}) or {}).get('bma', {}) or {}).get('ic_window_bars', 200))
+    bma_ic = {'base': RollingIC(bma_win), 'prob': RollingIC(bma_win)}
+    bma_vol = {'base': RollingVol(bma_win), 'prob': RollingVol(bma_win)}
     prev_base_pred_bps = None
     prev_prob_pred_bps = None
     last_realized_bps_buffer = None  # realized for the last completed bar, set later in the loop
@@ -635,9 +640,19 @@ async def run_live(config_path: str, dry_run: bool = None):
         try:
             from live_demo.bandit import BanditStateIO
 
-            bandit_io = BanditStateIO(path=bandit_state_path)
+            # Atomic snapshots, coalesced to at most one write per persist_every_s
+            # (and/or every persist_every_n saves); flushed on shutdown
+            bandit_io = BanditStateIO(
+                path=bandit_state_path,
+                flush_every_s=float(bandit_cfg.get('persist_every_s', 300.0)),
+                flush_every_n=int(bandit_cfg.get('persist_every_n', 0)),
+            )
             # 4 arms: pros, amateurs, model_meta, model_bma (mood removed)
             bandit = bandit_io.load(n_arms=4)
+            if not os.path.exists(bandit_state_path):
+                # Write the fresh prior now so runtime_bandit.json exists before the first (deferred) save
+                bandit_io.save(bandit)
+                bandit_io.flush()
         except (ImportError, OSError, ValueError, TypeError) as e:
             raise RuntimeError(f"Failed to initialize bandit: {e}") from e
 
@@ -936,19 +951,16 @@ async def run_live(config_path: str, dry_run: bool = None):
             # Update BMA histories with previous bar's aligned data (prev preds vs last realized)
             try:
                 if last_realized_bps_buffer is not None and prev_base_pred_bps is not None and prev_prob_pred_bps is not None:
-                    bma_preds_hist['base'].append(float(prev_base_pred_bps))
-                    bma_preds_hist['prob'].append(float(prev_prob_pred_bps))
-                    bma_realized_hist.append(float(last_realized_bps_buffer))
+                    for arm, pred in (('base', prev_base_pred_bps), ('prob', prev_prob_pred_bps)):
+                        bma_ic[arm].add(float(pred), float(last_realized_bps_buffer))
+                        bma_vol[arm].add(float(pred))
                     # Recompute weights from history (using config window/kappa) unless frozen
                     ens_cfg = cfg.get('ensemble', {}) or {}
                     bma_cfg = ens_cfg.get('bma', {}) or {}
                     if not bool(bma_cfg.get('freeze', False)):
-                        win = int(bma_cfg.get('ic_window_bars', 200))
                         kappa = float(bma_cfg.get('kappa', 8.0))
-                        ic_base = rolling_ic(bma_preds_hist['base'], bma_realized_hist, window=win)
-                        ic_prob = rolling_ic(bma_preds_hist['prob'], bma_realized_hist, window=win)
-                        vol_base = series_vol(bma_preds_hist['base'], window=win)
-                        vol_prob = series_vol(bma_preds_hist['prob'], window=win)
+                        ic_base, ic_prob = bma_ic['base'].value(), bma_ic['prob'].value()
+                        vol_base, vol_prob = bma_vol['base'].value(), bma_vol['prob'].value()
                         bma_weights_state = bma_weights([ic_base, ic_prob], [vol_base, vol_prob], kappa=kappa)
             except Exception:
                 pass
@@ -1114,7 +1126,10 @@ async def run_live(config_path: str, dry_run: bool = None):
             }
             x = lf.update_and_build(bar_row, cohort.snapshot(), funding_rate)
 
-            # 5) Model inference
+            # 5) Model inference (a validated hot-reloaded model is swapped in here, between bars)
+            reload_event = mr.poll_reload()
+            if reload_event:
+                print(f"🔁 Model reload {reload_event.get('status')}: {reload_event}")
             model_out = mr.infer(x)
             if not isinstance(model_out, dict) or model_out is None:
                 # Guard against unexpected runtime returns to avoid crashing ensemble logic
@@ -1434,7 +1449,7 @@ async def run_live(config_path: str, dry_run: bool = None):
                         '', '', ''  # counts/means/variances after update
                     ],
                 )
-                # Persist bandit state immediately so runtime_bandit.json appears even before first reward
+                # Record the selection; written once the persist_every_s/_n debounce is due (or at shutdown)
                 try:
                     if bandit_io is not None:
                         bandit_io.save(bandit)
@@ -2145,6 +2160,9 @@ async def run_live(config_path: str, dry_run: bool = None):
             except gspread.exceptions.APIError:
                 # Keep running; rows remain buffered for a later retry
                 pass
+            # Write deferred bandit state once its debounce window has passed
+            if bandit_io is not None:
+                bandit_io.flush_if_due()
 
             # Simple pacing per bar
             if one_shot:
@@ -2152,6 +2170,9 @@ async def run_live(config_path: str, dry_run: bool = None):
             await asyncio.sleep(1)
             bar_count += 1
 
+        if bandit_io is not None:
+            bandit_io.flush()
+
         # Clean up consumer task on exit (e.g., one-shot mode)
         try:
             if _consumer_task:
@@ -2,8 +2,14 @@
 
 Lightweight utilities to compute rolling information coefficients (IC),
 estimate per-model volatility, and derive BMA weights.
+
+rolling_ic/series_vol recompute from a history each call. RollingIC and
+RollingVol give the same values from streaming sums with O(1) add/evict,
+for callers that update once per bar.
 """
-from typing import Iterable, List
+import math
+from collections import deque
+from typing import Iterable, List, Optional
 import numpy as np
 
 
@@ -81,3 +87,141 @@ def bma_weights(ic_vec: List[float], vol_vec: List[float], kappa: float = 8.0, e
     except Exception:
         n = max(1, len(ic_vec))
         return [1.0 / n] * n
+
+
+def _default_min_samples(window: int) -> int:
+    return max(10, min(window, 200))
+
+
+def _shifted_var(s: float, ss: float, n: int) -> float:
+    """Population variance from shifted sums; relative round-off treated as zero."""
+    m = s / n
+    v = ss / n - m * m
+    return v if v > 1e-12 * (ss / n) else 0.0
+
+
+class RollingIC:
+    """Streaming counterpart of rolling_ic(): Pearson IC over the last `window` pairs.
+
+    Sums are kept over finite pairs only, shifted by a reference pair so that
+    constant windows give exactly zero variance. They are recomputed from the
+    window every `window` evictions to bound floating-point drift.
+    Same guards as rolling_ic: 0.0 until `min_samples` pairs (finite or not)
+    are in the window, with <= 1 finite pair, or a zero-variance series.
+    """
+
+    def __init__(self, window: int = 200, min_samples: Optional[int] = None):
+        self.window = int(window)
+        self.min_samples = _default_min_samples(self.window) if min_samples is None else int(min_samples)
+        self._buf: deque = deque()
+        self._evictions = 0
+        self._resync()
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def _resync(self) -> None:
+        self._n = 0
+        self._sp = self._sr = self._spp = self._srr = self._spr = 0.0
+        ref = next(((p, r) for p, r, ok in self._buf if ok), None)
+        self._kp, self._kr = ref if ref is not None else (None, None)
+        for p, r, ok in self._buf:
+            if ok:
+                self._acc(p, r, 1.0)
+        self._evictions = 0
+
+    def _acc(self, p: float, r: float, sign: float) -> None:
+        dp, dr = p - self._kp, r - self._kr
+        self._n += int(sign)
+        self._sp += sign * dp
+        self._sr += sign * dr
+        self._spp += sign * dp * dp
+        self._srr += sign * dr * dr
+        self._spr += sign * dp * dr
+
+    def add(self, pred: float, realized: float) -> None:
+        p, r = float(pred), float(realized)
+        ok = math.isfinite(p) and math.isfinite(r)
+        self._buf.append((p, r, ok))
+        if ok:
+            if self._kp is None:
+                self._kp, self._kr = p, r
+            self._acc(p, r, 1.0)
+        if len(self._buf) > self.window:
+            op, orr, ook = self._buf.popleft()
+            if ook:
+                self._acc(op, orr, -1.0)
+            self._evictions += 1
+            if self._evictions >= self.window or self._n == 0:
+                self._resync()
+
+    def value(self) -> float:
+        if len(self._buf) < self.min_samples or self._n <= 1:
+            return 0.0
+        n = self._n
+        vp = _shifted_var(self._sp, self._spp, n)
+        vr = _shifted_var(self._sr, self._srr, n)
+        if vp <= 0.0 or vr <= 0.0:
+            return 0.0
+        cov = self._spr / n - (self._sp / n) * (self._sr / n)
+        c = cov / math.sqrt(vp * vr)
+        if not math.isfinite(c):
+            return 0.0
+        return max(-1.0, min(1.0, c))
+
+
+class RollingVol:
+    """Streaming counterpart of series_vol(): std of the finite values in the last `window`.
+
+    Returns 1.0 for an empty window or fewer than `min_samples` finite values,
+    otherwise max(std, eps).
+    """
+
+    def __init__(self, window: int = 200, eps: float = 1e-9, min_samples: Optional[int] = None):
+        self.window = int(window)
+        self.eps = float(eps)
+        self.min_samples = _default_min_samples(self.window) if min_samples is None else int(min_samples)
+        self._buf: deque = deque()
+        self._evictions = 0
+        self._resync()
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def _resync(self) -> None:
+        self._n = 0
+        self._s = self._ss = 0.0
+        self._k = next((x for x in self._buf if math.isfinite(x)), None)
+        for x in self._buf:
+            if math.isfinite(x):
+                self._acc(x, 1.0)
+        self._evictions = 0
+
+    def _acc(self, x: float, sign: float) -> None:
+        d = x - self._k
+        self._n += int(sign)
+        self._s += sign * d
+        self._ss += sign * d * d
+
+    def add(self, x: float) -> None:
+        x = float(x)
+        self._buf.append(x)
+        if math.isfinite(x):
+            if self._k is None:
+                self._k = x
+            self._acc(x, 1.0)
+        if len(self._buf) > self.window:
+            old = self._buf.popleft()
+            if math.isfinite(old):
+                self._acc(old, -1.0)
+            self._evictions += 1
+            if self._evictions >= self.window or self._n == 0:
+                self._resync()
+
+    def value(self) -> float:
+        if not self._buf or self._n < self.min_samples:
+            return 1.0
+        v = math.sqrt(_shifted_var(self._s, self._ss, self._n))
+        if not math.isfinite(v):
+            return 1.0
+        return max(v, self.eps)
@@ -12,17 +12,41 @@ Conventions:
 
 These utilities are additive and do not change existing logging; they write
 into logs/<stream>/date=YYYY-MM-DD/asset=<ASSET>/<stream>.jsonl.gz
+
+write_jsonl keeps one file handle open per partition (see GzipJsonlWriter):
+records are buffered for a few seconds, and each flush extends the current
+block's gzip member and rewrites its trailer, so the file is a valid
+multi-member gzip between flushes and plain gzip.open readers work on the
+live day. A block is one member of about BLOCK_BYTES uncompressed, not one
+member per flush, so even slow streams decompress in large members. A member
+cut short by a crash is reduced to its complete lines by the next session
+before it appends.
+
+Each block's member offset is appended as "<offset>\t<ts_ist>" (its first
+record's time) to a <stream>.idx sidecar.
+read_gzip_tail() and read_gzip_range() seek straight to the members they
+need, so the cost of a tail or time-range read does not grow with the size
+of the day's file.
+
+Closed days can be compacted to a typed <stream>.parquet next to the JSONL
+(ops/log_compaction.py); read_log_partition() and the readers here prefer the
+compacted file and fall back to the JSONL when no parquet engine is present.
 """
 
 from __future__ import annotations
 
+import atexit
 import gzip
+import io
 import json
 import os
 import pathlib
+import threading
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import pytz
@@ -33,6 +57,7 @@ RUN_ID = os.environ.get("RUN_ID", str(uuid.uuid4()))
 # Per-record budget and per-stream daily budget guard (soft)
 SIZE_BUDGET = dict(max_fields=32, max_bytes=1500)  # bytes after JSON serialization
 STREAM_BUDGET_MB = 200  # soft daily ceiling per asset per stream
+BLOCK_BYTES = 64 * 1024  # uncompressed bytes per independently decodable block (see index_path)
 
 
 def ist_now() -> str:
@@ -46,14 +71,35 @@ def bar_id_from_ts(ts_ist: str, freq_minutes: int = 5) -> int:
     Note: This is a deterministic mapping for logging; for trading logic use
     your existing bar sequencing.
     """
-    ts = pd.to_datetime(ts_ist)
-    # Floor to frequency
     nanos = int(freq_minutes) * 60 * 1_000_000_000
-    return int(ts.value // nanos)
+    dt = _parse_iso(ts_ist)
+    if dt is None:
+        ts = pd.to_datetime(ts_ist)
+        return int(ts.value // nanos)
+    # Same epoch-ns value pandas computes (naive timestamps count as UTC)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    value = (dt - _EPOCH) // timedelta(microseconds=1) * 1000
+    return int(value // nanos)
 
 
-def _ensure_caps(rec: Dict) -> Dict:
-    """Trim a record to stay within field and byte budgets."""
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _parse_iso(ts_ist: str) -> Optional[datetime]:
+    """datetime.fromisoformat fast path for the ISO strings we write; None when it cannot parse."""
+    if not isinstance(ts_ist, str):
+        return None
+    try:
+        return datetime.fromisoformat(ts_ist)
+    except ValueError:
+        return None
+
+
+_BULKY_KEYS = ("reason_codes", "bandit_weights", "bandit_weights_slim", "feature_dump", "extra")
+
+
+def _trim_fields(rec: Dict) -> Dict:
     # Drop extra fields beyond the first N (stable order on insertion in Python 3.7+)
     keys = list(rec.keys())
     if len(keys) > SIZE_BUDGET["max_fields"]:
@@ -63,21 +109,66 @@ def _ensure_caps(rec: Dict) -> Dict:
     for k, v in list(rec.items()):
         if isinstance(v, str) and len(v) > 256:
             rec[k] = v[:256]
-    # Check serialized size and drop optional bulky keys if needed
-    s = json.dumps(rec, separators=(",", ":"))
-    if len(s.encode("utf-8")) > SIZE_BUDGET["max_bytes"]:
-        for k in [
-            "reason_codes",
-            "bandit_weights",
-            "bandit_weights_slim",
-            "feature_dump",
-            "extra",
-        ]:
-            if k in rec:
-                rec.pop(k, None)
     return rec
 
 
+def _ensure_caps(rec: Dict) -> Dict:
+    """Trim a record to stay within field and byte budgets."""
+    encode_capped(_trim_fields(rec))
+    return rec
+
+
+def encode_capped(rec: Dict) -> bytes:
+    """Serialize rec once; if over the byte budget drop optional bulky keys (in place) and re-encode."""
+    data = json.dumps(rec, separators=(",", ":")).encode("utf-8")
+    if len(data) > SIZE_BUDGET["max_bytes"]:
+        dropped = [k for k in _BULKY_KEYS if k in rec]
+        for k in dropped:
+            rec.pop(k)
+        if dropped:
+            data = json.dumps(rec, separators=(",", ":")).encode("utf-8")
+    return data
+
+
+def _freq_minutes(default: int) -> int:
+    # Allow overriding bar frequency for bar_id via environment (e.g., 60 for 1h, 720 for 12h)
+    try:
+        env_freq = os.environ.get("LLM_FREQ_MINUTES")
+        return int(env_freq) if env_freq is not None else int(default)
+    except Exception:
+        return int(default)
+
+
+def encode_jsonl(rec: Dict, *, freq_minutes: int = 5, capped: bool = True) -> Tuple[Dict, bytes]:
+    """Envelope (run_id, ts_ist, schema_v, bar_id) plus caps; returns (record, one JSONL line).
+
+    With capped=False the record is encoded whole; cap_encoded() derives the
+    budgeted line from that result only when the record is over budget.
+    """
+    rec = {"run_id": RUN_ID, **rec}
+    if "ts_ist" not in rec:
+        rec["ts_ist"] = ist_now()
+    rec.setdefault("schema_v", "1")
+    if "bar_id" not in rec:
+        rec["bar_id"] = bar_id_from_ts(rec["ts_ist"], freq_minutes=_freq_minutes(freq_minutes))
+    if not capped:
+        return rec, json.dumps(rec, separators=(",", ":")).encode("utf-8") + b"\n"
+    rec = _trim_fields(rec)
+    return rec, encode_capped(rec) + b"\n"
+
+
+def cap_encoded(rec: Dict, data: bytes) -> Tuple[Dict, bytes]:
+    """Budgeted (record, line) for an uncapped encode; the same objects when already within budget."""
+    if (
+        len(rec) <= SIZE_BUDGET["max_fields"]
+        and len(data) - 1 <= SIZE_BUDGET["max_bytes"]
+        and not any(isinstance(v, str) and len(v) > 256 for v in rec.values())
+    ):
+        return rec, data
+    rec = _trim_fields(dict(rec))
+    return rec, encode_capped(rec) + b"\n"
+
+
 def _unified_logs_root() -> pathlib.Path:
     """Resolve the absolute logs root.
 
@@ -98,42 +189,465 @@ def _unified_logs_root() -> pathlib.Path:
 
 
 def part_path(stream: str, ts_ist: str, asset: str = "ALL", *, base_root: Optional[str] = None) -> str:
-    dt = pd.to_datetime(ts_ist)
+    dt = _parse_iso(ts_ist) or pd.to_datetime(ts_ist)
     # If a base_root is provided, honor it; otherwise use unified logs root
     base_dir = pathlib.Path(base_root).resolve() if base_root else _unified_logs_root()
     base = base_dir / stream / f"date={dt.date()}" / f"asset={asset}"
     return str((base / f"{stream}.jsonl.gz").resolve())
 
 
+def index_path(path) -> pathlib.Path:
+    """<stream>.idx block index next to a <stream>.jsonl.gz partition."""
+    p = pathlib.Path(path)
+    name = p.name[: -len(".jsonl.gz")] if p.name.endswith(".jsonl.gz") else p.name.split(".")[0]
+    return p.with_name(name + ".idx")
+
+
+def _complete_members_end(data: bytes) -> int:
+    """Length of the prefix of data that consists of complete gzip members."""
+    pos = 0
+    while pos < len(data):
+        d = zlib.decompressobj(wbits=31)
+        try:
+            d.decompress(data[pos:])
+        except zlib.error:
+            break
+        if not d.eof:
+            break
+        pos = len(data) - len(d.unused_data)
+    return pos
+
+
+def _repair_partition(path: str) -> int:
+    """Finish a member left unfinished by a crash; returns the resulting file size.
+
+    The complete lines that member still decodes to are rewritten as a
+    finished member, so at most a partial record is lost. Only the data from
+    the last indexed member on is checked, so this stays cheap for indexed
+    partitions.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return 0
+    if size == 0:
+        return 0
+    entries = read_partition_index(path)
+    start = entries[-1][0] if entries else 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        end = start + _complete_members_end(f.read())
+    if end == start and start > 0:
+        with open(path, "rb") as f:  # stale index: check the whole file
+            end = _complete_members_end(f.read())
+    if end < size:
+        with open(path, "rb") as f:
+            f.seek(end)
+            salvaged = _complete_lines(_inflate(f.read()))
+        os.truncate(path, end)
+        if salvaged:
+            with open(path, "ab") as f:
+                f.write(gzip.compress(salvaged))
+        idx = index_path(path)
+        kept = b"".join(f"{off}\t{ts or ''}\n".encode("utf-8") for off, ts in entries
+                        if off < end or (salvaged and off == end))
+        idx.write_bytes(kept)
+        return os.path.getsize(path)
+    return end
+
+
+class _Partition:
+    """One open partition file: the current block is a single gzip member, finished at every flush.
+
+    Records are compressed incrementally into the open block's member; a
+    flush rewrites only that member's trailing bytes (compressor output not
+    yet final plus the gzip trailer, from a copy of the compressor), so the
+    file stays a complete multi-member gzip while the block grows to
+    block_bytes uncompressed and then becomes final.
+    """
+
+    __slots__ = ("path", "raw", "index", "size", "compresslevel", "block_bytes", "pending", "pending_bytes",
+                 "pending_ts", "comp", "block_at", "block_out", "block_len")
+
+    def __init__(self, path: str, compresslevel: int, block_bytes: int):
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.size = _repair_partition(path)
+        self.raw = open(path, "ab")
+        # A new file gets a new index; data written before indexing existed is one unindexed block
+        self.index = open(index_path(path), "wb" if self.size == 0 else "ab")
+        if self.size > 0 and self.index.tell() == 0:
+            self.index.write(b"0\t\n")
+        self.compresslevel = compresslevel
+        self.block_bytes = block_bytes
+        self.pending: List[bytes] = []
+        self.pending_bytes = 0
+        self.pending_ts: Optional[str] = None
+        self.comp = None  # compressor of the open block; None: no open block
+        self.block_at = 0  # offset of the open block's member
+        self.block_out = 0  # compressor output so far (final bytes of the member)
+        self.block_len = 0  # uncompressed bytes in the open block
+
+    def write(self, data: bytes, ts_ist: Optional[str]) -> None:
+        if not self.pending:
+            self.pending_ts = ts_ist
+        self.pending.append(data)
+        self.pending_bytes += len(data)
+        if self.block_len + self.pending_bytes >= self.block_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Add the buffered records to the open block's member and finish it on disk."""
+        if not self.pending:
+            return
+        opened = self.comp is None
+        if opened:
+            self.comp = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)
+            self.block_at, self.block_out, self.block_len = self.size, 0, 0
+        body = self.comp.compress(b"".join(self.pending))
+        self.block_len += self.pending_bytes
+        done = self.block_len >= self.block_bytes
+        trailer = self.comp.flush() if done else self.comp.copy().flush()
+        keep = self.block_at + self.block_out
+        if self.size > keep:
+            self.raw.truncate(keep)  # drop the previous flush's trailer
+        self.raw.write(body + trailer)
+        self.raw.flush()
+        self.block_out += len(body)
+        self.size = keep + len(body) + len(trailer)
+        # The index only ever points at members that are already on disk
+        if opened:
+            self.index.write(f"{self.block_at}\t{self.pending_ts or ''}\n".encode("utf-8"))
+            self.index.flush()
+        if done:
+            self.comp = None
+        self.pending, self.pending_bytes, self.pending_ts = [], 0, None
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.raw.close()
+            self.index.close()
+
+
+class GzipJsonlWriter:
+    """Append-only gzip JSONL writer with one open file handle per partition.
+
+    Each (root, stream, asset) has at most one open partition file: a record
+    for a new date flushes and closes the previous day's file before the new
+    one is opened. Buffered records reach disk by a daemon thread every
+    flush_interval_s, when a block fills, and on flush()/close(); every flush
+    leaves the file complete, and each block_bytes block is one gzip member
+    however many flushes it took (see _Partition). At most max_open files
+    stay open; the least recently written one is closed first. A partition
+    must have a single writing process.
+    """
+
+    def __init__(self, flush_interval_s: float = 2.0, max_open: int = 64, compresslevel: int = 6,
+                 block_bytes: int = BLOCK_BYTES):
+        self.flush_interval_s = float(flush_interval_s)
+        self.block_bytes = max(1, int(block_bytes))
+        self.max_open = max(1, int(max_open))
+        self.compresslevel = int(compresslevel)
+        self._lock = threading.RLock()
+        self._open: "OrderedDict[str, _Partition]" = OrderedDict()
+        self._current: Dict[Tuple[str, str], str] = {}
+        self._dirs: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def path_for(self, stream: str, ts_ist: str, asset: str, root: Optional[str]) -> str:
+        """part_path() with the resolved logs root cached."""
+        key = (root, os.environ.get("PAPER_TRADING_ROOT"))
+        base = self._dirs.get(key)
+        if base is None:
+            base = self._dirs[key] = str(pathlib.Path(root).resolve() if root else _unified_logs_root())
+        dt = _parse_iso(ts_ist) or pd.to_datetime(ts_ist)
+        return os.path.join(base, stream, f"date={dt.date()}", f"asset={asset}", f"{stream}.jsonl.gz")
+
+    def write(self, path: str, data: bytes, ts_ist: Optional[str] = None) -> None:
+        """Append bytes to the partition file at path (<stream>/date=D/asset=A/<stream>.jsonl.gz).
+
+        ts_ist is the (first) record's timestamp, used for the block index.
+        """
+        asset_dir = os.path.dirname(path)
+        key = (os.path.dirname(os.path.dirname(asset_dir)), os.path.basename(asset_dir))
+        with self._lock:
+            part = self._open.get(path)
+            if part is None:
+                previous = self._current.get(key)
+                if previous is not None and previous != path:
+                    self._close_path(previous)  # date boundary
+                while len(self._open) >= self.max_open:
+                    self._close_path(next(iter(self._open)))
+                part = self._open[path] = _Partition(path, self.compresslevel, self.block_bytes)
+                self._current[key] = path
+            else:
+                self._open.move_to_end(path)
+            part.write(data, ts_ist)
+            if self._flusher is None and self.flush_interval_s > 0:
+                self._stop.clear()
+                self._flusher = threading.Thread(target=self._flush_loop, name="jsonl-gzip-flush", daemon=True)
+                self._flusher.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            for part in self._open.values():
+                part.flush()
+
+    def close(self) -> None:
+        """Flush and close every open partition; the writer can be used again afterwards."""
+        self._stop.set()
+        with self._lock:
+            for path in list(self._open):
+                self._close_path(path)
+            self._current.clear()
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join(timeout=5.0)
+
+    def open_paths(self) -> List[str]:
+        with self._lock:
+            return list(self._open)
+
+    def _close_path(self, path: str) -> None:
+        part = self._open.pop(path, None)
+        if part is not None:
+            part.close()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval_s):
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+
+_WRITER = GzipJsonlWriter()
+atexit.register(_WRITER.close)
+
+
+def flush_jsonl() -> None:
+    """Make everything written so far readable from disk."""
+    _WRITER.flush()
+
+
+def close_jsonl() -> None:
+    """Flush and close all open partition files (called automatically at exit)."""
+    _WRITER.close()
+
+
 def write_jsonl(stream: str, rec: Dict, asset: str = "ALL", *, freq_minutes: int = 5, root: Optional[str] = None) -> str:
     """Append a single JSON record to the gzipped JSONL partition for (stream, date, asset).
 
     Returns: absolute path written to (string)
     """
-    # Minimal envelope
-    rec = {"run_id": RUN_ID, **rec}
-    rec.setdefault("ts_ist", ist_now())
-    rec.setdefault("schema_v", "1")
-    # Allow overriding bar frequency for bar_id via environment (e.g., 60 for 1h, 720 for 12h)
+    rec, data = encode_jsonl(rec, freq_minutes=freq_minutes)
+    p = _WRITER.path_for(stream, rec["ts_ist"], asset, root)
+    _WRITER.write(p, data, rec["ts_ist"])
+    return p
+
+
+def write_jsonl_bytes(stream: str, data: bytes, ts_ist: str, asset: str = "ALL", *, root: Optional[str] = None) -> str:
+    """Append an already encoded line (see encode_jsonl) to its partition."""
+    p = _WRITER.path_for(stream, ts_ist, asset, root)
+    _WRITER.write(p, data, ts_ist)
+    return p
+
+
+def _inflate(data: bytes) -> bytes:
+    """Decompress consecutive gzip members, stopping quietly at a truncated or corrupt one."""
+    out = []
+    while data:
+        d = zlib.decompressobj(wbits=31)
+        try:
+            out.append(d.decompress(data))
+        except zlib.error:
+            break
+        if not d.eof:
+            break
+        data = d.unused_data
+    return b"".join(out)
+
+
+def _complete_lines(raw: bytes) -> bytes:
+    if raw and not raw.endswith(b"\n"):
+        raw = raw[: raw.rfind(b"\n") + 1]
+    return raw
+
+
+def read_gzip_tolerant(path) -> bytes:
+    """Decompressed bytes of every member in a gzip file.
+
+    Unlike gzip.open, a final member without its trailer (left by a crash
+    that no later session has repaired) yields what was flushed instead of
+    raising. A trailing partial line is dropped.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return _complete_lines(_inflate(data))
+
+
+def read_partition_index(path) -> List[Tuple[int, Optional[str]]]:
+    """(offset, first ts_ist) per indexed member of a partition, by offset.
+
+    Entries past the end of the data file and malformed lines are skipped;
+    [] when there is no index.
+    """
     try:
-        env_freq = os.environ.get("LLM_FREQ_MINUTES")
-        fm = int(env_freq) if env_freq is not None else int(freq_minutes)
-    except Exception:
-        fm = int(freq_minutes)
-    rec.setdefault("bar_id", bar_id_from_ts(rec["ts_ist"], freq_minutes=fm))
-    rec = _ensure_caps(rec)
-    p = pathlib.Path(part_path(stream, rec["ts_ist"], asset, base_root=root))
-    p.parent.mkdir(parents=True, exist_ok=True)
-    with gzip.open(p, "ab") as f:
-        f.write((json.dumps(rec, separators=(",", ":")) + "\n").encode("utf-8"))
-    return str(p.resolve())
+        size = os.path.getsize(path)
+        with open(index_path(path), "rb") as f:
+            lines = f.read().decode("utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+    entries = {}
+    for line in lines:
+        parts = line.split("\t")
+        if len(parts) != 2:
+            continue
+        try:
+            offset = int(parts[0])
+        except ValueError:
+            continue
+        if 0 <= offset < size:
+            entries[offset] = parts[1] or None
+    return sorted(entries.items())
+
+
+def _read_blocks(f, offset: int, end: int) -> bytes:
+    """Inflate the members between byte offsets offset and end (a member start or EOF)."""
+    f.seek(offset)
+    return _inflate(f.read(end - offset))
+
+
+def read_gzip_tail(path, n: int) -> bytes:
+    """The last n complete lines of a partition, reading only the blocks they are in."""
+    if n <= 0:
+        return b""
+    entries = read_partition_index(path)
+    if not entries or entries[0][0] != 0:
+        return b"".join(read_gzip_tolerant(path).splitlines(keepends=True)[-n:])
+    chunks: List[bytes] = []
+    count = 0
+    with open(path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        for i in range(len(entries) - 1, -1, -1):
+            chunk = _complete_lines(_read_blocks(f, entries[i][0], end))
+            chunks.append(chunk)
+            count += chunk.count(b"\n")
+            end = entries[i][0]
+            if count >= n:
+                break
+    return b"".join(b"".join(reversed(chunks)).splitlines(keepends=True)[-n:])
+
+
+def _as_ist(ts) -> Optional[datetime]:
+    if ts is None or isinstance(ts, datetime):
+        return ts
+    return _parse_iso(str(ts)) or pd.Timestamp(ts).to_pydatetime()
+
+
+def _read_blocks_between(path, start: Optional[datetime], end: Optional[datetime]) -> bytes:
+    """Complete lines of the blocks that can hold records in [start, end] (whole file if unindexed)."""
+    entries = read_partition_index(path)
+    if not entries or entries[0][0] != 0:
+        return read_gzip_tolerant(path)
+    first = 0
+    stop = None
+    for i, (offset, ts) in enumerate(entries):
+        t = _parse_iso(ts) if ts else None
+        if t is None:
+            continue
+        if start is not None and t < start:
+            first = i
+        if end is not None and t > end and i > first:
+            stop = offset
+            break
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        return _complete_lines(_read_blocks(f, entries[first][0], size if stop is None else stop))
 
 
-def _read_jsonl_gz(path: pathlib.Path) -> Optional[pd.DataFrame]:
+def read_gzip_range(path, start=None, end=None) -> bytes:
+    """Lines whose ts_ist is within [start, end] (ISO strings or aware datetimes).
+
+    Uses the block index to skip members entirely before start or after end;
+    records are expected in time order within a partition.
+    """
+    start, end = _as_ist(start), _as_ist(end)
+    out = []
+    for line in _read_blocks_between(path, start, end).splitlines(keepends=True):
+        try:
+            t = _parse_iso(json.loads(line).get("ts_ist"))
+        except (ValueError, AttributeError):
+            continue
+        if t is None or (start is not None and t < start) or (end is not None and t > end):
+            continue
+        out.append(line)
+    return b"".join(out)
+
+
+def compacted_path(path) -> pathlib.Path:
+    """<stream>.parquet next to a <stream>.jsonl.gz partition (see ops/log_compaction.py)."""
+    p = pathlib.Path(path)
+    name = p.name[: -len(".jsonl.gz")] if p.name.endswith(".jsonl.gz") else p.name.split(".")[0]
+    return p.with_name(name + ".parquet")
+
+
+def _fresh_compacted(path) -> Optional[pathlib.Path]:
+    """The compacted file for a partition if it exists and is not older than the JSONL."""
+    c = compacted_path(path)
     try:
-        return pd.read_json(path, lines=True, compression="gzip")
+        c_mtime = c.stat().st_mtime
+    except OSError:
+        return None
+    try:
+        if pathlib.Path(path).stat().st_mtime > c_mtime:
+            return None
+    except OSError:
+        pass  # source removed after compaction
+    return c
+
+
+def read_log_partition(path, columns: Optional[List[str]] = None, since=None) -> Optional[pd.DataFrame]:
+    """Read one partition, preferring its compacted Parquet file (only `columns` if given).
+
+    since lets a JSONL read skip index blocks before that time; rows are not
+    filtered otherwise, so callers still apply their own cutoff.
+    """
+    c = pathlib.Path(path) if str(path).endswith(".parquet") else _fresh_compacted(path)
+    if c is not None:
+        try:
+            cols = None if columns is None else [col for col in columns if col in _parquet_columns(c)]
+            return pd.read_parquet(c, columns=cols)
+        except Exception:
+            if c == pathlib.Path(path):
+                return None
+            # no parquet engine or unreadable file: fall back to the JSONL
+    try:
+        raw = read_gzip_tolerant(path) if since is None else _read_blocks_between(path, _as_ist(since), None)
+        df = pd.read_json(io.BytesIO(raw), lines=True)
     except Exception:
         return None
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
+
+
+def _parquet_columns(path: pathlib.Path) -> List[str]:
+    import pyarrow.parquet as pq
+    return list(pq.read_schema(path).names)
+
+
+def _read_jsonl_gz(path: pathlib.Path) -> Optional[pd.DataFrame]:
+    return read_log_partition(path)
+
+
+def _orphan_compacted(root_path: pathlib.Path, pattern: str = "*.parquet") -> List[pathlib.Path]:
+    """Compacted partitions whose JSONL source was removed after compaction."""
+    return [p for p in root_path.rglob(pattern)
+            if not p.with_name(p.name[: -len(".parquet")] + ".jsonl.gz").exists()]
 
 
 def _normalize_df_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -285,14 +799,15 @@ def build_llm_context_pack(
         for name in names:
             globs.extend(root_path.rglob(f"{name}.jsonl.gz"))
             globs.extend(root_path.rglob(f"{name}.jsonl"))
+            globs.extend(_orphan_compacted(root_path, f"{name}.parquet"))
         if not globs:
             continue
         frames: List[pd.DataFrame] = []
         for g in globs:
             df = None
             pth = pathlib.Path(g)
-            if str(pth).endswith(".jsonl.gz"):
-                df = _read_jsonl_gz(pth)
+            if str(pth).endswith((".jsonl.gz", ".parquet")):
+                df = read_log_partition(pth, since=cutoff)
             else:
                 # Plain JSONL fallback
                 try:
@@ -352,6 +867,7 @@ def build_llm_context_pack(
     overlay_globs = []
     overlay_globs.extend(root_path.rglob("overlay_status.jsonl.gz"))
     overlay_globs.extend(root_path.rglob("overlay_status.jsonl"))
+    overlay_globs.extend(_orphan_compacted(root_path, "overlay_status.parquet"))
     overlay_frames: List[pd.DataFrame] = []
     for g in overlay_globs:
         df = _read_jsonl_gz(g)
@@ -516,6 +1032,7 @@ def _collect_all_stream_files(root_path: pathlib.Path) -> List[pathlib.Path]:
     files: List[pathlib.Path] = []
     files.extend(root_path.rglob("*.jsonl.gz"))
     files.extend(root_path.rglob("*.jsonl"))
+    files.extend(_orphan_compacted(root_path))
     return files
 
 
@@ -540,6 +1057,8 @@ def _parse_stream_name(path: pathlib.Path, logs_root: pathlib.Path) -> str:
             stem = stem[:-9]
         elif stem.endswith(".jsonl"):
             stem = stem[:-6]
+        elif stem.endswith(".parquet"):
+            stem = stem[:-8]
         # sanity: if first folder equals stem, that's the stream
         if parts[0] == stem:
             return stem
@@ -548,9 +1067,9 @@ def _parse_stream_name(path: pathlib.Path, logs_root: pathlib.Path) -> str:
     return path.stem
 
 
-def _read_any_jsonl(path: pathlib.Path) -> Optional[pd.DataFrame]:
-    if str(path).endswith(".jsonl.gz"):
-        return _read_jsonl_gz(path)
+def _read_any_jsonl(path: pathlib.Path, since=None) -> Optional[pd.DataFrame]:
+    if str(path).endswith((".jsonl.gz", ".parquet")):
+        return read_log_partition(path, since=since)
     try:
         return pd.read_json(path, lines=True)
     except Exception:
@@ -566,7 +1085,7 @@ def _collect_stream_arrays(logs_root: pathlib.Path, hours: int, top_k: int) -> D
     arrays: Dict[str, List[Dict]] = {}
     stream_frames: Dict[str, List[pd.DataFrame]] = {}
     for p in all_files:
-        df = _read_any_jsonl(p)
+        df = _read_any_jsonl(p, since=cutoff)
         if df is None or len(df) == 0:
             continue
         df = _normalize_df_columns(df)
@@ -0,0 +1,173 @@
+"""
+Nightly compaction of closed JSONL log partitions into typed Parquet files.
+
+Partitions written by ops.llm_logging live at
+    <logs>/<stream>/date=YYYY-MM-DD/asset=<ASSET>/<stream>.jsonl.gz
+Once a day is over (its date is before today in IST) nothing appends to it
+any more, and compact_logs() writes <stream>.parquet next to it. Column dtypes
+come from live_demo/schemas/production_schemas.py where the stream has a
+schema (ensemble_log -> "ensemble", market_ingest_log -> "market_data", ...);
+other columns keep the dtype pandas infers. Values that do not fit the schema
+dtype keep the column as strings rather than being coerced to null, and JSON
+fields (dicts/lists) are stored as JSON strings.
+
+Readers in ops.llm_logging prefer a compacted file that is at least as new as
+its JSONL, so re-running after a late append simply recompacts that day.
+Writing Parquet needs pyarrow; without it readers keep using the JSONL.
+
+Usage:
+    from ops.log_compaction import compact_logs
+    compact_logs("paper_trading_outputs/5m/logs")
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import pathlib
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from ops.llm_logging import IST, _fresh_compacted, compacted_path, index_path, read_gzip_tolerant
+
+# Streams whose schema name differs from the stream name without "_log"
+_SCHEMA_ALIASES = {
+    "market_ingest": "market_data",
+    "executions": "execution",
+}
+
+
+def schema_for_stream(stream: str) -> list:
+    """FieldDefinitions for a stream from ProductionSchemas ([] when there is none)."""
+    from live_demo.schemas.production_schemas import ProductionSchemas
+
+    name = stream[: -len("_log")] if stream.endswith("_log") else stream
+    return ProductionSchemas.get_schema(_SCHEMA_ALIASES.get(name, name))
+
+
+def _is_nested(v) -> bool:
+    return isinstance(v, (dict, list))
+
+
+def _as_json(col: pd.Series) -> pd.Series:
+    return col.map(lambda v: v if v is None or (isinstance(v, float) and pd.isna(v))
+                   else json.dumps(v, separators=(",", ":"), default=str)).astype("string")
+
+
+def _as_string(col: pd.Series) -> pd.Series:
+    if col.map(_is_nested).any():
+        return _as_json(col)
+    return col.map(lambda v: v if v is None or (isinstance(v, float) and pd.isna(v)) else str(v)).astype("string")
+
+
+def _lossless(orig: pd.Series, cast: pd.Series) -> bool:
+    return int(cast.isna().sum()) <= int(orig.isna().sum())
+
+
+def _cast(col: pd.Series, dtype: str) -> pd.Series:
+    """Cast one column to a schema dtype ('int', 'float', 'bool', 'str', 'timestamp', 'json')."""
+    if dtype == "json":
+        return _as_json(col)
+    if dtype == "str":
+        return _as_string(col)
+    if dtype in ("int", "float"):
+        num = pd.to_numeric(col, errors="coerce")
+        if not _lossless(col, num):
+            return _as_string(col)
+        if dtype == "int" and bool((num.dropna() % 1 == 0).all()):
+            return num.astype("Int64")
+        return num.astype("float64")
+    if dtype == "bool":
+        mapping = {True: True, False: False, 1: True, 0: False, "true": True, "false": False,
+                   "True": True, "False": False}
+        cast = col.map(lambda v: mapping.get(v) if not _is_nested(v) else None).astype("boolean")
+        return cast if _lossless(col, cast) else _as_string(col)
+    if dtype == "timestamp":
+        cast = pd.to_datetime(col, utc=True, errors="coerce", format="ISO8601")
+        return cast.dt.tz_convert(IST) if _lossless(col, cast) else _as_string(col)
+    return col
+
+
+def typed_frame(df: pd.DataFrame, stream: str) -> pd.DataFrame:
+    """Apply the stream's schema dtypes; other object columns become strings/JSON strings."""
+    dtypes = {f.field: f.dtype.value for f in schema_for_stream(stream)}
+    if "ts_ist" in df.columns:
+        dtypes.setdefault("ts_ist", "timestamp")
+    out = {}
+    for name in df.columns:
+        col = df[name]
+        if name in dtypes:
+            out[name] = _cast(col, dtypes[name])
+        elif col.dtype == object:
+            out[name] = _as_string(col)
+        else:
+            out[name] = col
+    return pd.DataFrame(out, index=df.index)
+
+
+def _partition_date(path: pathlib.Path) -> Optional[date]:
+    for part in path.parts:
+        if part.startswith("date="):
+            try:
+                return date.fromisoformat(part[len("date="):])
+            except ValueError:
+                return None
+    return None
+
+
+def closed_partitions(logs_root, today: Optional[date] = None, force: bool = False) -> List[pathlib.Path]:
+    """JSONL partitions of finished days that have no up-to-date compacted file."""
+    today = today or datetime.now(IST).date()
+    out = []
+    for p in sorted(pathlib.Path(logs_root).rglob("*.jsonl.gz")):
+        d = _partition_date(p)
+        if d is None or d >= today:
+            continue
+        if force or _fresh_compacted(p) is None:
+            out.append(p)
+    return out
+
+
+def compact_partition(path, remove_source: bool = False) -> Optional[str]:
+    """Write the typed Parquet file for one partition; returns its path (None if empty)."""
+    path = pathlib.Path(path)
+    raw = read_gzip_tolerant(path)
+    if not raw.strip():
+        return None
+    df = pd.read_json(io.BytesIO(raw), lines=True, dtype=False, convert_dates=False)
+    stream = path.name[: -len(".jsonl.gz")]
+    df = typed_frame(df, stream)
+    dest = compacted_path(path)
+    tmp = dest.with_name(dest.name + ".tmp")
+    df.to_parquet(tmp, index=False, compression="zstd")
+    os.replace(tmp, dest)
+    if remove_source:
+        path.unlink()
+        index_path(path).unlink(missing_ok=True)
+    return str(dest)
+
+
+def compact_logs(logs_root, today: Optional[date] = None, remove_source: bool = False,
+                 force: bool = False) -> Dict[str, object]:
+    """Compact every closed partition under logs_root; returns a small summary."""
+    summary: Dict[str, object] = {"compacted": [], "skipped_empty": [], "errors": {},
+                                  "bytes_in": 0, "bytes_out": 0}
+    for p in closed_partitions(logs_root, today=today, force=force):
+        try:
+            size_in = p.stat().st_size
+            dest = compact_partition(p, remove_source=remove_source)
+        except ImportError:
+            raise
+        except Exception as e:
+            summary["errors"][str(p)] = repr(e)
+            continue
+        if dest is None:
+            summary["skipped_empty"].append(str(p))
+            continue
+        summary["compacted"].append(dest)
+        summary["bytes_in"] += size_in
+        summary["bytes_out"] += os.path.getsize(dest)
+    return summary
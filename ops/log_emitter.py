@@ -46,17 +46,7 @@ class LogEmitter:
         if "ts_ist" not in record:
             record["ts_ist"] = datetime.now(IST).isoformat()
 
-        # Inject minimal strategy metadata if not present (non-destructive)
-        try:
-            from core.config import get_strategy_id, get_schema_version
-
-            if "strategy_id" not in record:
-                record["strategy_id"] = get_strategy_id()
-            if "schema_version" not in record:
-                record["schema_version"] = get_schema_version()
-        except Exception:
-            # Keep write non-failing if core.config is not available
-            pass
+        stamp_envelope(record)
 
         # Write record
         with open(path, "a", encoding="utf-8") as f:
@@ -121,6 +111,21 @@ class LogEmitter:
 _emitters = {}
 
 
+def stamp_envelope(record):
+    """Inject minimal strategy metadata if not present (non-destructive); returns record."""
+    try:
+        from core.config import get_strategy_id, get_schema_version
+
+        if "strategy_id" not in record:
+            record["strategy_id"] = get_strategy_id()
+        if "schema_version" not in record:
+            record["schema_version"] = get_schema_version()
+    except Exception:
+        # Keep write non-failing if core.config is not available
+        pass
+    return record
+
+
 def _cache_key(bot_version: str, base_dir: str | None) -> str:
     # Use bot_version + normalized base_dir for uniqueness; base_dir may be None
     bd = str(base_dir) if base_dir else ""
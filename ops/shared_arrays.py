@@ -0,0 +1,41 @@
+"""Named NumPy arrays in one shared-memory block for process-pool workers.
+
+The parent packs every array once with share_arrays() and passes the small
+picklable spec to each worker's initializer; workers call attach_arrays() for
+read-only, zero-copy views. Used by walk_forward, bootstrap and
+live_demo.param_search.
+"""
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+
+import numpy as np
+
+_ALIGN = 64
+
+
+def share_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[shared_memory.SharedMemory, Dict]:
+    """Pack named arrays into one new shared-memory block -> (handle, spec for attach_arrays).
+
+    Each array keeps its dtype and shape and starts on a 64-byte boundary.
+    The caller owns the block and must close() and unlink() it.
+    """
+    layout, offset = [], 0
+    for key, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        layout.append((key, arr.dtype.str, arr.shape, offset))
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for (key, dtype, shape, off), arr in zip(layout, arrays.values()):
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)[...] = arr
+    return shm, {'name': shm.name, 'layout': layout}
+
+
+def attach_arrays(spec: Dict) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+    """Read-only views onto a block made by share_arrays()."""
+    shm = shared_memory.SharedMemory(name=spec['name'])
+    views = {}
+    for key, dtype, shape, off in spec['layout']:
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)
+        view.flags.writeable = False
+        views[key] = view
+    return shm, views
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Wall time of run_allocator_backtest's bar loop: O(n) loop vs the original.
+
+This builds a synthetic one-year 5m series (105,120 bars, 4 arms) and runs both
+loops with the same RNG seed. It checks that the equity, trade and bandit
+frames are identical, then prints the timings and the speedup as JSON. The
+reference loop is quadratic, so expect it to take a while at full size.
+
+Usage:
+    python scripts/bench_allocator_backtest.py [--bars 105120] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from backtest_engine import _allocator_loop, _allocator_loop_reference  # noqa: E402
+
+BARS_PER_YEAR_5M = 365 * 24 * 12
+
+
+def synthetic_inputs(n: int, n_arms: int = 4, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2025-01-01", periods=n, freq="5min", tz="UTC")
+    rets = rng.normal(0.0, 0.002, n)
+    rets[rng.random(n) < 0.03] = 0.0
+    bt_df = pd.DataFrame({"returns": rets}, index=idx)
+    arm_signals = rng.normal(0.0, 1.0, (n, n_arms))
+    arm_eligible = rng.random((n, n_arms)) < 0.4
+    adv = pd.Series(rng.uniform(1e6, 2e6, n), index=idx)
+    side_eps = np.linspace(0.0, 0.5, n_arms)
+    return (bt_df, arm_signals, arm_eligible, adv, 3, 2.0, 1e3, side_eps, 1e-12, 0.20, 1.0, 0.05, 0)
+
+
+def _timed(fn, args, seed: int):
+    np.random.seed(seed)
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--bars", type=int, default=BARS_PER_YEAR_5M)
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs of the O(n) loop (best is reported)")
+    ap.add_argument("--seed", type=int, default=11)
+    args = ap.parse_args()
+
+    inputs = synthetic_inputs(args.bars)
+    fast_s, fast = min((_timed(_allocator_loop, inputs, args.seed) for _ in range(max(1, args.repeat))),
+                       key=lambda r: r[0])
+    ref_s, ref = _timed(_allocator_loop_reference, inputs, args.seed)
+
+    for name, a, b in zip(("equity", "trades", "bandit_updates"), fast, ref):
+        pd.testing.assert_frame_equal(a, b, obj=name)
+
+    print(json.dumps({
+        "bars": args.bars,
+        "n_trades": int(len(fast[1])),
+        "n_bandit_updates": int(len(fast[2])),
+        "final_equity": float(fast[0]["equity"].iloc[-1]),
+        "identical": True,
+        "reference_s": round(ref_s, 3),
+        "fast_s": round(fast_s, 3),
+        "speedup": round(ref_s / fast_s, 1) if fast_s > 0 else None,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
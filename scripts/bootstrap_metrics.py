@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Bootstrap confidence intervals and p-values for backtest / paper-trading metrics.
+
+Reads one numeric column from a CSV. --kind controls how it is treated:
+  equity   an equity curve; bar returns are bootstrapped (stationary blocks)
+  returns  per-bar returns (stationary blocks)
+  trades   per-trade PnL; resampled i.i.d., hit_rate and mean by default
+Replicates are computed on a process pool; see bootstrap.py. Prints the
+metric table and optionally writes it as JSON.
+
+Usage:
+    python scripts/bootstrap_metrics.py --csv backtest_equity.csv --col equity --kind equity
+    python scripts/bootstrap_metrics.py --csv paper_trading_outputs/5m/sheets_fallback/equity.csv \\
+        --col equity --kind equity --bars-per-year 105120 --n-boot 10000 --out equity_ci.json
+    python scripts/bootstrap_metrics.py --csv trades.csv --col pnl_$ --kind trades
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from bootstrap import METHODS, bootstrap_metrics  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--csv', required=True)
+    ap.add_argument('--col', required=True)
+    ap.add_argument('--kind', choices=['equity', 'returns', 'trades'], default='returns')
+    ap.add_argument('--metrics', default=None, help='Comma list (default depends on --kind)')
+    ap.add_argument('--n-boot', type=int, default=5000)
+    ap.add_argument('--block-len', type=int, default=None, help='Default n ** (1/3); ignored for trades')
+    ap.add_argument('--method', choices=METHODS, default='stationary')
+    ap.add_argument('--alpha', type=float, default=0.05)
+    ap.add_argument('--bars-per-year', type=float, default=365 * 24 * 12, help='Annualization (default 5m bars)')
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--out', default=None, help='Write the table as JSON records')
+    args = ap.parse_args()
+
+    values = pd.to_numeric(pd.read_csv(args.csv)[args.col], errors='coerce')
+    if args.kind == 'equity':
+        values = values.pct_change()
+    x = values.to_numpy(dtype=float)
+    x = x[np.isfinite(x)]
+
+    if args.metrics:
+        metrics = tuple(m.strip() for m in args.metrics.split(',') if m.strip())
+    elif args.kind == 'trades':
+        metrics = ('hit_rate', 'mean')
+    else:
+        metrics = ('sharpe', 'sortino', 'max_dd', 'hit_rate')
+    method, block_len = ('iid', 1) if args.kind == 'trades' else (args.method, args.block_len)
+
+    t0 = time.perf_counter()
+    table = bootstrap_metrics(x, metrics, n_boot=args.n_boot, block_len=block_len, method=method,
+                              alpha=args.alpha, annualizer=float(np.sqrt(args.bars_per_year)),
+                              workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+
+    with pd.option_context('display.width', 160, 'display.max_columns', 20):
+        print(table.to_string(index=False))
+    print(f'\n{len(x)} observations, {args.n_boot} replicates ({method}) in {elapsed:.2f}s')
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(json.loads(table.to_json(orient='records')), f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Compact closed days of JSONL log partitions into typed Parquet files.
+
+Every <stream>/date=D/asset=A/<stream>.jsonl.gz under --root whose date is
+before today (IST) and has no up-to-date <stream>.parquet next to it is
+converted with dtypes from live_demo/schemas/production_schemas.py (see
+ops/log_compaction.py). Meant to run nightly, e.g. from cron:
+
+    15 0 * * *  cd /path/to/repo && python scripts/compact_logs.py --root paper_trading_outputs/5m/logs
+
+Requires pyarrow. Exits 1 if any partition failed to compact.
+
+Usage:
+    python scripts/compact_logs.py --root paper_trading_outputs/5m/logs
+    python scripts/compact_logs.py --root paper_trading_outputs/logs --remove-source
+    python scripts/compact_logs.py --root paper_trading_outputs/logs --force --today 2025-10-23
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from ops.log_compaction import compact_logs  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--root", required=True, help="Logs root containing <stream>/date=.../asset=... partitions")
+    ap.add_argument("--today", default=None, help="Treat days before this date (YYYY-MM-DD) as closed")
+    ap.add_argument("--remove-source", action="store_true", help="Delete each JSONL after compacting it")
+    ap.add_argument("--force", action="store_true", help="Recompact partitions that are already compacted")
+    args = ap.parse_args()
+
+    today = date.fromisoformat(args.today) if args.today else None
+    summary = compact_logs(args.root, today=today, remove_source=args.remove_source, force=args.force)
+    for path in summary["compacted"]:
+        print(f"compacted  {path}")
+    for path, err in summary["errors"].items():
+        print(f"FAILED     {path}: {err}")
+    n_in, n_out = summary["bytes_in"], summary["bytes_out"]
+    ratio = f" ({n_out / n_in:.0%} of input)" if n_in else ""
+    print(f"\n{len(summary['compacted'])} partitions, {n_in / 1e6:.2f} MB -> {n_out / 1e6:.2f} MB{ratio}, "
+          f"{len(summary['skipped_empty'])} empty, {len(summary['errors'])} failed")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
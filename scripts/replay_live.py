@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded session through the real live_demo.main.run_live loop.
+
+Klines, Hyperliquid public trades, cohort user fills and funding are served
+from the recording directory (see live_demo/replay.py for the layout) as of a
+virtual clock. Every sleep of the bar loop advances that clock, so a day of
+5m bars replays in minutes with --speed 0 (as fast as possible) or at a
+fixed multiple of real time with --speed N. Orders are never sent (dry run)
+and the bandit starts from a fresh prior seeded with --seed, so two runs of
+the same recording produce the same logs.
+
+Usage:
+    python scripts/replay_live.py --config live_demo/config.json \\
+        --recording recordings/2025-06-01 [--speed 0] [--seed 0] \\
+        [--warmup-bars 1000] [--out-root paper_trading_outputs/replay]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from live_demo.replay import Recording, ReplaySession  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", required=True, help="Bot config JSON")
+    ap.add_argument("--recording", required=True, help="Directory with candles.csv, trades.jsonl, ...")
+    ap.add_argument("--speed", type=float, default=0.0, help="Virtual seconds per real second (0 = unthrottled)")
+    ap.add_argument("--seed", type=int, default=0, help="Seed np.random for bandit sampling")
+    ap.add_argument("--warmup-bars", type=int, default=None, help="Defaults to data.warmup_bars in the config")
+    ap.add_argument("--out-root", default=str(REPO_ROOT / "paper_trading_outputs" / "replay"),
+                    help="Folder for logs, sheets fallback and state written during the replay")
+    args = ap.parse_args()
+
+    # Imported here so --help works without the live bot's dependencies
+    from live_demo.main import load_config, run_live
+
+    cfg = load_config(args.config)
+    interval = cfg["data"]["interval"]
+    warmup = args.warmup_bars if args.warmup_bars is not None else int(cfg["data"].get("warmup_bars", 1000))
+    recording = Recording.load(args.recording, interval=interval)
+    session = ReplaySession(
+        recording, warmup_bars=warmup, speed=args.speed, seed=args.seed, output_root=args.out_root,
+    )
+
+    t0 = time.perf_counter()
+    asyncio.run(run_live(args.config, dry_run=True, replay=session))
+    wall_s = time.perf_counter() - t0
+
+    virtual_s = (session.clock.time_ms() - int(recording.candles["ts"].iloc[session.warmup_bars])) / 1000.0
+    report = {
+        "bars": len(recording.candles) - session.warmup_bars,
+        "trades": len(recording.trades),
+        "user_fills": len(recording.user_fills),
+        "wall_s": round(wall_s, 3),
+        "virtual_s": round(virtual_s, 1),
+        "speedup": round(virtual_s / wall_s, 1) if wall_s > 0 else None,
+        "out_root": args.out_root,
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Run the hot-path benchmarks and gate on regressions against a stored baseline.
+
+`run` times the benchmarks in benchmarks/suite.py on fixed synthetic fixtures
+and writes per-benchmark latency (seconds per op) and throughput to JSON.
+`compare` checks a results file against a baseline and exits 1 when any
+benchmark's median latency is more than --threshold slower. With --baseline
+and no results file, `run` and `compare` happen in one step. Record a
+baseline on the same machine the gate runs on:
+
+Usage:
+    python scripts/run_benchmarks.py run --out benchmarks/baseline.json
+    python scripts/run_benchmarks.py run --out results.json [-k features -k infer]
+    python scripts/run_benchmarks.py compare results.json --baseline benchmarks/baseline.json [--threshold 0.25]
+    python scripts/run_benchmarks.py compare --baseline benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from benchmarks import (  # noqa: E402
+    compare_results,
+    format_comparison,
+    load_results,
+    run_suite,
+    select,
+    write_results,
+)
+
+DEFAULT_BASELINE = str(REPO_ROOT / "benchmarks" / "baseline.json")
+
+
+def _run(args) -> dict:
+    benches = select(args.k)
+    if not benches:
+        raise SystemExit(f"No benchmark matches {args.k}")
+
+    def progress(name, res):
+        print(f"{name:<34}{res['median_s'] * 1e6:12.3f} us/op{res['ops_per_s']:14.0f} ops/s", flush=True)
+
+    return run_suite(benches, repeat=args.repeat, min_time=args.min_time, progress=progress)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name in ("run", "compare"):
+        p = sub.add_parser(name)
+        p.add_argument("-k", action="append", default=None, help="Only benchmarks whose name contains this")
+        p.add_argument("--repeat", type=int, default=5, help="Timed samples per benchmark")
+        p.add_argument("--min-time", type=float, default=0.5, help="Total timed seconds per benchmark")
+        p.add_argument("--out", default=None, help="Write the results JSON here")
+    sub.choices["compare"].add_argument("results", nargs="?", default=None,
+                                        help="Results JSON to check (run the suite when omitted)")
+    sub.choices["compare"].add_argument("--baseline", default=DEFAULT_BASELINE)
+    sub.choices["compare"].add_argument("--threshold", type=float, default=0.25,
+                                        help="Allowed slowdown of the median, as a fraction")
+    args = ap.parse_args()
+
+    if args.cmd == "run":
+        results = _run(args)
+        if args.out:
+            write_results(results, args.out)
+            print(f"Wrote {args.out}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    results = load_results(args.results) if args.results else _run(args)
+    if args.out and not args.results:
+        write_results(results, args.out)
+    if args.k:
+        keep = {b.name for b in select(args.k)}
+        baseline = {**baseline, "benchmarks": {n: v for n, v in baseline["benchmarks"].items() if n in keep}}
+    rows = compare_results(results, baseline, threshold=args.threshold)
+    print(format_comparison(rows))
+    regressed = [r["name"] for r in rows if r["status"] == "regressed"]
+    if regressed:
+        print(f"FAIL: {len(regressed)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    print("OK: no benchmark regressed beyond the threshold")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Walk-forward backtests of many (timeframe x config) combinations in parallel.
+
+Each --data CSV is a timeframe. It needs a ts column (epoch ms or ISO) and
+either returns or close, plus the arm/signal columns. Configs are the
+cartesian product of the --grid lists. Every (timeframe, config, fold) job runs
+on a process pool over shared-memory arrays; see walk_forward.py.
+
+This writes <out>_folds.csv (one row per job segment), <out>_summary.csv (per
+config mean/std/min/max across test folds) and <out>_selection.csv (best
+config on each train window, scored on the following test window).
+
+Usage:
+    python scripts/run_walk_forward.py \\
+        --data 5m=paper_trading_outputs/5m/sheets_fallback/signals.csv \\
+        --grid cost_bps=[2,5] --grid dd_stop=[0.03,0.05] \\
+        --grid 'side_eps=[[0.001,0.001,0.001,0.3],[0.01,0.01,0.01,0.5]]' --folds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from walk_forward import Dataset, config_grid, run_walk_forward, select_walk_forward, summarize_walk_forward  # noqa: E402
+
+
+def _load(path: str, ts_col: str, adv: float) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    ts = df[ts_col]
+    df.index = pd.to_datetime(ts, unit='ms', utc=True) if pd.api.types.is_numeric_dtype(ts) else pd.to_datetime(ts, utc=True)
+    # Sheet fallbacks can log a bar more than once; keep the last row
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    if 'returns' not in df.columns:
+        df['returns'] = df['close'].pct_change()
+    if 'adv' not in df.columns:
+        df['adv'] = adv
+    return df
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--data', action='append', required=True, metavar='NAME=CSV')
+    ap.add_argument('--ts-col', default='ts')
+    ap.add_argument('--arm-cols', default='S_top,S_bot,S_mood,dir')
+    ap.add_argument('--signal-col', default='s_model', help='Signal column for --engine simple')
+    ap.add_argument('--adv', type=float, default=25e6, help='Constant ADV when the CSV has no adv column')
+    ap.add_argument('--engine', choices=['allocator', 'simple'], default='allocator')
+    ap.add_argument('--grid', action='append', default=[], metavar='KEY=[v1,v2]', help='JSON list of values')
+    ap.add_argument('--folds', type=int, default=5)
+    ap.add_argument('--train-bars', type=int, default=None)
+    ap.add_argument('--anchored', action='store_true')
+    ap.add_argument('--select-metric', default='sharpe')
+    ap.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--out', default='walk_forward')
+    args = ap.parse_args()
+
+    grid = {'engine': [args.engine]}
+    for item in args.grid:
+        key, sep, raw = item.partition('=')
+        values = json.loads(raw) if sep else None
+        if not isinstance(values, list):
+            ap.error(f"--grid expects KEY=<JSON list>, got '{item}'")
+        grid[key.strip()] = values
+    configs = config_grid(**grid)
+
+    arm_cols = [c for c in args.arm_cols.split(',') if c]
+    datasets = {}
+    for item in args.data:
+        name, sep, path = item.partition('=')
+        if not sep:
+            ap.error(f"--data expects NAME=CSV, got '{item}'")
+        df = _load(path, args.ts_col, args.adv)
+        datasets[name] = Dataset.from_frame(
+            df,
+            arm_cols=arm_cols if args.engine == 'allocator' else None,
+            signal_col=args.signal_col if args.engine == 'simple' else None,
+            adv_col='adv',
+        )
+
+    t0 = time.perf_counter()
+    results = run_walk_forward(datasets, configs, n_folds=args.folds, train_bars=args.train_bars,
+                               anchored=args.anchored, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+    summary = summarize_walk_forward(results)
+    selection = select_walk_forward(results, metric=args.select_metric)
+
+    results.to_csv(f'{args.out}_folds.csv', index=False)
+    summary.to_csv(f'{args.out}_summary.csv', index=False)
+    selection.to_csv(f'{args.out}_selection.csv', index=False)
+
+    print(f"{len(results)} segment backtests ({len(configs)} configs x {args.folds} folds x {len(datasets)} "
+          f"datasets) in {elapsed:.2f}s on {args.workers} workers")
+    key = f'{args.select_metric}_mean'
+    cols = ['dataset', 'config_id', 'n_folds'] + [c for c in summary.columns
+                                                  if c.startswith(args.select_metric + '_') or c.startswith('cfg_')]
+    if key in summary.columns:
+        print(summary.sort_values(key, ascending=False)[cols].head(10).to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Headless replay of an OHLCV CSV through the live decision loop.
+
+The first --warmup-bars rows seed ADV20 and the feature computer, exactly as
+offline run_live does with snapshot.csv. The rest go through
+live_demo.simulator.Simulator with no sleeps, network or Sheets. The script
+prints the run summary and the throughput in bars per second. Optional
+funding, pros/amateurs/mood and bid/ask columns in the CSV are used when
+present.
+
+Usage:
+    python scripts/simulate_live.py --bars live_demo/snapshot.csv \\
+        --config live_demo/config_overlay.json [--seed 7] [--batch-inference] \\
+        [--out sim.npz] [--log sim_decisions.jsonl]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from live_demo.simulator import Simulator, summarize  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--bars", default="live_demo/snapshot.csv", help="CSV with ts,open,high,low,close,volume")
+    ap.add_argument("--config", required=True, help="Bot config JSON (thresholds, risk, artifacts, ...)")
+    ap.add_argument("--warmup-bars", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=None, help="Seed np.random for bandit sampling")
+    ap.add_argument("--batch-inference", action="store_true", help="Score all bars in one infer_batch call")
+    ap.add_argument("--out", default=None, help="Write the per-bar arrays to this .npz")
+    ap.add_argument("--log", default=None, help="Write one JSON line per decided bar")
+    args = ap.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    bars = pd.read_csv(args.bars)
+    warmup = min(args.warmup_bars, len(bars) - 1)
+
+    log_fh = open(args.log, "w", encoding="utf-8") if args.log else None
+    sink = None
+    if log_fh is not None:
+        def sink(rec):
+            log_fh.write(json.dumps(rec, default=float) + "\n")
+
+    try:
+        sim = Simulator(cfg, sink=sink)
+        t0 = time.perf_counter()
+        sim.warmup(bars.iloc[:warmup])
+        warm_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        res = sim.run(bars.iloc[warmup:], seed=args.seed, batch_inference=args.batch_inference)
+        run_s = time.perf_counter() - t0
+    finally:
+        if log_fh is not None:
+            log_fh.close()
+
+    report = {
+        "warmup_bars": warmup,
+        "warmup_s": round(warm_s, 3),
+        "run_s": round(run_s, 3),
+        "bars_per_s": round(len(res["ts"]) / run_s, 1) if run_s > 0 else None,
+        **summarize(res),
+    }
+    print(json.dumps(report, indent=2))
+    if args.out:
+        np.savez_compressed(args.out, **{k: v for k, v in res.items() if k != "mode"}, mode=res["mode"].astype(str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
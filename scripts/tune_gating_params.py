@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Search gating thresholds over logged signals with a parallel counterfactual replay.
+
+The script runs --grid KEY=v1,v2,... (cartesian product) or --bayes KEY=lo:hi
+(Gaussian-process search) across a process pool that shares one copy of the
+signal arrays. Every configuration is scored on net PnL, turnover and
+eligible bars per day. It writes a ranked JSON report. With --emit-overlay it
+also writes the winning configuration as a config fragment; drop that fragment
+in as <bot>/config/config.local.json to deep-merge it over the bot config.
+
+Keys are counterfactual.ReplayParams.with_overrides() keys: band_bps,
+conflict_band_bps, conflict_band_mult, cost_bps, expected_move_bps,
+thresholds.X, risk.X, controls.X.
+
+Usage:
+    python scripts/tune_gating_params.py --signals paper_trading_outputs/5m/logs \\
+        --prices live_demo/snapshot.csv --config live_demo_1h/config.json \\
+        --grid band_bps=0,5,10,15 --grid thresholds.CONF_MIN=0.45,0.55,0.65 \\
+        --out gating_search_report.json --emit-overlay live_demo/config/config.local.json
+
+    python scripts/tune_gating_params.py --signals ... --bayes band_bps=0:30 \\
+        --bayes thresholds.CONF_MIN=0.3:0.8 --n-iter 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from live_demo.counterfactual import ReplayParams, config_overlay, load_signal_arrays  # noqa: E402
+from live_demo.param_search import Objective, SearchPool, bayes_search, evaluate, grid_search  # noqa: E402
+
+
+def _number(raw: str):
+    value = json.loads(raw)
+    if not isinstance(value, (int, float)):
+        raise ValueError(raw)
+    return value
+
+
+def _parse_grid(items):
+    space = {}
+    for item in items:
+        key, sep, values = item.partition("=")
+        if not sep:
+            raise ValueError(f"--grid expects KEY=v1,v2,..., got '{item}'")
+        space[key.strip()] = [json.loads(v) for v in values.split(",") if v.strip()]
+    return space
+
+
+def _parse_bounds(items):
+    bounds = {}
+    for item in items:
+        key, sep, rng = item.partition("=")
+        lo, sep2, hi = rng.partition(":")
+        if not (sep and sep2):
+            raise ValueError(f"--bayes expects KEY=lo:hi, got '{item}'")
+        bounds[key.strip()] = (_number(lo), _number(hi))
+    return bounds
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--signals", nargs="+", required=True, help="signals JSONL files, globs or log directories")
+    ap.add_argument("--prices", default=None, help="OHLCV CSV with ts,close for PnL")
+    ap.add_argument("--config", default=None, help="Bot config JSON for the baseline parameters")
+    ap.add_argument("--grid", action="append", default=[], metavar="KEY=v1,v2")
+    ap.add_argument("--bayes", action="append", default=[], metavar="KEY=lo:hi")
+    ap.add_argument("--n-iter", type=int, default=48, help="Evaluation budget for --bayes")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--turnover-cost-bps", type=float, default=0.0, help="Extra penalty per unit turnover")
+    ap.add_argument("--min-eligible-per-day", type=float, default=5.0)
+    ap.add_argument("--max-eligible-per-day", type=float, default=50.0)
+    ap.add_argument("--eligibility-penalty-bps", type=float, default=10.0)
+    ap.add_argument("--top", type=int, default=25, help="Ranked configurations kept in the report")
+    ap.add_argument("--out", default="gating_search_report.json")
+    ap.add_argument("--emit-overlay", default=None, help="Write the winner as a config fragment here")
+    args = ap.parse_args()
+
+    if bool(args.grid) == bool(args.bayes):
+        ap.error("pass either --grid or --bayes parameters")
+    try:
+        space = _parse_grid(args.grid)
+        bounds = _parse_bounds(args.bayes)
+    except ValueError as e:
+        ap.error(str(e))
+
+    cfg = {}
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+    base = ReplayParams.from_config(cfg)
+    objective = Objective(
+        turnover_cost_bps=args.turnover_cost_bps,
+        min_eligible_per_day=args.min_eligible_per_day,
+        max_eligible_per_day=args.max_eligible_per_day,
+        eligibility_penalty_bps=args.eligibility_penalty_bps,
+    )
+    arr = load_signal_arrays(args.signals, prices=args.prices)
+    if not len(arr):
+        print("No signal records found", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    with SearchPool(arr, base, objective, workers=args.workers) as pool:
+        if space:
+            ranked = grid_search(pool, space)
+        else:
+            ranked = bayes_search(pool, bounds, n_iter=args.n_iter, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+
+    report = {
+        "method": "grid" if space else "bayes",
+        "space": space or {k: list(v) for k, v in bounds.items()},
+        "objective": vars(objective),
+        "n_bars": len(arr),
+        "n_evaluated": len(ranked),
+        "workers": args.workers,
+        "elapsed_s": round(elapsed, 3),
+        "baseline": evaluate(arr, base, {}, objective),
+        "ranked": ranked[: args.top],
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    best = ranked[0]
+    print(f"Evaluated {len(ranked)} configurations on {len(arr)} bars in {elapsed:.2f}s -> {args.out}")
+    print(f"Baseline score {report['baseline']['score']:.2f}; best {best['score']:.2f} with {best['overrides']}")
+    if args.emit_overlay:
+        os.makedirs(os.path.dirname(os.path.abspath(args.emit_overlay)), exist_ok=True)
+        with open(args.emit_overlay, "w", encoding="utf-8") as f:
+            json.dump(config_overlay(best["overrides"]), f, indent=2)
+        print(f"Wrote config overlay -> {args.emit_overlay}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+tests/test_allocator_backtest.py
+
+Verifies the O(n) allocator bar loop reproduces the original loop exactly:
+same equity curve, trades and bandit updates from the same RNG seed.
+
+Run with:
+    python -m pytest tests/test_allocator_backtest.py -v
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest_engine import _allocator_loop, _allocator_loop_reference, _trailing_std, run_allocator_backtest
+
+
+def _inputs(n=4000, seed=0, n_arms=4):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2025-01-01", periods=n, freq="5min")
+    rets = rng.normal(0.0, 0.002, n)
+    rets[rng.random(n) < 0.05] = 0.0
+    bt_df = pd.DataFrame({"returns": rets}, index=idx)
+    arm_signals = rng.normal(0.0, 1.0, (n, n_arms))
+    arm_eligible = rng.random((n, n_arms)) < 0.4
+    adv = pd.Series(rng.uniform(1e6, 2e6, n), index=idx)
+    return bt_df, arm_signals, arm_eligible, adv
+
+
+def _both(*args):
+    np.random.seed(3)
+    fast = _allocator_loop(*args)
+    state_fast = np.random.get_state()[1].copy()
+    np.random.seed(3)
+    ref = _allocator_loop_reference(*args)
+    assert np.array_equal(state_fast, np.random.get_state()[1])
+    return fast, ref
+
+
+class TestAllocatorLoopParity:
+    @pytest.mark.parametrize("cooldown,latency,dd_stop", [(3, 0, 0.05), (0, 2, 0.02), (5, 1, 0.0)])
+    def test_frames_identical(self, cooldown, latency, dd_stop):
+        bt_df, sig, elig, adv = _inputs()
+        args = (bt_df, sig, elig, adv, cooldown, 2.0, 1e3, np.array([0.1, 0.2, 0.5, 0.0]),
+                1e-12, 0.2, 1.0, dd_stop, latency)
+        fast, ref = _both(*args)
+        for a, b in zip(fast, ref):
+            pd.testing.assert_frame_equal(a, b)
+        assert len(fast[1]) > 0 and len(fast[2]) > 0
+
+    def test_short_eligibility_and_no_adv(self):
+        bt_df, sig, elig, _ = _inputs(1500, seed=1)
+        bt_df = bt_df.reset_index(drop=True)
+        args = (bt_df, sig, elig[:1000], None, 0, 0.0, 5.0, None, 1e-12, 0.2, 1.0, 0.05, 0)
+        fast, ref = _both(*args)
+        for a, b in zip(fast, ref):
+            pd.testing.assert_frame_equal(a, b)
+
+    def test_trailing_std_matches_slices(self):
+        rets = np.random.default_rng(5).normal(0.0, 0.01, 300)
+        expected = [np.std(rets[max(0, t - 20):t + 1]) for t in range(len(rets))]
+        np.testing.assert_array_equal(_trailing_std(rets), expected)
+        np.testing.assert_array_equal(_trailing_std(rets[:7]), expected[:7])
+
+    def test_metrics_still_computed(self):
+        bt_df, sig, elig, adv = _inputs(500)
+        _, _, _, metrics = run_allocator_backtest(bt_df, sig, elig, adv, 3, 2.0, 1e3, np.zeros(4))
+        assert metrics["n_trades"] > 0 and np.isfinite(metrics["final_equity"])
@@ -0,0 +1,94 @@
+"""
+tests/test_artifact_registry.py
+
+Verifies the process-wide model artifact cache: one load per content hash,
+shared between ModelRuntime instances, with optional memory-mapped arrays,
+and entries that do not outlive the models using them.
+
+Run with:
+    python -m pytest tests/test_artifact_registry.py -v
+"""
+import gc
+import json
+import shutil
+import weakref
+
+import joblib
+import numpy as np
+import pytest
+
+from live_demo.model_runtime import ModelRuntime
+from live_demo.models import artifact_registry as registry
+from tests.test_model_runtime import _rows, _wait_for_candidate, _write_artifacts
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+class TestArtifactRegistry:
+
+    def test_identical_content_loads_once(self, tmp_path):
+        joblib.dump({"w": np.arange(10.0)}, tmp_path / "a.joblib")
+        shutil.copy(tmp_path / "a.joblib", tmp_path / "b.joblib")
+        a = registry.load_artifact(str(tmp_path / "a.joblib"))
+        b = registry.load_artifact(str(tmp_path / "b.joblib"))
+        assert a is b
+        assert registry.cache_info() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_changed_content_loads_new_object(self, tmp_path):
+        path = tmp_path / "m.joblib"
+        joblib.dump([1, 2], path)
+        first = registry.load_artifact(str(path))
+        joblib.dump([1, 2, 3], path)
+        assert registry.load_artifact(str(path)) == [1, 2, 3]
+        assert first == [1, 2]
+
+    def test_mmap_mode_returns_read_only_memmap(self, tmp_path):
+        path = tmp_path / "arr.joblib"
+        joblib.dump({"coef": np.ones((64, 64))}, path)
+        obj = registry.load_artifact(str(path), mmap_mode="r")
+        assert isinstance(obj["coef"], np.memmap)
+        assert not obj["coef"].flags.writeable
+
+    def test_runtimes_share_model_and_calibrator(self, tmp_path):
+        (tmp_path / "one").mkdir()
+        (tmp_path / "two").mkdir()
+        m1 = ModelRuntime(_write_artifacts(tmp_path / "one"))
+        m2 = ModelRuntime(_write_artifacts(tmp_path / "two"))
+        assert m1.model is m2.model and m1.calibrator is m2.calibrator
+        assert m1._xbuf is not m2._xbuf
+        x = [0.1, -0.2, 0.3, 0.0]
+        assert m1.infer(x) == m2.infer(x)
+
+
+class TestRelease:
+
+    def test_counted_entries_dropped_on_last_release(self, tmp_path):
+        joblib.dump({"w": 1}, tmp_path / "a.joblib")
+        a = registry.load_artifact(str(tmp_path / "a.joblib"))
+        b = registry.load_artifact(str(tmp_path / "a.joblib"))
+        registry.release_artifact(a)
+        assert registry.cache_info()["entries"] == 1
+        registry.release_artifact(b)
+        assert registry.cache_info()["entries"] == 0
+        registry.release_artifact(b)  # extra releases are ignored
+
+    def test_superseded_model_freed_after_hot_reload(self, tmp_path):
+        manifest = _write_artifacts(tmp_path, calibrator=False, seed=0)
+        mr = ModelRuntime(manifest)
+        mr.enable_hot_reload(check_interval_s=0.0, probation_calls=1)
+        old = weakref.ref(mr.model)
+        _write_artifacts(tmp_path, calibrator=False, seed=1)
+        m = json.loads((tmp_path / "LATEST.json").read_text())
+        (tmp_path / "LATEST.json").write_text(json.dumps({**m, "git_commit": "retrained"}))
+        assert _wait_for_candidate(mr)["status"] == "swapped"
+        gc.collect()
+        assert old() is not None  # kept for rollback during probation
+        mr.infer(_rows(1)[0])
+        gc.collect()
+        assert old() is None
+        assert registry.cache_info()["entries"] == 1
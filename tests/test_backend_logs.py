@@ -0,0 +1,64 @@
+"""
+tests/test_backend_logs.py
+
+Verifies the API backend's log reads: the last N records of plain and gzip
+JSONL files, and a log day whose JSONL partition nightly compaction has
+replaced with Parquet (compact_logs(remove_source=True)).
+
+Run with:
+    python -m pytest tests/test_backend_logs.py -v
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import backend.main as backend
+from ops.llm_logging import close_jsonl, compacted_path, write_jsonl
+from ops.log_compaction import compact_logs
+
+
+def _rows():
+    return [
+        {"ts_ist": f"2025-10-22T10:{m:02d}:00+05:30", "asset": "BTCUSDT", "pred_bps": float(m),
+         "sanitized": {"sharpe_1w": 0.5}}
+        for m in range(0, 30, 5)
+    ]
+
+
+class TestReadJsonlSafe:
+    def test_plain_and_gzip_files_return_the_last_records(self, tmp_path):
+        plain = tmp_path / "signals.jsonl"
+        plain.write_text("".join(f'{{"i": {i}}}\n' for i in range(10)) + "\n")
+        for r in _rows():
+            write_jsonl("signals", r, asset="BTCUSDT", root=str(tmp_path))
+        close_jsonl()
+        gz = next(tmp_path.rglob("signals.jsonl.gz"))
+
+        assert [r["i"] for r in backend.read_jsonl_safe(plain, limit=3)] == [7, 8, 9]
+        assert len(backend.read_jsonl_safe(plain)) == 10
+        assert [r["pred_bps"] for r in backend.read_jsonl_safe(gz, limit=2)] == [20.0, 25.0]
+
+
+class TestCompactedDay:
+    def test_reads_compacted_day_with_source_removed(self, tmp_path, monkeypatch):
+        pytest.importorskip("pyarrow")
+        logs = tmp_path / "5m" / "logs"
+        for r in _rows():
+            write_jsonl("kpi_scorecard", r, asset="BTCUSDT", root=str(logs))
+        close_jsonl()
+        src = next(logs.rglob("kpi_scorecard.jsonl.gz"))
+
+        compact_logs(logs, remove_source=True, force=True)
+        assert not src.exists() and compacted_path(src).exists()
+
+        monkeypatch.setattr(backend, "OUTPUTS_DIR", tmp_path)
+        monkeypatch.setattr(backend, "LOGS_DIR", tmp_path / "legacy")
+        out = asyncio.run(backend.get_logs("kpi_scorecard", date="2025-10-22", limit=2, bot_version="5m"))
+
+        assert out["file_exists"] and out["count"] == 2
+        # The last rows of the day, with timestamps and nested fields as the JSONL had them
+        assert [r["pred_bps"] for r in out["data"]] == [20.0, 25.0]
+        assert out["data"][-1]["ts_ist"] == "2025-10-22T10:25:00+05:30"
+        assert out["data"][-1]["sanitized"] == {"sharpe_1w": 0.5}
@@ -12,10 +12,13 @@ Coverage:
 
 from __future__ import annotations
 
+import json
+import os
+
 import numpy as np
 import pytest
 
-from live_demo.bandit import SimpleThompsonBandit
+from live_demo.bandit import BanditStateIO, SimpleThompsonBandit, replay_rewards
 
 
 class TestRewardNormalization:
@@ -282,6 +285,60 @@ class TestPersistence:
         assert bandit.peak_pnl == 0.0
 
 
+class TestBanditStateIO:
+    """Atomic, compact and debounced state persistence."""
+
+    def test_write_through_roundtrip_is_compact(self, tmp_path):
+        path = str(tmp_path / "runtime_bandit.json")
+        io = BanditStateIO(path=path)
+        bandit = SimpleThompsonBandit(n_arms=4)
+        bandit.update(2, 0.5)
+        io.save(bandit)
+        text = open(path, encoding="utf-8").read()
+        assert "\n" not in text and ": " not in text
+        loaded = BanditStateIO(path=path).load(n_arms=4)
+        np.testing.assert_array_equal(loaded.counts, bandit.counts)
+        assert [f for f in os.listdir(tmp_path) if f.endswith(".tmp")] == []
+
+    def test_other_keys_are_preserved(self, tmp_path):
+        path = tmp_path / "runtime_bandit.json"
+        path.write_text(json.dumps({"bandit_state": {"n_arms": 2}, "note": "keep"}))
+        io = BanditStateIO(path=str(path))
+        bandit = io.load(n_arms=2)
+        io.save(bandit)
+        assert json.loads(path.read_text())["note"] == "keep"
+
+    def test_saves_are_coalesced_until_due(self, tmp_path):
+        path = str(tmp_path / "runtime_bandit.json")
+        io = BanditStateIO(path=path, flush_every_s=3600.0, flush_every_n=3)
+        bandit = SimpleThompsonBandit(n_arms=2)
+        for _ in range(2):
+            bandit.update(0, 1.0)
+            io.save(bandit)
+        assert not os.path.exists(path) and io.writes == 0
+        bandit.update(1, 1.0)
+        io.save(bandit)
+        assert io.writes == 1
+        assert json.loads(open(path).read())["bandit_state"]["counts"] == [2.0, 1.0]
+
+    def test_flush_writes_latest_pending_state(self, tmp_path):
+        path = str(tmp_path / "runtime_bandit.json")
+        io = BanditStateIO(path=path, flush_every_s=3600.0)
+        bandit = SimpleThompsonBandit(n_arms=2)
+        io.save(bandit)
+        bandit.update(1, 1.0)
+        assert io.flush_if_due() is False
+        assert io.flush() is True
+        assert io.flush() is False  # nothing pending
+        assert json.loads(open(path).read())["bandit_state"]["counts"] == [0.0, 1.0]
+
+    def test_corrupt_file_falls_back_to_fresh_bandit(self, tmp_path):
+        path = tmp_path / "runtime_bandit.json"
+        path.write_text('{"bandit_state": {"n_arms": 4, "cou')
+        bandit = BanditStateIO(path=str(path)).load(n_arms=4)
+        assert bandit.n_arms == 4 and np.all(bandit.counts == 0)
+
+
 class TestEdgeCases:
     """Test edge cases and error handling."""
     
@@ -351,6 +408,70 @@ class TestEdgeCases:
         assert "drawdown_exceeded" in bandit2.freeze_reason
 
 
+class TestRewardWindow:
+    """Running-sum reward statistics match the full-history numpy versions."""
+
+    def test_global_stats_match_numpy_over_rolling_window(self):
+        rng = np.random.default_rng(3)
+        bandit = SimpleThompsonBandit(n_arms=2)
+        rewards = rng.normal(5.0, 2.0, 2600)
+        rewards[1200:1300] = 4.0  # constant stretch
+        for i, r in enumerate(rewards):
+            bandit.update(i % 2, r)
+            if i >= 1:
+                window = rewards[max(0, i - 999): i + 1]
+                assert bandit.global_reward_mean == pytest.approx(np.mean(window), rel=1e-10)
+                assert bandit.global_reward_std == pytest.approx(np.std(window), rel=1e-8, abs=1e-12)
+        assert len(bandit.reward_history) == 1000
+        np.testing.assert_array_equal(bandit.reward_history, rewards[-1000:])
+
+    def test_constant_window_has_zero_std(self):
+        bandit = SimpleThompsonBandit(n_arms=1)
+        for r in [0.3, -2.0, 7.5]:
+            bandit.update(0, r)
+        for _ in range(1000):
+            bandit.update(0, 1.7)
+        assert bandit.global_reward_std == 0.0
+
+    def test_assigned_history_is_used(self):
+        bandit = SimpleThompsonBandit(n_arms=1)
+        bandit.reward_history = [1.0] * 9
+        bandit.update(0, 3.0)
+        assert len(bandit.reward_history) == 10
+        assert bandit.global_reward_mean == pytest.approx(1.2)
+
+
+class TestReplayRewards:
+    """Vectorized replay agrees with sequential update() calls."""
+
+    def test_matches_sequential_updates(self):
+        rng = np.random.default_rng(11)
+        n = 3000
+        arms = rng.integers(0, 4, n)
+        rewards = rng.normal(0.2, 1.0, n) * np.where(np.arange(n) % 700 < 300, 1.0, -1.0)
+        rewards[900:1100] = 0.5
+        thresholds = [0.05, 0.10, 0.30]
+        out = replay_rewards(arms, rewards, 4, thresholds)
+        for k, thr in enumerate(thresholds):
+            bandit = SimpleThompsonBandit(n_arms=4, drawdown_threshold=thr)
+            frozen = []
+            for a, r in zip(arms, rewards):
+                bandit.update(int(a), float(r))
+                frozen.append(bandit.frozen)
+            np.testing.assert_array_equal(out["counts"][k], bandit.counts)
+            np.testing.assert_allclose(out["means"][k], bandit.means, atol=1e-12)
+            np.testing.assert_allclose(out["variances"][k], bandit.variances, atol=1e-6)
+            assert out["frozen"][k] == bandit.frozen
+            assert out["frozen_share"][k] == pytest.approx(np.mean(frozen))
+        assert out["cumulative_pnl"] == pytest.approx(bandit.cumulative_pnl)
+        assert out["peak_pnl"] == pytest.approx(bandit.peak_pnl)
+
+    def test_invalid_arms_are_ignored(self):
+        out = replay_rewards([0, 5, -1, 1], [1.0, 100.0, 100.0, 2.0], 2, [0.1])
+        assert out["n_rewards"] == 2
+        np.testing.assert_array_equal(out["counts"][0], [1.0, 1.0])
+
+
 class TestCHG04AcceptanceCriteria:
     """Validate CHG-04 acceptance criteria from ChatGPT audit."""
     
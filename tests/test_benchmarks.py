@@ -0,0 +1,72 @@
+"""
+tests/test_benchmarks.py
+
+Verifies the benchmark harness (timing entries, JSON round trip, regression
+statuses) and that every registered hot-path benchmark builds and runs.
+
+Run with:
+    python -m pytest tests/test_benchmarks.py -v
+"""
+import pytest
+
+from benchmarks import (
+    BENCHMARKS,
+    Benchmark,
+    compare_results,
+    format_comparison,
+    load_results,
+    run_benchmark,
+    run_suite,
+    select,
+    write_results,
+)
+
+
+def _doc(**medians):
+    return {"version": 1, "environment": {}, "benchmarks": {k: {"median_s": v} for k, v in medians.items()}}
+
+
+class TestHarness:
+    def test_run_benchmark_entry(self):
+        calls = []
+
+        def setup(workdir):
+            return lambda: calls.append(workdir)
+
+        res = run_benchmark(Benchmark("noop", setup, ops=4), repeat=3, min_time=0.003)
+        assert res["repeat"] == 3 and res["ops_per_call"] == 4
+        assert len(calls) >= 1 + 3 * res["calls_per_sample"]
+        assert 0 < res["min_s"] <= res["median_s"] <= res["max_s"]
+        assert res["ops_per_s"] == pytest.approx(1.0 / res["median_s"])
+
+    def test_results_round_trip(self, tmp_path):
+        doc = run_suite([Benchmark("noop", lambda w: (lambda: None))], repeat=2, min_time=0.002)
+        path = tmp_path / "sub" / "results.json"
+        write_results(doc, str(path))
+        loaded = load_results(str(path))
+        assert loaded["benchmarks"]["noop"]["median_s"] == doc["benchmarks"]["noop"]["median_s"]
+        assert loaded["environment"]["python"]
+        (tmp_path / "bad.json").write_text("[]")
+        with pytest.raises(ValueError):
+            load_results(str(tmp_path / "bad.json"))
+
+    def test_compare_statuses(self):
+        base = _doc(a=1.0, b=1.0, c=1.0, gone=1.0)
+        cur = _doc(a=1.2, b=1.3, c=0.5, fresh=1.0)
+        rows = {r["name"]: r for r in compare_results(cur, base, threshold=0.25)}
+        assert {k: r["status"] for k, r in rows.items()} == {
+            "a": "ok", "b": "regressed", "c": "improved", "gone": "missing", "fresh": "new"}
+        assert rows["b"]["change"] == pytest.approx(0.3)
+        assert "regressed" in format_comparison(list(rows.values()))
+
+
+class TestSuite:
+    def test_select(self):
+        assert [b.name for b in select(["infer"])] == ["model_runtime.infer"]
+        assert len(select()) == len(BENCHMARKS) == 7
+
+    @pytest.mark.parametrize("name", sorted(BENCHMARKS))
+    def test_benchmark_runs(self, name, tmp_path):
+        fn = BENCHMARKS[name].setup(str(tmp_path))
+        fn()
+        fn()
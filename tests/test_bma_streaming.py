@@ -0,0 +1,87 @@
+"""
+tests/test_bma_streaming.py
+
+Verifies the streaming RollingIC / RollingVol accumulators against the
+batch rolling_ic / series_vol they replace in the bar loop and HealthMonitor.
+
+Run with:
+    python -m pytest tests/test_bma_streaming.py -v
+"""
+from collections import deque
+
+import numpy as np
+import pytest
+
+from live_demo.health_monitor import HealthMonitor
+from live_demo.ops.bma import RollingIC, RollingVol, rolling_ic, series_vol
+
+
+def _series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    p = rng.normal(0.0, 5.0, n)
+    r = 0.3 * p + rng.normal(0.0, 5.0, n)
+    p[50:60] = np.nan            # NaN predictions
+    r[120] = np.inf              # non-finite realized
+    p[300:520] = 2.5             # constant prediction segment longer than the window
+    return p, r
+
+
+class TestRollingIC:
+    @pytest.mark.parametrize("window", [5, 20, 200])
+    def test_matches_batch_rolling_ic(self, window):
+        p, r = _series(900)
+        acc = RollingIC(window)
+        hp, hr = deque(maxlen=window), deque(maxlen=window)
+        for a, b in zip(p, r):
+            acc.add(a, b)
+            hp.append(a)
+            hr.append(b)
+            assert acc.value() == pytest.approx(rolling_ic(hp, hr, window=window), abs=1e-9)
+
+    def test_constant_window_is_zero(self):
+        acc = RollingIC(20)
+        for i in range(40):
+            acc.add(1.0, float(i))
+        assert acc.value() == 0.0
+
+    def test_zero_until_min_samples(self):
+        acc = RollingIC(200)
+        for i in range(199):
+            acc.add(float(i), float(i))
+        assert acc.value() == 0.0
+        acc.add(199.0, 199.0)
+        assert acc.value() == pytest.approx(1.0)
+
+
+class TestRollingVol:
+    @pytest.mark.parametrize("window", [5, 20, 200])
+    def test_matches_batch_series_vol(self, window):
+        p, _ = _series(900, seed=3)
+        acc = RollingVol(window)
+        hist = deque(maxlen=window)
+        for x in p:
+            acc.add(x)
+            hist.append(x)
+            assert acc.value() == pytest.approx(series_vol(hist, window=window), abs=1e-9)
+
+    def test_large_offset_constant_is_eps(self):
+        acc = RollingVol(20, eps=1e-9)
+        for _ in range(30):
+            acc.add(1e6 + 0.1)
+        assert acc.value() == 1e-9
+
+
+class TestHealthMonitorIC:
+    def test_ic_history_matches_last_20_corrcoef(self):
+        rng = np.random.default_rng(7)
+        hm = HealthMonitor()
+        preds, actuals = [], []
+        for t in range(60):
+            p, a = float(rng.normal()), float(rng.normal())
+            preds.append(p)
+            actuals.append(a)
+            hm.update_predictions(p, a, t)
+            if t >= 1:
+                expected = np.corrcoef(preds[-20:], actuals[-20:])[0, 1]
+                assert hm.ic_history[-1] == pytest.approx(expected, abs=1e-9)
+        assert len(hm.ic_history) == 59
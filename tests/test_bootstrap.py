@@ -0,0 +1,80 @@
+"""
+tests/test_bootstrap.py
+
+Verifies the block bootstrap: resample index structure, metric kernels that
+match run_allocator_backtest, pooled runs that match in-process runs, and
+intervals/p-values that behave on series with a known answer.
+
+Run with:
+    python -m pytest tests/test_bootstrap.py -v
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest_engine import run_allocator_backtest
+from bootstrap import bootstrap_backtest, bootstrap_metrics, metric_values, resample_indices
+from benchmarks.fixtures import allocator_inputs
+
+
+class TestResample:
+    @pytest.mark.parametrize("method", ["stationary", "moving", "iid"])
+    def test_shape_and_range(self, method):
+        idx = resample_indices(500, 7, 10, np.random.default_rng(0), method)
+        assert idx.shape == (7, 500) and idx.min() >= 0 and idx.max() < 500
+
+    def test_blocks_are_contiguous_and_wrap(self):
+        n = 1000
+        idx = resample_indices(n, 20, 25, np.random.default_rng(1), "moving")
+        step = np.diff(idx, axis=1)
+        breaks = np.ones(n - 1, dtype=bool)
+        breaks[24::25] = False
+        assert np.all((step[:, breaks] == 1) | (step[:, breaks] == 1 - n))
+        stat = resample_indices(n, 200, 25, np.random.default_rng(2), "stationary")
+        new_blocks = ~np.isin(np.diff(stat, axis=1), [1, 1 - n])
+        assert new_blocks.mean() == pytest.approx(1 / 25, rel=0.1)
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            resample_indices(10, 2, 3, np.random.default_rng(0), "circular")
+
+
+class TestMetrics:
+    def test_kernels_match_backtest_engine(self):
+        np.random.seed(3)
+        eq, tr, _, metrics = run_allocator_backtest(**allocator_inputs(3000))
+        rets = eq["equity"].pct_change().dropna().to_numpy()
+        vals = metric_values(rets, ["sharpe", "sortino", "max_dd"])
+        assert vals["sharpe"][0] == pytest.approx(metrics["sharpe"], rel=1e-9)
+        assert vals["sortino"][0] == pytest.approx(metrics["sortino"], rel=1e-9)
+        assert vals["max_dd"][0] == pytest.approx(metrics["maxDD"], rel=1e-9)
+        table = bootstrap_backtest(eq, tr, n_boot=200, workers=1).set_index("metric")
+        assert list(table.index) == ["sharpe", "sortino", "max_dd"] + (["hit_rate"] if "pnl_$" in tr else [])
+        assert table.loc["sharpe", "ci_low"] <= table.loc["sharpe", "ci_high"]
+
+    def test_pool_matches_in_process(self):
+        x = np.random.default_rng(4).normal(0.0, 0.01, 40_000)
+        serial = bootstrap_metrics(x, n_boot=300, workers=1, seed=9)
+        pooled = bootstrap_metrics(x, n_boot=300, workers=2, seed=9)
+        pd.testing.assert_frame_equal(serial, pooled)
+        assert not serial.equals(bootstrap_metrics(x, n_boot=300, workers=1, seed=10))
+
+    def test_intervals_and_p_values(self):
+        rng = np.random.default_rng(5)
+        strong = rng.normal(0.002, 0.01, 4000)
+        flat = rng.normal(-0.0005, 0.01, 4000)
+        up = bootstrap_metrics(strong, ("mean", "sharpe", "hit_rate"), n_boot=1000, method="iid", workers=1)
+        down = bootstrap_metrics(flat, ("mean", "sharpe"), n_boot=1000, method="iid", workers=1)
+        up, down = up.set_index("metric"), down.set_index("metric")
+        se = 0.01 / np.sqrt(4000)
+        assert up.loc["mean", "ci_low"] < up.loc["mean", "estimate"] < up.loc["mean", "ci_high"]
+        assert up.loc["mean", "boot_std"] == pytest.approx(se, rel=0.15)
+        assert up.loc["mean", "ci_high"] - up.loc["mean", "ci_low"] == pytest.approx(2 * 1.96 * se, rel=0.15)
+        assert up.loc["sharpe", "p_value"] < 0.01 and up.loc["hit_rate", "p_value"] < 0.01
+        assert down.loc["sharpe", "p_value"] > 0.5
+
+    def test_rejects_bad_input(self):
+        with pytest.raises(ValueError):
+            bootstrap_metrics([0.01], n_boot=10)
+        with pytest.raises(ValueError):
+            bootstrap_metrics(np.ones(10), ("calmar",), n_boot=10)
@@ -0,0 +1,206 @@
+"""
+tests/test_counterfactual.py
+
+Verifies the vectorized counterfactual replay against the scalar decision
+functions and RiskAndExec pre-trade guards it mirrors.
+
+Run with:
+    python -m pytest tests/test_counterfactual.py -v
+"""
+import dataclasses
+import json
+import logging
+
+import numpy as np
+import pytest
+
+from live_demo.counterfactual import (
+    ARMS,
+    ReplayArrays,
+    ReplayParams,
+    arm_decision_arrays,
+    edge_after_costs_arrays,
+    gate_and_score_arrays,
+    load_signal_arrays,
+    replay,
+    summarize,
+)
+from live_demo.decision import (
+    Thresholds,
+    compute_edge_after_costs,
+    compute_signals_and_eligibility,
+    decide_bandit,
+    gate_and_score,
+)
+from live_demo.risk_and_exec import RiskAndExec, RiskConfig
+
+
+def _arrays(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    p = rng.dirichlet([1, 2, 1], n)
+    return ReplayArrays.from_columns(
+        ts=np.arange(n) * 300_000,
+        p_down=p[:, 0], p_neutral=p[:, 1], p_up=p[:, 2],
+        s_model=rng.normal(0, 0.5, n),
+        s_model_bma=rng.normal(0, 0.3, n),
+        mood=rng.normal(0, 0.5, n),
+        pros=rng.normal(0, 0.2, n),
+        amateurs=rng.normal(0, 0.2, n),
+        a=rng.normal(0, 0.0005, n),
+        close=60000 * np.exp(np.cumsum(rng.normal(0, 0.003, n))),
+        funding=rng.normal(0, 0.1, n),
+    )
+
+
+def _cohort(arr, i):
+    return {"pros": arr.pros[i], "amateurs": arr.amateurs[i], "mood": arr.mood[i]}
+
+
+def _model_out(arr, i):
+    return {
+        "s_model": arr.s_model[i], "s_model_meta": arr.s_model_meta[i], "s_model_bma": arr.s_model_bma[i],
+        "p_up": arr.p_up[i], "p_down": arr.p_down[i], "p_neutral": arr.p_neutral[i],
+    }
+
+
+class _FixedArm:
+    def __init__(self, idx):
+        self.idx = idx
+        self.means = [0.0] * 4
+
+    def select(self, mask):
+        return self.idx
+
+
+class TestScalarParity:
+    @pytest.mark.parametrize("th", [Thresholds(), Thresholds(CONF_MIN=0.3, flip_mood=False)])
+    def test_gate_and_score(self, th):
+        arr = _arrays()
+        d, a = gate_and_score_arrays(arr, th)
+        for i in range(len(arr)):
+            ref = gate_and_score(_cohort(arr, i), _model_out(arr, i), th)
+            assert (ref["dir"], ref["alpha"]) == pytest.approx((d[i], a[i]), abs=1e-12)
+
+    @pytest.mark.parametrize("arm", ARMS)
+    def test_fixed_bandit_arm(self, arm):
+        arr, th = _arrays(), Thresholds()
+        d, a = arm_decision_arrays(arr, th, arm)
+        for i in range(len(arr)):
+            sig, elig, eps, extras = compute_signals_and_eligibility(_cohort(arr, i), _model_out(arr, i), th)
+            ref = decide_bandit(sig, elig, eps, extras, _FixedArm(ARMS.index(arm))) if elig[arm] else {"dir": 0, "alpha": 0.0}
+            assert (ref["dir"], ref["alpha"]) == pytest.approx((d[i], a[i]), abs=1e-12)
+
+    def test_edge_after_costs(self):
+        arr = _arrays()
+        edge, direction, ok = edge_after_costs_arrays(arr.p_up, arr.p_down, 5.0, 50.0)
+        for i in range(len(arr)):
+            ref = compute_edge_after_costs({"p_up": arr.p_up[i], "p_down": arr.p_down[i]}, 5.0, 50.0)
+            assert ref["should_trade"] == ok[i]
+            assert ref["direction"] == direction[i]
+            assert ref["edge_after_costs_bps"] == pytest.approx(edge[i], abs=0.006)
+
+
+class TestReplay:
+    def test_positions_match_sequential_guards(self):
+        logging.disable(logging.CRITICAL)
+        try:
+            arr = _arrays(2000, seed=1)
+            th = Thresholds(CONF_MIN=0.3)
+            rc = RiskConfig(impact_k=0.0005, vol_floor=0.3, max_impact_bps_hard=3.0, base_notional=50000)
+            controls = {"delta_pi_min_bps": 20, "min_sign_flip_gap_s": 1800,
+                        "funding_guard_bias": 0.1, "max_impact_bps": 1.5}
+            res = replay(arr, ReplayParams(thresholds=th, risk=rc, controls=controls, band_bps=5, edge_gating=False))
+
+            risk = RiskAndExec(None, "BTC", rc)
+            expected = []
+            for i in range(len(arr)):
+                if i:
+                    risk.update_returns(arr.close[i - 1], arr.close[i])
+                d = gate_and_score(_cohort(arr, i), _model_out(arr, i), th)
+                d = risk.evaluate_pretrade_guards(d, ts_ms=int(arr.ts[i]), funding_rate=arr.funding[i],
+                                                  last_price=arr.close[i], controls=controls)
+                if abs(1e4 * (arr.a[i] + arr.b[i] * arr.s_model[i])) <= 5:
+                    d = {**d, "dir": 0, "alpha": 0.0}
+                tgt = risk.target_position(d["dir"], d["alpha"]) if d["dir"] != 0 else 0.0
+                old, risk._pos = risk._pos, tgt
+                risk.post_execution_update({"qty": tgt - old, "price": arr.close[i]}, int(arr.ts[i]))
+                expected.append(tgt)
+        finally:
+            logging.disable(logging.NOTSET)
+        np.testing.assert_allclose(res["pos"], expected, atol=1e-12)
+        vetoes = summarize(res)["vetoes"]
+        for reason in ("funding_guard", "min_sign_flip", "impact_guard"):
+            assert vetoes.get(reason, 0) > 0
+
+    def test_band_and_pnl(self):
+        arr = ReplayArrays.from_columns(
+            ts=[0, 1, 2, 3], s_model=[-0.9] * 4, a=[0.0, 0.0, 0.9, 0.0], mood=[0.0] * 4,
+            p_up=[0.9] * 4, p_down=[0.05] * 4, close=[100.0, 101.0, 102.0, 101.0],
+        )
+        params = ReplayParams(risk=RiskConfig(vol_floor=0.2, cost_bps=0.0), band_bps=5.0, use_realized_vol=False)
+        res = replay(arr, params)
+        # flip_model makes -0.9 a long; a=0.9 puts bar 2's calibrated score inside the band
+        np.testing.assert_array_equal(res["dir"], [1, 1, 0, 1])
+        assert res["veto"][2] == "calibration_band_gate"
+        assert res["pnl_bps"][1] == pytest.approx(0.9 * 100.0)
+        assert res["pnl_bps"][3] == pytest.approx(0.0)
+
+    def test_overrides(self):
+        base = ReplayParams()
+        p = base.with_overrides({"band_bps": 10.0, "thresholds.CONF_MIN": 0.5, "controls.delta_pi_min_bps": 3})
+        assert (p.band_bps, p.thresholds.CONF_MIN, p.controls["delta_pi_min_bps"]) == (10.0, 0.5, 3)
+        assert base.band_bps == 5.0 and base.thresholds.CONF_MIN == 0.60
+        with pytest.raises(KeyError):
+            base.with_overrides({"nope.x": 1})
+
+    def test_edge_veto_only_on_overlay_bars(self):
+        arr = _arrays(400, seed=3)
+        params = ReplayParams(thresholds=Thresholds(CONF_MIN=0.3), band_bps=0.0, cost_bps=20.0)
+        _, _, should_trade = edge_after_costs_arrays(arr.p_up, arr.p_down, 20.0, 50.0)
+        assert (~should_trade).any()
+        # No overlay signals logged: live never reaches the edge gate
+        res = replay(arr, params)
+        assert "negative_edge" not in summarize(res)["vetoes"]
+
+        on = np.zeros(len(arr))
+        on[::2] = 1.0
+        res = replay(dataclasses.replace(arr, overlay=on), params)
+        edge_vetoed = res["veto"] == "negative_edge"
+        assert edge_vetoed.any() and not edge_vetoed[1::2].any()
+
+    def test_conflict_band_uses_live_default(self):
+        assert (ReplayParams.from_config({}).band_bps, ReplayParams.from_config({}).conflict_band_bps) == (5.0, 15.0)
+        p = ReplayParams.from_config({"calibration": {"band_bps": 8}})
+        assert p.band_bps == p.conflict_band_bps == 8.0
+        assert ReplayParams().with_overrides({"band_bps": 10.0}).conflict_band_bps == 10.0
+
+        # 5m/15m conflict with |pred_cal_bps| = 20: inside 2 x 15, outside 2 x 5
+        arr = ReplayArrays.from_columns(
+            ts=[0], s_model=[-0.9], a=[0.898], mood=[0.0], p_up=[0.9], p_down=[0.05],
+            dir_5m=[1], dir_15m=[-1], close=[100.0],
+        )
+        assert replay(arr, ReplayParams(edge_gating=False, use_realized_vol=False))["veto"][0] == "conflict_band_skip"
+        p = ReplayParams(conflict_band_bps=5.0, edge_gating=False, use_realized_vol=False)
+        assert replay(arr, p)["veto"][0] != "conflict_band_skip"
+
+
+class TestLoader:
+    def test_loads_dedupes_and_joins_prices(self, tmp_path):
+        recs = [
+            {"ts": 600, "model_out": {"p_up": 0.5, "p_down": 0.1, "p_neutral": 0.4, "s_model": 0.4},
+             "cohort": {"mood": 0.2}, "decision": {"dir": 1, "alpha": 0.4, "details": {}}},
+            {"ts": 300, "model_out": {"s_model": 0.1}, "cohort": {},
+             "decision": {"dir": 0, "details": {"model_source": "bma", "pred_bma_bps": 250.0,
+                                                "overlay": {"individual_signals": {"5m": {"direction": 1}}}}}},
+            {"ts": 600, "model_out": {"s_model": 0.3}, "cohort": {}, "decision": {}},
+        ]
+        path = tmp_path / "signals.jsonl"
+        path.write_text("\n".join(json.dumps(r) for r in recs) + "\n")
+        (tmp_path / "px.csv").write_text("ts,open,high,low,close,volume\n300,1,1,1,10.0,1\n900,1,1,1,11.0,1\n")
+        arr = load_signal_arrays(str(tmp_path), prices=str(tmp_path / "px.csv"))
+        np.testing.assert_array_equal(arr.ts, [300, 600])
+        assert arr.s_model[0] == pytest.approx(0.025) and arr.s_model_meta[0] == pytest.approx(0.1)
+        assert arr.s_model[1] == pytest.approx(0.3)
+        assert arr.dir_5m[0] == 1.0
+        np.testing.assert_array_equal(arr.overlay, [1.0, 0.0])
+        assert arr.close[0] == 10.0 and np.isnan(arr.close[1])
@@ -0,0 +1,135 @@
+"""
+tests/test_event_bus.py
+
+Verifies the single-emission event bus: one encode per event, identical bytes
+in every JSONL sink, spliced event ids, sink error isolation, and LogRouter
+publishing ensemble/health/calibration through it per its topic config.
+
+Run with:
+    python -m pytest tests/test_event_bus.py -v
+"""
+import json
+
+import pytest
+
+from live_demo.ops.event_bus import ALL_TOPICS, EventBus, JsonlFileSink, PartitionSink, SheetsSink
+from live_demo.ops.log_router import LogRouter, build_event_id
+from ops import llm_logging
+from ops.llm_logging import close_jsonl, read_gzip_tolerant
+
+
+@pytest.fixture(autouse=True)
+def _finish_open_partitions():
+    yield
+    close_jsonl()
+
+
+class _Sheets:
+    def __init__(self):
+        self.rows = []
+
+    def buffer(self, tab, row):
+        self.rows.append((tab, row))
+
+
+class TestEventBus:
+    def test_encodes_once_and_fans_out_same_bytes(self, tmp_path, monkeypatch):
+        bus = EventBus()
+        files = JsonlFileSink(str(tmp_path / "emit"))
+        sheets = _Sheets()
+        bus.subscribe(["health", "ensemble"], files)
+        bus.subscribe("health", PartitionSink(root=str(tmp_path / "llm")))
+        bus.subscribe("health", SheetsSink(sheets, "Health", lambda ev: [ev.ts, ev.record["metrics"]["x"]]))
+        seen = []
+        bus.subscribe(ALL_TOPICS, seen.append)
+
+        calls = []
+        real_dumps = json.dumps
+        monkeypatch.setattr(llm_logging.json, "dumps", lambda *a, **k: calls.append(1) or real_dumps(*a, **k))
+        ev = bus.publish("health", {"ts": 1761107700000, "metrics": {"x": 1.5}, "ts_ist": "2025-10-22T10:05:00+05:30"},
+                         asset="BTC", ts=1761107700000)
+        monkeypatch.undo()
+        assert len(calls) == 1
+
+        bus.close()
+        close_jsonl()
+        line = (tmp_path / "emit" / "health" / "health.jsonl").read_bytes()
+        part = llm_logging.part_path("health_log", "2025-10-22T10:05:00+05:30", "BTC", base_root=str(tmp_path / "llm"))
+        assert line == ev.data == read_gzip_tolerant(part)
+        rec = json.loads(line)
+        assert rec == ev.record and seen == [ev]
+        assert rec["event_id"].startswith("1761107700000:BTC:health:") and rec["bar_id"] and rec["run_id"]
+        assert sheets.rows == [("Health", [1761107700000, 1.5])]
+        assert bus.stats()["health"] == {"events": 1, "bytes": len(line), "deliveries": 4, "errors": 0}
+
+    def test_emitter_envelope_and_llm_budget_only_on_partitions(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("STRATEGY_ID", "strat_x")
+        bus = EventBus()
+        bus.subscribe("calibration", JsonlFileSink(str(tmp_path / "emit")))
+        bus.subscribe("calibration", PartitionSink(root=str(tmp_path / "llm")))
+        ts_ist = "2025-10-22T10:05:00+05:30"
+        ev = bus.publish("calibration", {"ts_ist": ts_ist, "note": "n" * 400, "feature_dump": list(range(400))},
+                         asset="BTC", ts=1761107700000)
+        bus.close()
+        close_jsonl()
+
+        full = json.loads((tmp_path / "emit" / "calibration" / "calibration.jsonl").read_bytes())
+        assert full == ev.record
+        assert full["strategy_id"] == "strat_x" and full["schema_version"]
+        assert len(full["note"]) == 400 and full["feature_dump"] == list(range(400))
+
+        part = llm_logging.part_path("calibration_log", ts_ist, "BTC", base_root=str(tmp_path / "llm"))
+        capped = json.loads(read_gzip_tolerant(part))
+        assert read_gzip_tolerant(part) == ev.capped != ev.data
+        assert capped["event_id"] == full["event_id"] and capped["strategy_id"] == "strat_x"
+        assert len(capped["note"]) == 256 and "feature_dump" not in capped
+
+    def test_sink_errors_are_isolated(self):
+        bus = EventBus(event_ids=False)
+        got = []
+
+        def boom(ev):
+            raise OSError("disk full")
+
+        bus.subscribe("t", boom)
+        bus.subscribe("t", got.append)
+        ev = bus.publish("t", {"v": 1})
+        assert got == [ev] and "event_id" not in ev.record
+        assert bus.stats()["t"]["errors"] == 1
+        assert bus.publish("unsubscribed", {"v": 1}) is None
+
+
+class TestRouterOnBus:
+    def test_topics_follow_config(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PAPER_TRADING_ROOT", str(tmp_path / "unified"))
+        bus = EventBus()
+        cfg = {"topics": {"ensemble": "emitter+llm", "health": "emitter"}}
+        router = LogRouter(cfg, bot_version="5m", base_root=str(tmp_path / "logs"), bus=bus)
+        router.emit_ensemble(ts=1761107700000, asset="BTC", raw_preds={"s_model": 0.0012}, meta={"manifest": "m"})
+        router.emit_health(ts=1761107700000, asset="BTC", health={"recent_bars": 3})
+        router.emit_calibration(ts=1761107700000, asset="BTC", calibration={"a": 0.0, "pred_cal_bps": 4.0})
+        bus.close()
+        close_jsonl()
+
+        ens = (tmp_path / "logs" / "ensemble" / "ensemble.jsonl").read_bytes()
+        rec = json.loads(ens)
+        assert rec["predictions"] == {"s_model": 0.0012} and rec["pred_stack_bps"] == 12.0
+        assert rec["meta"] == {"manifest": "m", "event_id": rec["event_id"]}
+        assert rec["event_id"] == build_event_id(1761107700000, "BTC", "ensemble",
+                                                 {"raw": {"s_model": 0.0012}, "meta": {"manifest": "m"}})
+        # ensemble_log keeps its compact shape
+        llm = list((tmp_path / "logs" / "5m" / "ensemble_log").rglob("*.jsonl.gz"))
+        assert len(llm) == 1
+        compact = json.loads(read_gzip_tolerant(llm[0]))
+        assert compact == {"run_id": rec["run_id"], "asset": "BTC", "event_id": rec["event_id"], "pred_stack_bps": 12.0,
+                           "ts_ist": rec["ts_ist"], "schema_v": "1", "bar_id": rec["bar_id"]}
+
+        health = json.loads((tmp_path / "logs" / "health" / "health.jsonl").read_bytes())
+        assert health["metrics"] == {"recent_bars": 3}
+        assert not (tmp_path / "logs" / "5m" / "health_log").exists()
+
+        # Calibration keeps its default emitter+llm sinks and the unified llm root
+        cal = (tmp_path / "logs" / "calibration" / "calibration.jsonl").read_bytes()
+        cal_llm = list((tmp_path / "unified" / "logs" / "calibration_log").rglob("*.jsonl.gz"))
+        assert len(cal_llm) == 1 and read_gzip_tolerant(cal_llm[0]) == cal
+        assert json.loads(cal)["asset"] == "BTC"
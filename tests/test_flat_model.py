@@ -0,0 +1,105 @@
+"""
+tests/test_flat_model.py
+
+Verifies that flat NumPy exports reproduce sklearn/EnhancedMetaClassifier
+probabilities and that ModelRuntime uses an export only when it is exact.
+
+Run with:
+    python -m pytest tests/test_flat_model.py -v
+"""
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    GradientBoostingClassifier,
+    HistGradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.linear_model import LogisticRegression
+
+from live_demo.custom_models import EnhancedMetaClassifier
+from live_demo.model_runtime import ModelRuntime
+from live_demo.models.artifact_registry import file_digest
+from live_demo.models.flat_model import FlatModel, export_flat, flat_export_path
+from tests.test_model_runtime import _rows, _write_artifacts
+
+
+def _data(n=900, d=5, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, d)), columns=[f"f{i}" for i in range(d)])
+    y = pd.Series(np.digitize(X.f0 + 0.5 * X.f1 + 0.5 * rng.normal(size=n), [-0.5, 0.5]))
+    return X, y
+
+
+def _roundtrip(model, tmp_path):
+    path = str(tmp_path / "m.flat.npz")
+    export_flat(model, path)
+    return FlatModel.load(path)
+
+
+def _test_rows(d=5):
+    return np.random.default_rng(9).normal(0.0, 1.5, size=(400, d))
+
+
+class TestFlatExport:
+
+    @pytest.mark.parametrize("model", [
+        RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0),
+        ExtraTreesClassifier(n_estimators=15, max_depth=8, random_state=0),
+        GradientBoostingClassifier(n_estimators=20, max_depth=3, random_state=0),
+        HistGradientBoostingClassifier(max_iter=20, random_state=0),
+        LogisticRegression(max_iter=500),
+    ], ids=lambda m: type(m).__name__)
+    def test_base_estimators_match_sklearn(self, model, tmp_path):
+        X, y = _data()
+        model.fit(X.values, y)
+        Xt = _test_rows()
+        flat = _roundtrip(model, tmp_path)
+        assert np.abs(flat.predict_proba(Xt) - model.predict_proba(Xt)).max() < 1e-9
+
+    def test_enhanced_meta_classifier_matches(self, tmp_path):
+        X, y = _data()
+        emc = EnhancedMetaClassifier(n_folds=3, min_train_samples=200)
+        small = emc._get_base_models()
+        small["histgb"].set_params(max_iter=15)
+        small["randomforest"].set_params(n_estimators=10, n_jobs=1)
+        small["extratrees"].set_params(n_estimators=10, n_jobs=1)
+        small["gb_classifier"].set_params(n_estimators=15)
+        small["logistic_scaled"].set_params(quantile__n_quantiles=200)
+        emc._get_base_models = lambda: small
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            emc.fit(X, y)
+            Xt = _test_rows()
+            ref = emc.predict_proba(Xt)
+        assert np.abs(_roundtrip(emc, tmp_path).predict_proba(Xt) - ref).max() < 1e-9
+
+    def test_unsupported_model_raises(self, tmp_path):
+        from sklearn.neighbors import KNeighborsClassifier
+        X, y = _data()
+        with pytest.raises(NotImplementedError):
+            export_flat(KNeighborsClassifier().fit(X.values, y), str(tmp_path / "k.flat.npz"))
+
+
+class TestRuntimeUsesExport:
+
+    def test_picks_up_verified_export(self, tmp_path):
+        manifest = _write_artifacts(tmp_path)
+        reference = ModelRuntime(manifest)
+        model_path = str(tmp_path / "model.joblib")
+        export_flat(joblib.load(model_path), flat_export_path(model_path), source_sha256=file_digest(model_path))
+
+        mr = ModelRuntime(manifest)
+        assert mr._flat is not None
+        for x in _rows():
+            assert mr.infer(x)["p_up"] == pytest.approx(reference.infer(x)["p_up"], abs=1e-12)
+
+    def test_ignores_stale_export(self, tmp_path):
+        manifest = _write_artifacts(tmp_path)
+        model_path = str(tmp_path / "model.joblib")
+        export_flat(joblib.load(model_path), flat_export_path(model_path), source_sha256="0" * 64)
+        assert ModelRuntime(manifest)._flat is None
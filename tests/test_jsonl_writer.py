@@ -0,0 +1,154 @@
+"""
+tests/test_jsonl_writer.py
+
+Verifies the persistent-handle gzip writer behind ops.llm_logging.write_jsonl:
+one complete member per block across flushes, date rotation, plain gzip
+reads of a partition that is still open, crash repair, appends across writer
+sessions and the bar_id/partition fast paths.
+
+Run with:
+    python -m pytest tests/test_jsonl_writer.py -v
+"""
+import gzip
+import json
+import time
+import zlib
+
+import pandas as pd
+import pytest
+
+from ops import llm_logging
+from ops.llm_logging import (
+    GzipJsonlWriter,
+    _read_jsonl_gz,
+    bar_id_from_ts,
+    close_jsonl,
+    flush_jsonl,
+    part_path,
+    read_gzip_tolerant,
+    write_jsonl,
+)
+
+
+def _members(path):
+    data, n = open(path, "rb").read(), 0
+    while data:
+        d = zlib.decompressobj(wbits=31)
+        d.decompress(data)
+        assert d.eof
+        data, n = d.unused_data, n + 1
+    return n
+
+
+@pytest.fixture(autouse=True)
+def _finish_open_partitions():
+    yield
+    close_jsonl()
+
+
+class TestWriteJsonl:
+    def test_one_member_per_flush(self, tmp_path):
+        paths = {write_jsonl("signals", {"ts_ist": f"2025-10-22T10:{m:02d}:00+05:30", "x": m}, asset="BTC",
+                             root=str(tmp_path)) for m in range(50)}
+        assert len(paths) == 1
+        path = paths.pop()
+        assert path == part_path("signals", "2025-10-22T10:00:00+05:30", "BTC", base_root=str(tmp_path))
+        flush_jsonl()
+        assert _members(path) == 1
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert [r["x"] for r in rows] == list(range(50))
+        assert rows[0]["bar_id"] == bar_id_from_ts("2025-10-22T10:00:00+05:30")
+
+    def test_rotates_at_date_boundary(self, tmp_path):
+        a = write_jsonl("s", {"ts_ist": "2025-10-22T23:55:00+05:30"}, asset="BTC", root=str(tmp_path))
+        b = write_jsonl("s", {"ts_ist": "2025-10-23T00:00:00+05:30"}, asset="BTC", root=str(tmp_path))
+        c = write_jsonl("s", {"ts_ist": "2025-10-22T23:55:00+05:30"}, asset="ETH", root=str(tmp_path))
+        assert "date=2025-10-22" in a and "date=2025-10-23" in b and a != b
+        assert set(llm_logging._WRITER.open_paths()) == {b, c}
+        # The finished day is a complete gzip file while the next day is still open
+        with gzip.open(a, "rt") as f:
+            assert len(f.readlines()) == 1
+
+    def test_plain_gzip_reader_while_writer_runs(self, tmp_path):
+        w = GzipJsonlWriter(flush_interval_s=0.05)
+        path = str(tmp_path / "s" / "date=2025-10-22" / "asset=A" / "s.jsonl.gz")
+        for v in range(3):
+            w.write(path, json.dumps({"v": v}).encode() + b"\n")
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                try:
+                    with gzip.open(path, "rb") as f:
+                        rows = [json.loads(line)["v"] for line in f]
+                except (OSError, EOFError):
+                    rows = []
+                if rows == list(range(v + 1)):
+                    break
+                time.sleep(0.01)
+            assert rows == list(range(v + 1))
+        assert w.open_paths() == [path]
+        w.close()
+        df = _read_jsonl_gz(path)
+        assert df["v"].tolist() == [0, 1, 2]
+
+    def test_appends_across_sessions(self, tmp_path):
+        for session in range(3):
+            for i in range(4):
+                path = write_jsonl("s", {"ts_ist": "2025-10-22T10:00:00+05:30", "k": session * 4 + i},
+                                   root=str(tmp_path))
+            close_jsonl()
+        assert _members(path) >= 3
+        assert _read_jsonl_gz(path)["k"].tolist() == list(range(12))
+
+    def test_next_session_salvages_crashed_member(self, tmp_path):
+        path = write_jsonl("s", {"ts_ist": "2025-10-22T10:00:00+05:30", "k": 0}, root=str(tmp_path))
+        close_jsonl()
+        with open(path, "ab") as f:
+            f.write(gzip.compress(b'{"k":99}\n{"k":98')[:-5])  # killed mid-write
+        with pytest.raises(EOFError):
+            with gzip.open(path, "rb") as f:
+                f.read()
+        write_jsonl("s", {"ts_ist": "2025-10-22T10:05:00+05:30", "k": 1}, root=str(tmp_path))
+        flush_jsonl()
+        with gzip.open(path, "rt") as f:
+            # The crashed member keeps its complete lines; the partial record is dropped
+            assert [json.loads(line)["k"] for line in f] == [0, 99, 1]
+
+
+class TestWriter:
+    def test_block_is_one_member_across_flushes(self, tmp_path):
+        w = GzipJsonlWriter(flush_interval_s=0, block_bytes=1024)
+        path = str(tmp_path / "s" / "date=2025-01-01" / "asset=A" / "s.jsonl.gz")
+        rows = [json.dumps({"v": v, "pad": "x" * 40}).encode() + b"\n" for v in range(60)]
+        for v, row in enumerate(rows):
+            w.write(path, row)
+            w.flush()
+            with gzip.open(path, "rb") as f:
+                assert f.read() == b"".join(rows[: v + 1])
+        # ~60 flushes, but one member per filled 1 KiB block
+        n_blocks = -(-sum(map(len, rows)) // 1024)
+        assert _members(path) <= n_blocks < 10
+        w.close()
+        assert _members(path) <= n_blocks
+
+    def test_max_open_and_partial_tail(self, tmp_path):
+        w = GzipJsonlWriter(flush_interval_s=0, max_open=2)
+        paths = [str(tmp_path / f"s{i}" / "date=2025-01-01" / "asset=A" / f"s{i}.jsonl.gz") for i in range(3)]
+        for p in paths:
+            w.write(p, b'{"a":1}\n')
+        assert w.open_paths() == paths[1:]
+        w.write(paths[2], b'{"a":2')
+        w.flush()
+        assert read_gzip_tolerant(paths[2]) == b'{"a":1}\n'
+        w.close()
+        assert read_gzip_tolerant(paths[0]) == b'{"a":1}\n'
+
+
+class TestFastPaths:
+    @pytest.mark.parametrize("ts", [
+        "2025-10-22T10:05:00+05:30", "2025-10-22T10:07:31.123456+05:30", "2025-10-22T04:35:00Z",
+        "2025-10-22 10:05:00", "2025-10-22",
+    ])
+    def test_bar_id_matches_pandas(self, ts):
+        for freq in (5, 60, 720):
+            assert bar_id_from_ts(ts, freq) == int(pd.to_datetime(ts).value // (freq * 60 * 1_000_000_000))
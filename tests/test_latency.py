@@ -0,0 +1,61 @@
+"""
+tests/test_latency.py
+
+Verifies BarSpanRecorder stage timing, emitted records and rolling percentiles.
+
+Run with:
+    python -m pytest tests/test_latency.py -v
+"""
+import json
+import time
+
+import pytest
+
+from live_demo.generate_health import save_health_snapshot
+from live_demo.latency import BarSpanRecorder
+
+
+def _bar(rec, sleep_s=0.002, close_ts_ms=None):
+    rec.begin()
+    rec.set_bar(1, close_ts_ms=close_ts_ms)
+    rec.mark("candle_poll")
+    time.sleep(sleep_s)
+    rec.mark("inference")
+    rec.mark("execution")
+    rec.mark("flush")
+    return rec.end_bar()
+
+
+class TestBarSpanRecorder:
+
+    def test_record_has_stage_durations_in_order(self):
+        out = []
+        rec = BarSpanRecorder(writer=out.append)
+        r = _bar(rec, close_ts_ms=time.time() * 1000.0 - 500.0)
+        assert out == [r]
+        assert list(r["stages"]) == ["candle_poll", "inference", "execution", "flush"]
+        assert r["stages"]["inference"] >= 2.0
+        assert r["to_order_ms"] <= r["total_ms"]
+        assert r["close_lag_ms"] >= 500.0
+        assert r["close_to_order_ms"] == pytest.approx(r["close_lag_ms"] + r["to_order_ms"], abs=0.2)
+
+    def test_rolling_percentiles_over_window(self):
+        rec = BarSpanRecorder(window=3, writer=lambda r: None)
+        for _ in range(5):
+            _bar(rec, sleep_s=0.0)
+        pct = rec.percentiles()
+        assert pct["inference"]["n"] == 3 and pct["total"]["n"] == 3
+        assert pct["total"]["p50"] <= pct["total"]["p95"] <= pct["total"]["p99"]
+        assert "close_to_order" not in pct  # offline bars have no close time
+
+    def test_marks_without_begin_are_ignored(self):
+        rec = BarSpanRecorder(writer=lambda r: None)
+        rec.mark("inference")
+        assert rec.end_bar() is None and rec.percentiles() == {}
+
+    def test_health_snapshot_includes_latency(self, tmp_path):
+        rec = BarSpanRecorder(writer=lambda r: None)
+        _bar(rec, sleep_s=0.0)
+        save_health_snapshot(log_dir=str(tmp_path), latency=rec.percentiles())
+        snap = json.loads((tmp_path / "snapshot_health.jsonl").read_text().splitlines()[-1])
+        assert snap["latency_ms"]["total"]["n"] == 1
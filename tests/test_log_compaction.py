@@ -0,0 +1,88 @@
+"""
+tests/test_log_compaction.py
+
+Verifies nightly JSONL -> Parquet compaction: schema dtypes with lossless
+fallbacks, selection of closed/stale partitions, and readers that prefer the
+compacted file (and fall back to the JSONL when it cannot be read).
+
+Run with:
+    python -m pytest tests/test_log_compaction.py -v
+"""
+import io
+import json
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from ops.llm_logging import (
+    _collect_all_stream_files,
+    close_jsonl,
+    compacted_path,
+    read_log_partition,
+    write_jsonl,
+)
+from ops.log_compaction import closed_partitions, compact_logs, typed_frame
+
+
+def _rows():
+    return [
+        {"ts_ist": "2025-10-22T10:05:00+05:30", "asset": "BTC", "a": 0.1, "b": 1, "pred_cal_bps": 3.2,
+         "in_band_flag": True, "band_bps": 5, "extra": {"k": 1}},
+        {"ts_ist": "2025-10-22T10:10:00+05:30", "asset": "BTC", "a": None, "b": 1.5, "pred_cal_bps": "n/a",
+         "in_band_flag": False, "band_bps": 5, "extra": [1]},
+    ]
+
+
+def _write_day(root, day="2025-10-22", stream="calibration_log"):
+    for r in _rows():
+        write_jsonl(stream, {**r, "ts_ist": r["ts_ist"].replace("2025-10-22", day)}, asset="BTC", root=str(root))
+    close_jsonl()
+    return next(root.rglob(f"date={day}/**/{stream}.jsonl.gz"))
+
+
+class TestTypedFrame:
+    def test_schema_dtypes_and_lossless_fallback(self):
+        df = pd.read_json(io.StringIO("\n".join(json.dumps(r) for r in _rows())), lines=True,
+                          dtype=False, convert_dates=False)
+        t = typed_frame(df, "calibration_log")
+        assert str(t["ts_ist"].dtype).endswith(", Asia/Kolkata]")
+        assert t["a"].dtype == "float64" and t["band_bps"].dtype == "float64"
+        assert str(t["in_band_flag"].dtype) == "boolean"
+        # A value that does not parse keeps the whole column as strings instead of nulling it
+        assert t["pred_cal_bps"].tolist() == ["3.2", "n/a"]
+        assert t["extra"].tolist() == ['{"k":1}', "[1]"]
+
+
+class TestSelection:
+    def test_closed_and_stale_partitions(self, tmp_path):
+        old = _write_day(tmp_path, "2025-10-22")
+        _write_day(tmp_path, "2025-10-23")
+        assert closed_partitions(tmp_path, today=date(2025, 10, 23)) == [old]
+        c = compacted_path(old)
+        c.write_bytes(b"not parquet")
+        assert closed_partitions(tmp_path, today=date(2025, 10, 23)) == []
+        os.utime(c, (1, 1))
+        assert closed_partitions(tmp_path, today=date(2025, 10, 23)) == [old]
+
+    def test_reader_falls_back_to_jsonl(self, tmp_path):
+        old = _write_day(tmp_path)
+        compacted_path(old).write_bytes(b"not parquet")
+        df = read_log_partition(old, columns=["asset", "band_bps", "missing"])
+        assert list(df.columns) == ["asset", "band_bps"] and len(df) == 2
+
+
+class TestParquet:
+    def test_round_trip_and_orphans(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        old = _write_day(tmp_path)
+        summary = compact_logs(tmp_path, today=date(2025, 10, 23), remove_source=True)
+        assert summary["compacted"] == [str(compacted_path(old))] and not summary["errors"]
+        assert not old.exists()
+        files = _collect_all_stream_files(tmp_path)
+        assert files == [compacted_path(old)]
+        df = read_log_partition(files[0], columns=["ts_ist", "band_bps", "in_band_flag"])
+        assert list(df.columns) == ["ts_ist", "band_bps", "in_band_flag"]
+        assert df["in_band_flag"].tolist() == [True, False]
+        assert compact_logs(tmp_path, today=date(2025, 10, 23))["compacted"] == []
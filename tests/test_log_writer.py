@@ -0,0 +1,139 @@
+"""
+tests/test_log_writer.py
+
+Verifies the off-loop LogWriter: FIFO writes on the writer thread, payload
+copies at submit time, per-stream overflow policies, counters, sink proxies
+and inline fallback once closed or disabled.
+
+Run with:
+    python -m pytest tests/test_log_writer.py -v
+"""
+import threading
+
+import pytest
+
+from live_demo.ops.log_writer import LogWriter
+
+
+class _Gate:
+    """A sink that blocks the writer thread until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+    def __call__(self):
+        self.entered.set()
+        self.release.wait(5)
+
+
+def _stalled(**kw):
+    w = LogWriter(**kw)
+    gate = _Gate()
+    w.submit("gate", gate)
+    assert gate.entered.wait(5)
+    return w, gate
+
+
+class TestLogWriter:
+    def test_fifo_on_writer_thread_and_copies(self):
+        w = LogWriter()
+        out, threads = [], set()
+
+        def sink(rec):
+            threads.add(threading.current_thread().name)
+            out.append(rec)
+
+        rec = {"i": 0, "nested": [1]}
+        for i in range(100):
+            rec["i"] = i
+            w.submit("s", sink, rec)
+        rec["nested"].append(2)
+        assert w.flush(5)
+        assert [r["i"] for r in out] == list(range(100))
+        assert all(r["nested"] == [1] for r in out)
+        assert threads == {"log-writer"}
+        st = w.stats()
+        assert st["written"] == st["enqueued"] == 100 and st["depth"] == 0
+        w.close()
+
+    def test_overflow_policies(self):
+        w, gate = _stalled(max_queue=3, policies={"old": "drop_oldest", "keep": "overflow"})
+        out = []
+        w.submit("new", out.append, ("new", 0))
+        w.submit("old", out.append, ("old", 0))
+        w.submit("new", out.append, ("new", 1))
+        assert w.submit("new", out.append, ("new", 2)) is False
+        assert w.submit("old", out.append, ("old", 1)) is True
+        assert w.submit("keep", out.append, ("keep", 0)) is True
+        assert w.submit("old", out.append, ("old", 2)) is True
+        gate.release.set()
+        assert w.flush(5)
+        assert out == [("new", 0), ("new", 1), ("keep", 0), ("old", 2)]
+        st = w.stats()
+        assert st["streams"]["new"]["dropped"] == 1
+        assert st["streams"]["old"] == {"enqueued": 3, "written": 1, "dropped": 2, "overflowed": 0, "errors": 0}
+        assert st["streams"]["keep"]["overflowed"] == 1
+        assert st["max_depth"] == 4 and st["lag_ms_max"] > 0
+        w.close()
+
+    def test_submit_does_not_wait_for_a_stalled_sink(self):
+        w, gate = _stalled(max_queue=10)
+        for i in range(50):
+            w.submit("s", lambda: None)
+        assert w.stats()["depth"] == 10 and w.stats()["dropped"] == 40
+        gate.release.set()
+        w.close()
+        assert w.stats()["written"] == 11
+
+    def test_proxy_errors_and_close(self):
+        class Sink:
+            rows = []
+
+            def buffer(self, tab, row):
+                self.rows.append((tab, row))
+
+            def flush(self):
+                raise RuntimeError("sheets down")
+
+        w = LogWriter()
+        sink = w.proxy(Sink(), "sheets")
+        sink.buffer("signals", [1, 2])
+        sink.flush()
+        w.close()
+        assert Sink.rows == [("signals", [1, 2])]
+        st = w.stats()["streams"]
+        assert st["sheets.buffer"]["written"] == 1 and st["sheets.flush"]["errors"] == 1
+        assert w.policy_for("sheets.flush") == "overflow"
+        # After close, submits run inline
+        sink.buffer("signals", [3])
+        assert Sink.rows[-1] == ("signals", [3])
+
+    def test_stalled_sheets_writer_does_not_hold_disk_writes(self):
+        disk = LogWriter()
+        sheets = LogWriter.from_config({}, name="sheets-writer")
+        gate = _Gate()
+        sheets.submit("sheets.flush", gate)
+        assert gate.entered.wait(5)
+        out, threads = [], set()
+
+        def sink(rec):
+            threads.add(threading.current_thread().name)
+            out.append(rec)
+
+        for i in range(5):
+            disk.submit("emitter.emit_signals", sink, i)
+        assert disk.flush(5) and out == list(range(5)) and threads == {"log-writer"}
+        assert not sheets.flush(0.05)
+        gate.release.set()
+        assert sheets.flush(5)
+        disk.close()
+        sheets.close()
+
+    def test_disabled_runs_inline_and_bad_policy(self):
+        out = []
+        w = LogWriter.from_config({"enabled": False})
+        w.wrap(out.append, "s")(1)
+        assert out == [1] and w.flush()
+        with pytest.raises(ValueError):
+            LogWriter(policies={"s": "block"})
@@ -0,0 +1,200 @@
+"""
+tests/test_model_runtime.py
+
+Verifies that the prepared NumPy inference path in ModelRuntime matches the
+original DataFrame path, using small synthetic artifacts.
+
+Run with:
+    python -m pytest tests/test_model_runtime.py -v
+"""
+import json
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+
+from live_demo.calibration_utils import CalibrationWrapper
+from live_demo.model_runtime import ModelRuntime
+
+
+COLUMNS = ["mom_1", "mom_3", "rv_1h", "flow_diff"]
+
+
+def _write_artifacts(tmp_path, columns=COLUMNS, fit_columns=COLUMNS, calibrator=True, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(300, len(fit_columns))), columns=fit_columns)
+    y = np.digitize(X.iloc[:, 0] + 0.3 * rng.normal(size=300), [-0.4, 0.4])
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    joblib.dump(model, tmp_path / "model.joblib")
+    manifest = {
+        "meta_classifier": "model.joblib",
+        "feature_columns": "cols.json",
+        "feature_dim": len(columns),
+    }
+    if calibrator:
+        raw = model.predict_proba(X)
+        isos = [IsotonicRegression(out_of_bounds="clip").fit(raw[:, i], (y == i).astype(int)) for i in range(3)]
+        wrapper = CalibrationWrapper([{"calibrators": isos, "classes": np.array([0, 1, 2])}], np.array([0, 1, 2]))
+        joblib.dump(wrapper, tmp_path / "cal.pkl")
+        manifest["calibrator"] = "cal.pkl"
+    (tmp_path / "cols.json").write_text(json.dumps({"feature_cols": columns}))
+    (tmp_path / "LATEST.json").write_text(json.dumps(manifest))
+    return str(tmp_path / "LATEST.json")
+
+
+def _rows(n=20, d=len(COLUMNS)):
+    return [list(r) for r in np.random.default_rng(3).normal(size=(n, d))]
+
+
+class TestPreparedInference:
+
+    def test_matches_dataframe_path_with_calibrator(self, tmp_path):
+        mr = ModelRuntime(_write_artifacts(tmp_path))
+        assert mr._prepared and mr._cal_mode == "proba"
+        for x in _rows():
+            fast, ref = mr.infer(x), mr._infer_dataframe(x)
+            for k in ("p_down", "p_neutral", "p_up", "s_model", "a", "b"):
+                assert fast[k] == pytest.approx(ref[k], abs=1e-12)
+
+    def test_reorders_schema_to_model_feature_names(self, tmp_path):
+        shuffled = [COLUMNS[i] for i in (2, 0, 3, 1)]
+        mr = ModelRuntime(_write_artifacts(tmp_path, columns=shuffled, calibrator=False))
+        assert mr._prepared and mr._feat_idx is not None
+        for x in _rows():
+            ordered = pd.DataFrame([x], columns=shuffled)[COLUMNS]
+            ref = mr.model.predict_proba(ordered)[0]
+            assert mr.infer(x)["p_up"] == pytest.approx(ref[2], abs=1e-12)
+
+    def test_no_feature_name_warnings_or_per_call_filter_changes(self, tmp_path):
+        mr = ModelRuntime(_write_artifacts(tmp_path))
+        with warnings.catch_warnings(record=True) as caught:
+            # Behind the module's import-time filter, so other warnings still surface
+            warnings.simplefilter("always", append=True)
+            before = list(warnings.filters)
+            mr.infer(_rows(1)[0])
+            mr.infer_batch(_rows(5))
+            assert warnings.filters == before
+        assert not [w for w in caught if "valid feature names" in str(w.message)]
+
+    def test_failing_calibrator_falls_back_to_dataframe_path(self, tmp_path):
+        mr = ModelRuntime(_write_artifacts(tmp_path))
+
+        def boom(_):
+            raise ValueError("calibrator broke")
+
+        mr.calibrator.predict_proba = boom
+        x = _rows(1)[0]
+        raw = mr.model.predict_proba(pd.DataFrame([x], columns=COLUMNS))[0]
+        assert mr.infer(x)["p_up"] == pytest.approx(raw[2], abs=1e-12)
+        batch = mr.infer_batch(_rows(3))
+        assert batch["p_up"].shape == (3,) and np.isfinite(batch["p_up"]).all()
+
+    def test_not_prepared_when_schema_does_not_match_model(self, tmp_path):
+        mr = ModelRuntime(_write_artifacts(tmp_path, columns=["a", "b", "c", "d"], calibrator=False))
+        assert not mr._prepared
+
+
+class TestInferBatch:
+
+    def test_batch_matches_single_row_infer(self, tmp_path):
+        mr = ModelRuntime(_write_artifacts(tmp_path))
+        rows = _rows(50)
+        batch = mr.infer_batch(np.array(rows))
+        assert batch["p_up"].shape == (50,)
+        for i, x in enumerate(rows):
+            single = mr.infer(x)
+            for k in ("p_down", "p_neutral", "p_up", "s_model"):
+                assert batch[k][i] == pytest.approx(single[k], abs=1e-12)
+
+    def test_unprepared_runtime_falls_back_per_row(self, tmp_path):
+        mr = ModelRuntime(_write_artifacts(tmp_path, calibrator=False))
+        mr._prepared = False
+        rows = _rows(5)
+        batch = mr.infer_batch(rows)
+        assert batch["s_model"][3] == pytest.approx(mr._infer_dataframe(rows[3])["s_model"])
+
+
+class _BrokenModel:
+    def predict_proba(self, X):
+        raise RuntimeError("corrupt trees")
+
+
+def _wait_for_candidate(mr, timeout=10.0):
+    mr._reload_next_check = 0.0
+    assert mr.poll_reload() is None  # starts the background load
+    mr._reload_thread.join(timeout)
+    return mr.poll_reload()
+
+
+class TestHotReload:
+
+    def test_swaps_validated_model_between_calls(self, tmp_path):
+        manifest = _write_artifacts(tmp_path, calibrator=False, seed=0)
+        mr = ModelRuntime(manifest)
+        mr.enable_hot_reload(check_interval_s=0.0, probation_calls=1)
+        old_model, x = mr.model, _rows(1)[0]
+        before = mr.infer(x)
+
+        _write_artifacts(tmp_path, calibrator=True, seed=1)
+        event = _wait_for_candidate(mr)
+        assert event["status"] == "swapped"
+        assert mr.model is not old_model and mr._cal_mode == "proba"
+        assert mr.infer(x)["p_up"] != before["p_up"]
+        assert mr._reload_previous is None  # probation over after one good call
+
+    def test_rejects_candidate_with_changed_schema(self, tmp_path):
+        manifest = _write_artifacts(tmp_path, calibrator=False)
+        mr = ModelRuntime(manifest)
+        mr.enable_hot_reload(check_interval_s=0.0)
+        old_model = mr.model
+
+        _write_artifacts(tmp_path, columns=COLUMNS + ["extra"], fit_columns=COLUMNS + ["extra"], calibrator=False)
+        event = _wait_for_candidate(mr)
+        assert event["status"] == "rejected" and "schema" in event["error"]
+        assert mr.model is old_model
+        # Same bad manifest is not retried until it changes again
+        mr._reload_stat = None
+        mr._reload_next_check = 0.0
+        assert mr.poll_reload() is None and not mr._reload_thread.is_alive()
+
+    def test_rolls_back_when_live_inference_fails(self, tmp_path):
+        manifest = _write_artifacts(tmp_path, calibrator=False, seed=0)
+        mr = ModelRuntime(manifest)
+        mr.enable_hot_reload(check_interval_s=0.0)
+        old_model, x = mr.model, _rows(1)[0]
+        expected = mr.infer(x)
+
+        _write_artifacts(tmp_path, calibrator=False, seed=2)
+        m = json.loads((tmp_path / "LATEST.json").read_text())
+        (tmp_path / "LATEST.json").write_text(json.dumps({**m, "git_commit": "retrained"}))
+        assert _wait_for_candidate(mr)["status"] == "swapped"
+        mr.model = _BrokenModel()
+
+        out = mr.infer(x)
+        assert mr.model is old_model
+        assert out["p_up"] == pytest.approx(expected["p_up"])
+        assert mr.poll_reload()["status"] == "rolled_back"
+
+    def test_batch_inference_is_on_probation(self, tmp_path):
+        manifest = _write_artifacts(tmp_path, calibrator=False, seed=0)
+        mr = ModelRuntime(manifest)
+        mr.enable_hot_reload(check_interval_s=0.0, probation_calls=2)
+        old_model, X = mr.model, np.array(_rows(8))
+        expected = mr.infer_batch(X)
+
+        _write_artifacts(tmp_path, calibrator=False, seed=2)
+        m = json.loads((tmp_path / "LATEST.json").read_text())
+        (tmp_path / "LATEST.json").write_text(json.dumps({**m, "git_commit": "retrained"}))
+        assert _wait_for_candidate(mr)["status"] == "swapped"
+        mr.infer_batch(X)
+        assert mr._reload_probation_left == 1
+        mr.model = _BrokenModel()
+
+        out = mr.infer_batch(X)
+        assert mr.model is old_model and mr._reload_previous is None
+        np.testing.assert_allclose(out["p_up"], expected["p_up"])
+        assert mr.poll_reload()["status"] == "rolled_back"
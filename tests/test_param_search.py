@@ -0,0 +1,72 @@
+"""
+tests/test_param_search.py
+
+Verifies the shared-memory parameter search: pooled evaluations match the
+in-process replay, and the winning overrides round-trip through a config overlay.
+
+Run with:
+    python -m pytest tests/test_param_search.py -v
+"""
+import numpy as np
+import pytest
+
+from live_demo.counterfactual import ReplayArrays, ReplayParams, config_overlay
+from live_demo.param_search import (
+    Objective,
+    SearchPool,
+    bayes_search,
+    evaluate,
+    grid_points,
+    grid_search,
+)
+
+
+def _arrays(n, seed=0):
+    rng = np.random.default_rng(seed)
+    p = rng.dirichlet([1, 2, 1], n)
+    return ReplayArrays.from_columns(
+        ts=np.arange(n) * 300_000,
+        p_down=p[:, 0], p_neutral=p[:, 1], p_up=p[:, 2],
+        s_model=rng.normal(0, 0.5, n),
+        mood=rng.normal(0, 0.5, n),
+        a=rng.normal(0, 0.0005, n),
+        close=60000 * np.exp(np.cumsum(rng.normal(0, 0.003, n))),
+    )
+
+
+SPACE = {"band_bps": [0.0, 5.0, 15.0], "thresholds.CONF_MIN": [0.3, 0.6]}
+
+
+class TestSearch:
+    def test_grid_points(self):
+        points = grid_points(SPACE)
+        assert len(points) == 6
+        assert points[0] == {"band_bps": 0.0, "thresholds.CONF_MIN": 0.3}
+
+    def test_pool_matches_in_process(self):
+        arr, base, obj = _arrays(2000, seed=2), ReplayParams(), Objective(turnover_cost_bps=1.0)
+        with SearchPool(arr, base, obj, workers=2) as pool:
+            ranked = grid_search(pool, SPACE)
+        assert [r["score"] for r in ranked] == sorted((r["score"] for r in ranked), reverse=True)
+        for r in ranked:
+            assert r["score"] == pytest.approx(evaluate(arr, base, r["overrides"], obj)["score"])
+
+    def test_bayes_budget_and_integer_bounds(self):
+        with SearchPool(_arrays(500), workers=1) as pool:
+            ranked = bayes_search(pool, {"band_bps": (0, 20), "thresholds.CONF_MIN": (0.2, 0.8)}, n_iter=9, batch=3)
+        assert len(ranked) == 9
+        assert all(isinstance(r["overrides"]["band_bps"], int) for r in ranked)
+        assert all(0.2 <= r["overrides"]["thresholds.CONF_MIN"] <= 0.8 for r in ranked)
+
+
+class TestConfigOverlay:
+    def test_round_trips_through_from_config(self):
+        overrides = {"band_bps": 12.0, "conflict_band_mult": 3.0, "cost_bps": 4.0,
+                     "thresholds.CONF_MIN": 0.5, "controls.delta_pi_min_bps": 7}
+        p = ReplayParams.from_config(config_overlay(overrides))
+        assert (p.band_bps, p.conflict_band_mult, p.cost_bps) == (12.0, 3.0, 4.0)
+        assert p.thresholds.CONF_MIN == 0.5 and p.controls == {"delta_pi_min_bps": 7}
+
+    def test_replay_only_keys_rejected(self):
+        with pytest.raises(KeyError):
+            config_overlay({"policy": "pros"})
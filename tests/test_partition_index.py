@@ -0,0 +1,113 @@
+"""
+tests/test_partition_index.py
+
+Verifies the block index written next to gzip JSONL partitions: indexed
+offsets that start complete gzip members, tail and time-range reads
+that only touch the blocks they need, appends across writer sessions and the
+fallback for partitions written before the index existed.
+
+Run with:
+    python -m pytest tests/test_partition_index.py -v
+"""
+import gzip
+import json
+import os
+
+import pytest
+
+from ops import llm_logging
+from ops.llm_logging import (
+    GzipJsonlWriter,
+    close_jsonl,
+    encode_jsonl,
+    index_path,
+    read_gzip_range,
+    read_gzip_tail,
+    read_gzip_tolerant,
+    read_log_partition,
+    read_partition_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def _finish_open_partitions():
+    yield
+    close_jsonl()
+
+
+def _ts(i):
+    return f"2025-10-22T{10 + i // 60:02d}:{i % 60:02d}:00+05:30"
+
+
+def _write(writer, path, rng):
+    for i in rng:
+        rec, data = encode_jsonl({"ts_ist": _ts(i), "i": i, "pad": "x" * 200})
+        writer.write(path, data, rec["ts_ist"])
+
+
+def _ids(raw):
+    return [json.loads(line)["i"] for line in raw.splitlines()]
+
+
+@pytest.fixture
+def partition(tmp_path):
+    path = str(tmp_path / "signals" / "date=2025-10-22" / "asset=BTC" / "signals.jsonl.gz")
+    writer = GzipJsonlWriter(flush_interval_s=0, block_bytes=2048)
+    _write(writer, path, range(200))
+    writer.close()
+    return path
+
+
+class TestIndex:
+    def test_blocks_and_full_read(self, partition):
+        entries = read_partition_index(partition)
+        assert len(entries) > 10
+        assert entries[0] == (0, _ts(0))
+        with gzip.open(partition, "rb") as f:
+            assert _ids(f.read()) == list(range(200))
+
+    def test_tail_reads_only_last_blocks(self, partition, monkeypatch):
+        calls = []
+        real = llm_logging._inflate
+        monkeypatch.setattr(llm_logging, "_inflate", lambda data: calls.append(len(data)) or real(data))
+        assert _ids(read_gzip_tail(partition, 5)) == list(range(195, 200))
+        assert 1 <= len(calls) <= 2 and sum(calls) < os.path.getsize(partition) / 10
+        assert _ids(read_gzip_tail(partition, 50)) == list(range(150, 200))
+        assert _ids(read_gzip_tail(partition, 500)) == list(range(200))
+
+    def test_range(self, partition):
+        assert _ids(read_gzip_range(partition, _ts(100), _ts(109))) == list(range(100, 110))
+        assert _ids(read_gzip_range(partition, start=_ts(190))) == list(range(190, 200))
+        assert _ids(read_gzip_range(partition, end=_ts(3))) == list(range(4))
+        df = read_log_partition(partition, since=_ts(150))
+        assert df["i"].min() <= 150 and df["i"].max() == 199 and len(df) < 200
+
+    def test_open_partition_and_new_session(self, partition):
+        size_before = os.path.getsize(partition)
+        writer = GzipJsonlWriter(flush_interval_s=0, block_bytes=2048)
+        _write(writer, partition, range(200, 230))
+        writer.flush()
+        # Still open for writing, and readable by plain gzip
+        assert _ids(read_gzip_tail(partition, 3)) == [227, 228, 229]
+        with gzip.open(partition, "rb") as f:
+            assert _ids(f.read()) == list(range(230))
+        writer.close()
+        assert (size_before, _ts(200)) in read_partition_index(partition)
+        assert _ids(read_gzip_range(partition, _ts(195), _ts(204))) == list(range(195, 205))
+        assert _ids(read_gzip_tolerant(partition)) == list(range(230))
+
+
+class TestUnindexed:
+    def test_legacy_file_gets_a_whole_file_block(self, tmp_path):
+        path = tmp_path / "signals.jsonl.gz"
+        with gzip.open(path, "wb") as f:
+            f.write(b"".join(encode_jsonl({"ts_ist": _ts(i), "i": i})[1] for i in range(3)))
+        assert read_partition_index(path) == []
+        assert _ids(read_gzip_tail(path, 2)) == [1, 2]
+
+        writer = GzipJsonlWriter(flush_interval_s=0)
+        _write(writer, str(path), range(3, 5))
+        writer.close()
+        assert index_path(path).read_bytes().startswith(b"0\t\n")
+        assert _ids(read_gzip_range(path, _ts(1), _ts(3))) == [1, 2, 3]
+        assert _ids(read_gzip_tail(path, 10)) == list(range(5))
@@ -0,0 +1,104 @@
+"""
+tests/test_production_emitter.py
+
+Verifies ProductionLogEmitter's single writer thread: every log type goes
+through one queue and one thread, handles stay open across batches, sizes are
+tracked from written bytes and files rotate once they pass the size limit.
+Also checks that emit never blocks (full queue drops and counts, emits after
+close are written inline) and that open gzip files read with plain gzip.
+
+Run with:
+    python -m pytest tests/test_production_emitter.py -v
+"""
+import gzip
+import json
+import threading
+import time
+
+from live_demo.emitters.production_emitter import LOG_TYPES, EmitterConfig, ProductionLogEmitter
+from ops.llm_logging import read_gzip_tolerant
+
+
+def _lines(raw: bytes):
+    return [json.loads(line) for line in raw.splitlines() if line]
+
+
+class TestProductionLogEmitter:
+    def test_one_writer_thread_for_all_types(self, tmp_path):
+        before = threading.active_count()
+        em = ProductionLogEmitter(EmitterConfig(base_dir=str(tmp_path), compression=False, flush_interval=0.05))
+        assert threading.active_count() == before + 1
+        for i in range(30):
+            em.emit_signals({"i": i})
+            em.emit_health({"i": i})
+            em.emit_calibration({"i": i})
+        em.flush_all()
+        stats = em.get_stats()
+        assert stats["queue"]["size"] == 0
+        assert {k: v["records_written"] for k, v in stats["files"].items()} == {
+            "signals": 30, "health": 30, "calibration": 30}
+        path = stats["files"]["signals"]["path"]
+        raw = open(path, "rb").read()
+        assert [r["i"] for r in _lines(raw)] == list(range(30))
+        assert stats["files"]["signals"]["size_mb"] * 1024 * 1024 == len(raw)
+        em.close()
+        assert threading.active_count() == before
+        assert len(LOG_TYPES) == 11
+
+    def test_gzip_handles_persist_and_stay_readable(self, tmp_path):
+        em = ProductionLogEmitter(EmitterConfig(base_dir=str(tmp_path), compression=True, flush_interval=0.05))
+        em.emit_execution({"n": 1})
+        em.flush_all()
+        path = em.get_stats()["files"]["execution"]["path"]
+        assert [r["n"] for r in _lines(read_gzip_tolerant(path))] == [1]
+        em.emit_execution({"n": 2})
+        em.close()
+        assert [r["n"] for r in _lines(read_gzip_tolerant(path))] == [1, 2]
+
+    def test_rotates_on_tracked_size(self, tmp_path):
+        cfg = EmitterConfig(base_dir=str(tmp_path), compression=False, enable_async=False, max_file_size_mb=0)
+        cfg.max_file_size_mb = 200 / (1024 * 1024)
+        em = ProductionLogEmitter(cfg)
+        for i in range(6):
+            em.emit_risk({"i": i, "pad": "x" * 100})
+        em.close()
+        files = sorted(p.name for p in tmp_path.rglob("risk*.jsonl*"))
+        assert "risk.jsonl" in files and len(files) > 1
+        rows = []
+        for p in tmp_path.rglob("risk*.jsonl*"):
+            rows += [r["i"] for r in _lines(p.read_bytes())]
+        assert sorted(rows) == list(range(6))
+
+    def test_open_gzip_file_reads_with_plain_gzip(self, tmp_path):
+        em = ProductionLogEmitter(EmitterConfig(base_dir=str(tmp_path), compression=True, flush_interval=0.05))
+        for n in range(3):
+            em.emit_health({"n": n})
+            em.flush_all()
+        path = em.get_stats()["files"]["health"]["path"]
+        with gzip.open(path, "rb") as f:
+            assert [r["n"] for r in _lines(f.read())] == [0, 1, 2]
+        em.close()
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        em = ProductionLogEmitter(EmitterConfig(base_dir=str(tmp_path), compression=False, queue_size=2))
+        with em._lock:  # park the writer on its first record
+            em.emit_signals({"i": 0})
+            deadline = time.monotonic() + 5
+            while em._queue.qsize() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            for i in range(1, 6):
+                em.emit_signals({"i": i})
+            assert em.get_stats()["queue"]["dropped"] == {"signals": 3}
+        em.flush_all()
+        assert em.get_stats()["files"]["signals"]["records_written"] == 3
+        em.close()
+
+    def test_emit_after_close_writes_inline(self, tmp_path):
+        em = ProductionLogEmitter(EmitterConfig(base_dir=str(tmp_path), compression=True, queue_size=1))
+        em.emit_costs({"n": 0})
+        em.close()
+        for n in range(1, 4):
+            em.emit_costs({"n": n})
+        path = next(tmp_path.rglob("costs.jsonl.gz"))
+        with gzip.open(path, "rb") as f:
+            assert [r["n"] for r in _lines(f.read())] == [0, 1, 2, 3]
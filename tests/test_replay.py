@@ -0,0 +1,186 @@
+"""
+tests/test_replay.py
+
+Verifies the replay transports for run_live: the virtual clock, klines served
+as of that clock through MarketData, trade streaming that is drained before a
+sleeper resumes, disjoint user-fill polls and loading a recording directory;
+and an end-to-end run_live replay (Google Sheets client stubbed) that keeps
+every output under the session's output_root.
+
+Run with:
+    python -m pytest tests/test_replay.py -v
+"""
+import asyncio
+import importlib
+import json
+import os
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from live_demo.market_data import MarketData
+from live_demo.replay import Recording, ReplayClock, ReplaySession
+
+T0 = 1_700_000_000_000
+BAR = 300_000
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _candles(n):
+    close = 60000.0 + np.arange(n, dtype=float)
+    return pd.DataFrame({"ts": T0 + BAR * np.arange(n), "open": close, "high": close + 1.0,
+                         "low": close - 1.0, "close": close, "volume": 1.0})
+
+
+def _trades(n_bars, per_bar=3):
+    return [{"ts": T0 + BAR * i + 1000 * (j + 1), "coin": "BTC", "side": "buy", "price": 1.0, "size": 1.0,
+             "source": "public"} for i in range(n_bars) for j in range(per_bar)]
+
+
+class TestClock:
+    def test_waiters_released_in_deadline_order(self):
+        async def scenario():
+            clock = ReplayClock(0)
+            seen = []
+
+            async def waiter(ts):
+                await clock.wait_until(ts)
+                seen.append((ts, clock.time_ms()))
+
+            tasks = [asyncio.create_task(waiter(ts)) for ts in (3000, 1000, 2000, 0)]
+            await asyncio.sleep(0)
+            await clock.sleep(2.5)
+            assert seen == [(0, 0), (1000, 2500), (2000, 2500)]
+            await clock.sleep(1.0)
+            await asyncio.gather(*tasks)
+            return seen, clock.time()
+
+        seen, now = asyncio.run(scenario())
+        assert seen[-1] == (3000, 3500) and now == 3.5
+
+
+class TestTransports:
+    def test_klines_as_of_clock(self):
+        session = ReplaySession(Recording(_candles(20)), warmup_bars=10)
+        md = MarketData(session.client, "BTCUSDT", "5m")
+        warm = md.get_klines(limit=1000)
+        assert len(warm) == 10 and int(warm["ts"].iloc[-1]) == T0 + 9 * BAR
+        session.clock.advance(T0 + 12 * BAR + 5)
+        assert md.poll_last_closed_kline()[0] == T0 + 11 * BAR
+        assert not session.exhausted
+        session.clock.advance(T0 + 19 * BAR)
+        assert session.exhausted
+
+    def test_stream_drained_before_sleeper_resumes(self):
+        session = ReplaySession(Recording(_candles(6), trades=_trades(6)), warmup_bars=2)
+
+        async def scenario():
+            seen = []
+
+            async def consume():
+                async with session.listener("ws://unused", addresses=[], coin="BTC", mode="public_trades") as hl:
+                    async for t in hl.stream():
+                        seen.append(t["ts"])
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0)
+            counts = []
+            for _ in range(3):
+                await session.clock.sleep(BAR / 1000.0)
+                counts.append(sum(ts <= session.clock.time_ms() for ts in seen))
+                assert counts[-1] == len(seen)
+            task.cancel()
+            return counts
+
+        assert asyncio.run(scenario()) == [9, 12, 15]
+
+    def test_user_fills_polled_once(self):
+        fills = [{"ts": T0 + BAR * i, "address": "0xabc", "coin": "BTC", "side": "sell", "price": 1.0, "size": 2.0}
+                 for i in range(10)]
+        session = ReplaySession(Recording(_candles(10), user_fills=fills), warmup_bars=4)
+        assert session.poll_user_fills(T0 + 2 * BAR) == []
+        got = session.poll_user_fills(T0 + 6 * BAR) + session.poll_user_fills(T0 + 9 * BAR)
+        assert [f["ts"] for f in got] == [T0 + BAR * i for i in range(4, 10)]
+        assert all(f["source"] == "user" for f in got)
+
+    def test_funding_as_of_clock(self):
+        session = ReplaySession(Recording(_candles(10), funding=[(T0 + 2 * BAR, 1e-4), (T0 + 8 * BAR, 2e-4)]),
+                                warmup_bars=5)
+        assert asyncio.run(session.fetch_funding())["funding"] == 1e-4
+        session.clock.advance(T0 + 8 * BAR)
+        assert asyncio.run(session.fetch_funding()) == {"ts": T0 + 8 * BAR, "coin": "BTC", "funding": 2e-4,
+                                                        "stale": False}
+
+
+class TestRecording:
+    def test_load_directory(self, tmp_path):
+        _candles(5).sample(frac=1.0, random_state=0).to_csv(tmp_path / "candles.csv", index=False)
+        with open(tmp_path / "trades.jsonl", "w", encoding="utf-8") as f:
+            for t in reversed(_trades(5, per_bar=1)):
+                f.write(json.dumps(t) + "\n")
+        pd.DataFrame({"ts": [T0], "funding": [1e-5]}).to_csv(tmp_path / "funding.csv", index=False)
+        rec = Recording.load(str(tmp_path))
+        assert rec.candles["ts"].is_monotonic_increasing
+        assert (rec.candles["close_ts"] == rec.candles["ts"] + BAR - 1).all()
+        assert [t["ts"] for t in rec.trades] == sorted(t["ts"] for t in rec.trades)
+        assert rec.user_fills == [] and rec.funding == [(T0, 1e-5)]
+
+    def test_too_short(self):
+        with pytest.raises(ValueError):
+            ReplaySession(Recording(_candles(1)))
+
+
+def _snapshot(root: Path):
+    return {str(p): (p.stat().st_size, p.stat().st_mtime_ns) for p in root.rglob("*") if p.is_file()}
+
+
+class TestRunLive:
+    def test_replay_end_to_end(self, tmp_path, monkeypatch):
+        # The Sheets client is not needed offline: replays use the CSV fallback
+        gspread = types.ModuleType("gspread")
+        gspread.authorize = lambda *a, **k: None
+        service_account = types.ModuleType("google.oauth2.service_account")
+        service_account.Credentials = object
+        monkeypatch.setitem(sys.modules, "gspread", gspread)
+        monkeypatch.setitem(sys.modules, "google", types.ModuleType("google"))
+        monkeypatch.setitem(sys.modules, "google.oauth2", types.ModuleType("google.oauth2"))
+        monkeypatch.setitem(sys.modules, "google.oauth2.service_account", service_account)
+        monkeypatch.delenv("PAPER_TRADING_ROOT", raising=False)
+        main = importlib.import_module("live_demo.main")
+        from live_demo.alerts.alert_router import close_alert_router
+        from ops.llm_logging import close_jsonl, read_gzip_tolerant
+
+        cfg = json.loads((REPO_ROOT / "live_demo" / "config.json.backup_20260220_130454").read_text(encoding="utf-8"))
+        cfg_path = tmp_path / "cfg" / "config.json"
+        cfg_path.parent.mkdir()
+        cfg_path.write_text(json.dumps(cfg), encoding="utf-8")
+        n = 230
+        close = 60000.0 + np.cumsum(np.random.default_rng(0).normal(0.0, 20.0, n))
+        candles = pd.DataFrame({"ts": T0 + BAR * np.arange(n), "open": close, "high": close + 5.0,
+                                "low": close - 5.0, "close": close, "volume": 10.0})
+        out = tmp_path / "out"
+        session = ReplaySession(Recording(candles, trades=_trades(n)), warmup_bars=200, output_root=str(out))
+
+        live = REPO_ROOT / "paper_trading_outputs"
+        before = _snapshot(live)
+        try:
+            asyncio.run(asyncio.wait_for(main.run_live(str(cfg_path), dry_run=True, replay=session), 120))
+        finally:
+            close_alert_router()
+            close_jsonl()
+        assert session.exhausted
+        assert os.environ["PAPER_TRADING_ROOT"] == str(out)
+        assert _snapshot(live) == before
+
+        # Every closed bar after warmup went through the bar loop once
+        signals = [json.loads(line) for line in (out / "logs" / "default" / "signals" / "signals.jsonl").open()]
+        assert [r["ts"] for r in signals] == [T0 + BAR * i for i in range(198, n - 1)]
+        cal = next(out.rglob("calibration_log.jsonl.gz"))
+        assert len(read_gzip_tolerant(cal).splitlines()) == len(signals)
+        for rel in ("cohort_state.json", "sheets_fallback/signals.csv", "run_manifest.json"):
+            assert (out / rel).exists(), rel
+        assert next(out.rglob("market_ingest_log.jsonl.gz")) and next(out.rglob("latency.jsonl.gz"))
@@ -0,0 +1,72 @@
+"""
+tests/test_shadow_lane.py
+
+Verifies ShadowModelLane scoring, side-by-side records and hypothetical PnL.
+
+Run with:
+    python -m pytest tests/test_shadow_lane.py -v
+"""
+import threading
+
+import pytest
+
+from live_demo.decision import Thresholds, gate_and_score
+from live_demo.model_runtime import ModelRuntime
+from live_demo.shadow_lane import ShadowModelLane
+from tests.test_model_runtime import _rows, _write_artifacts
+
+
+NULL_COHORT = {"pros": 0.0, "amateurs": 0.0, "mood": 0.0}
+PROD_OUT = {"p_up": 0.5, "p_down": 0.2, "p_neutral": 0.3, "s_model": 0.3}
+
+
+def _lane(tmp_path, th, **kw):
+    (tmp_path / "cand").mkdir()
+    manifest = _write_artifacts(tmp_path / "cand", seed=4)
+    records = []
+    lane = ShadowModelLane({"cand": manifest}, th, writer=records.append, **kw)
+    return lane, records, ModelRuntime(manifest)
+
+
+class TestShadowModelLane:
+
+    def test_records_match_direct_scoring(self, tmp_path):
+        th = Thresholds(S_MIN=0.0, M_MIN=0.0, CONF_MIN=0.0)
+        lane, records, mr = _lane(tmp_path, th)
+        rows = _rows(3)
+        for i, x in enumerate(rows):
+            assert lane.submit(i, x, NULL_COHORT, PROD_OUT, {"dir": 1, "alpha": 1.0}, 100.0 + i)
+        lane.close()
+
+        assert [r["ts"] for r in records] == [0, 1, 2]
+        for rec, x in zip(records, rows):
+            out = mr.infer(x)
+            assert rec["candidate"] == "cand"
+            assert rec["p_up"] == pytest.approx(out["p_up"])
+            assert rec["dir"] == gate_and_score(NULL_COHORT, out, th)["dir"]
+            assert rec["prod_p_up"] == 0.5 and rec["prod_dir"] == 1
+        assert lane.stats["scored"] == 3 and lane.stats["dropped"] == 0
+
+    def test_hypothetical_pnl_uses_previous_position(self, tmp_path):
+        lane, records, _ = _lane(tmp_path, Thresholds(), cost_bps=2.0)
+        x = _rows(1)[0]
+        lane.submit(0, x, NULL_COHORT, PROD_OUT, {"dir": 1, "alpha": 0.5}, 100.0)
+        lane.submit(1, x, NULL_COHORT, PROD_OUT, {"dir": -1, "alpha": 0.5}, 101.0)
+        lane.close()
+
+        # Opening 0.5 on the first bar pays its entry cost
+        assert records[0]["prod_pnl_bps"] == pytest.approx(-0.5 * 2.0)
+        # Long 0.5 over a +1% bar, then flip to -0.5 (1.0 unit turnover at 2 bps)
+        assert records[1]["prod_pnl_bps"] == pytest.approx(0.5 * 100.0 - 2.0)
+        assert records[1]["prod_cum_pnl_bps"] == pytest.approx(47.0)
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        (tmp_path / "cand").mkdir()
+        release = threading.Event()
+        lane = ShadowModelLane({"cand": _write_artifacts(tmp_path / "cand")}, Thresholds(),
+                               max_queue=1, writer=lambda rec: release.wait(5.0))
+        x = _rows(1)[0]
+        accepted = sum(lane.submit(i, x, NULL_COHORT, PROD_OUT, {}, 100.0) for i in range(50))
+        release.set()
+        lane.close()
+        assert accepted <= 2 and lane.stats["dropped"] == 50 - accepted
@@ -0,0 +1,50 @@
+"""
+tests/test_shared_arrays.py
+
+Verifies the shared-memory helpers used by walk_forward, bootstrap and the
+parameter search: arrays round-trip with dtype and shape intact as read-only
+views, including a ReplayArrays rebuilt from the attached columns.
+
+Run with:
+    python -m pytest tests/test_shared_arrays.py -v
+"""
+import numpy as np
+import pytest
+
+from live_demo.counterfactual import ReplayArrays
+from ops.shared_arrays import attach_arrays, share_arrays
+
+
+class TestSharedArrays:
+    def test_round_trip_is_read_only_view(self):
+        arrays = {"x/returns": np.arange(5.0), "x/arm_eligible": np.eye(3, dtype=bool), "ts": np.arange(4) * 300_000}
+        shm, spec = share_arrays(arrays)
+        try:
+            handle, views = attach_arrays(spec)
+            for k, v in arrays.items():
+                np.testing.assert_array_equal(views[k], v)
+                assert views[k].dtype == v.dtype and not views[k].flags.writeable
+            with pytest.raises(ValueError):
+                views["x/returns"][0] = 1.0
+            del views
+            handle.close()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_replay_arrays_from_attached_columns(self):
+        rng = np.random.default_rng(0)
+        arr = ReplayArrays.from_columns(ts=np.arange(50) * 300_000, s_model=rng.normal(size=50),
+                                        close=60000 + rng.normal(size=50))
+        shm, spec = share_arrays(arr.as_dict())
+        try:
+            handle, cols = attach_arrays(spec)
+            view = ReplayArrays(**cols)
+            for name, col in arr.as_dict().items():
+                np.testing.assert_array_equal(getattr(view, name), col)
+            assert view.ts.dtype == np.int64
+            del view, cols
+            handle.close()
+        finally:
+            shm.close()
+            shm.unlink()
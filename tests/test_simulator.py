@@ -0,0 +1,137 @@
+"""
+tests/test_simulator.py
+
+Verifies the headless simulator: warm-up gating, per-bar decisions that match
+the live decision functions on the same inputs, batched vs per-bar inference,
+seeded bandit runs and the paper daily stop.
+
+Run with:
+    python -m pytest tests/test_simulator.py -v
+"""
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from live_demo.decision import Thresholds, gate_and_score
+from live_demo.model_runtime import ModelRuntime
+from live_demo.simulator import Simulator, simulate, summarize
+
+COLUMNS = ["mom_1", "mom_3", "mr_ema20_z", "rv_1h"]
+
+
+@pytest.fixture(scope="module")
+def model(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("sim_model")
+    rng = np.random.default_rng(0)
+    X = rng.normal(0.0, [0.003, 0.005, 1.0, 0.01], (600, 4))
+    y = np.digitize(X[:, 2] + 0.3 * rng.normal(size=600), [-0.5, 0.5])
+    joblib.dump(LogisticRegression(max_iter=500).fit(X, y), tmp_path / "model.joblib")
+    (tmp_path / "cols.json").write_text(json.dumps({"feature_cols": COLUMNS}))
+    (tmp_path / "LATEST.json").write_text(json.dumps(
+        {"meta_classifier": "model.joblib", "feature_columns": "cols.json", "feature_dim": len(COLUMNS)}))
+    return ModelRuntime(str(tmp_path / "LATEST.json"))
+
+
+def _bars(n, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 60000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.004, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0.0, 0.002, n)) * close
+    return pd.DataFrame({
+        "ts": 1_700_000_000_000 + 300_000 * np.arange(n),
+        "open": open_, "high": np.maximum(open_, close) + spread, "low": np.minimum(open_, close) - spread,
+        "close": close, "volume": rng.uniform(50.0, 150.0, n),
+    })
+
+
+def _cfg(**overrides):
+    cfg = {
+        "data": {"symbol": "BTCUSDT", "interval": "5m"},
+        "thresholds": {"S_MIN": 0.05, "M_MIN": 0.12, "CONF_MIN": 0.05, "ALPHA_MIN": 0.1},
+        "risk": {"sigma_target": 0.2, "pos_max": 1.0, "cooldown_bars": 1, "vol_floor": 0.3,
+                 "base_notional": 5000.0, "cost_bps": 5.0, "enable_net_edge_gating": False},
+        "calibration": {"band_bps": 0.0},
+        "execution": {},
+    }
+    for key, value in overrides.items():
+        section, _, name = key.partition(".")
+        cfg.setdefault(section, {})[name] = value
+    return cfg
+
+
+class TestWarmup:
+    def test_short_warmup_gates_first_bars(self, model):
+        sim = Simulator(_cfg(), model)
+        sim.warmup(_bars(10))
+        res = sim.run(_bars(100, seed=2))
+        # 10 warmup bars + the repeated sanity bar; the 39th bar is the 50th fed
+        assert not res["warmed"][:38].any() and res["warmed"][38:].all()
+        assert np.isnan(res["equity"][:38]).all() and sim.bar_count == 100
+
+    def test_non_advancing_bars_skipped(self, model):
+        bars = _bars(300)
+        dup = pd.concat([bars.iloc[:200], bars.iloc[150:]], ignore_index=True)
+        a = simulate(_cfg(), bars, warmup_bars=100, model=model)
+        b = simulate(_cfg(), dup, warmup_bars=100, model=model)
+        for k in a:
+            np.testing.assert_array_equal(a[k], b[k])
+
+
+class TestDecisions:
+    def test_matches_live_decision_functions(self, model):
+        records = []
+        res = simulate(_cfg(), _bars(1600), model=model, sink=records.append)
+        assert len(records) == res["warmed"].sum() == 600
+        th = Thresholds(**_cfg()["thresholds"])
+        for r in records:
+            d = r["decision"]
+            if d["details"].get("mode") == "exit":
+                continue
+            ref = gate_and_score({"pros": 0.0, "amateurs": 0.0, "mood": 0.0}, r["decision_model_out"], th)
+            assert (d["dir"], d["alpha"]) == (ref["dir"], ref["alpha"])
+        assert summarize(res)["n_trades"] > 10
+
+    def test_run_step_and_batch_inference_agree(self, model):
+        bars = _bars(1400, seed=3)
+        rng = np.random.default_rng(5)
+        for k, scale in (("pros", 0.2), ("amateurs", 0.2), ("mood", 0.5)):
+            bars[k] = rng.normal(0.0, scale, len(bars))
+        res = simulate(_cfg(), bars, model=model)
+        batched = simulate(_cfg(), bars, model=model, batch_inference=True)
+        sim = Simulator(_cfg(), model)
+        sim.warmup(bars.iloc[:1000])
+        stepped = [sim.step(row.ts, {k: getattr(row, k) for k in ("open", "high", "low", "close", "volume")},
+                            cohort={k: getattr(row, k) for k in ("pros", "amateurs", "mood")})
+                   for row in bars.iloc[1000:].itertuples()]
+        assert [o["decision"]["dir"] for o in stepped] == res["dir"].tolist()
+        for k in ("dir", "chosen", "traded"):
+            np.testing.assert_array_equal(res[k], batched[k])
+        for k in ("target", "equity"):
+            np.testing.assert_allclose(res[k], batched[k], rtol=1e-12)
+
+    def test_bandit_seeded_and_rewarded(self, model):
+        cfg = _cfg(**{"execution.bandit": {"enabled": True, "epsilon": 0.1}})
+        a = simulate(cfg, _bars(1500), model=model, seed=7)
+        b = simulate(cfg, _bars(1500), model=model, seed=7)
+        for k in a:
+            np.testing.assert_array_equal(a[k], b[k])
+        assert (a["chosen"] >= 2).any()
+        sim = Simulator(cfg, model)
+        sim.warmup(_bars(1000))
+        sim.run(_bars(1500).iloc[1000:], seed=7)
+        assert sim.bandit.counts.sum() > 0
+
+
+class TestPaper:
+    def test_daily_stop_goes_flat(self, model):
+        res = simulate(_cfg(**{"risk.daily_stop_dd_pct": 0.05}), _bars(1600), model=model)
+        eq = res["equity"]
+        dd = 100.0 * (np.maximum.accumulate(np.r_[10000.0, eq])[1:] - eq) / np.maximum.accumulate(np.r_[10000.0, eq])[1:]
+        hit = int(np.argmax(dd >= 0.05))
+        assert dd[hit] >= 0.05
+        after = res["target"][hit + 1:]
+        assert np.all(after[np.isfinite(after)] == 0.0) and res["position"][-1] == 0.0
@@ -0,0 +1,102 @@
+"""
+tests/test_trade_tape.py
+
+Verifies IntrabarTradeAggregator statistics, bucketing of trades stamped
+after the bar close into the next bar, and their exposure through
+LiveFeatureComputer.
+
+Run with:
+    python -m pytest tests/test_trade_tape.py -v
+"""
+import math
+
+import pytest
+
+from live_demo.features import LiveFeatureComputer
+from live_demo.trade_tape import IntrabarTradeAggregator, TAPE_FEATURES
+
+
+def _trade(price, size, side, coin="BTC", source="public", ts=0):
+    return {"ts": ts, "address": "", "coin": coin, "side": side,
+            "price": price, "size": size, "source": source}
+
+
+NULL_COHORT = {"pros": 0.0, "amateurs": 0.0, "mood": 0.0}
+BAR = {"open": 100.0, "high": 103.0, "low": 99.0, "close": 102.0, "volume": 6.0}
+
+
+class TestIntrabarTradeAggregator:
+
+    def test_bar_statistics(self):
+        agg = IntrabarTradeAggregator(large_print_size=2.0)
+        agg.add_trade(_trade(100.0, 1.0, "buy"))
+        agg.add_trade(_trade(101.0, 3.0, "sell"))
+        agg.add_trade(_trade(102.0, 2.0, "buy"))
+        out = agg.roll(close=102.0)
+
+        vwap = (100.0 * 1 + 101.0 * 3 + 102.0 * 2) / 6.0
+        assert out["tape_vwap"] == pytest.approx(vwap)
+        assert out["tape_vwap_dev"] == pytest.approx(102.0 / vwap - 1.0)
+        assert out["tape_imbalance"] == pytest.approx((3.0 - 3.0) / 6.0)
+        assert out["tape_trade_count"] == 3.0
+        assert out["tape_large_share"] == pytest.approx(5.0 / 6.0)
+        rv = math.log(101 / 100) ** 2 + math.log(102 / 101) ** 2
+        assert out["tape_rv_intrabar"] == pytest.approx(rv)
+
+    def test_roll_resets_and_ignores_foreign_prints(self):
+        agg = IntrabarTradeAggregator()
+        assert agg.add_trade(_trade(100.0, 1.0, "buy", coin="ETH")) is False
+        assert agg.add_trade(_trade(100.0, 1.0, "buy", source="user")) is False
+        assert agg.add_trade(_trade(0.0, 1.0, "buy")) is False
+        agg.add_trade(_trade(100.0, 1.0, "buy"))
+        agg.roll()
+        empty = agg.roll(close=100.0)
+        assert all(empty[k] == 0.0 for k in TAPE_FEATURES)
+
+
+    def test_trades_after_bar_close_carry_into_next_bar(self):
+        bar_ms = 300_000
+        agg = IntrabarTradeAggregator(bar_ms=bar_ms)
+        agg.roll(close_ts=bar_ms - 1)  # bar [0, 300000) closed; next closes at 599999
+        agg.add_trade(_trade(100.0, 1.0, "buy", ts=bar_ms + 10))
+        agg.add_trade(_trade(101.0, 1.0, "buy", ts=2 * bar_ms - 1))
+        # Prints for the following bar arrive before this one is rolled
+        agg.add_trade(_trade(110.0, 2.0, "sell", ts=2 * bar_ms))
+        agg.add_trade(_trade(111.0, 2.0, "sell", ts=2 * bar_ms + 5))
+        assert agg.trade_count == 2 and agg.carried_count == 2
+
+        out = agg.roll(close=101.0, close_ts=2 * bar_ms - 1)
+        assert out["tape_trade_count"] == 2.0
+        assert out["tape_vwap"] == pytest.approx(100.5)
+        assert out["tape_imbalance"] == pytest.approx(1.0)
+
+        nxt = agg.roll(close=111.0, close_ts=3 * bar_ms - 1)
+        assert nxt["tape_trade_count"] == 2.0
+        assert nxt["tape_vwap"] == pytest.approx(110.5)
+        assert nxt["tape_rv_intrabar"] == pytest.approx(math.log(111 / 110) ** 2)
+
+
+class TestTapeFeatures:
+
+    def _tape(self):
+        agg = IntrabarTradeAggregator()
+        agg.add_trade(_trade(101.0, 1.0, "buy"))
+        agg.add_trade(_trade(101.0, 1.0, "buy"))
+        return agg.roll(close=BAR["close"])
+
+    def test_named_tape_columns_exposed(self):
+        lf = LiveFeatureComputer(["tape_imbalance", "tape_trade_count", "mom_1"])
+        feats = lf.update_and_build(BAR, NULL_COHORT, 0.0, tape=self._tape())
+        assert feats[0] == pytest.approx(1.0)
+        assert feats[1] == 2.0
+
+    def test_proxies_unchanged_unless_enabled(self):
+        cols = ["vwap_momentum", "depth_proxy"]
+        tape = self._tape()
+        default = LiveFeatureComputer(cols).update_and_build(BAR, NULL_COHORT, 0.0, tape=tape)
+        assert default == [0.0, 0.0]  # mom_3 is 0 on the first bar, depth stays 0
+
+        lf = LiveFeatureComputer(cols, use_tape_proxies=True)
+        feats = lf.update_and_build(BAR, NULL_COHORT, 0.0, tape=tape)
+        assert feats[0] == pytest.approx(102.0 / 101.0 - 1.0)
+        assert feats[1] == pytest.approx(1.0)
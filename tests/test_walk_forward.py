@@ -0,0 +1,75 @@
+"""
+tests/test_walk_forward.py
+
+Verifies walk-forward fold splitting, that pooled shared-memory runs match
+in-process runs, and the fold aggregation/selection tables.
+
+Run with:
+    python -m pytest tests/test_walk_forward.py -v
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from walk_forward import (
+    Dataset,
+    config_grid,
+    make_folds,
+    run_walk_forward,
+    select_walk_forward,
+    summarize_walk_forward,
+)
+
+
+def _dataset(n, seed=0, tz=None):
+    rng = np.random.default_rng(seed)
+    sig = rng.normal(0.0, 1.0, (n, 4))
+    df = pd.DataFrame(
+        {"returns": rng.normal(0.0, 0.002, n), "a": sig[:, 0], "b": sig[:, 1], "c": sig[:, 2], "d": sig[:, 3],
+         "adv": 2e6},
+        index=pd.date_range("2025-01-01", periods=n, freq="5min", tz=tz),
+    )
+    return Dataset.from_frame(df, arm_cols=["a", "b", "c", "d"], signal_col="a", adv_col="adv")
+
+
+CONFIGS = config_grid(cost_bps=[1.0, 5.0], dd_stop=[0.05], side_eps=[[0.5] * 4]) + [
+    {"engine": "simple", "threshold": 0.5, "cost_bps": 2.0, "dataset": "1h"},
+]
+
+
+class TestFolds:
+    def test_rolling(self):
+        folds = make_folds(103, n_folds=4, train_bars=20)
+        assert [f.test for f in folds] == [(20, 40), (40, 60), (60, 80), (80, 103)]
+        assert all(f.train == (f.test[0] - 20, f.test[0]) for f in folds)
+
+    def test_anchored_default_train(self):
+        folds = make_folds(60, n_folds=5, anchored=True)
+        assert folds[0].train == (0, 10) and folds[-1].train == (0, 50)
+
+    def test_too_short(self):
+        with pytest.raises(ValueError):
+            make_folds(5, n_folds=10)
+
+
+class TestRunner:
+    def test_pool_matches_in_process(self):
+        datasets = {"5m": _dataset(3000, tz="UTC"), "1h": _dataset(1200, seed=1)}
+        serial = run_walk_forward(datasets, CONFIGS, n_folds=3, workers=1, seed=4)
+        pooled = run_walk_forward(datasets, CONFIGS, n_folds=3, workers=2, seed=4)
+        pd.testing.assert_frame_equal(serial, pooled)
+        # 2 allocator configs on both datasets + 1 simple config on 1h, 3 folds, train + test
+        assert len(serial) == (2 * 2 + 1) * 3 * 2
+        assert set(serial.loc[serial["dataset"] == "5m", "config_id"]) == {0, 1}
+
+    def test_summary_and_selection(self):
+        results = run_walk_forward({"1h": _dataset(1200, seed=2)}, CONFIGS, n_folds=3, workers=1)
+        summary = summarize_walk_forward(results)
+        assert len(summary) == 3 and (summary["n_folds"] == 3).all()
+        assert {"final_equity_mean", "final_equity_std", "final_equity_min", "final_equity_max"} <= set(summary.columns)
+        selection = select_walk_forward(results, metric="final_equity")
+        train = results[results["segment"] == "train"]
+        for _, row in selection.iterrows():
+            fold_train = train[train["fold"] == row["fold"]]
+            assert row["train_final_equity"] == fold_train["final_equity"].max()
+            assert row["start"] == fold_train["end"].iloc[0]
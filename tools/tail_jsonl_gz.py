@@ -1,16 +1,22 @@
 import sys
-import gzip
 from pathlib import Path
 
+# Ensure repo root on path
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from ops.llm_logging import read_gzip_tail  # type: ignore
+
 
 def tail_jsonl_gz(path: Path, n: int = 5):
     if not path.exists():
         print(f"[ERR] File not found: {path}")
         return 1
     try:
-        with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as fh:
-            lines = fh.readlines()
-        for line in lines[-n:]:
+        # Seeks via the partition's block index; tolerant of a member cut short by a crash
+        lines = read_gzip_tail(path, n).decode('utf-8', errors='replace').splitlines()
+        for line in lines:
             print(line.rstrip())
         return 0
     except Exception as e:
@@ -0,0 +1,277 @@
+"""
+Parallel Walk-Forward Runner
+Splits history into rolling (or anchored) train/test folds and runs every
+(dataset x config x fold) backtest job on a process pool.
+
+Each dataset is a timeframe's return, signal and eligibility arrays. All
+datasets are packed once into a single shared-memory block. Workers attach
+read-only views and rebuild only the slice a job needs. No DataFrame is
+pickled per job.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest_engine import run_allocator_backtest, run_simple_backtest
+from ops.shared_arrays import attach_arrays, share_arrays
+
+
+@dataclass
+class Dataset:
+    """Per-bar arrays for one timeframe.
+
+    The allocator engine needs arm_signals, arm_eligible and optionally adv.
+    The simple engine needs signal. ts (int64 ns since epoch) becomes the
+    DatetimeIndex of each sliced frame; without it a RangeIndex is used.
+    """
+
+    returns: np.ndarray
+    ts: Optional[np.ndarray] = None
+    arm_signals: Optional[np.ndarray] = None
+    arm_eligible: Optional[np.ndarray] = None
+    adv: Optional[np.ndarray] = None
+    signal: Optional[np.ndarray] = None
+    tz: Optional[str] = None
+
+    def __len__(self) -> int:
+        return int(len(self.returns))
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        names = ('returns', 'ts', 'arm_signals', 'arm_eligible', 'adv', 'signal')
+        return {k: np.asarray(getattr(self, k)) for k in names if getattr(self, k) is not None}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, arm_cols: Optional[Sequence[str]] = None,
+                   signal_col: Optional[str] = None, adv_col: Optional[str] = None,
+                   eligible_eps: float = 1e-3) -> 'Dataset':
+        """Build from a DataFrame with a 'returns' column and a DatetimeIndex.
+
+        Arms count as eligible where |signal| > eligible_eps, the same rule as
+        example_backtest.py.
+        """
+        idx = df.index
+        ts = idx.asi8 if isinstance(idx, pd.DatetimeIndex) else None
+        tz = str(idx.tz) if isinstance(idx, pd.DatetimeIndex) and idx.tz is not None else None
+        arm_signals = df[list(arm_cols)].fillna(0).to_numpy(dtype=float) if arm_cols else None
+        return cls(
+            returns=df['returns'].fillna(0).to_numpy(dtype=float),
+            ts=ts,
+            arm_signals=arm_signals,
+            arm_eligible=np.abs(arm_signals) > eligible_eps if arm_signals is not None else None,
+            adv=df[adv_col].to_numpy(dtype=float) if adv_col else None,
+            signal=df[signal_col].to_numpy(dtype=float) if signal_col else None,
+            tz=tz,
+        )
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Bar ranges [start, end) of one walk-forward step."""
+
+    index: int
+    train: Tuple[int, int]
+    test: Tuple[int, int]
+
+
+def make_folds(n: int, n_folds: int = 5, train_bars: Optional[int] = None, anchored: bool = False) -> List[Fold]:
+    """
+    Split n bars into consecutive, non-overlapping test windows
+
+    Args:
+        n: Number of bars
+        n_folds: Number of test windows
+        train_bars: Bars before the first test window (default n // (n_folds + 1))
+        anchored: Train on everything before each test window instead of a
+            rolling window of train_bars
+
+    Returns:
+        Folds in time order; the last test window absorbs the remainder
+    """
+    train_bars = int(train_bars if train_bars is not None else n // (n_folds + 1))
+    test_bars = (n - train_bars) // n_folds
+    if n_folds < 1 or train_bars < 1 or test_bars < 1:
+        raise ValueError(f"Cannot split {n} bars into {n_folds} folds after {train_bars} train bars")
+    folds = []
+    for k in range(n_folds):
+        start = train_bars + k * test_bars
+        end = n if k == n_folds - 1 else start + test_bars
+        folds.append(Fold(k, (0 if anchored else start - train_bars, start), (start, end)))
+    return folds
+
+
+def config_grid(**values: Sequence) -> List[Dict]:
+    """Cartesian product of keyword value lists, e.g. config_grid(cost_bps=[2, 5], dd_stop=[0.05])."""
+    keys = list(values)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(values[k] for k in keys))]
+
+
+# ---- jobs ------------------------------------------------------------------------
+
+_ALLOCATOR_KEYS = ('cooldown_bars', 'cost_bps', 'impact_k', 'eps', 'sigma_target', 'pos_max',
+                   'dd_stop', 'latency_bars', 'annualizer')
+_SIMPLE_KEYS = ('threshold', 'cost_bps', 'pos_max')
+_ALLOCATOR_DEFAULTS = {'cooldown_bars': 12, 'cost_bps': 5.0, 'impact_k': 0.0}
+
+
+def _index(cols: Dict[str, np.ndarray], tz: Optional[str], lo: int, hi: int) -> pd.Index:
+    if 'ts' not in cols:
+        return pd.RangeIndex(lo, hi)
+    idx = pd.DatetimeIndex(np.asarray(cols['ts'][lo:hi], dtype='datetime64[ns]'))
+    return idx.tz_localize('UTC').tz_convert(tz) if tz else idx
+
+
+def _run_segment(cols: Dict[str, np.ndarray], tz: Optional[str], lo: int, hi: int, config: Dict) -> Dict:
+    engine = config.get('engine', 'allocator')
+    index = _index(cols, tz, lo, hi)
+    returns = pd.Series(cols['returns'][lo:hi], index=index)
+    if engine == 'simple':
+        signals = pd.DataFrame({'signal': cols['signal'][lo:hi]}, index=index)
+        return run_simple_backtest(signals, returns, **{k: config[k] for k in _SIMPLE_KEYS if k in config})
+    if engine != 'allocator':
+        raise ValueError(f"Unknown engine '{engine}'")
+    kwargs = {**_ALLOCATOR_DEFAULTS, **{k: config[k] for k in _ALLOCATOR_KEYS if k in config}}
+    n_arms = cols['arm_signals'].shape[1]
+    side_eps = np.asarray(config.get('side_eps', [0.0] * n_arms), dtype=float)
+    adv = pd.Series(cols['adv'][lo:hi], index=index) if 'adv' in cols else None
+    _, _, _, metrics = run_allocator_backtest(
+        pd.DataFrame({'returns': returns}), cols['arm_signals'][lo:hi], cols['arm_eligible'][lo:hi],
+        adv, side_eps_vec=side_eps, **kwargs,
+    )
+    return metrics
+
+
+def _run_job(cols: Dict[str, np.ndarray], tz: Optional[str], job: Tuple, seed: int, include_train: bool) -> List[Dict]:
+    dataset, fold, config_id, config = job
+    rows = []
+    segments = (('train', fold.train), ('test', fold.test)) if include_train else (('test', fold.test),)
+    for s, (segment, (lo, hi)) in enumerate(segments):
+        # Allocator bandit draws from the global RNG; seed per job so results
+        # do not depend on which worker ran what, or in which order
+        np.random.seed(np.random.SeedSequence([seed, config_id, fold.index, s]).generate_state(1)[0])
+        metrics = _run_segment(cols, tz, lo, hi, config)
+        rows.append({'dataset': dataset, 'config_id': config_id, 'fold': fold.index, 'segment': segment,
+                     'start': lo, 'end': hi, **metrics})
+    return rows
+
+
+_WORKER: Dict = {}
+
+
+def _init_worker(spec: Dict, tz: Dict[str, Optional[str]], seed: int, include_train: bool) -> None:
+    shm, views = attach_arrays(spec)
+    by_dataset: Dict[str, Dict[str, np.ndarray]] = {}
+    for key, view in views.items():
+        name, _, col = key.rpartition('/')
+        by_dataset.setdefault(name, {})[col] = view
+    _WORKER.update(shm=shm, cols=by_dataset, tz=tz, seed=seed, include_train=include_train)
+
+
+def _run_job_in_worker(job: Tuple) -> List[Dict]:
+    w = _WORKER
+    return _run_job(w['cols'][job[0]], w['tz'][job[0]], job, w['seed'], w['include_train'])
+
+
+# ---- runner ----------------------------------------------------------------------
+
+def run_walk_forward(
+    datasets: Dict[str, Dataset],
+    configs: Sequence[Dict],
+    n_folds: int = 5,
+    train_bars: Optional[int] = None,
+    anchored: bool = False,
+    include_train: bool = True,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Run every (dataset x config x fold) backtest job
+
+    Args:
+        datasets: Timeframe name -> Dataset
+        configs: Backtest configs. 'engine' is 'allocator' (default) or 'simple'.
+            The remaining keys are run_allocator_backtest / run_simple_backtest
+            keyword arguments, with side_eps as a per-arm list. A 'dataset'
+            key restricts a config to that timeframe.
+        n_folds, train_bars, anchored: Passed to make_folds per dataset
+        include_train: Also backtest each fold's train window (needed by
+            select_walk_forward)
+        workers: Process count (default os.cpu_count(); <= 1 runs in-process)
+        seed: Base seed for the per-job RNG
+
+    Returns:
+        One row per (dataset, config_id, fold, segment) with the engine's metrics
+    """
+    jobs = []
+    for name, ds in datasets.items():
+        for fold in make_folds(len(ds), n_folds, train_bars, anchored):
+            for config_id, config in enumerate(configs):
+                if config.get('dataset', name) == name:
+                    jobs.append((name, fold, config_id, config))
+
+    workers = int(workers if workers is not None else (os.cpu_count() or 1))
+    tz = {name: ds.tz for name, ds in datasets.items()}
+    if workers <= 1:
+        cols = {name: ds.arrays() for name, ds in datasets.items()}
+        nested = [_run_job(cols[j[0]], tz[j[0]], j, seed, include_train) for j in jobs]
+    else:
+        packed = {f'{name}/{k}': v for name, ds in datasets.items() for k, v in ds.arrays().items()}
+        shm, spec = share_arrays(packed)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(spec, tz, seed, include_train)) as pool:
+                nested = list(pool.map(_run_job_in_worker, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    results = pd.DataFrame([row for rows in nested for row in rows])
+    if not results.empty:
+        params = pd.DataFrame([{k: (str(v) if isinstance(v, (list, tuple, np.ndarray)) else v)
+                                for k, v in {'engine': 'allocator', **c}.items() if k != 'dataset'}
+                               for c in configs])
+        params.columns = [f'cfg_{c}' for c in params.columns]
+        results = results.join(params, on='config_id')
+    return results
+
+
+def summarize_walk_forward(results: pd.DataFrame, segment: str = 'test') -> pd.DataFrame:
+    """
+    Aggregate fold rows into one metrics table with per-fold dispersion
+
+    Returns:
+        One row per (dataset, config_id). For each metric there are
+        <metric>_mean, _std, _min and _max columns across folds, plus n_folds
+        and the cfg_* parameter columns.
+    """
+    rows = results[results['segment'] == segment]
+    cfg_cols = [c for c in rows.columns if c.startswith('cfg_')]
+    skip = {'config_id', 'fold', 'start', 'end', *cfg_cols}
+    metric_cols = [c for c in rows.select_dtypes(include=[np.number, bool]).columns if c not in skip]
+    grouped = rows.groupby(['dataset', 'config_id'])
+    agg = grouped[metric_cols].agg(['mean', 'std', 'min', 'max'])
+    agg.columns = [f'{m}_{stat}' for m, stat in agg.columns]
+    agg.insert(0, 'n_folds', grouped['fold'].nunique())
+    if cfg_cols:
+        agg = agg.join(grouped[cfg_cols].first())
+    return agg.reset_index()
+
+
+def select_walk_forward(results: pd.DataFrame, metric: str = 'sharpe') -> pd.DataFrame:
+    """
+    Walk-forward selection: per (dataset, fold) pick the config with the best
+    train-window `metric` and report its out-of-sample test metrics
+
+    Returns:
+        One row per (dataset, fold) with config_id, train_<metric> and the test metrics
+    """
+    train = results[results['segment'] == 'train'].dropna(subset=[metric])
+    best = train.loc[train.groupby(['dataset', 'fold'])[metric].idxmax(), ['dataset', 'fold', 'config_id', metric]]
+    best = best.rename(columns={metric: f'train_{metric}'})
+    test = results[results['segment'] == 'test'].drop(columns=['segment'])
+    return best.merge(test, on=['dataset', 'fold', 'config_id'], how='left').reset_index(drop=True)